@@ -0,0 +1,16 @@
+"""
+Index bookings by (status, created_at) for the pending-booking expiry sweep
+"""
+# Alembic identifiers
+revision = '20261018_booking_expiry_index'
+down_revision = '20261018_invoice_next_reminder_at'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_bookings_status_created_at', 'bookings', ['status', 'created_at'])
+
+def downgrade():
+    op.drop_index('ix_bookings_status_created_at', table_name='bookings')
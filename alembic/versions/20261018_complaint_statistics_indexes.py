@@ -0,0 +1,19 @@
+"""
+Index complaints by (hostel_name, created_at) and (assigned_to_email, created_at)
+for the aggregate complaint statistics
+"""
+# Alembic identifiers
+revision = '20261018_complaint_statistics_indexes'
+down_revision = '20261018_hostel_search_indexes'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_complaints_hostel_name_created_at', 'complaints', ['hostel_name', 'created_at'])
+    op.create_index('ix_complaints_assigned_to_email_created_at', 'complaints', ['assigned_to_email', 'created_at'])
+
+def downgrade():
+    op.drop_index('ix_complaints_assigned_to_email_created_at', table_name='complaints')
+    op.drop_index('ix_complaints_hostel_name_created_at', table_name='complaints')
@@ -0,0 +1,34 @@
+"""
+Create email_outbox table for background SMTP delivery
+"""
+# Alembic identifiers
+revision = '20261018_email_outbox'
+down_revision = '20261018_push_broadcast_batches'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('to_email', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=False),
+        sa.Column('text_body', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_email_outbox_id', 'email_outbox', ['id'])
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'])
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_id', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,19 @@
+"""
+Add the claimed_at lease to email_outbox
+"""
+# Alembic identifiers
+revision = '20261018_email_outbox_lease'
+down_revision = '20261018_payment_reminder_claims'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('email_outbox', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    # Rows already "sending" get a fresh lease rather than being resent at once
+    op.execute("UPDATE email_outbox SET claimed_at = CURRENT_TIMESTAMP WHERE status = 'sending'")
+
+def downgrade():
+    op.drop_column('email_outbox', 'claimed_at')
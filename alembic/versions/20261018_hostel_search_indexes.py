@@ -0,0 +1,33 @@
+"""
+Hostel coordinates for geo search, and trigram / full-text indexes for the
+database search fallback (used while Elasticsearch is unavailable)
+"""
+# Alembic identifiers
+revision = '20261018_hostel_search_indexes'
+down_revision = '20261018_booking_expiry_index'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+# Must stay identical to the expression in SearchService._search_document
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(hostel_name, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(full_address, ''))"
+)
+
+def upgrade():
+    op.add_column('hostels', sa.Column('latitude', sa.Numeric(9, 6), nullable=True))
+    op.add_column('hostels', sa.Column('longitude', sa.Numeric(9, 6), nullable=True))
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_hostels_hostel_name_trgm ON hostels USING gin (hostel_name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_hostels_full_address_trgm ON hostels USING gin (full_address gin_trgm_ops)")
+    op.execute(f"CREATE INDEX ix_hostels_search_document ON hostels USING gin ({SEARCH_DOCUMENT})")
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_hostels_search_document")
+    op.execute("DROP INDEX IF EXISTS ix_hostels_full_address_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_hostels_hostel_name_trgm")
+    op.drop_column('hostels', 'longitude')
+    op.drop_column('hostels', 'latitude')
@@ -0,0 +1,30 @@
+"""
+Add reminder state and the next_reminder_at due-time index to invoices
+"""
+# Alembic identifiers
+revision = '20261018_invoice_next_reminder_at'
+down_revision = '20261018_student_import_jobs'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('invoices', sa.Column('reminder_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('invoices', sa.Column('last_reminder_sent', sa.DateTime(), nullable=True))
+    op.add_column('invoices', sa.Column('escalation_level', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('invoices', sa.Column('next_reminder_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_invoices_next_reminder_at_id', 'invoices', ['next_reminder_at', 'id'])
+    # Open invoices are looked at by the next run, which schedules them properly
+    op.execute(
+        "UPDATE invoices SET next_reminder_at = CURRENT_TIMESTAMP "
+        "WHERE status IN ('pending', 'partial', 'overdue')"
+    )
+
+def downgrade():
+    op.drop_index('ix_invoices_next_reminder_at_id', table_name='invoices')
+    op.drop_column('invoices', 'next_reminder_at')
+    op.drop_column('invoices', 'escalation_level')
+    op.drop_column('invoices', 'last_reminder_sent')
+    op.drop_column('invoices', 'reminder_count')
@@ -0,0 +1,32 @@
+"""
+Create hostel_occupancy_snapshots table for daily occupancy history
+"""
+# Alembic identifiers
+revision = '20261018_occupancy_snapshots'
+down_revision = '20251201_add_read_to_notificationstatus'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'hostel_occupancy_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('hostel_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('occupied_beds', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_beds', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('hostel_id', 'snapshot_date', name='unique_hostel_snapshot_date'),
+    )
+    op.create_index('ix_hostel_occupancy_snapshots_id', 'hostel_occupancy_snapshots', ['id'])
+    op.create_index('ix_hostel_occupancy_snapshots_hostel_id', 'hostel_occupancy_snapshots', ['hostel_id'])
+    op.create_index('ix_hostel_occupancy_snapshots_snapshot_date', 'hostel_occupancy_snapshots', ['snapshot_date'])
+
+def downgrade():
+    op.drop_index('ix_hostel_occupancy_snapshots_snapshot_date', table_name='hostel_occupancy_snapshots')
+    op.drop_index('ix_hostel_occupancy_snapshots_hostel_id', table_name='hostel_occupancy_snapshots')
+    op.drop_index('ix_hostel_occupancy_snapshots_id', table_name='hostel_occupancy_snapshots')
+    op.drop_table('hostel_occupancy_snapshots')
@@ -0,0 +1,19 @@
+"""
+Add queued_at to payment reminders (claim held while the SMS is queued)
+"""
+# Alembic identifiers
+revision = '20261018_payment_reminder_claims'
+down_revision = '20261018_complaint_statistics_indexes'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('payment_reminderss', sa.Column('queued_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_payment_reminderss_queued_at', 'payment_reminderss', ['queued_at'])
+
+def downgrade():
+    op.drop_index('ix_payment_reminderss_queued_at', table_name='payment_reminderss')
+    op.drop_column('payment_reminderss', 'queued_at')
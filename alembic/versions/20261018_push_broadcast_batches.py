@@ -0,0 +1,21 @@
+"""
+Link notification_logs to their broadcast batch and track batch status
+"""
+# Alembic identifiers
+revision = '20261018_push_broadcast_batches'
+down_revision = '20261018_occupancy_snapshots'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('notification_logs', sa.Column('batch_id', sa.Integer(), nullable=True))
+    op.create_index('ix_notification_logs_batch_id', 'notification_logs', ['batch_id'])
+    op.add_column('notification_batches', sa.Column('status', sa.String(), nullable=True, server_default='completed'))
+
+def downgrade():
+    op.drop_column('notification_batches', 'status')
+    op.drop_index('ix_notification_logs_batch_id', table_name='notification_logs')
+    op.drop_column('notification_logs', 'batch_id')
@@ -0,0 +1,19 @@
+"""
+Add heartbeat_at to student_import_jobs
+"""
+# Alembic identifiers
+revision = '20261018_student_import_heartbeat'
+down_revision = '20261018_email_outbox_lease'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('student_import_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    # Jobs already running get a fresh heartbeat rather than being taken over at once
+    op.execute("UPDATE student_import_jobs SET heartbeat_at = CURRENT_TIMESTAMP WHERE status = 'running'")
+
+def downgrade():
+    op.drop_column('student_import_jobs', 'heartbeat_at')
@@ -0,0 +1,59 @@
+"""
+Create student_import_jobs and the student_import_rows staging table
+"""
+# Alembic identifiers
+revision = '20261018_student_import_jobs'
+down_revision = '20261018_email_outbox'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'student_import_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('last_row', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('created_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('skipped_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_student_import_jobs_id', 'student_import_jobs', ['id'])
+
+    op.create_table(
+        'student_import_rows',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.String(), nullable=False),
+        sa.Column('student_name', sa.String(), nullable=False),
+        sa.Column('student_email', sa.String(), nullable=False),
+        sa.Column('student_phone', sa.String(), nullable=False),
+        sa.Column('date_of_birth', sa.Date(), nullable=True),
+        sa.Column('guardian_name', sa.String(), nullable=True),
+        sa.Column('guardian_phone', sa.String(), nullable=True),
+        sa.Column('emergency_contact', sa.String(), nullable=True),
+        sa.Column('check_in_date', sa.Date(), nullable=True),
+        sa.Column('room_assignment', sa.String(), nullable=True),
+        sa.Column('bed_assignment', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+    )
+    op.create_index('ix_student_import_rows_job_row', 'student_import_rows', ['job_id', 'row_number'])
+
+def downgrade():
+    op.drop_index('ix_student_import_rows_job_row', table_name='student_import_rows')
+    op.drop_table('student_import_rows')
+    op.drop_index('ix_student_import_jobs_id', table_name='student_import_jobs')
+    op.drop_table('student_import_jobs')
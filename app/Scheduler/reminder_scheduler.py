@@ -1,10 +1,14 @@
 # app/scheduler/reminder_scheduler.py
 
-from app.Scheduler.reminder_scheduler import BackgroundScheduler
-from app.Scheduler.reminder_scheduler import CronTrigger
+import logging
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
 from app.core.database import SessionLocal
 from app.services.reminder_services import process_automated_reminders
 
+logger = logging.getLogger(__name__)
+
 scheduler = BackgroundScheduler()
 
 
@@ -32,8 +36,10 @@ def stop_scheduler():
 
 
 def run_reminder_job():
+    # Both jobs fire at 9 AM; the job's advisory lock lets only one of them run
     db = SessionLocal()
     try:
-        process_automated_reminders(db)
+        report = process_automated_reminders(db)
+        logger.info("Reminder job: %s", report)
     finally:
         db.close()
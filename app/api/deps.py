@@ -1,7 +1,7 @@
 """
 Dependency functions (get_current_user, role_required)
 """
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
  
@@ -9,6 +9,7 @@ from app.core.security import get_current_user
 from app.core.roles import Role
 from app.core.permissions import has_permission
 from app.core.exceptions import AccessDeniedException
+from app.core.hostel_scope import resolve_hostel_ids, resolve_hostel_ids_many
 from app.models.user import User
 from app.core.database import get_db
  
@@ -26,52 +27,13 @@ def get_active_hostel_id(request: Request) -> Optional[int]:
  
  
 def get_user_hostel_ids(user_id: int, user_role: str, db: Session) -> List[int]:
-    """Get list of hostel IDs user has access to"""
-    from app.repositories.hostel_repository import HostelRepository
-    from app.repositories.user_repository import UserRepository
-   
-    if user_role == Role.SUPERADMIN:
-        # Superadmin has access to all hostels
-        hostel_repo = HostelRepository(db)
-        hostels = hostel_repo.get_all_hostels(skip=0, limit=1000)
-        return [h.id for h in hostels]
-    elif user_role == Role.ADMIN:
-        # Admin has access to assigned hostels
-        hostel_repo = HostelRepository(db)
-        hostels = hostel_repo.get_by_admin(user_id)
-        return [h.id for h in hostels]
-    elif user_role == Role.SUPERVISOR:
-        # Supervisor may be assigned to multiple hostels via supervisor_hostels table
-        # Try several ways to locate the supervisor record so older data (pre-linking)
-        # still works: 1) match Supervisor.user_id, 2) fallback to matching supervisor_email/phone
-        from app.models.supervisors import Supervisor, SupervisorHostel
-        from app.repositories.user_repository import UserRepository
- 
-        # Try direct link first
-        sup = db.query(Supervisor).filter(Supervisor.user_id == user_id).first()
- 
-        # Fallback: try matching by email/phone from the User record (handles pre-linked rows)
-        if not sup:
-            user_repo = UserRepository(db)
-            user = user_repo.get_by_id(user_id)
-            if user:
-                if user.email:
-                    sup = db.query(Supervisor).filter(Supervisor.supervisor_email == user.email).first()
-                if not sup and getattr(user, "phone_number", None):
-                    sup = db.query(Supervisor).filter(Supervisor.supervisor_phone == user.phone_number).first()
- 
-        if not sup:
-            return []
- 
-        rows = db.query(SupervisorHostel).filter(SupervisorHostel.employee_id == sup.employee_id).all()
-        return [r.hostel_id for r in rows]
-    else:
-        # Other roles have access to their own hostel
-        user_repo = UserRepository(db)
-        user = user_repo.get_by_id(user_id)
-        if user and user.hostel_id:
-            return [user.hostel_id]
-        return []
+    """Get list of hostel IDs user has access to (cached per user and role, see app.core.hostel_scope)"""
+    return resolve_hostel_ids(db, user_id, user_role)
+ 
+ 
+def get_users_hostel_ids(users: List[Tuple[int, str]], db: Session) -> Dict[Tuple[int, str], List[int]]:
+    """Hostel IDs for many (user_id, role) pairs at once, e.g. for reports"""
+    return resolve_hostel_ids_many(db, users)
  
  
 def role_required(*allowed_roles):
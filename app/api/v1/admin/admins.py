@@ -24,6 +24,7 @@ from app.schemas.user import UserCreate, UserUpdate, UserResponse, AdminCreate
 from app.repositories.user_repository import UserRepository
 from app.services.permission_service import PermissionService
 from app.core.security import get_password_hash
+from app.core.token_cache import revoke_user_tokens
 from app.config import settings
 from fastapi import Body
  
@@ -70,7 +71,7 @@ def save_profile_picture(file: UploadFile, user_id: int) -> str:
 
 
 @router.post("/admins", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["admin"])
-async def create_admin(
+def create_admin(
     admin_data: AdminCreate,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
     db: Session = Depends(get_db),
@@ -159,7 +160,7 @@ async def create_admin(
 
 
 @router.get("/admins", response_model=List[UserResponse], tags=["admin"])
-async def list_admins(
+def list_admins(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     hostel_id: Optional[int] = Query(None, description="Filter by hostel ID"),
@@ -196,7 +197,7 @@ async def list_admins(
 
 
 @router.get("/admins/{admin_id}", response_model=UserResponse, tags=["admin"])
-async def get_admin(
+def get_admin(
     admin_id: int,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
     db: Session = Depends(get_db),
@@ -231,7 +232,7 @@ async def get_admin(
 
 
 @router.put("/admins/{admin_id}", response_model=UserResponse, tags=["admin"])
-async def update_admin(
+def update_admin(
     admin_id: int,
     admin_data: UserUpdate,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
@@ -306,7 +307,7 @@ async def update_admin(
 
 
 @router.delete("/admins/{admin_id}", status_code=status.HTTP_200_OK, tags=["admin"])
-async def delete_admin(
+def delete_admin(
     admin_id: int,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
     db: Session = Depends(get_db),
@@ -373,11 +374,14 @@ async def delete_admin(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to deactivate admin")
 
+    # Void its cached token claims and active-hostel claims
+    revoke_user_tokens(admin.id)
+
     return {"message": "Admin deactivated"}
 
 
 @router.post("/admins/{admin_id}/profile-picture", response_model=dict, tags=["admin"])
-async def upload_profile_picture(
+def upload_profile_picture(
     admin_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
@@ -439,7 +443,7 @@ async def upload_profile_picture(
 
 
 @router.post("/admins/{admin_id}/assign-hostels", response_model=dict, tags=["admin"])
-async def assign_hostels_to_admin(
+def assign_hostels_to_admin(
     admin_id: int,
     hostel_ids: List[int] = Body(..., embed=True, description="List of hostel ids to assign"),
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
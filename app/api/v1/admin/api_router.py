@@ -90,7 +90,7 @@ def get_template(
 # SEND NOTIFICATION (individual)
 # ============================================================
 @router.post("/send/", response_model=UnifiedNotificationResponse)
-async def send_notification(
+def send_notification(
     request: SendNotificationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -120,7 +120,7 @@ async def send_notification(
         if template else get_user_channel_preferences(db, request.user_id, request.category)
     )
 
-    log = await process_notification(
+    log = process_notification(
         db,
         request.user_id,
         request.user_role.value,
@@ -146,7 +146,7 @@ async def send_notification(
 # BROADCAST NOTIFICATION - Admin + SuperAdmin Only
 # ============================================================
 @router.post("/broadcast/")
-async def broadcast_notification(
+def broadcast_notification(
     request: BroadcastNotificationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -173,7 +173,7 @@ async def broadcast_notification(
             if request.channels else get_user_channel_preferences(db, user_id, request.category)
         )
 
-        await process_notification(
+        process_notification(
             db,
             user_id,
             request.user_role.value if request.user_role else UserRole.student.value,
@@ -16,7 +16,7 @@ router = APIRouter()
 
 
 @router.get("/approvals/pending", response_model=List[dict], status_code=status.HTTP_200_OK)
-async def get_pending_approvals(
+def get_pending_approvals(
     hostel_id: Optional[int] = Query(None),
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
@@ -27,7 +27,7 @@ async def get_pending_approvals(
 
 
 @router.post("/approvals/{approval_id}/approve", response_model=dict, status_code=status.HTTP_200_OK)
-async def approve_request(
+def approve_request(
     approval_id: int,
     notes: Optional[str] = None,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
@@ -39,7 +39,7 @@ async def approve_request(
 
 
 @router.post("/approvals/{approval_id}/reject", response_model=dict, status_code=status.HTTP_200_OK)
-async def reject_request(
+def reject_request(
     approval_id: int,
     notes: Optional[str] = None,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
@@ -51,7 +51,7 @@ async def reject_request(
 
 
 @router.get("/approvals/{approval_id}", response_model=dict, status_code=status.HTTP_200_OK)
-async def get_approval_status(
+def get_approval_status(
     approval_id: int,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN, Role.SUPERVISOR)),
     db: Session = Depends(get_db)
@@ -1,12 +1,13 @@
 """
 View supervisor activity
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.pagination import set_page_headers
 from app.core.roles import Role
 from app.api.deps import role_required, get_current_active_user
 from app.models.user import User
@@ -19,9 +20,11 @@ router = APIRouter()
 
 
 @router.get("/audit", response_model=List[AuditLogResponse], status_code=status.HTTP_200_OK)
-async def get_audit_logs(
+def get_audit_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     user_id: Optional[int] = None,
     hostel_id: Optional[int] = None,
     action: Optional[str] = None,
@@ -41,17 +44,20 @@ async def get_audit_logs(
         end_date=end_date
     )
     
-    return audit_service.get_audit_logs(
+    page = audit_service.get_audit_logs_page(
         viewer_role=current_user.role,
         viewer_user_id=current_user.id,
         skip=skip,
         limit=limit,
-        filters=filters
+        filters=filters,
+        cursor=cursor
     )
+    set_page_headers(response, page)
+    return page.items
 
 
 @router.post("/audit/logs", response_model=AuditLogResponse, status_code=status.HTTP_201_CREATED)
-async def create_audit_log(
+def create_audit_log(
     payload: AuditLogBase = Body(...),
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
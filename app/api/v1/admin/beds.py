@@ -227,7 +227,7 @@ def transfer_bed(
 # CSV columns: student_id, room_number, bed_number
 # ---------------------------------------------------------
 @router.post("/bulk/assign")
-async def bulk_assign_beds(
+def bulk_assign_beds(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -235,7 +235,7 @@ async def bulk_assign_beds(
     ),
     _: None = Depends(permission_required(Permission.MANAGE_STUDENTS)),
 ):
-    content = (await file.read()).decode("utf-8")
+    content = file.file.read().decode("utf-8")
     reader = csv.DictReader(StringIO(content))
 
     assignments = []
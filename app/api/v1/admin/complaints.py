@@ -34,7 +34,7 @@ router = APIRouter(prefix="/admin/complaints", tags=["Admin Complaints"])
 # LIST ALL COMPLAINTS
 # ------------------------------------------------------------------------------------
 @router.get("/", response_model=ComplaintListResponse)
-async def list_all_complaints(
+def list_all_complaints(
     hostel_name: Optional[str] = None,
     category: Optional[str] = None,
     status_filter: Optional[str] = None,
@@ -46,6 +46,7 @@ async def list_all_complaints(
     end_date: Optional[datetime] = Query(None),
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     current_user: User = Depends(role_required(Role.ADMIN)),
     db: Session = Depends(get_db)
 ):
@@ -60,18 +61,22 @@ async def list_all_complaints(
         start_date=start_date,
         end_date=end_date,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor
     )
  
     service = ComplaintService(ComplaintRepository(db))
-    complaints, total = await service.list_complaints(filters)
+    result = service.list_complaints_page(filters)
+    total = result.total
  
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": (total + page_size - 1) // page_size,
-        "complaints": complaints
+        "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+        "complaints": result.items,
+        "next_cursor": result.next_cursor,
+        "total_is_estimate": result.total_is_estimate
     }
  
  
@@ -79,11 +84,11 @@ async def list_all_complaints(
 # GET SINGLE COMPLAINT
 # ------------------------------------------------------------------------------------
 @router.get("/{complaint_id}", response_model=ComplaintDetailResponse)
-async def get_complaint(complaint_id: int,
+def get_complaint(complaint_id: int,
     current_user: User = Depends(role_required(Role.ADMIN)),
     db: Session = Depends(get_db)):
     service = ComplaintService(ComplaintRepository(db))
-    result = await service.get_complaint_with_details(complaint_id)
+    result = service.get_complaint_with_details(complaint_id)
  
     if not result:
         raise HTTPException(404, "Complaint not found")
@@ -101,9 +106,9 @@ async def get_complaint(complaint_id: int,
 # UPDATE COMPLAINT
 # ------------------------------------------------------------------------------------
 @router.patch("/{complaint_id}", response_model=ComplaintResponse)
-async def update_complaint(complaint_id: int, update_data: ComplaintUpdate,current_user: User = Depends(role_required(Role.ADMIN)), db: Session = Depends(get_db)):
+def update_complaint(complaint_id: int, update_data: ComplaintUpdate,current_user: User = Depends(role_required(Role.ADMIN)), db: Session = Depends(get_db)):
     service = ComplaintService(ComplaintRepository(db))
-    complaint = await service.update_complaint(complaint_id, update_data)
+    complaint = service.update_complaint(complaint_id, update_data)
  
     if not complaint:
         raise HTTPException(404, "Complaint not found")
@@ -115,10 +120,10 @@ async def update_complaint(complaint_id: int, update_data: ComplaintUpdate,curre
 # REASSIGN COMPLAINT
 # ------------------------------------------------------------------------------------
 @router.post("/{complaint_id}/reassign", response_model=ComplaintResponse)
-async def reassign_complaint(complaint_id: int, assignment_data: ComplaintAssignment, current_user: User = Depends(role_required(Role.ADMIN)),db: Session = Depends(get_db)):
+def reassign_complaint(complaint_id: int, assignment_data: ComplaintAssignment, current_user: User = Depends(role_required(Role.ADMIN)),db: Session = Depends(get_db)):
     service = ComplaintService(ComplaintRepository(db))
  
-    complaint = await service.reassign_complaint(
+    complaint = service.reassign_complaint(
         complaint_id,
         assignment_data.assigned_to_name,
         assignment_data.assigned_to_email
@@ -134,7 +139,7 @@ async def reassign_complaint(complaint_id: int, assignment_data: ComplaintAssign
 # ANALYTICS — OVERVIEW
 # ------------------------------------------------------------------------------------
 @router.get("/analytics/overview", response_model=ComplaintAnalytics)
-async def get_complaint_analytics(
+def get_complaint_analytics(
     hostel_name: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
@@ -142,7 +147,7 @@ async def get_complaint_analytics(
     db: Session = Depends(get_db)
 ):
     service = ComplaintService(ComplaintRepository(db))
-    result = await service.get_analytics(hostel_name, start_date, end_date)
+    result = service.get_analytics(hostel_name, start_date, end_date)
     return result
  
  
@@ -150,7 +155,7 @@ async def get_complaint_analytics(
 # ANALYTICS — CROSS HOSTEL
 # ------------------------------------------------------------------------------------
 @router.get("/analytics/cross-hostel")
-async def get_cross_hostel_analytics(
+def get_cross_hostel_analytics(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(role_required(Role.ADMIN)),
@@ -162,7 +167,7 @@ async def get_cross_hostel_analytics(
     cross_hostel_data = []
  
     for hostel_name in hostels:
-        analytics = await service.get_analytics(hostel_name, start_date, end_date)
+        analytics = service.get_analytics(hostel_name, start_date, end_date)
         cross_hostel_data.append({"hostel_name": hostel_name, "analytics": analytics})
  
     category_counts = {}
@@ -187,7 +192,7 @@ async def get_cross_hostel_analytics(
 # ANALYTICS — SUPERVISOR PERFORMANCE
 # ------------------------------------------------------------------------------------
 @router.get("/analytics/supervisor-performance")
-async def get_all_supervisor_performance(
+def get_all_supervisor_performance(
     hostel_name: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
@@ -211,7 +216,7 @@ async def get_all_supervisor_performance(
         if not supervisor_email:
             continue
  
-        performance = await service.get_supervisor_performance(
+        performance = service.get_supervisor_performance(
             supervisor_email,
             start_date,
             end_date
@@ -234,7 +239,7 @@ async def get_all_supervisor_performance(
 # ANALYTICS — SLA VIOLATIONS
 # ------------------------------------------------------------------------------------
 @router.get("/analytics/sla-violations")
-async def get_sla_violations(
+def get_sla_violations(
     hostel_name: Optional[str] = Query(None),
     current_user: User = Depends(role_required(Role.ADMIN)),
     db: Session = Depends(get_db)
@@ -275,7 +280,7 @@ async def get_sla_violations(
 # ANALYTICS — ESCALATED COMPLAINTS
 # ------------------------------------------------------------------------------------
 @router.get("/analytics/escalated")
-async def get_escalated_complaints(
+def get_escalated_complaints(
     hostel_name: Optional[str] = Query(None),
     page: int = 1,
     page_size: int = 10,
@@ -290,7 +295,7 @@ async def get_escalated_complaints(
     )
  
     service = ComplaintService(ComplaintRepository(db))
-    complaints, total = await service.list_complaints(filters)
+    complaints, total = service.list_complaints(filters)
  
     return {
         "total": total,
@@ -305,14 +310,14 @@ async def get_escalated_complaints(
 # DELETE COMPLAINT
 # ------------------------------------------------------------------------------------
 @router.delete("/{complaint_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_complaint(complaint_id: int,current_user: User = Depends(role_required(Role.ADMIN)), db: Session = Depends(get_db)):
+def delete_complaint(complaint_id: int,current_user: User = Depends(role_required(Role.ADMIN)), db: Session = Depends(get_db)):
     repo = ComplaintRepository(db)
-    complaint = await repo.get_by_id(complaint_id)
+    complaint = repo.get_by_id(complaint_id)
  
     if not complaint:
         raise HTTPException(404, "Complaint not found")
  
-    success = await repo.delete(complaint_id)
+    success = repo.delete(complaint_id)
     if not success:
         raise HTTPException(500, "Failed to delete complaint")
    
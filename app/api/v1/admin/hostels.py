@@ -16,7 +16,7 @@ router = APIRouter()
 
 
 @router.get("/hostels", response_model=List[dict], status_code=status.HTTP_200_OK)
-async def get_user_hostels(
+def get_user_hostels(
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
 ):
@@ -26,7 +26,7 @@ async def get_user_hostels(
 
 
 @router.post("/hostels/{hostel_id}/assign-admin/{admin_id}", response_model=dict, status_code=status.HTTP_200_OK)
-async def assign_admin_to_hostel(
+def assign_admin_to_hostel(
     hostel_id: int,
     admin_id: int,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
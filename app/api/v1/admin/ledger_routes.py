@@ -48,6 +48,33 @@ def get_transaction_history(
     )
 
 
+# ---------------------------------------------------------
+# 🔹 Transaction History Export (streamed)
+# ---------------------------------------------------------
+@router.get("/transactions/export")
+def export_transaction_history(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    hostel_id: Optional[int] = Query(None),
+    user_id: Optional[int] = Query(None),
+    transaction_type: Optional[str] = Query(None),
+    format: str = Query("csv"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(
+        role_required([Role.SUPERADMIN, Role.ADMIN])
+    ),
+    _: None = Depends(permission_required(Permission.EXPORT_REPORTS)),
+):
+    return LedgerService(db).export_transaction_history(
+        start_date=start_date,
+        end_date=end_date,
+        hostel_id=hostel_id,
+        user_id=user_id,
+        transaction_type=transaction_type,
+        export_format=format,
+    )
+
+
 # ---------------------------------------------------------
 # 🔹 Outstanding Payments
 # ---------------------------------------------------------
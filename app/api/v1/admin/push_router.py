@@ -13,6 +13,7 @@ from app.models.push_models import (
 from app.schemas.push_schemas import *
 from app.utils.push_utils import render_template
 from app.services.push_services import send_fcm_notification
+from app.services.push_broadcast import batch_progress, get_broadcast_engine
 
 # RBAC imports
 from app.core.roles import Role
@@ -99,7 +100,7 @@ def list_templates(
 # SEND INDIVIDUAL NOTIFICATIONS
 # ============================================================
 @router.post("/send/")
-async def send_notification(
+def send_notification(
     req: SendNotificationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -167,7 +168,7 @@ async def send_notification(
         success = False
 
         for tkn in tokens:
-            msg_id, err = await send_fcm_notification(
+            msg_id, err = send_fcm_notification(
                 tkn.device_token,
                 title,
                 body,
@@ -201,8 +202,8 @@ async def send_notification(
 # ============================================================
 # BROADCAST NOTIFICATIONS
 # ============================================================
-@router.post("/broadcast/")
-async def broadcast(
+@router.post("/broadcast/", status_code=202)
+def broadcast(
     req: BroadcastNotificationRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -210,12 +211,14 @@ async def broadcast(
     ),
     _: None = Depends(permission_required(Permission.MANAGE_NOTIFICATIONS)),
 ):
+    """Queue a broadcast; poll GET /broadcast/{batch_id} for progress"""
     batch = NotificationBatch(
         batch_name=f"{req.notification_type.value}_{datetime.utcnow().timestamp()}",
         notification_type=req.notification_type,
         target_audience=req.target_audience,
         hostel_ids=req.hostel_ids,
         user_ids=req.user_ids,
+        status="queued",
         created_by=req.created_by,
         created_by_role=req.created_by_role
     )
@@ -223,70 +226,30 @@ async def broadcast(
     db.commit()
     db.refresh(batch)
 
-    # Determine audience
-    q = db.query(DeviceToken).filter(DeviceToken.is_active == True)
-
-    if req.target_audience == TargetAudience.specific_hostel:
-        q = q.filter(DeviceToken.hostel_id.in_(req.hostel_ids))
-
-    if req.target_audience == TargetAudience.specific_users:
-        q = q.filter(DeviceToken.user_id.in_(req.user_ids))
-
-    if req.target_audience == TargetAudience.all_students:
-        q = q.filter(DeviceToken.user_role == UserRole.student)
-
-    recipients = list({t.user_id: t for t in q.all()}.values())
-    batch.total_recipients = len(recipients)
-
-    sent, failed = 0, 0
-
-    for t in recipients:
-        log = NotificationLog(
-            user_id=t.user_id,
-            user_role=t.user_role,
-            hostel_id=t.hostel_id,
-            notification_type=req.notification_type,
-            title=req.title,
-            body=req.body,
-            data=req.data,
-            priority=req.priority,
-            status=NotificationStatus.pending,
-        )
-        db.add(log)
-        db.commit()
-
-        # Try sending
-        msg_id, err = await send_fcm_notification(
-            t.device_token,
-            req.title,
-            req.body,
-            req.data,
-            req.priority
-        )
-
-        if msg_id:
-            log.status = NotificationStatus.sent
-            log.sent_at = datetime.utcnow()
-            sent += 1
-        else:
-            log.status = NotificationStatus.failed
-            failed += 1
-
-        db.commit()
-
-    batch.sent_count = sent
-    batch.failed_count = failed
-    batch.completed_at = datetime.utcnow()
-    db.commit()
+    # Recipients, logs and FCM multicast chunks are handled off the request
+    get_broadcast_engine().submit(batch.id, req.dict())
 
     return {
         "batch_id": batch.id,
-        "total": batch.total_recipients,
-        "sent": sent,
-        "failed": failed
+        "status": batch.status,
     }
 
 
+@router.get("/broadcast/{batch_id}")
+def broadcast_progress(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(
+        role_required([Role.ADMIN, Role.SUPERADMIN])
+    ),
+    _: None = Depends(permission_required(Permission.READ_NOTIFICATIONS)),
+):
+    batch = db.query(NotificationBatch).filter(NotificationBatch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(404, "Batch not found")
+    return batch_progress(batch)
+
+
 # ============================================================
 # USER NOTIFICATION LOGS (Student must access own only)
 # ============================================================
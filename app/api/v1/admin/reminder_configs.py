@@ -7,6 +7,7 @@ import json
 from app.core.database import get_db
 from app.schemas.payment_schemas import ReminderConfigCreate, ReminderConfigResponse
 from app.models.payment_models import ReminderConfiguration
+from app.services.reminder_services import reschedule_hostel_reminders
 
 # RBAC imports
 from app.core.roles import Role
@@ -45,6 +46,9 @@ def save_config(config: ReminderConfigCreate, db: Session = Depends(get_db)):
     if data.get("escalation_cc"):
         data["escalation_cc"] = json.dumps(data["escalation_cc"])
 
+    # Invoices are scheduled against the old (or missing) config; re-evaluate them
+    reschedule_hostel_reminders(db, config.hostel_id)
+
     if existing:
         for key, val in data.items():
             setattr(existing, key, val)
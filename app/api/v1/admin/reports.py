@@ -276,7 +276,7 @@ def compare_hostels(
     """Compare revenue and performance across hostels"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
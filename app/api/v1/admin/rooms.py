@@ -106,13 +106,13 @@ def read_rooms(
 # BULK IMPORT ROOMS (must come before /{room_id})
 # ---------------------------------------------------------------------
 @router.post("/bulk", status_code=status.HTTP_201_CREATED)
-async def bulk_import_rooms(
+def bulk_import_rooms(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
     _: None = Depends(permission_required(Permission.IMPORT_ROOMS)),
 ):
-    content = (await file.read()).decode("utf-8")
+    content = file.file.read().decode("utf-8")
     reader = csv.DictReader(StringIO(content))
 
     created = 0
@@ -1,7 +1,7 @@
 """
 Session switching APIs
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -12,36 +12,47 @@ from app.models.user import User
 from app.services.session_service import SessionService
 from app.schemas.session import SwitchSessionRequest, SessionContextResponse
 from app.services.tenant_service import TenantService
+from app.core.session_cache import ACTIVE_HOSTEL_CLAIM_HEADER, create_active_hostel_claim
 
 router = APIRouter()
 
 
 @router.post("/session/switch", response_model=SessionContextResponse, status_code=status.HTTP_200_OK)
-async def switch_session(
+def switch_session(
     request: SwitchSessionRequest,
+    response: Response,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Switch active hostel session"""
+    """Switch active hostel session.
+
+    The response carries a short-lived X-Active-Hostel-Token; echoing it back
+    lets the tenant filter skip the active-session lookup.
+    """
     session_service = SessionService(db)
-    return session_service.switch_session(current_user.id, current_user.role, request)
+    session = session_service.switch_session(current_user.id, current_user.role, request)
+    response.headers[ACTIVE_HOSTEL_CLAIM_HEADER] = create_active_hostel_claim(current_user.id, session.hostel_id)
+    return session
 
 
 @router.post("/session/set-active-hostel", response_model=SessionContextResponse, status_code=status.HTTP_200_OK)
-async def set_active_hostel(
+def set_active_hostel(
     request: SwitchSessionRequest,
+    response: Response,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
 ):
     """Set or activate the user's active hostel (alias for switch)."""
     session_service = SessionService(db)
-    return session_service.switch_session(current_user.id, current_user.role, request)
+    session = session_service.switch_session(current_user.id, current_user.role, request)
+    response.headers[ACTIVE_HOSTEL_CLAIM_HEADER] = create_active_hostel_claim(current_user.id, session.hostel_id)
+    return session
 
 
 
 
 @router.get("/session/active", response_model=SessionContextResponse, status_code=status.HTTP_200_OK)
-async def get_active_session(
+def get_active_session(
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
 ):
@@ -60,7 +71,7 @@ async def get_active_session(
 
 
 @router.get("/session/recent", response_model=List[SessionContextResponse], status_code=status.HTTP_200_OK)
-async def get_recent_sessions(
+def get_recent_sessions(
     limit: int = 5,
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
@@ -73,7 +84,7 @@ async def get_recent_sessions(
 
 
 @router.post("/session/clear", status_code=status.HTTP_200_OK)
-async def clear_session(
+def clear_session(
     session_id: Optional[int] = Body(None, embed=True, description="Optional session id to clear; if omitted, clears the active session"),
     current_user: User = Depends(role_required(Role.ADMIN, Role.SUPERADMIN)),
     db: Session = Depends(get_db)
@@ -1,10 +1,11 @@
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime, timedelta
 
-from app.config import get_db
+from app.config import get_db, settings
 from app.models.sms_models import (
     SMSTemplate, SMSLog, OTPS, PaymentReminders, EmergencyAlert,
     SMSProvider, SMSStatus, MessageType, OTPStatus
@@ -17,6 +18,7 @@ from app.schemas.sms_schemas import (
 )
 from app.utils.sms_utils import generate_otp, hash_otp, render_template
 from app.services.sms_services import TwilioService, AWSSNSService
+from app.services.sms_dispatch import get_sms_dispatcher
 
 # RBAC imports
 from app.core.roles import Role
@@ -33,7 +35,7 @@ router = APIRouter(prefix="/sms", tags=["SMS Service"])
 # ============================================================
 # INTERNAL SENDER FUNCTION
 # ============================================================
-async def send_sms_internal(
+def send_sms_internal(
     db: Session,
     phone_number: str,
     message: str,
@@ -128,7 +130,7 @@ def delete_template(
 # SEND SMS
 # ============================================================
 @router.post("/send/", response_model=SMSLogResponse)
-async def send_sms(
+def send_sms(
     request: SendSMSRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -154,7 +156,7 @@ async def send_sms(
     if not message:
         raise HTTPException(400, "Message or template_name required")
 
-    return await send_sms_internal(
+    return send_sms_internal(
         db, request.phone_number, message,
         request.provider, request.message_type, template_id
     )
@@ -164,7 +166,7 @@ async def send_sms(
 # OTP MANAGEMENT (NO RBAC)
 # ============================================================
 @router.post("/otp/send/", response_model=OTPResponse)
-async def send_otp(
+def send_otp(
     request: SendOTPRequest,
     db: Session = Depends(get_db)
 ):
@@ -195,7 +197,7 @@ async def send_otp(
 
     msg = f"Your OTP is {code}. Valid for {request.validity_minutes} minutes."
 
-    log = await send_sms_internal(
+    log = send_sms_internal(
         db, request.phone_number, msg,
         request.provider, MessageType.otp
     )
@@ -259,7 +261,7 @@ def create_payment_reminder(
 
 
 @router.post("/payment-reminders/{id}/send")
-async def send_payment_reminder(
+def send_payment_reminder(
     id: int,
     provider: SMSProvider = SMSProvider.twilio,
     db: Session = Depends(get_db),
@@ -280,7 +282,7 @@ async def send_payment_reminder(
         f"for invoice {r.invoice_number} is due on {r.due_date.date()}."
     )
 
-    log = await send_sms_internal(
+    log = send_sms_internal(
         db, r.phone_number, msg,
         provider, MessageType.payment_reminder
     )
@@ -293,6 +295,48 @@ async def send_payment_reminder(
     return {"sms_log_id": log.id, "sent": True}
 
 
+@router.post("/payment-reminders/send-due", status_code=202)
+def send_due_payment_reminders(
+    provider: SMSProvider = SMSProvider.twilio,
+    due_within_days: int = 3,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(
+        role_required([Role.ADMIN, Role.SUPERADMIN, Role.SUPERVISOR])
+    ),
+    _: None = Depends(permission_required(Permission.MANAGE_SMS)),
+):
+    """Queue every unsent reminder due within `due_within_days`"""
+    # Claimed with queued_at in one UPDATE so a second call does not queue
+    # them twice. reminder_sent is only set by the dispatcher once the
+    # outcome is written; a claim whose outcome never arrives (the process
+    # died with it queued) goes stale after SMS_REMINDER_CLAIM_TIMEOUT
+    claimed_at = datetime.utcnow()
+    stale = claimed_at - timedelta(seconds=settings.SMS_REMINDER_CLAIM_TIMEOUT)
+    db.query(PaymentReminders).filter(
+        PaymentReminders.reminder_sent == False,
+        PaymentReminders.due_date <= claimed_at + timedelta(days=due_within_days),
+        or_(PaymentReminders.queued_at.is_(None), PaymentReminders.queued_at < stale),
+    ).update({PaymentReminders.queued_at: claimed_at}, synchronize_session=False)
+    db.commit()
+    due = db.query(PaymentReminders).filter(PaymentReminders.queued_at == claimed_at).all()
+
+    queued = get_sms_dispatcher().submit_many(
+        (
+            (
+                r.phone_number,
+                f"Dear {r.customer_name}, payment of ${r.amount:.2f} "
+                f"for invoice {r.invoice_number} is due on {r.due_date.date()}.",
+                r.id,
+            )
+            for r in due
+        ),
+        provider,
+        MessageType.payment_reminder,
+    )
+
+    return {"queued": queued}
+
+
 @router.get("/payment-reminders/")
 def list_payment_reminders(
     db: Session = Depends(get_db),
@@ -311,8 +355,8 @@ def list_payment_reminders(
 # ============================================================
 # EMERGENCY ALERTS (Admins only)
 # ============================================================
-@router.post("/emergency-alerts/")
-async def create_alert(
+@router.post("/emergency-alerts/", status_code=202)
+def create_alert(
     data: EmergencyAlertCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(
@@ -326,37 +370,48 @@ async def create_alert(
         severity=data.severity,
         target_groups=str(data.phone_numbers),
         total_recipients=len(data.phone_numbers),
+        sent_count=0,
+        failed_count=0,
         created_by=data.created_by
     )
     db.add(obj)
     db.commit()
     db.refresh(obj)
 
-    sent = 0
-    failed = 0
-
-    for phone in data.phone_numbers:
-        try:
-            log = await send_sms_internal(
-                db,
-                phone,
-                f"[{data.severity.upper()}] {data.title}: {data.message}",
-                SMSProvider.twilio,
-                MessageType.emergency_alert
-            )
-            if log.status == SMSStatus.sent:
-                sent += 1
-            else:
-                failed += 1
-        except:
-            failed += 1
-
-    obj.sent_count = sent
-    obj.failed_count = failed
-    obj.sent_at = datetime.utcnow()
-    db.commit()
+    # Sent ahead of any queued reminders; counters fill in as messages go out
+    text = f"[{data.severity.upper()}] {data.title}: {data.message}"
+    queued = get_sms_dispatcher().submit_many(
+        ((phone, text, None) for phone in data.phone_numbers),
+        SMSProvider.twilio,
+        MessageType.emergency_alert,
+        alert_id=obj.id,
+    )
+
+    return {"alert_id": obj.id, "queued": queued}
+
+
+@router.get("/emergency-alerts/{id}")
+def get_alert_progress(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(
+        role_required([Role.ADMIN, Role.SUPERADMIN])
+    ),
+    _: None = Depends(permission_required(Permission.READ_SMS)),
+):
+    obj = db.query(EmergencyAlert).filter(EmergencyAlert.id == id).first()
+    if not obj:
+        raise HTTPException(404, "Alert not found")
 
-    return {"alert_id": obj.id, "sent": sent, "failed": failed}
+    done = (obj.sent_count or 0) + (obj.failed_count or 0)
+    return {
+        "alert_id": obj.id,
+        "total": obj.total_recipients,
+        "sent": obj.sent_count or 0,
+        "failed": obj.failed_count or 0,
+        "pending": max(0, (obj.total_recipients or 0) - done),
+        "completed_at": obj.sent_at,
+    }
 
 
 # ============================================================
@@ -1,16 +1,16 @@
 from typing import List, Optional
 from datetime import datetime
-import csv
-from io import StringIO
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.core.database import get_db
 from app.core.roles import Role
 from app.core.permissions import Permission
+from app.core.pagination import set_page_headers
 from app.api.deps import (
     role_required,
     permission_required,
@@ -18,6 +18,9 @@ from app.api.deps import (
 )
 from app.models.user import User
 from app.models.students import Student
+from app.models.student_import import StudentImportJob
+from app.services.student_import import get_student_importer, job_progress as student_import_progress, spool_upload
+from app.utils.streaming_export import stream_rows, streaming_export_response
 
 from app.schemas.students import (
     StudentCreate,
@@ -32,6 +35,8 @@ from app.schemas.students import (
 )
 from app.services.student_service import (
     list_students as service_list_students,
+    list_students_page as service_list_students_page,
+    export_students_statement as service_export_students_statement,
     get_student as service_get_student,
     create_student as service_create_student,
     update_student as service_update_student,
@@ -58,8 +63,10 @@ router = APIRouter(prefix="/admin/students", tags=["students"])
 # --------------------------------------------------------------------
 @router.get("/", response_model=List[StudentOut])
 def read_students(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     name: Optional[str] = None,
     room: Optional[str] = None,
     payment_status: Optional[str] = None,
@@ -70,15 +77,18 @@ def read_students(
     ),
     _: None = Depends(permission_required(Permission.READ_HOSTEL)),
 ):
-    return service_list_students(
+    page = service_list_students_page(
         db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         name=name,
         room=room,
         payment_status=payment_status,
         attendance_status=attendance_status,
     )
+    set_page_headers(response, page)
+    return page.items
 
 
 # --------------------------------------------------------------------
@@ -87,8 +97,10 @@ def read_students(
 # --------------------------------------------------------------------
 @router.get("/search", response_model=List[StudentOut])
 def search_students(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     name: Optional[str] = None,
     student_id: Optional[str] = None,
     student_email: Optional[str] = None,
@@ -137,13 +149,15 @@ def search_students(
                 detail="Invalid checkin_to date (use YYYY-MM-DD)",
             )
 
-    active_hostel_id = repository_context.get("active_hostel_id")
     user_hostel_ids = repository_context.get("user_hostel_ids")
 
-    return service_list_students(
+    # The payment-due / attendance-% / complaint-count filters are accepted
+    # but not applied by the student query yet
+    page = service_list_students_page(
         db,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         name=name,
         room=room,
         payment_status=payment_status,
@@ -158,15 +172,10 @@ def search_students(
         checkin_to=ct,
         sort_by=sort_by,
         sort_order=sort_order,
-        payment_due_min=payment_due_min,
-        payment_due_max=payment_due_max,
-        attendance_pct_lt=attendance_pct_lt,
-        attendance_pct_gt=attendance_pct_gt,
-        complaint_count_lt=complaint_count_lt,
-        complaint_count_gt=complaint_count_gt,
         user_hostel_ids=user_hostel_ids,
-        active_hostel_id=active_hostel_id,
     )
+    set_page_headers(response, page)
+    return page.items
 
 
 # --------------------------------------------------------------------
@@ -186,27 +195,11 @@ def export_students(
     bed: Optional[str] = None,
     status: Optional[str] = None,
     limited: Optional[bool] = False,
+    format: str = "csv",
     db: Session = Depends(get_db),
     current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
     _: None = Depends(permission_required(Permission.EXPORT_REPORTS)),
 ):
-    rows = service_list_students(
-        db,
-        skip=0,
-        limit=100000,
-        name=name,
-        room=room,
-        student_id=student_id,
-        student_email=student_email,
-        student_phone=student_phone,
-        hostel_id=hostel_id,
-        bed=bed,
-        status=status,
-    )
-
-    buf = StringIO()
-    writer = csv.writer(buf)
-
     if limited:
         headers = [
             "student_id",
@@ -230,16 +223,21 @@ def export_students(
             "bed_assignment",
             "status",
         ]
-    writer.writerow(headers)
-    for s in rows:
-        writer.writerow([getattr(s, h, None) for h in headers])
-
-    buf.seek(0)
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=students.csv"},
+    # Column-only select streamed through a server-side cursor; rows are
+    # encoded and sent as they arrive instead of being built in memory.
+    statement = service_export_students_statement(
+        db,
+        headers,
+        name=name,
+        room=room,
+        student_id=student_id,
+        student_email=student_email,
+        student_phone=student_phone,
+        hostel_id=hostel_id,
+        bed=bed,
+        status=status,
     )
+    return streaming_export_response(headers, stream_rows(statement), format, "students")
 
 
 # --------------------------------------------------------------------
@@ -535,7 +533,7 @@ def create_document(
     response_model=StudentDocumentOut,
     status_code=status.HTTP_201_CREATED,
 )
-async def upload_document(
+def upload_document(
     student_id: str,
     file: UploadFile = File(...),
     doc_type: Optional[str] = None,
@@ -543,7 +541,7 @@ async def upload_document(
     current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
     _: None = Depends(permission_required(Permission.MANAGE_STUDENTS)),
 ):
-    content = await file.read()
+    content = file.file.read()
     path = save_student_document(student_id, file.filename, content)
     payload = StudentDocumentCreate(doc_type=doc_type, doc_url=path)
     return service_create_student_document(db, student_id, payload)
@@ -564,98 +562,45 @@ def list_documents(
 # --------------------------------------------------------------------
 # BULK IMPORT – CSV upload
 # --------------------------------------------------------------------
-@router.post("/bulk", status_code=status.HTTP_201_CREATED)
-async def bulk_import_students(
+@router.post("/bulk", status_code=status.HTTP_202_ACCEPTED)
+def bulk_import_students(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
     _: None = Depends(permission_required(Permission.MANAGE_STUDENTS)),
 ):
-    content = (await file.read()).decode("utf-8")
-    reader = csv.DictReader(StringIO(content))
-
-    alias_map = {
-        "id": "student_id",
-        "student id": "student_id",
-        "student_id": "student_id",
-        "name": "student_name",
-        "student name": "student_name",
-        "student_name": "student_name",
-        "email": "student_email",
-        "student email": "student_email",
-        "student_email": "student_email",
-        "phone": "student_phone",
-        "mobile": "student_phone",
-        "student phone": "student_phone",
-        "student_phone": "student_phone",
-        "dob": "date_of_birth",
-        "date of birth": "date_of_birth",
-        "date_of_birth": "date_of_birth",
-        "guardian": "guardian_name",
-        "guardian_name": "guardian_name",
-        "guardian phone": "guardian_phone",
-        "guardian_phone": "guardian_phone",
-        "emergency": "emergency_contact",
-        "emergency_contact": "emergency_contact",
-        "checkin": "check_in_date",
-        "check_in": "check_in_date",
-        "check_in_date": "check_in_date",
-        "room": "room_assignment",
-        "room_assignment": "room_assignment",
-        "bed": "bed_assignment",
-        "bed_assignment": "bed_assignment",
-        "status": "status",
-    }
-    required = {"student_id", "student_name", "student_email", "student_phone"}
-
-    created = 0
-    failed = 0
-    errors = []
-
-    def norm_key(k: str) -> str:
-        return (k or "").strip().lower()
-
-    for idx, row in enumerate(reader, start=2):
-        normalized: dict = {}
-        for k, v in row.items():
-            key = alias_map.get(norm_key(k))
-            if not key:
-                continue
-            normalized[key] = (v.strip() if isinstance(v, str) else v) or None
-
-        missing = [k for k in required if not normalized.get(k)]
-        if missing:
-            failed += 1
-            errors.append(
-                {"row": idx, "error": f"missing required: {', '.join(missing)}"}
-            )
-            continue
-
-        for date_key in ("date_of_birth", "check_in_date"):
-            if normalized.get(date_key):
-                try:
-                    normalized[date_key] = datetime.strptime(
-                        normalized[date_key], "%Y-%m-%d"
-                    ).date()
-                except Exception:
-                    errors.append(
-                        {
-                            "row": idx,
-                            "error": f"invalid date format for {date_key} (use YYYY-MM-DD)",
-                        }
-                    )
-                    failed += 1
-                    normalized = None
-                    break
-        if normalized is None:
-            continue
+    # Spool the upload to disk and import it on a worker; poll GET /bulk/{job_id}
+    path, total_rows = spool_upload(file.file, settings.STUDENT_IMPORT_DIR)
+    importer = get_student_importer()
+    job_id = importer.create_job(path, filename=file.filename, total_rows=total_rows,
+                                 created_by=current_user.id)
+    importer.submit(job_id)
+    return {"job_id": job_id, "status": "pending", "total_rows": total_rows}
+
+
+@router.get("/bulk/{job_id}")
+def bulk_import_progress(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
+    _: None = Depends(permission_required(Permission.MANAGE_STUDENTS)),
+):
+    job = db.get(StudentImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return student_import_progress(job)
 
-        try:
-            service_create_student(db, StudentCreate(**normalized))
-            created += 1
-        except Exception as e:
-            failed += 1
-            errors.append({"row": idx, "error": str(e)})
-            continue
-
-    return {"created": created, "failed": failed, "errors": errors}
+
+@router.post("/bulk/{job_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+def resume_bulk_import(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(role_required([Role.SUPERADMIN, Role.ADMIN])),
+    _: None = Depends(permission_required(Permission.MANAGE_STUDENTS)),
+):
+    job = db.get(StudentImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if not get_student_importer().resume(job_id):
+        raise HTTPException(status_code=409, detail=f"Import job is {job.status}, only failed jobs can be resumed")
+    return {"job_id": job_id, "status": "pending", "resume_after_row": job.last_row}
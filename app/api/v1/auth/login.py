@@ -5,18 +5,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.rate_limiter import rate_limit
 from app.services.auth_service import AuthService
 from app.schemas.auth import UserLogin, Token
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
+@router.post("/login", response_model=Token, status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("auth_login"))])
 async def login_user(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
     """Login and receive JWT tokens"""
     auth_service = AuthService(db)
-    return auth_service.login(credentials)
+    return await auth_service.alogin(credentials)
 
@@ -2,19 +2,57 @@
 Enhanced login with email/phone and remember me
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app.core.database import get_db
+from app.core.rate_limiter import rate_limit
 from app.services.auth_service import AuthService
 from app.schemas.auth_enhanced import UserLoginEnhanced
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.security import averify_and_upgrade, create_access_token, create_refresh_token
 from app.config import settings
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=dict, status_code=status.HTTP_200_OK)
+def _find_user(auth_service: AuthService, email_or_phone: str):
+    if '@' in email_or_phone:
+        # Try email
+        return auth_service.user_repo.get_by_email(email_or_phone)
+    # Try phone number
+    for u in auth_service.user_repo.get_all():
+        if u.phone_number and email_or_phone in u.phone_number:
+            return u
+    return None
+
+
+def _issue_tokens(auth_service: AuthService, user, remember_me: bool):
+    # Set remember me
+    user.remember_me = remember_me
+    auth_service.db.commit()
+
+    # Generate tokens with extended expiry for remember me
+    expires_delta = None
+    if remember_me:
+        expires_delta = timedelta(days=30)  # 30 days for remember me
+
+    access_token = create_access_token(
+        data={"sub": str(user.id), "role": user.role, "hostel_id": user.hostel_id, "email": user.email},
+        expires_delta=expires_delta
+    )
+
+    # Refresh token always has longer expiry
+    refresh_token = create_refresh_token(
+        data={"sub": str(user.id), "role": user.role}
+    )
+
+    # Store refresh token
+    auth_service.token_repo.create_token(user.id, refresh_token)
+    return access_token, refresh_token
+
+
+@router.post("/login", response_model=dict, status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("auth_login"))])
 async def login_user_enhanced(
     credentials: UserLoginEnhanced,
     response: Response,
@@ -23,19 +61,9 @@ async def login_user_enhanced(
     """Login with email/phone and optional remember me"""
     auth_service = AuthService(db)
     
-    # Find user by email or phone
-    user = None
-    
-    if '@' in credentials.email_or_phone:
-        # Try email
-        user = auth_service.user_repo.get_by_email(credentials.email_or_phone)
-    else:
-        # Try phone number
-        users = auth_service.user_repo.get_all()
-        for u in users:
-            if u.phone_number and credentials.email_or_phone in u.phone_number:
-                user = u
-                break
+    # Find user by email or phone (session work runs on the threadpool; only
+    # bcrypt is awaited here, on the hashing pool)
+    user = await run_in_threadpool(_find_user, auth_service, credentials.email_or_phone)
     
     if not user:
         raise HTTPException(
@@ -51,7 +79,7 @@ async def login_user_enhanced(
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if not await averify_and_upgrade(db, user, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email/phone or password"
@@ -64,29 +92,8 @@ async def login_user_enhanced(
             detail="Account is not activated. Please verify your email/phone."
         )
     
-    # Set remember me
-    user.remember_me = credentials.remember_me
-    db.commit()
-    
-    # Generate tokens with extended expiry for remember me
-    expires_delta = None
-    if credentials.remember_me:
-        expires_delta = timedelta(days=30)  # 30 days for remember me
-    
-    access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role, "hostel_id": user.hostel_id, "email": user.email},
-        expires_delta=expires_delta
-    )
-    
-    # Refresh token always has longer expiry
-    refresh_token_expiry = timedelta(days=30) if credentials.remember_me else timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token = create_refresh_token(
-        data={"sub": str(user.id), "role": user.role}
-    )
-    
-    # Store refresh token
-    auth_service.token_repo.create_token(user.id, refresh_token)
-    
+    access_token, refresh_token = await run_in_threadpool(_issue_tokens, auth_service, user, credentials.remember_me)
+
     # If user asked to be remembered, set an HttpOnly cookie so other tabs can detect login
     # Cookie is set only for 'remember_me' to avoid implicit session cookies.
     response_payload = {
@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=dict, status_code=status.HTTP_200_OK, tags=["auth"])
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -16,7 +16,7 @@ router = APIRouter()
 
 
 @router.post("/forgot-password", response_model=dict, status_code=status.HTTP_200_OK)
-async def forgot_password(
+def forgot_password(
     request: PasswordResetRequest,
     debug: bool = False,
     db: Session = Depends(get_db)
@@ -27,7 +27,7 @@ async def forgot_password(
 
 
 @router.post("/verify-reset-code", response_model=dict, status_code=status.HTTP_200_OK)
-async def verify_reset_code(
+def verify_reset_code(
     request: PasswordResetVerify,
     db: Session = Depends(get_db)
 ):
@@ -41,7 +41,7 @@ async def verify_reset_code(
 
 
 @router.post("/reset-password", response_model=dict, status_code=status.HTTP_200_OK)
-async def reset_password(
+def reset_password(
     request: PasswordResetComplete,
     db: Session = Depends(get_db)
 ):
@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.post("/assign-role", response_model=dict, status_code=status.HTTP_200_OK)
-async def assign_role(
+def assign_role(
     assign_data: RoleAssign,
     current_user: User = Depends(role_required(Role.SUPERADMIN)),
     db: Session = Depends(get_db)
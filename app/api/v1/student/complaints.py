@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status,
 from sqlalchemy.orm import Session
 from typing import Optional
 from pathlib import Path
-import aiofiles
+import shutil
 import uuid
  
 from app.core.database import get_db
@@ -37,7 +37,7 @@ router = APIRouter(prefix="/student/complaints", tags=["Student Complaints"])
  
  
 @router.post("/", response_model=ComplaintResponse, status_code=status.HTTP_201_CREATED)
-async def create_complaint(
+def create_complaint(
     complaint_data: ComplaintCreate,
     current_user: User = Depends(role_required(Role.STUDENT)),
     db: Session = Depends(get_db)
@@ -53,7 +53,6 @@ async def create_complaint(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="hostel id not found")
  
     if hostel_id is not None:
-        # `get_db` yields a synchronous Session; execute synchronously to avoid awaiting a non-awaitable
         result = db.execute(select(Hostel).where(Hostel.id == int(hostel_id)))
         hostel = result.scalar_one_or_none()
         if not hostel:
@@ -75,7 +74,7 @@ async def create_complaint(
     # Pass a plain dict payload that includes `hostel_name` so the repository
     # gets the expected field for DB insertion.
     try:
-        complaint = await service.create_complaint(payload)
+        complaint = service.create_complaint(payload)
         return complaint
     except ValueError as e:
         # Map service validation errors to HTTP responses
@@ -83,7 +82,7 @@ async def create_complaint(
  
  
 @router.get("/", response_model=ComplaintListResponse)
-async def list_student_complaints(
+def list_student_complaints(
     student_email: str = Header(..., alias="X-User-Email"),
     hostel_name: Optional[str] = None,
     category: Optional[str] = None,
@@ -106,7 +105,7 @@ async def list_student_complaints(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    complaints, total = await service.list_complaints(filters)
+    complaints, total = service.list_complaints(filters)
    
     total_pages = (total + page_size - 1) // page_size
    
@@ -120,7 +119,7 @@ async def list_student_complaints(
  
  
 @router.get("/{complaint_id}", response_model=ComplaintDetailResponse)
-async def get_complaint(
+def get_complaint(
     complaint_id: int,
     student_email: str = Header(..., alias="X-User-Email"),
     current_user: User = Depends(role_required(Role.STUDENT)),
@@ -130,7 +129,7 @@ async def get_complaint(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    result = await service.get_complaint_with_details(complaint_id)
+    result = service.get_complaint_with_details(complaint_id)
    
     if not result:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -152,7 +151,7 @@ async def get_complaint(
  
  
 @router.post("/{complaint_id}/attachments", status_code=status.HTTP_201_CREATED)
-async def upload_attachment(
+def upload_attachment(
     complaint_id: int,
     file: UploadFile = File(...),
     student_email: str = Header(..., alias="X-User-Email"),
@@ -163,7 +162,7 @@ async def upload_attachment(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
    
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -195,12 +194,11 @@ async def upload_attachment(
     file_path = upload_dir / unique_filename
    
     # Save file
-    async with aiofiles.open(file_path, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
+    with open(file_path, 'wb') as out_file:
+        shutil.copyfileobj(file.file, out_file)
    
     # Save attachment record
-    attachment = await service.add_attachment(
+    attachment = service.add_attachment(
         complaint_id=complaint_id,
         uploaded_by=student_email,
         file_path=str(file_path),
@@ -217,7 +215,7 @@ async def upload_attachment(
  
  
 @router.post("/{complaint_id}/feedback", response_model=ComplaintResponse)
-async def submit_feedback(
+def submit_feedback(
     complaint_id: int,
     feedback_data: ComplaintFeedback,
     student_email: str = Header(..., alias="X-User-Email"),
@@ -228,7 +226,7 @@ async def submit_feedback(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
    
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -245,12 +243,12 @@ async def submit_feedback(
             detail="Feedback can only be submitted for resolved complaints"
         )
    
-    complaint = await service.submit_feedback(complaint_id, feedback_data)
+    complaint = service.submit_feedback(complaint_id, feedback_data)
     return complaint
  
  
 @router.post("/{complaint_id}/reopen", response_model=ComplaintResponse)
-async def reopen_complaint(
+def reopen_complaint(
     complaint_id: int,
     reopen_data: ComplaintReopen,
     student_email: str = Header(..., alias="X-User-Email"),
@@ -261,7 +259,7 @@ async def reopen_complaint(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
    
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -273,14 +271,14 @@ async def reopen_complaint(
         )
    
     try:
-        complaint = await service.reopen_complaint(complaint_id, reopen_data)
+        complaint = service.reopen_complaint(complaint_id, reopen_data)
         return complaint
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
  
  
 @router.post("/{complaint_id}/notes", status_code=status.HTTP_201_CREATED)
-async def add_note(
+def add_note(
     complaint_id: int,
     note: str,
     student_name: str = Header(..., alias="X-User-Name"),
@@ -292,7 +290,7 @@ async def add_note(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
    
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
    
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -310,7 +308,7 @@ async def add_note(
         is_internal=False
     )
    
-    created_note = await service.add_note(complaint_id, note_data)
+    created_note = service.add_note(complaint_id, note_data)
    
     return {
         "message": "Note added successfully",
@@ -9,13 +9,14 @@ from app.core.security import get_current_user
 from app.models.user import User
 from app.models.review import Review
 from app.schemas.review_schema import ReviewCreate
-from app.utils.content_filter import detect_spam, detect_inappropriate_content, content_quality_score
+from app.utils.content_filter import moderate_content
 from app.api.deps import role_required
+from app.core.rate_limiter import rate_limit
 from app.core.roles import Role
 
 router = APIRouter(prefix="/student/reviews", tags=["Student Reviews"])
 
-@router.post("/{hostel_id}")
+@router.post("/{hostel_id}", dependencies=[Depends(rate_limit("review_submission", scope="user"))])
 def post_review(
     hostel_id: int, 
     body: ReviewCreate, 
@@ -30,15 +31,13 @@ def post_review(
         raise HTTPException(400, "You have already reviewed this hostel")
     
     # Content filtering and spam detection
-    is_spam, spam_keywords = detect_spam(body.text)
-    is_inappropriate, inappropriate_keywords = detect_inappropriate_content(body.text)
-    quality_score = content_quality_score(body.text, body.rating)
+    moderation = moderate_content(body.text, body.rating)
     
-    if is_inappropriate:
-        raise HTTPException(400, f"Review contains inappropriate content: {', '.join(inappropriate_keywords)}")
+    if moderation["is_inappropriate"]:
+        raise HTTPException(400, f"Review contains inappropriate content: {', '.join(moderation['inappropriate_keywords'])}")
     
     # Auto-approve high quality reviews, flag low quality ones for manual review
-    auto_approve = quality_score > 0.7 and not is_spam
+    auto_approve = moderation["quality_score"] > 0.7 and not moderation["is_spam"]
     
     r = Review(
         hostel_id=hostel_id, 
@@ -53,7 +52,7 @@ def post_review(
     db.refresh(r)
     
     message = "Review submitted and approved" if auto_approve else "Review submitted for moderation"
-    if is_spam:
+    if moderation["is_spam"]:
         message += " (flagged for spam review)"
     
     return {"id": r.id, "message": message, "auto_approved": auto_approve}
@@ -1,8 +1,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.async_database import get_async_db
 from app.services.dashboard_service import DashboardService
+from app.core.cache import cache_stats
+from app.config import get_pool_stats
+from app.core.audit_pipeline import audit_pipeline_stats
+from app.core.session_cache import active_session_cache
+from app.core.token_cache import auth_cache_stats
+from app.core.security import password_pool_stats
 from app.schemas.super_admin_schemas import DashboardResponse
 import logging
 
@@ -17,16 +23,64 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/", response_model=DashboardResponse)
-def get_dashboard(
-    db: Session = Depends(get_db),
+async def get_dashboard(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(
         role_required([Role.SUPERADMIN])   # 🔥 Only SuperAdmins allowed
     ),
     _: None = Depends(permission_required(Permission.VIEW_DASHBOARD)),
 ):
     try:
-        data = DashboardService.get_dashboard_and_activities(db)
+        data = await DashboardService.get_dashboard_and_activities_async(db)
         return data
     except Exception as e:
         logger.exception("Error fetching dashboard")
         raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
+
+
+@router.get("/cache-stats")
+def get_cache_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """Hit/miss counters and size of the application cache"""
+    return cache_stats()
+
+
+@router.get("/db-pool-stats")
+def get_db_pool_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """Checked-out connections, overflow and checkout wait times of the DB pool"""
+    return get_pool_stats()
+
+
+@router.get("/audit-pipeline-stats")
+def get_audit_pipeline_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """Queue depth and written/spilled/dropped counters of the audit pipeline"""
+    return audit_pipeline_stats()
+
+
+@router.get("/session-cache-stats")
+def get_session_cache_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """Active-session lookups served by claims/cache vs the database"""
+    return active_session_cache.stats()
+
+
+@router.get("/auth-cache-stats")
+def get_auth_cache_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """Hit/miss counters of the verified-token cache"""
+    return auth_cache_stats()
+
+
+@router.get("/password-pool-stats")
+def get_password_pool_stats(
+    current_user: User = Depends(role_required([Role.SUPERADMIN])),
+):
+    """bcrypt cost factor and hashing pool queue depth / wait times"""
+    return password_pool_stats()
@@ -29,7 +29,7 @@ def get_unified_dashboard(
     """Get unified multi-hostel dashboard with aggregate KPIs"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
@@ -50,7 +50,7 @@ def get_revenue_comparison(
     
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
@@ -69,12 +69,29 @@ def get_occupancy_trends(
     """Occupancy trends across multiple hostels"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
     return AnalyticsService.get_occupancy_trends(db, hostel_ids, start_date, end_date)
 
+@router.get("/cross-hostel/occupancy-trends/series", response_model=List[OccupancyTrendSeries])
+def get_occupancy_trend_series(
+    hostel_ids: List[int] = Query(...),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    current_user: User = Depends(role_required(Role.SUPERADMIN)),
+    db: Session = Depends(get_db)
+):
+    """Occupancy trends as per-hostel columnar arrays (one entry per day)"""
+    # Validate hostels
+    repo = HostelRepository(db)
+    missing = repo.get_missing_ids(hostel_ids)
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
+
+    return AnalyticsService.get_occupancy_trend_series(db, hostel_ids, start_date, end_date)
+
 @router.get("/cross-hostel/complaint-metrics")
 def get_complaint_metrics(
     hostel_ids: List[int] = Query(...),
@@ -86,7 +103,7 @@ def get_complaint_metrics(
     """Complaint metrics across multiple hostels"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
@@ -103,7 +120,7 @@ def get_marketing_analytics(
     """Marketing analytics across hostels"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
@@ -186,7 +203,7 @@ def get_booking_conversion_rates(
     if hostel_ids:
         # Validate hostels
         repo = HostelRepository(db)
-        missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+        missing = repo.get_missing_ids(hostel_ids)
         if missing:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
         where_clause += " AND hostel_id = ANY(:hostel_ids)"
@@ -228,7 +245,7 @@ def get_consolidated_attendance(
     """Consolidated attendance report across multiple hostels"""
     # Validate hostels
     repo = HostelRepository(db)
-    missing = [hid for hid in hostel_ids if not repo.get_by_id(hid)]
+    missing = repo.get_missing_ids(hostel_ids)
     if missing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"hostel id(s) not found: {missing}")
 
@@ -16,7 +16,7 @@ router = APIRouter()
 
 
 @router.post("/approvals/request", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def create_approval_request(
+def create_approval_request(
     approval_data: ApprovalRequestCreate,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
     db: Session = Depends(get_db)
@@ -39,7 +39,7 @@ async def create_approval_request(
 
 
 @router.get("/approvals/my-requests", response_model=List[dict], status_code=status.HTTP_200_OK)
-async def get_my_approval_requests(
+def get_my_approval_requests(
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
     db: Session = Depends(get_db)
 ):
@@ -63,7 +63,7 @@ async def get_my_approval_requests(
 
 
 @router.get("/approvals/{approval_id}/status", response_model=dict, status_code=status.HTTP_200_OK)
-async def check_approval_status(
+def check_approval_status(
     approval_id: int,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
     db: Session = Depends(get_db)
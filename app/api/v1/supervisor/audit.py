@@ -1,12 +1,13 @@
 """
 Supervisor activity logs
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
  
 from app.core.database import get_db
+from app.core.pagination import set_page_headers
 from app.core.roles import Role
 from app.core.permissions import Permission
 from app.api.deps import role_required, permission_required, get_current_active_user, get_user_hostel_ids
@@ -21,9 +22,11 @@ router = APIRouter()
  
  
 @router.get("/audit", response_model=List[AuditLogResponse], status_code=status.HTTP_200_OK)
-async def get_supervisor_audit_logs(
+def get_supervisor_audit_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     hostel_id: Optional[int] = None,
     action: Optional[str] = None,
     start_date: Optional[datetime] = None,
@@ -50,18 +53,21 @@ async def get_supervisor_audit_logs(
         end_date=end_date
     )
    
-    return audit_service.get_audit_logs(
+    page = audit_service.get_audit_logs_page(
         viewer_role=current_user.role,
         viewer_user_id=current_user.id,
         skip=skip,
         limit=limit,
-        filters=filters
+        filters=filters,
+        cursor=cursor
     )
+    set_page_headers(response, page)
+    return page.items
  
  
  
 @router.post("/audit/logs", response_model=AuditLogResponse, status_code=status.HTTP_201_CREATED)
-async def supervisor_create_audit_log(
+def supervisor_create_audit_log(
     payload: AuditLogBase = Body(...),
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
     _perm: User = Depends(permission_required(Permission.CREATE_AUDIT)),
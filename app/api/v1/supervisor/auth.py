@@ -4,11 +4,12 @@ Special login endpoint for supervisors with hostel context
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.security import averify_and_upgrade, create_access_token, create_refresh_token
 from app.core.roles import Role
 from app.models.user import User
 from app.config import get_settings
@@ -17,6 +18,10 @@ router = APIRouter()
 settings = get_settings()
 
 
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
 @router.post("/supervisor/login")
 async def supervisor_login(
     email: str,
@@ -26,10 +31,13 @@ async def supervisor_login(
     """
     Supervisor-specific login endpoint
     Returns access token with hostel context
+
+    Stays async to await bcrypt on the hashing pool; its session work runs
+    on the threadpool.
     """
     
     # Find user by email
-    user = db.query(User).filter(User.email == email).first()
+    user = await run_in_threadpool(_find_user, db, email)
     
     if not user:
         raise HTTPException(
@@ -38,7 +46,7 @@ async def supervisor_login(
         )
     
     # Verify password
-    if not verify_password(password, user.hashed_password):
+    if not user.hashed_password or not await averify_and_upgrade(db, user, password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -59,6 +67,10 @@ async def supervisor_login(
             detail="Account is inactive"
         )
     
+    # Persist a password re-hashed at the current cost
+    if db.dirty:
+        await run_in_threadpool(db.commit)
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
@@ -32,7 +32,7 @@ router = APIRouter(prefix="/supervisor/complaints", tags=["Supervisor Complaints
 
 
 @router.get("/", response_model=ComplaintListResponse)
-async def list_complaints(
+def list_complaints(
     hostel_name: Optional[str] = None,
     category: Optional[str] = None,
     status_filter: Optional[str] = None,
@@ -41,8 +41,9 @@ async def list_complaints(
     supervisor_email: str = Header(None, alias="X-User-Email"),
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """List complaints for supervisor"""
     filters = ComplaintFilter(
@@ -52,36 +53,40 @@ async def list_complaints(
         priority=priority,
         assigned_to_email=supervisor_email if assigned_to_me else None,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor
     )
     
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaints, total = await service.list_complaints(filters)
+    result = service.list_complaints_page(filters)
+    total = result.total
     
-    total_pages = (total + page_size - 1) // page_size
+    total_pages = (total + page_size - 1) // page_size if total is not None else None
     
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
-        "complaints": complaints
+        "complaints": result.items,
+        "next_cursor": result.next_cursor,
+        "total_is_estimate": result.total_is_estimate
     }
 
 
 @router.get("/{complaint_id}", response_model=ComplaintDetailResponse)
-async def get_complaint(
+def get_complaint(
     complaint_id: int,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Get complaint details"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    result = await service.get_complaint_with_details(complaint_id)
+    result = service.get_complaint_with_details(complaint_id)
     
     if not result:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -96,17 +101,17 @@ async def get_complaint(
 
 
 @router.patch("/{complaint_id}", response_model=ComplaintResponse)
-async def update_complaint(
+def update_complaint(
     complaint_id: int,
     update_data: ComplaintUpdate,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Update complaint details"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaint = await service.update_complaint(complaint_id, update_data)
+    complaint = service.update_complaint(complaint_id, update_data)
     
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -115,17 +120,17 @@ async def update_complaint(
 
 
 @router.post("/{complaint_id}/assign", response_model=ComplaintResponse)
-async def assign_complaint(
+def assign_complaint(
     complaint_id: int,
     assignment_data: ComplaintAssignment,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Assign complaint to supervisor/staff"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaint = await service.assign_complaint(complaint_id, assignment_data)
+    complaint = service.assign_complaint(complaint_id, assignment_data)
     
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -134,18 +139,18 @@ async def assign_complaint(
 
 
 @router.post("/{complaint_id}/resolve", response_model=ComplaintResponse)
-async def resolve_complaint(
+def resolve_complaint(
     complaint_id: int,
     resolution_data: ComplaintResolution,
     supervisor_email: str = Header(..., alias="X-User-Email"),
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Mark complaint as resolved"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
     
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -163,47 +168,47 @@ async def resolve_complaint(
             detail="Only pending, in-progress or reopened complaints can be resolved"
         )
     
-    complaint = await service.resolve_complaint(complaint_id, resolution_data)
+    complaint = service.resolve_complaint(complaint_id, resolution_data)
     return complaint
 
 
 @router.post("/{complaint_id}/close", response_model=ComplaintResponse)
-async def close_complaint(
+def close_complaint(
     complaint_id: int,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Close a resolved complaint"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
     
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
     
     try:
-        complaint = await service.close_complaint(complaint_id)
+        complaint = service.close_complaint(complaint_id)
         return complaint
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{complaint_id}/notes", status_code=status.HTTP_201_CREATED)
-async def add_note(
+def add_note(
     complaint_id: int,
     note: str,
     is_internal: bool = True,
     user_name: str = Header(..., alias="X-User-Name"),
     user_email: str = Header(..., alias="X-User-Email"),
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Add internal or public note to complaint"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaint = await service.get_complaint(complaint_id)
+    complaint = service.get_complaint(complaint_id)
     
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
@@ -215,7 +220,7 @@ async def add_note(
         is_internal=is_internal
     )
     
-    created_note = await service.add_note(complaint_id, note_data)
+    created_note = service.add_note(complaint_id, note_data)
     
     return {
         "message": "Note added successfully",
@@ -224,18 +229,18 @@ async def add_note(
 
 
 @router.get("/analytics/performance", response_model=SupervisorPerformance)
-async def get_my_performance(
+def get_my_performance(
     supervisor_email: str = Header(..., alias="X-User-Email"),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Get personal performance metrics"""
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    performance = await service.get_supervisor_performance(
+    performance = service.get_supervisor_performance(
         supervisor_email,
         start_date,
         end_date
@@ -245,11 +250,11 @@ async def get_my_performance(
 
 
 @router.get("/analytics/unresolved")
-async def get_unresolved_complaints(
+def get_unresolved_complaints(
     supervisor_email: str = Header(..., alias="X-User-Email"),
     hostel_name: Optional[str] = None,
     current_user: User = Depends(role_required(Role.SUPERVISOR)),
-    db: AsyncSession = Depends(get_db)
+    db: Session = Depends(get_db)
 ):
     """Get unresolved complaints with aging information"""
     filters = ComplaintFilter(
@@ -262,7 +267,7 @@ async def get_unresolved_complaints(
     repository = ComplaintRepository(db)
     service = ComplaintService(repository)
     
-    complaints, total = await service.list_complaints(filters)
+    complaints, total = service.list_complaints(filters)
     
     # Filter unresolved
     unresolved = [
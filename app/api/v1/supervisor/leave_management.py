@@ -7,6 +7,7 @@ from datetime import date
 from typing import Optional
 
 from app.core.database import get_db
+from app.core.loaders import get_loader
 from app.models.user import User
 from app.models.leave import LeaveRequest
 from app.api.deps import get_current_user
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/leave-applications", tags=["Supervisor Leave Managem
 
 
 @router.get("/")
-async def get_leave_applications(
+def get_leave_applications(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None, alias="status"),
@@ -48,8 +49,9 @@ async def get_leave_applications(
     
     # Convert to response format
     leave_responses = []
+    students = get_loader(db, User).load_many(leave_app.student_id for leave_app in leave_applications)
     for leave_app in leave_applications:
-        student = db.query(User).filter(User.id == leave_app.student_id).first()
+        student = students.get(leave_app.student_id)
         
         # Calculate duration
         duration_days = (leave_app.end_date - leave_app.start_date).days + 1
@@ -80,7 +82,7 @@ async def get_leave_applications(
 
 
 @router.put("/{leave_id}/approve")
-async def approve_leave_application(
+def approve_leave_application(
     leave_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -121,7 +123,7 @@ async def approve_leave_application(
 
 
 @router.put("/{leave_id}/reject")
-async def reject_leave_application(
+def reject_leave_application(
     leave_id: int,
     rejection_reason: str = Query(..., min_length=10),
     current_user: User = Depends(get_current_user),
@@ -164,7 +166,7 @@ async def reject_leave_application(
 
 
 @router.get("/{leave_id}")
-async def get_leave_application(
+def get_leave_application(
     leave_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4,7 +4,7 @@ All supervisor-specific endpoints for hostel management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, or_
 from typing import Optional
 from datetime import datetime, date
@@ -12,14 +12,34 @@ from datetime import datetime, date
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.core.roles import Role
+from app.core.pagination import Keyset, paginate
+from app.core.loaders import get_loader
 from app.api.deps import role_required
 from app.models.user import User
 from app.models.complaint import Complaint
 from app.models.reports import Attendance  # Use Attendance from reports (now with attendance_date field)
 from app.models.leave import LeaveRequest  # Correct model name
+from app.repositories.complaint_repository import COMPLAINT_KEYSET
 
 router = APIRouter()
 
+ATTENDANCE_KEYSET = Keyset(Attendance.date, Attendance.id)
+
+
+def _page_response(items, result, page: int, size: int, cursor: Optional[str]) -> dict:
+    """List envelope; total / pages are None on cursor pages, which skip the count"""
+    total = result.total
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size if total is not None else None,
+        "has_next": result.has_more,
+        "has_prev": page > 1 and not cursor,
+        "next_cursor": result.next_cursor,
+    }
+
 
 def get_supervisor_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Verify current user is a supervisor, admin, or superadmin - ROLE-BASED AUTHENTICATION"""
@@ -36,7 +56,7 @@ def get_supervisor_user(current_user: User = Depends(get_current_user), db: Sess
 # ==================== DASHBOARD APIs ====================
 
 @router.get("/dashboard/metrics")
-async def get_supervisor_dashboard_metrics(
+def get_supervisor_dashboard_metrics(
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
 ):
@@ -97,7 +117,7 @@ async def get_supervisor_dashboard_metrics(
 
 
 @router.get("/dashboard/quick-stats")
-async def get_quick_stats(
+def get_quick_stats(
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
 ):
@@ -166,18 +186,20 @@ async def get_quick_stats(
 # ==================== COMPLAINT MANAGEMENT APIs ====================
 
 @router.get("/complaints")
-async def get_complaints(
+def get_complaints(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     priority: Optional[str] = None,
     assigned_to_me: bool = False,
+    cursor: Optional[str] = None,
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
 ):
-    """Get complaints with filtering"""
+    """Get complaints with filtering (newest first; pass next_cursor back as cursor for the next page)"""
     
-    query = db.query(Complaint)
+    # Students are loaded for the whole page in one extra query
+    query = db.query(Complaint).options(selectinload(Complaint.student))
     
     # Filter by hostel
     if supervisor.hostel_id:
@@ -193,16 +215,13 @@ async def get_complaints(
     if assigned_to_me:
         query = query.filter(Complaint.assigned_to_id == supervisor.id)
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    complaints = query.offset((page - 1) * size).limit(size).all()
+    # Offset pages are counted; cursor pages are not
+    result = paginate(db, query, COMPLAINT_KEYSET, size, cursor=cursor, offset=(page - 1) * size)
     
     # Convert to response format
     complaint_responses = []
-    for complaint in complaints:
-        user = db.query(User).filter(User.id == complaint.user_id).first()
+    for complaint in result.items:
+        student = complaint.student
         complaint_responses.append({
             "id": complaint.id,
             "complaint_title": complaint.complaint_title,
@@ -210,25 +229,17 @@ async def get_complaints(
             "complaint_status": complaint.status,
             "priority": complaint.priority,
             "user_id": complaint.user_id,
-            "user_name": user.name if user else "Unknown",
+            "user_name": student.student_name if student else complaint.student_name or "Unknown",
             "hostel_id": str(complaint.hostel_id) if complaint.hostel_id else None,
             "room_number": complaint.room_number,
             "created_at": complaint.created_at.isoformat() if complaint.created_at else None
         })
     
-    return {
-        "items": complaint_responses,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": (total + size - 1) // size,
-        "has_next": page * size < total,
-        "has_prev": page > 1
-    }
+    return _page_response(complaint_responses, result, page, size, cursor)
 
 
 @router.get("/complaints/{complaint_id}")
-async def get_complaint(
+def get_complaint(
     complaint_id: int,
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
@@ -270,7 +281,7 @@ async def get_complaint(
 
 
 @router.put("/complaints/{complaint_id}/assign")
-async def assign_complaint(
+def assign_complaint(
     complaint_id: int,
     role: Optional[str] = None,
     assigned_to: Optional[int] = None,
@@ -344,7 +355,7 @@ async def assign_complaint(
 
 
 @router.put("/complaints/{complaint_id}/resolve")
-async def resolve_complaint(
+def resolve_complaint(
     complaint_id: int,
     resolution_notes: str,
     resolution_attachments: Optional[str] = None,
@@ -380,17 +391,18 @@ async def resolve_complaint(
 # ==================== ATTENDANCE OPERATIONS APIs ====================
 
 @router.get("/attendance")
-async def get_attendance_records(
+def get_attendance_records(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     user_id: Optional[int] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
 ):
-    """Get attendance records"""
+    """Get attendance records (latest dates first; pass next_cursor back as cursor for the next page)"""
     
     query = db.query(Attendance)
     
@@ -416,15 +428,13 @@ async def get_attendance_records(
             query = query.filter(Attendance.is_present == False)
     
     # Order by date descending
-    query = query.order_by(Attendance.date.desc())
-    
-    total = query.count()
-    attendance_records = query.offset((page - 1) * size).limit(size).all()
+    result = paginate(db, query, ATTENDANCE_KEYSET, size, cursor=cursor, offset=(page - 1) * size)
     
     # Convert to response format
     attendance_responses = []
-    for record in attendance_records:
-        user = db.query(User).filter(User.id == record.student_id).first()
+    users = get_loader(db, User).load_many(record.student_id for record in result.items)
+    for record in result.items:
+        user = users.get(record.student_id)
         attendance_responses.append({
             "user_id": record.student_id,
             "user_name": user.name if user else record.student_name or "Unknown",
@@ -436,19 +446,11 @@ async def get_attendance_records(
             "notes": record.notes
         })
     
-    return {
-        "items": attendance_responses,
-        "total": total,
-        "page": page,
-        "size": size,
-        "pages": (total + size - 1) // size,
-        "has_next": page * size < total,
-        "has_prev": page > 1
-    }
+    return _page_response(attendance_responses, result, page, size, cursor)
 
 
 @router.post("/attendance/{user_id}/approve-leave")
-async def approve_leave(
+def approve_leave(
     user_id: int,
     attendance_id: int = Query(...),
     supervisor: User = Depends(get_supervisor_user),
@@ -483,7 +485,7 @@ async def approve_leave(
 
 
 @router.post("/quick-actions/mark-attendance/{user_id}")
-async def quick_mark_attendance(
+def quick_mark_attendance(
     user_id: int,
     attendance_status: str,
     supervisor: User = Depends(get_supervisor_user),
@@ -537,7 +539,7 @@ async def quick_mark_attendance(
 # ==================== LEAVE APPLICATION MANAGEMENT APIs ====================
 
 @router.get("/leave-applications")
-async def get_leave_applications(
+def get_leave_applications(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
@@ -565,8 +567,9 @@ async def get_leave_applications(
     
     # Convert to response format
     leave_responses = []
+    students = get_loader(db, User).load_many(leave_app.student_id for leave_app in leave_applications)
     for leave_app in leave_applications:
-        student = db.query(User).filter(User.id == leave_app.student_id).first()
+        student = students.get(leave_app.student_id)
         
         # Calculate duration
         duration_days = 0
@@ -596,7 +599,7 @@ async def get_leave_applications(
 
 
 @router.put("/leave-applications/{leave_id}/approve")
-async def approve_leave_application(
+def approve_leave_application(
     leave_id: int,
     supervisor: User = Depends(get_supervisor_user),
     db: Session = Depends(get_db)
@@ -634,7 +637,7 @@ async def approve_leave_application(
 
 
 @router.put("/leave-applications/{leave_id}/reject")
-async def reject_leave_application(
+def reject_leave_application(
     leave_id: int,
     rejection_reason: str = Query(..., min_length=10),
     supervisor: User = Depends(get_supervisor_user),
@@ -675,7 +678,7 @@ async def reject_leave_application(
 # ==================== STUDENT MANAGEMENT APIs ====================
 
 @router.get("/students")
-async def get_students(
+def get_students(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
@@ -11,6 +11,7 @@ from app.models.user import OTP
 
 router = APIRouter()
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.schemas.auth_schemas import UserRegister, OTPVerify, OTPResend, Token
 from app.schemas.auth_schemas import UserRegister, UserResponse, OTPVerify, OTPResend, Token
@@ -23,29 +24,37 @@ router = APIRouter()
 
 @router.post("/register", status_code=status.HTTP_201_CREATED, operation_id="visitor_register_user")
 async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    # Async only to await bcrypt on the hashing pool; session work and OTP
+    # delivery run on the threadpool
+    def check_available():
+        if user_data.email and repo.get_user_by_email(db, user_data.email):
+            raise HTTPException(400, "Email already registered")
+        if user_data.phone and repo.get_user_by_phone(db, user_data.phone):
+            raise HTTPException(400, "Phone already registered")
+
+    def create_and_send_otp(hashed):
+        user = repo.create_user(db, name=user_data.name, email=user_data.email, phone=user_data.phone, hashed_password=hashed)
+
+        otp_code = service.generate_otp()
+        expires_at = service.otp_expiry_time()
+        repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
+
+        if user.email:
+            service.send_otp_email(user.email, otp_code)
+        if user.phone_number:
+            service.send_otp_sms(user.phone_number, otp_code)
+
     if not user_data.email and not user_data.phone:
         raise HTTPException(400, "Email or phone required")
-    if user_data.email and repo.get_user_by_email(db, user_data.email):
-        raise HTTPException(400, "Email already registered")
-    if user_data.phone and repo.get_user_by_phone(db, user_data.phone):
-        raise HTTPException(400, "Phone already registered")
-
-    hashed = service.get_password_hash(user_data.password)
-    user = repo.create_user(db, name=user_data.name, email=user_data.email, phone=user_data.phone, hashed_password=hashed)
-
-    otp_code = service.generate_otp()
-    expires_at = service.otp_expiry_time()
-    repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
+    await run_in_threadpool(check_available)
 
-    if user.email:
-        await service.send_otp_email(user.email, otp_code)
-    if user.phone_number:
-        await service.send_otp_sms(user.phone_number, otp_code)
+    hashed = await service.aget_password_hash(user_data.password)
+    await run_in_threadpool(create_and_send_otp, hashed)
 
     return {"message": "User registered. OTP sent."}
 
 @router.post("/verify-otp", response_model=Token, operation_id="visitor_verify_otp")
-async def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
+def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
     otp_record = repo.get_valid_otp(db, otp_data.otp_code)
     if not otp_record:
         raise HTTPException(400, "Invalid or expired OTP")
@@ -60,7 +69,7 @@ async def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/resend-otp", operation_id="visitor_resend_otp")
-async def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
+def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
     user = None
     if otp_data.email:
         user = repo.get_user_by_email(db, otp_data.email)
@@ -75,42 +84,48 @@ async def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
     repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
 
     if user.email:
-        await service.send_otp_email(user.email, otp_code)
+        service.send_otp_email(user.email, otp_code)
     if user.phone_number:
-        await service.send_otp_sms(user.phone_number, otp_code)
+        service.send_otp_sms(user.phone_number, otp_code)
 
     return {"message": "OTP resent successfully"}
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED, operation_id="visitor_register_user_response")
 async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    # Async only to await bcrypt on the hashing pool; session work and OTP
+    # delivery run on the threadpool
+    def check_available():
+        if user_data.email:
+            existing = repo.get_user_by_email(db, user_data.email)
+            if existing:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+        if user_data.phone:
+            existing = repo.get_user_by_phone(db, user_data.phone)
+            if existing:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Phone number already registered")
+
+    def create_and_send_otp(hashed):
+        user = repo.create_user(db, name=user_data.name, email=user_data.email, phone=user_data.phone, hashed_password=hashed)
+
+        otp_code = service.generate_otp()
+        expires_at = otp_expiry_time()
+        repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
+
+        if user_data.email:
+            service.send_otp_email(user_data.email, otp_code)
+        if user_data.phone:
+            service.send_otp_sms(user_data.phone, otp_code)
+        return user
+
     if not user_data.email and not user_data.phone:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Either email or phone must be provided")
+    await run_in_threadpool(check_available)
 
-    if user_data.email:
-        existing = repo.get_user_by_email(db, user_data.email)
-        if existing:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    if user_data.phone:
-        existing = repo.get_user_by_phone(db, user_data.phone)
-        if existing:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Phone number already registered")
-
-    hashed = service.get_password_hash(user_data.password)
-    user = repo.create_user(db, name=user_data.name, email=user_data.email, phone=user_data.phone, hashed_password=hashed)
-
-    otp_code = service.generate_otp()
-    expires_at = otp_expiry_time()
-    repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
-
-    if user_data.email:
-        await service.send_otp_email(user_data.email, otp_code)
-    if user_data.phone:
-        await service.send_otp_sms(user_data.phone, otp_code)
-
-    return user
+    hashed = await service.aget_password_hash(user_data.password)
+    return await run_in_threadpool(create_and_send_otp, hashed)
 
 @router.post("/verify-otp", response_model=Token, operation_id="visitor_verify_otp_response")
-async def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
+def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
     # Now we verify OTP by code only (email/phone removed from request body)
     print(f"\nVerifying OTP: {otp_data.otp_code}")
 
@@ -145,7 +160,7 @@ async def verify_otp(otp_data: OTPVerify, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/resend-otp", operation_id="visitor_resend_otp_response")
-async def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
+def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
     if not otp_data.email and not otp_data.phone:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Either email or phone must be provided")
     user = None
@@ -161,7 +176,7 @@ async def resend_otp(otp_data: OTPResend, db: Session = Depends(get_db)):
     repo.create_otp(db, user_id=user.id, otp_code=otp_code, expires_at=expires_at, email=user.email, phone=user.phone_number)
 
     if otp_data.email:
-        await service.send_otp_email(otp_data.email, otp_code)
+        service.send_otp_email(otp_data.email, otp_code)
     if otp_data.phone:
-        await service.send_otp_sms(otp_data.phone, otp_code)
+        service.send_otp_sms(otp_data.phone, otp_code)
     return {"message": "OTP sent successfully"}
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
 
-from app.dependencies import get_db
+from app.core.async_database import get_async_db
 from app.models.hostel import Hostel
 from app.models.rooms import Room
 from app.models.booking import Booking
@@ -15,11 +16,11 @@ router = APIRouter(
 
 
 @router.get("/{hostel_id}")
-def get_calendar(
+async def get_calendar(
     hostel_id: int,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Returns complete booking calendar for visual UI:
@@ -29,26 +30,28 @@ def get_calendar(
     """
 
     # Validate hostel
-    hostel = db.query(Hostel).filter(Hostel.id == hostel_id).first()
+    hostel = await db.get(Hostel, hostel_id)
     if not hostel:
         raise HTTPException(status_code=404, detail="Hostel not found")
 
     # Fetch all rooms
-    rooms = db.query(Room).filter(Room.hostel_id == hostel_id).all()
+    rooms = (
+        await db.execute(select(Room).where(Room.hostel_id == hostel_id))
+    ).scalars().all()
 
     if not rooms:
         raise HTTPException(status_code=404, detail="No rooms found in this hostel")
 
     # Fetch bookings within date range
     bookings = (
-        db.query(Booking)
-        .filter(
-            Booking.hostel_id == hostel_id,
-            Booking.check_in < end_date,
-            Booking.check_out > start_date
+        await db.execute(
+            select(Booking).where(
+                Booking.hostel_id == hostel_id,
+                Booking.check_in < end_date,
+                Booking.check_out > start_date
+            )
         )
-        .all()
-    )
+    ).scalars().all()
 
     # Build calendar data
     calendar = {}
@@ -73,9 +76,10 @@ def get_calendar(
     for b in bookings:
         current = b.check_in.date()
         while current < b.check_out.date():
-            if current.isoformat() in calendar[b.room_id]["dates"]:
-                calendar[b.room_id]["dates"][current.isoformat()] = {
-                    "status": b.status.value,
+            room_dates = calendar.get(b.room_id, {}).get("dates", {})
+            if current.isoformat() in room_dates:
+                room_dates[current.isoformat()] = {
+                    "status": b.status,
                     "booking_id": b.id
                 }
             current += timedelta(days=1)
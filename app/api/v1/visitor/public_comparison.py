@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import defaultdict
 import json
 
-from app.dependencies import get_db
+from app.core.async_database import get_async_db
 from app.models.hostel import Hostel
 from app.models.rooms import Room
 
@@ -13,9 +15,9 @@ router = APIRouter(
 
 
 @router.get("/")
-def compare_hostels(
+async def compare_hostels(
     hostel_ids: list[int] = Query(..., description="Provide up to 4 hostel IDs"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Compare up to 4 hostels and return essential details:
@@ -34,10 +36,8 @@ def compare_hostels(
         )
 
     hostels = (
-        db.query(Hostel)
-        .filter(Hostel.id.in_(hostel_ids))
-        .all()
-    )
+        await db.execute(select(Hostel).where(Hostel.id.in_(hostel_ids)))
+    ).scalars().all()
 
     if not hostels:
         raise HTTPException(
@@ -45,12 +45,19 @@ def compare_hostels(
             detail="No hostels found for the given IDs."
         )
 
+    # Fetch rooms of all compared hostels in one query
+    rooms_by_hostel = defaultdict(list)
+    room_rows = (
+        await db.execute(select(Room).where(Room.hostel_id.in_([h.id for h in hostels])))
+    ).scalars().all()
+    for room in room_rows:
+        rooms_by_hostel[room.hostel_id].append(room)
+
     response = []
 
     for hostel in hostels:
 
-        # Fetch rooms of hostel
-        rooms = db.query(Room).filter(Room.hostel_id == hostel.id).all()
+        rooms = rooms_by_hostel[hostel.id]
 
         prices = [r.price for r in rooms if r.price is not None]
         available_beds = sum(r.available_beds for r in rooms)
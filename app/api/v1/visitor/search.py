@@ -1,79 +1,56 @@
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.core.database import get_db
+from app.core.async_database import get_async_db
 from app.schemas.search import HostelSearchRequest, HostelSearchResponse, HostelSearchResult, HostelSearchFilters, HostelSearchSort
+from app.core.elasticsearch import elasticsearch_enabled
+from app.services.hostel_search import autocomplete_hostels, search_hostels as search_hostels_es
 from app.services.search_service import SearchService
 
 router = APIRouter(prefix="/visitor/search", tags=["Visitor Search"])
 
 @router.post("/hostels", response_model=HostelSearchResponse)
-def search_hostels(search_request: HostelSearchRequest, db: Session = Depends(get_db)):
-    """Search hostels with filters and sorting (PostgreSQL or Elasticsearch)"""
-    
-    # Try Elasticsearch first for advanced features
-    from app.core.elasticsearch import search_hostels_es, get_elasticsearch
+async def search_hostels(search_request: HostelSearchRequest, db: AsyncSession = Depends(get_async_db)):
+    """Search hostels with filters and sorting (Elasticsearch, or PostgreSQL while it is unavailable)"""
     
     es_results = None
-    if get_elasticsearch():
-        try:
-            filters_dict = search_request.filters.model_dump(exclude_none=True)
-            es_results = search_hostels_es(
-                query=filters_dict.get('query', ''),
-                filters=filters_dict,
-                size=search_request.page_size,
-                from_=(search_request.page - 1) * search_request.page_size
-            )
-        except Exception as e:
-            print(f"Elasticsearch search failed, falling back to PostgreSQL: {e}")
-    
-    if es_results:
-        # Use Elasticsearch results
-        results = []
-        for hit in es_results['hits']:
-            source = hit['_source']
-            # Add distance if available
-            if 'sort' in hit and len(hit['sort']) > 0:
-                source['distance_km'] = hit['sort'][0]
-            results.append(HostelSearchResult(**source))
-        
-        total_count = es_results['total']
-        total_pages = (total_count + search_request.page_size - 1) // search_request.page_size
-        
-        response = HostelSearchResponse(
-            results=results,
-            total_count=total_count,
-            page=search_request.page,
-            page_size=search_request.page_size,
-            total_pages=total_pages
+    if elasticsearch_enabled():
+        # The Elasticsearch client is blocking, keep it off the event loop
+        es_results = await run_in_threadpool(
+            search_hostels_es,
+            search_request.filters,
+            search_request.sort,
+            search_request.page,
+            search_request.page_size,
         )
-        
-        # Add facets/aggregations to response
-        response.facets = es_results.get('aggregations', {})
-        
+    
+    if es_results is not None:
+        hostels, total_count, facets = es_results['results'], es_results['total'], es_results['facets']
     else:
-        # Fallback to PostgreSQL
-        hostels, total_count = SearchService.search_hostels(
+        hostels, total_count = await SearchService.search_hostels_async(
             db, 
             search_request.filters, 
             search_request.sort,
             search_request.page,
             search_request.page_size
         )
-        
-        results = [HostelSearchResult(**hostel) for hostel in hostels]
-        total_pages = (total_count + search_request.page_size - 1) // search_request.page_size
-        
-        response = HostelSearchResponse(
-            results=results,
-            total_count=total_count,
-            page=search_request.page,
-            page_size=search_request.page_size,
-            total_pages=total_pages
-        )
+        facets = None
+    
+    total_pages = (total_count + search_request.page_size - 1) // search_request.page_size
+    response = HostelSearchResponse(
+        results=[HostelSearchResult(**hostel) for hostel in hostels],
+        total_count=total_count,
+        page=search_request.page,
+        page_size=search_request.page_size,
+        total_pages=total_pages,
+        facets=facets
+    )
     
     # Log search for analytics
-    SearchService.log_search(db, search_request.filters, total_count)
+    await SearchService.log_search_async(db, search_request.filters, total_count)
     
     return response
 
@@ -85,31 +62,12 @@ def autocomplete_search(
     db: Session = Depends(get_db)
 ):
     """Autocomplete suggestions for hostel search"""
-    from app.core.elasticsearch import autocomplete_hostels, get_elasticsearch
-    
-    if get_elasticsearch():
-        suggestions = autocomplete_hostels(query, field, limit)
-        if suggestions:
-            return {"suggestions": suggestions}
+    suggestions = autocomplete_hostels(query, field, limit) if elasticsearch_enabled() else None
+    if suggestions is None:
+        # Trigram-backed fallback while Elasticsearch is unavailable
+        suggestions = SearchService.autocomplete(db, query, field, limit)
     
-    # Fallback to PostgreSQL LIKE search
-    from sqlalchemy import text
-    
-    sql_query = f"""
-        SELECT DISTINCT {field}, city
-        FROM hostels
-        WHERE LOWER({field}) LIKE LOWER(:query)
-        LIMIT :limit
-    """
-    
-    results = db.execute(
-        text(sql_query),
-        {'query': f'%{query}%', 'limit': limit}
-    ).fetchall()
-    
-    return {
-        "suggestions": [dict(row._mapping) for row in results]
-    }
+    return {"suggestions": suggestions}
 
 @router.get("/hostels/{hostel_id}")
 def get_hostel_details(hostel_id: int, request: Request, db: Session = Depends(get_db)):
@@ -0,0 +1,47 @@
+"""
+Cross-worker job locks.
+
+`advisory_lock(bind, key)` is a non-blocking mutex for periodic jobs that must
+not run twice at once (several app workers each start the same scheduler).
+On PostgreSQL it takes a session-level `pg_try_advisory_lock` on a dedicated
+autocommit connection, held until the block exits, so the job's own session
+can commit batch by batch. Other databases (tests, local SQLite) fall back to
+a per-process lock.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from sqlalchemy import text
+
+_local_locks: Dict[int, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(key: int) -> threading.Lock:
+    with _local_locks_guard:
+        return _local_locks.setdefault(key, threading.Lock())
+
+
+@contextmanager
+def advisory_lock(bind, key: int) -> Iterator[bool]:
+    """Yields True if the lock was acquired, False if another worker holds it"""
+    if bind.dialect.name != "postgresql":
+        lock = _local_lock(key)
+        acquired = lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    with bind.engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
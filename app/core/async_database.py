@@ -0,0 +1,91 @@
+"""Async database engine and session management.
+
+Runs alongside the sync engine in `app.config`: read-heavy endpoints depend on
+`get_async_db` so slow queries wait on the event loop instead of holding a
+threadpool worker. Everything else keeps using `get_db`.
+
+The async URL is derived from DATABASE_URL (postgresql -> postgresql+asyncpg,
+sqlite -> sqlite+aiosqlite) unless ASYNC_DATABASE_URL is set. The engine is
+built on first use so the drivers are only required where the async path runs.
+"""
+
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app.config import apply_statement_timeout, settings, statement_timeout_for_path
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def async_database_url(database_url: str) -> str:
+    """Return `database_url` rewritten to use an asyncio driver"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.drivername in _ASYNC_DRIVERS.values() or backend not in _ASYNC_DRIVERS:
+        return database_url
+    return url.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        options = {}
+        if make_url(url).get_backend_name() != "sqlite":
+            options = {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+                "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            }
+        _async_engine = create_async_engine(url, **options)
+    return _async_engine
+
+
+class _AsyncBackingSession(Session):
+    """Sync session class behind AsyncSession, so event hooks stay scoped to it"""
+
+
+# Same per-route statement timeout as the sync request sessions
+event.listen(_AsyncBackingSession, "after_begin", apply_statement_timeout)
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            sync_session_class=_AsyncBackingSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for async DB sessions"""
+    async with get_async_sessionmaker()() as db:
+        if request is not None:
+            db.info["statement_timeout_ms"] = statement_timeout_for_path(request.url.path)
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (application shutdown)"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
@@ -2,13 +2,14 @@
 Comprehensive audit logging system for tracking sensitive operations
 Logs all critical actions for security and compliance
 """
+import json
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
-from app.models.base import Base
+from app.core.audit_pipeline import submit_audit
+from app.models.audit_log import AuditLog
 
 logger = logging.getLogger(__name__)
 
@@ -65,24 +66,6 @@ class AuditAction(str, Enum):
     BULK_EXPORT = "BULK_EXPORT"
     DATA_MODIFIED = "DATA_MODIFIED"
 
-class AuditLog(Base):
-    """Database model for audit logs"""
-    __tablename__ = "audit_logs"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
-    action = Column(String(50), nullable=False, index=True)
-    user_id = Column(Integer, nullable=True, index=True)
-    user_email = Column(String(255), nullable=True)
-    user_role = Column(String(32), nullable=True)
-    ip_address = Column(String(45), nullable=True)
-    user_agent = Column(String(500), nullable=True)
-    resource_type = Column(String(50), nullable=True, index=True)
-    resource_id = Column(Integer, nullable=True)
-    details = Column(JSON, nullable=True)
-    status = Column(String(20), nullable=False, default="SUCCESS")
-    error_message = Column(Text, nullable=True)
-
 class AuditLogger:
     """Audit logging service"""
     
@@ -102,10 +85,14 @@ class AuditLogger:
         error_message: Optional[str] = None
     ):
         """
-        Log an audit event to database and application logs
+        Log an audit event to the audit pipeline and application logs.
+        
+        The row is queued and batch-inserted into audit_logs in the background.
+        audit_logs.user_id is required, so events without a user (e.g. failed
+        logins) only go to the application log.
         
         Args:
-            db: Database session
+            db: Database session (unused, kept for callers)
             action: Type of action performed
             user_id: ID of user performing action
             user_email: Email of user
@@ -119,23 +106,22 @@ class AuditLogger:
             error_message: Error message if status is FAILURE
         """
         try:
-            # Create audit log entry
-            audit_entry = AuditLog(
-                action=action.value,
-                user_id=user_id,
-                user_email=user_email,
-                user_role=user_role,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                details=details,
-                status=status,
-                error_message=error_message
-            )
-            
-            db.add(audit_entry)
-            db.commit()
+            if user_id is not None:
+                resource = f"{resource_type}:{resource_id}" if resource_id is not None else (resource_type or action.value)
+                submit_audit({
+                    "user_id": user_id,
+                    "action": action.value,
+                    "resource": resource,
+                    "ip_address": ip_address,
+                    "user_agent": user_agent,
+                    "details": json.dumps({
+                        "user_email": user_email,
+                        "user_role": user_role,
+                        "status": status,
+                        "error_message": error_message,
+                        **(details or {}),
+                    }, default=str),
+                })
             
             # Also log to application logger
             log_message = f"AUDIT: {action.value} | User: {user_email or 'Anonymous'} ({user_role or 'N/A'}) | Resource: {resource_type}:{resource_id} | Status: {status}"
@@ -0,0 +1,357 @@
+"""
+Buffered audit pipeline.
+
+Audit rows are put on a bounded in-memory queue and written by a background
+flusher thread in multi-row INSERTs into `audit_logs`, every
+AUDIT_FLUSH_INTERVAL_MS or as soon as AUDIT_BATCH_SIZE rows are waiting, so
+request handlers never wait on an audit insert/commit.
+
+When the queue is full, sync producers wait up to AUDIT_ENQUEUE_TIMEOUT_MS for
+room (back-pressure); async producers never wait. Rows that still do not fit,
+and batches that fail because the database is unavailable, follow
+AUDIT_OVERFLOW_POLICY:
+ - "spill": appended as JSON lines to AUDIT_SPILL_PATH and replayed by the
+   flusher once the database accepts writes again
+ - "drop": discarded and counted
+
+A batch rejected because of its data (IntegrityError / DataError, e.g. a row
+without user_id) is split in halves and retried, so only the offending rows
+are isolated; those go to AUDIT_DEAD_LETTER_PATH with the error and are never
+retried, while the rest of the batch is written.
+
+`shutdown_audit_pipeline()` (application shutdown) drains the queue before
+the process exits.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+AuditRecord = Dict[str, Any]
+
+# Wait before replaying the spill file again after the database rejected it
+SPILL_REPLAY_BACKOFF_SECONDS = 30.0
+
+
+def _is_row_error(exc: Exception) -> bool:
+    """True when the database rejected the rows themselves, not the write"""
+    return isinstance(exc, (IntegrityError, DataError))
+
+
+class AuditPipeline:
+    """Bounded queue plus a background batch writer for audit_logs"""
+
+    def __init__(
+        self,
+        writer: Callable[[List[AuditRecord]], None],
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        enqueue_timeout: float = 0.05,
+        overflow_policy: str = "spill",
+        spill_path: Optional[str] = None,
+        dead_letter_path: Optional[str] = None,
+    ):
+        if overflow_policy not in ("spill", "drop"):
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path
+        self._queue: "queue.Queue[AuditRecord]" = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._spill_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._next_replay = 0.0
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "dead_lettered": 0,
+        }
+
+    # -----------------------------------------------------
+    # PRODUCERS
+    # -----------------------------------------------------
+    def submit(self, record: AuditRecord, block: bool = True) -> bool:
+        """
+        Queue an audit row. Returns False if it had to be spilled or dropped.
+
+        `block=False` skips the back-pressure wait (use it from async code).
+        """
+        record.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            if block and self.enqueue_timeout > 0:
+                self._queue.put(record, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._overflow([record])
+            return False
+        self._count("enqueued")
+        return True
+
+    # -----------------------------------------------------
+    # FLUSHER
+    # -----------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-pipeline", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after writing everything still queued"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Write all queued rows now (from the calling thread)"""
+        written = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return written
+            written += self._write(batch)[0]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+            elif self.overflow_policy == "spill":
+                try:
+                    self._replay_spill()
+                except Exception as e:
+                    logger.error(f"Audit spill replay failed: {e}")
+                    self._next_replay = time.monotonic() + SPILL_REPLAY_BACKOFF_SECONDS
+
+    def _collect(self) -> List[AuditRecord]:
+        """Wait for the first row, then gather until the batch is full or the interval ends"""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self, limit: int) -> List[AuditRecord]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[AuditRecord]) -> Tuple[int, bool]:
+        """
+        Write a batch; returns (rows written, False when the database could
+        not be written to and the unwritten rows were overflowed).
+        """
+        written = 0
+        parts = [batch]
+        while parts:
+            part = parts.pop()
+            try:
+                self.writer(part)
+            except Exception as e:
+                if not _is_row_error(e):
+                    logger.error(f"Audit batch of {len(part)} rows failed: {e}")
+                    self._count("failed_batches")
+                    self._overflow([record for rest in parts + [part] for record in rest])
+                    self._count("written", written)
+                    return written, False
+                if len(part) > 1:
+                    # Bisect until the rejected rows are isolated
+                    middle = len(part) // 2
+                    parts += [part[middle:], part[:middle]]
+                else:
+                    logger.error(f"Audit row rejected by the database: {e}")
+                    self._dead_letter(part[0], e)
+                continue
+            self._count("batches")
+            written += len(part)
+        self._count("written", written)
+        return written, True
+
+    # -----------------------------------------------------
+    # OVERFLOW / SPILL
+    # -----------------------------------------------------
+    def _overflow(self, records: List[AuditRecord]) -> None:
+        if self.overflow_policy == "spill" and self.spill_path:
+            try:
+                self._spill(records)
+                self._count("spilled", len(records))
+                return
+            except OSError as e:
+                logger.error(f"Audit spill to {self.spill_path} failed: {e}")
+        self._count("dropped", len(records))
+        logger.warning(f"Dropped {len(records)} audit rows")
+
+    def _spill(self, records: List[AuditRecord]) -> None:
+        directory = os.path.dirname(self.spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record, default=_json_default) + "\n")
+
+    def _dead_letter(self, record: AuditRecord, error: Exception) -> None:
+        self._count("dead_lettered")
+        if not self.dead_letter_path:
+            return
+        directory = os.path.dirname(self.dead_letter_path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._spill_lock, open(self.dead_letter_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps({"error": str(error).splitlines()[0], "record": record},
+                                    default=_json_default) + "\n")
+        except OSError as e:
+            logger.error(f"Audit dead letter to {self.dead_letter_path} failed: {e}")
+
+    def _replay_spill(self) -> None:
+        """Move spilled rows back into the database once it is idle and healthy"""
+        if not self.spill_path or time.monotonic() < self._next_replay:
+            return
+        replay_path = self.spill_path + ".replay"
+        with self._spill_lock:
+            # A leftover replay file (interrupted replay) is finished first
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+
+        with open(replay_path, encoding="utf-8") as fh:
+            records = [_from_json(json.loads(line)) for line in fh if line.strip()]
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            written, ok = self._write(batch)
+            self._count("replayed", written)
+            if not ok:
+                # _write re-spilled the batch's unwritten rows; keep the rest and back off
+                rest = records[start + self.batch_size:]
+                if rest:
+                    self._spill(rest)
+                self._next_replay = time.monotonic() + SPILL_REPLAY_BACKOFF_SECONDS
+                break
+        os.remove(replay_path)
+
+    # -----------------------------------------------------
+    # STATS
+    # -----------------------------------------------------
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._counter_lock:
+            self._counters[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            snapshot = dict(self._counters)
+        snapshot["queue_depth"] = self._queue.qsize()
+        snapshot["queue_max_size"] = self._queue.maxsize
+        snapshot["overflow_policy"] = self.overflow_policy
+        snapshot["running"] = self._thread is not None and self._thread.is_alive()
+        return snapshot
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _from_json(record: AuditRecord) -> AuditRecord:
+    for key, value in record.items():
+        if isinstance(value, dict) and "__datetime__" in value:
+            record[key] = datetime.fromisoformat(value["__datetime__"])
+    return record
+
+
+def insert_audit_rows(records: List[AuditRecord], bind=None) -> None:
+    """Multi-row INSERT of queued records into audit_logs"""
+    from app.config import engine
+    from app.models.audit_log import AuditLog
+
+    columns = [c.name for c in AuditLog.__table__.columns if c.name != "id"]
+    # executemany needs the same keys on every row
+    rows = [{name: record.get(name) for name in columns} for record in records]
+    with (bind or engine).begin() as conn:
+        conn.execute(AuditLog.__table__.insert(), rows)
+
+
+# ---------------------------------------------------------
+# PROCESS-WIDE PIPELINE
+# ---------------------------------------------------------
+_pipeline: Optional[AuditPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_audit_pipeline() -> AuditPipeline:
+    """Return the process-wide pipeline, starting its flusher on first use"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                pipeline = AuditPipeline(
+                    writer=insert_audit_rows,
+                    max_size=settings.AUDIT_QUEUE_MAX_SIZE,
+                    batch_size=settings.AUDIT_BATCH_SIZE,
+                    flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000.0,
+                    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_MS / 1000.0,
+                    overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+                    spill_path=settings.AUDIT_SPILL_PATH,
+                    dead_letter_path=settings.AUDIT_DEAD_LETTER_PATH,
+                )
+                pipeline.start()
+                _pipeline = pipeline
+    return _pipeline
+
+
+def submit_audit(record: AuditRecord, block: bool = True) -> bool:
+    return get_audit_pipeline().submit(record, block=block)
+
+
+def audit_pipeline_stats() -> Dict[str, Any]:
+    return get_audit_pipeline().stats()
+
+
+def shutdown_audit_pipeline(timeout: float = 10.0) -> None:
+    """Flush queued audit rows and stop the flusher (application shutdown)"""
+    global _pipeline
+    with _pipeline_lock:
+        pipeline, _pipeline = _pipeline, None
+    if pipeline is not None:
+        pipeline.stop(timeout=timeout)
@@ -0,0 +1,473 @@
+"""
+Application cache.
+
+Two tiers behind one interface:
+ - an in-process LRU/TTL tier (always on, per worker)
+ - an optional Redis tier shared by all workers (enabled by REDIS_URL)
+
+Service methods opt in with the `@cached` decorator. Entries carry tags
+(table names such as "hostels", "bookings", "complaints"); any committed
+INSERT/UPDATE/DELETE against a tagged table evicts the matching entries, so
+writes made through the ORM or raw SQL invalidate the cache without callers
+having to remember to do it. TTLs bound staleness for anything else (e.g.
+local entries on other workers when Redis is not configured).
+"""
+
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import math
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sentinel returned by cache lookups on a miss (None is a valid cached value)
+MISSING = object()
+
+# Tenant the current request runs for; set by the tenant filter middleware
+_current_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("cache_tenant", default=None)
+
+
+def set_cache_tenant(tenant: Optional[Union[int, str]]) -> contextvars.Token:
+    """Set the tenant used to partition `tenant_aware` cache keys"""
+    return _current_tenant.set(str(tenant) if tenant is not None else None)
+
+
+def get_cache_tenant() -> str:
+    return _current_tenant.get() or "global"
+
+
+# ---------------------------------------------------------
+# STATISTICS
+# ---------------------------------------------------------
+class CacheStats:
+    """Thread-safe hit/miss counters"""
+
+    FIELDS = ("hits", "misses", "local_hits", "remote_hits", "sets", "evictions", "invalidations", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[field] += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {field: 0 for field in self.FIELDS}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counters)
+        lookups = data["hits"] + data["misses"]
+        data["hit_ratio"] = round(data["hits"] / lookups, 4) if lookups else 0.0
+        return data
+
+
+# ---------------------------------------------------------
+# BACKENDS
+# ---------------------------------------------------------
+class MemoryCache:
+    """In-process LRU cache with per-entry TTL and a tag -> keys index"""
+
+    def __init__(self, max_entries: int = 2048, stats: Optional[CacheStats] = None):
+        self.max_entries = max_entries
+        self.stats = stats or CacheStats()
+        self._data: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, payload, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return MISSING
+            self._data.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, payload, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.stats.incr("evictions")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    if key in self._data:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        # caller holds the lock
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache:
+    """Shared cache tier over a redis-py compatible client.
+
+    Values live under `<prefix><key>` with a TTL; each tag is a Redis set of
+    the keys carrying it, so invalidation is SMEMBERS + DEL.
+    """
+
+    TAG_TTL_SECONDS = 24 * 3600
+
+    def __init__(self, client, prefix: str = "cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str):
+        payload = self.client.get(self.prefix + key)
+        return MISSING if payload is None else payload
+
+    def set(self, key: str, payload: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, ttl, payload)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            pipe.expire(self._tag_key(tag), self.TAG_TTL_SECONDS)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = list(self.client.smembers(tag_key))
+            if keys:
+                removed += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        return removed
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class TieredCache:
+    """Local LRU in front of an optional shared Redis tier.
+
+    Values are pickled so callers never share mutable objects with the cache,
+    together with their tags and expiry time: a Redis hit is copied into the
+    local tier under the same tags (so commit-driven invalidation evicts it)
+    and for no longer than the entry has left to live. Redis failures are logged and counted but never fail the request; the
+    cache degrades to the local tier.
+    """
+
+    def __init__(self, local: MemoryCache, remote: Optional[RedisCache] = None,
+                 default_ttl: int = 60, local_ttl: Optional[int] = None):
+        self.local = local
+        self.remote = remote
+        self.default_ttl = default_ttl
+        self.local_ttl = local_ttl
+        self.stats = local.stats
+
+    def _local_ttl(self, ttl: int) -> int:
+        # With a shared tier, keep local copies short-lived so invalidations
+        # issued by other workers are picked up quickly
+        if self.remote is not None and self.local_ttl:
+            return min(ttl, self.local_ttl)
+        return ttl
+
+    def get(self, key: str):
+        payload = self.local.get(key)
+        if payload is not MISSING:
+            self.stats.incr("hits")
+            self.stats.incr("local_hits")
+            return pickle.loads(payload)[0]
+
+        if self.remote is not None:
+            try:
+                payload = self.remote.get(key)
+            except Exception as exc:
+                self.stats.incr("errors")
+                logger.warning("Redis cache get failed for %s: %s", key, exc)
+                payload = MISSING
+            if payload is not MISSING:
+                self.stats.incr("hits")
+                self.stats.incr("remote_hits")
+                value, tags, expires_at = pickle.loads(payload)
+                remaining = math.ceil(expires_at - time.time())
+                if remaining > 0:
+                    self.local.set(key, payload, self._local_ttl(remaining), tags)
+                return value
+
+        self.stats.incr("misses")
+        return MISSING
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        ttl = ttl or self.default_ttl
+        tags = tuple(tags)
+        payload = pickle.dumps((value, tags, time.time() + ttl), protocol=pickle.HIGHEST_PROTOCOL)
+        self.local.set(key, payload, self._local_ttl(ttl), tags)
+        if self.remote is not None:
+            try:
+                self.remote.set(key, payload, ttl, tags)
+            except Exception as exc:
+                self.stats.incr("errors")
+                logger.warning("Redis cache set failed for %s: %s", key, exc)
+        self.stats.incr("sets")
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.remote is not None:
+            try:
+                self.remote.delete(key)
+            except Exception as exc:
+                self.stats.incr("errors")
+                logger.warning("Redis cache delete failed for %s: %s", key, exc)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        removed = self.local.invalidate_tags(tags)
+        if self.remote is not None:
+            try:
+                removed += self.remote.invalidate_tags(tags)
+            except Exception as exc:
+                self.stats.incr("errors")
+                logger.warning("Redis cache invalidation failed for %s: %s", tags, exc)
+        self.stats.incr("invalidations", removed)
+        return removed
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.remote is not None:
+            try:
+                self.remote.clear()
+            except Exception as exc:
+                self.stats.incr("errors")
+                logger.warning("Redis cache clear failed: %s", exc)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory+redis" if self.remote is not None else "memory",
+            "local_entries": len(self.local),
+            "max_local_entries": self.local.max_entries,
+            **self.stats.snapshot(),
+        }
+
+
+# ---------------------------------------------------------
+# GLOBAL INSTANCE
+# ---------------------------------------------------------
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+
+
+def _build_cache() -> TieredCache:
+    remote = None
+    if settings.REDIS_URL:
+        try:
+            import redis
+
+            remote = RedisCache(redis.Redis.from_url(settings.REDIS_URL), prefix=settings.CACHE_KEY_PREFIX)
+        except Exception as exc:
+            logger.warning("Redis cache tier disabled: %s", exc)
+    return TieredCache(
+        MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES),
+        remote,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        local_ttl=settings.CACHE_LOCAL_TTL,
+    )
+
+
+def get_cache() -> TieredCache:
+    """Return the process-wide cache, building it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache()
+    return _cache
+
+
+def set_cache(cache: Optional[TieredCache]) -> None:
+    """Replace the process-wide cache (tests, or to plug in another client)"""
+    global _cache
+    _cache = cache
+
+
+def invalidate_tags(*tags: str) -> int:
+    return get_cache().invalidate_tags(*tags)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return get_cache().info()
+
+
+# ---------------------------------------------------------
+# DECORATOR
+# ---------------------------------------------------------
+_SKIPPED_ARGS = {"db", "self", "cls"}
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalise(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in value.items()}
+    return value
+
+
+def _make_key(name: str, signature: inspect.Signature, key: Optional[Union[str, Callable[..., str]]],
+              tenant_aware: bool, args: tuple, kwargs: dict) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {
+        arg: value for arg, value in bound.arguments.items()
+        if arg not in _SKIPPED_ARGS and not isinstance(value, (Session, AsyncSession))
+    }
+
+    if callable(key):
+        suffix = str(key(**arguments))
+    elif isinstance(key, str):
+        suffix = key.format(**arguments)
+    else:
+        raw = json.dumps(_normalise(arguments), sort_keys=True, default=str)
+        suffix = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    tenant = get_cache_tenant() if tenant_aware else "*"
+    return f"{name}:{tenant}:{suffix}"
+
+
+def cached(ttl: Optional[int] = None, key: Optional[Union[str, Callable[..., str]]] = None,
+           tags: Iterable[str] = (), tenant_aware: bool = True):
+    """Cache a function's return value.
+
+    Args:
+        ttl: seconds to keep the value (defaults to CACHE_DEFAULT_TTL)
+        key: optional key builder; a format string or a callable, both fed the
+            function's arguments by name (the DB session is never part of the key).
+            Defaults to a hash of all arguments.
+        tags: table names whose writes should evict this entry
+        tenant_aware: partition entries by the active tenant of the request
+
+    Usage:
+        @staticmethod
+        @cached(ttl=60, tags=("hostels",))
+        def get_summary(db: Session, hostel_id: int): ...
+    """
+    tags = tuple(tags)
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not settings.CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                cache_key = _make_key(name, signature, key, tenant_aware, args, kwargs)
+                cache = get_cache()
+                value = cache.get(cache_key)
+                if value is not MISSING:
+                    return value
+                value = await func(*args, **kwargs)
+                cache.set(cache_key, value, ttl, tags)
+                return value
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return func(*args, **kwargs)
+            cache_key = _make_key(name, signature, key, tenant_aware, args, kwargs)
+            cache = get_cache()
+            value = cache.get(cache_key)
+            if value is not MISSING:
+                return value
+            value = func(*args, **kwargs)
+            cache.set(cache_key, value, ttl, tags)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------
+# WRITE-DRIVEN INVALIDATION
+# ---------------------------------------------------------
+# Matches the target table of INSERT / UPDATE / DELETE statements, whether they
+# were emitted by an ORM flush or written by hand with text()
+_WRITE_TABLE_RE = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _collect_written_tables(conn, cursor, statement, parameters, context, executemany):
+    match = _WRITE_TABLE_RE.match(statement)
+    if match:
+        conn.info.setdefault("cache_written_tables", set()).add(match.group(1).lower())
+
+
+@event.listens_for(Engine, "commit")
+def _invalidate_written_tables(conn):
+    tables = conn.info.pop("cache_written_tables", None)
+    if tables and _cache is not None:
+        _cache.invalidate_tags(*tables)
+
+
+@event.listens_for(Engine, "rollback")
+def _discard_written_tables(conn):
+    conn.info.pop("cache_written_tables", None)
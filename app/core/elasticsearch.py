@@ -1,314 +1,182 @@
+"""
+Elasticsearch client and the hostel index definition.
+
+`get_elasticsearch()` returns a shared client, or None when ELASTICSEARCH_URL
+is unset or the cluster did not answer. After a failed ping (or a failed
+request reported through `mark_elasticsearch_down`) the cluster is not tried
+again for ELASTICSEARCH_RETRY_SECONDS, so searches fall straight back to the
+database instead of paying a connect timeout each time.
+
+Querying and indexing live in app.services.hostel_search.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
 from elasticsearch import Elasticsearch
+
 from app.config import settings
-from typing import List, Dict, Any
-import logging
 
 # Suppress elasticsearch warnings
 logging.getLogger('elastic_transport').setLevel(logging.ERROR)
 
-es_client = None
+logger = logging.getLogger(__name__)
 
-def get_elasticsearch():
-    global es_client
-    if es_client is None:
-        try:
-            es_client = Elasticsearch(
-                [settings.ELASTICSEARCH_URL],
-                request_timeout=2,  # Faster timeout
-                max_retries=0,  # Don't retry
-                retry_on_timeout=False
-            )
-            # Quick ping to test connection
-            if not es_client.ping():
-                es_client = None
-        except Exception as e:
-            es_client = None
-    return es_client
+HOSTEL_INDEX = "hostels"
 
-def init_elasticsearch_indices():
-    """Initialize Elasticsearch indices for hostel search"""
-    es = get_elasticsearch()
-    if not es:
-        print("Elasticsearch not available - search will use PostgreSQL")
-        return
-    
-    try:
-        index_name = "hostels"
-        
-        if not es.indices.exists(index=index_name):
-            es.indices.create(
-                index=index_name,
-                body={
-                    "settings": {
-                        "analysis": {
-                            "analyzer": {
-                                "autocomplete_analyzer": {
-                                    "type": "custom",
-                                    "tokenizer": "standard",
-                                    "filter": ["lowercase", "autocomplete_filter"]
-                                },
-                                "fuzzy_analyzer": {
-                                    "type": "custom",
-                                    "tokenizer": "standard",
-                                    "filter": ["lowercase", "asciifolding"]
-                                }
-                            },
-                            "filter": {
-                                "autocomplete_filter": {
-                                    "type": "edge_ngram",
-                                    "min_gram": 2,
-                                    "max_gram": 20
-                                }
-                            }
-                        }
-                    },
-                    "mappings": {
-                        "properties": {
-                            "id": {"type": "integer"},
-                            "name": {
-                                "type": "text",
-                                "analyzer": "standard",
-                                "fields": {
-                                    "autocomplete": {
-                                        "type": "text",
-                                        "analyzer": "autocomplete_analyzer"
-                                    },
-                                    "fuzzy": {
-                                        "type": "text",
-                                        "analyzer": "fuzzy_analyzer"
-                                    }
-                                }
-                            },
-                            "description": {"type": "text"},
-                            "location": {
-                                "type": "text",
-                                "fields": {
-                                    "autocomplete": {
-                                        "type": "text",
-                                        "analyzer": "autocomplete_analyzer"
-                                    }
-                                }
-                            },
-                            "city": {"type": "keyword"},
-                            "area": {"type": "keyword"},
-                            "pincode": {"type": "keyword"},
-                            "gender": {"type": "keyword"},
-                            "price_range_min": {"type": "float"},
-                            "price_range_max": {"type": "float"},
-                            "rating": {"type": "float"},
-                            "amenities": {"type": "keyword"},
-                            "available_beds": {"type": "integer"},
-                            "geo_location": {"type": "geo_point"}
-                        }
-                    }
-                }
-            )
-        print("Elasticsearch indices initialized successfully")
-    except Exception as e:
-        print(f"Elasticsearch initialization failed: {e}")
-        print("Application will continue without Elasticsearch - search will use PostgreSQL")
+_AUTOCOMPLETE_FIELD = {
+    "type": "text",
+    # edge n-grams at index time only: the typed prefix is matched as is
+    "analyzer": "autocomplete_analyzer",
+    "search_analyzer": "autocomplete_search_analyzer",
+}
 
-def index_hostel(hostel_data: Dict[str, Any]):
-    """Index a single hostel to Elasticsearch"""
-    es = get_elasticsearch()
-    if not es:
-        return False
-    
-    try:
-        # Add geo_location point
-        if hostel_data.get('latitude') and hostel_data.get('longitude'):
-            hostel_data['geo_location'] = {
-                'lat': float(hostel_data['latitude']),
-                'lon': float(hostel_data['longitude'])
-            }
-        
-        es.index(
-            index="hostels",
-            id=hostel_data['id'],
-            body=hostel_data
-        )
-        return True
-    except Exception as e:
-        print(f"Error indexing hostel {hostel_data.get('id')}: {e}")
-        return False
-
-def bulk_index_hostels(hostels: List[Dict[str, Any]]):
-    """Bulk index hostels to Elasticsearch"""
-    es = get_elasticsearch()
-    if not es:
-        return False
-    
-    try:
-        from elasticsearch.helpers import bulk
-        
-        actions = []
-        for hostel in hostels:
-            # Add geo_location point
-            if hostel.get('latitude') and hostel.get('longitude'):
-                hostel['geo_location'] = {
-                    'lat': float(hostel['latitude']),
-                    'lon': float(hostel['longitude'])
-                }
-            
-            actions.append({
-                '_index': 'hostels',
-                '_id': hostel['id'],
-                '_source': hostel
-            })
-        
-        success, failed = bulk(es, actions)
-        print(f"Elasticsearch bulk index: {success} successful, {len(failed)} failed")
-        return True
-    except Exception as e:
-        print(f"Error bulk indexing hostels: {e}")
-        return False
-
-def search_hostels_es(query: str, filters: Dict[str, Any], size: int = 20, from_: int = 0):
-    """Advanced search using Elasticsearch"""
-    es = get_elasticsearch()
-    if not es:
-        return None
-    
-    try:
-        # Build Elasticsearch query
-        must_conditions = []
-        filter_conditions = []
-        
-        # Full-text search with fuzzy matching
-        if query:
-            must_conditions.append({
-                "multi_match": {
-                    "query": query,
-                    "fields": ["name^3", "name.fuzzy^2", "description", "location.autocomplete"],
-                    "fuzziness": "AUTO",
-                    "prefix_length": 1
-                }
-            })
-        
-        # Filters
-        if filters.get('city'):
-            filter_conditions.append({"term": {"city": filters['city']}})
-        
-        if filters.get('area'):
-            filter_conditions.append({"term": {"area": filters['area']}})
-        
-        if filters.get('gender'):
-            filter_conditions.append({"term": {"gender": filters['gender']}})
-        
-        if filters.get('amenities'):
-            for amenity in filters['amenities']:
-                filter_conditions.append({"term": {"amenities": amenity}})
-        
-        # Price range
-        if filters.get('min_price') or filters.get('max_price'):
-            price_range = {}
-            if filters.get('min_price'):
-                price_range['gte'] = filters['min_price']
-            if filters.get('max_price'):
-                price_range['lte'] = filters['max_price']
-            filter_conditions.append({"range": {"price_range_min": price_range}})
-        
-        # Rating
-        if filters.get('min_rating'):
-            filter_conditions.append({"range": {"rating": {"gte": filters['min_rating']}}})
-        
-        # Availability
-        if filters.get('available_only'):
-            filter_conditions.append({"range": {"available_beds": {"gt": 0}}})
-        
-        # Geo distance filter
-        if filters.get('latitude') and filters.get('longitude'):
-            filter_conditions.append({
-                "geo_distance": {
-                    "distance": f"{filters.get('radius_km', 5)}km",
-                    "geo_location": {
-                        "lat": filters['latitude'],
-                        "lon": filters['longitude']
-                    }
-                }
-            })
-        
-        # Build final query
-        es_query = {
-            "query": {
-                "bool": {
-                    "must": must_conditions if must_conditions else [{"match_all": {}}],
-                    "filter": filter_conditions
+HOSTEL_INDEX_BODY: Dict[str, Any] = {
+    "settings": {
+        "analysis": {
+            "analyzer": {
+                "autocomplete_analyzer": {
+                    "type": "custom",
+                    "tokenizer": "standard",
+                    "filter": ["lowercase", "asciifolding", "autocomplete_filter"]
+                },
+                "autocomplete_search_analyzer": {
+                    "type": "custom",
+                    "tokenizer": "standard",
+                    "filter": ["lowercase", "asciifolding"]
+                },
+                "fuzzy_analyzer": {
+                    "type": "custom",
+                    "tokenizer": "standard",
+                    "filter": ["lowercase", "asciifolding"]
                 }
             },
-            "size": size,
-            "from": from_
-        }
-        
-        # Add geo distance sorting if coordinates provided
-        if filters.get('latitude') and filters.get('longitude'):
-            es_query["sort"] = [
-                {
-                    "_geo_distance": {
-                        "geo_location": {
-                            "lat": filters['latitude'],
-                            "lon": filters['longitude']
-                        },
-                        "order": "asc",
-                        "unit": "km"
-                    }
+            "filter": {
+                "autocomplete_filter": {
+                    "type": "edge_ngram",
+                    "min_gram": 2,
+                    "max_gram": 20
                 }
-            ]
-        
-        # Add aggregations for faceted search
-        es_query["aggs"] = {
-            "cities": {"terms": {"field": "city", "size": 50}},
-            "areas": {"terms": {"field": "area", "size": 50}},
-            "genders": {"terms": {"field": "gender"}},
-            "amenities": {"terms": {"field": "amenities", "size": 50}},
-            "price_ranges": {
-                "range": {
-                    "field": "price_range_min",
-                    "ranges": [
-                        {"to": 5000},
-                        {"from": 5000, "to": 10000},
-                        {"from": 10000, "to": 15000},
-                        {"from": 15000}
-                    ]
+            },
+            "normalizer": {
+                "lowercase_normalizer": {
+                    "type": "custom",
+                    "filter": ["lowercase", "asciifolding"]
                 }
             }
         }
-        
-        response = es.search(index="hostels", body=es_query)
-        
-        return {
-            "hits": response['hits']['hits'],
-            "total": response['hits']['total']['value'],
-            "aggregations": response.get('aggregations', {})
+    },
+    "mappings": {
+        "properties": {
+            "id": {"type": "integer"},
+            "name": {
+                "type": "text",
+                "analyzer": "standard",
+                "fields": {
+                    "autocomplete": _AUTOCOMPLETE_FIELD,
+                    "fuzzy": {
+                        "type": "text",
+                        "analyzer": "fuzzy_analyzer"
+                    }
+                }
+            },
+            "description": {"type": "text"},
+            "location": {
+                "type": "text",
+                "fields": {"autocomplete": _AUTOCOMPLETE_FIELD}
+            },
+            "city": {
+                "type": "keyword",
+                "normalizer": "lowercase_normalizer",
+                "fields": {"autocomplete": _AUTOCOMPLETE_FIELD}
+            },
+            "area": {"type": "keyword", "normalizer": "lowercase_normalizer"},
+            "pincode": {"type": "keyword"},
+            "gender": {"type": "keyword", "normalizer": "lowercase_normalizer"},
+            "contact_phone": {"type": "keyword", "index": False},
+            "contact_email": {"type": "keyword", "index": False},
+            "price_range_min": {"type": "float"},
+            "price_range_max": {"type": "float"},
+            "rating": {"type": "float"},
+            "review_count": {"type": "integer"},
+            "amenities": {"type": "keyword", "normalizer": "lowercase_normalizer"},
+            "available_beds": {"type": "integer"},
+            "total_beds": {"type": "integer"},
+            "latitude": {"type": "float", "index": False},
+            "longitude": {"type": "float", "index": False},
+            "geo_location": {"type": "geo_point"},
+            "created_at": {"type": "date"}
         }
-    except Exception as e:
-        print(f"Elasticsearch search error: {e}")
-        return None
+    }
+}
+
+es_client: Optional[Elasticsearch] = None
+_retry_at = 0.0
+_client_lock = threading.Lock()
+
+
+def elasticsearch_enabled() -> bool:
+    """Whether a search should try Elasticsearch at all (no I/O)"""
+    return es_client is not None or (bool(settings.ELASTICSEARCH_URL) and time.monotonic() >= _retry_at)
+
 
-def autocomplete_hostels(query: str, field: str = "name", size: int = 10):
-    """Autocomplete suggestions for hostel search"""
+def get_elasticsearch() -> Optional[Elasticsearch]:
+    global es_client, _retry_at
+    if es_client is not None or not elasticsearch_enabled():
+        return es_client
+    with _client_lock:
+        if es_client is None and time.monotonic() >= _retry_at:
+            try:
+                client = Elasticsearch(
+                    [settings.ELASTICSEARCH_URL],
+                    request_timeout=2,  # Faster timeout
+                    max_retries=0,  # Don't retry
+                    retry_on_timeout=False
+                )
+                # Quick ping to test connection
+                if client.ping():
+                    es_client = client
+            except Exception:
+                logger.debug("Elasticsearch connection failed", exc_info=True)
+            if es_client is None:
+                _retry_at = time.monotonic() + settings.ELASTICSEARCH_RETRY_SECONDS
+    return es_client
+
+
+def mark_elasticsearch_down() -> None:
+    """Drop the client after a failed request; the database serves until the retry delay passes"""
+    global es_client, _retry_at
+    with _client_lock:
+        es_client = None
+        _retry_at = time.monotonic() + settings.ELASTICSEARCH_RETRY_SECONDS
+
+
+def set_elasticsearch(client: Optional[Elasticsearch]) -> None:
+    """Install a client (or reset with None), mainly for tests and benchmarks"""
+    global es_client, _retry_at
+    with _client_lock:
+        es_client = client
+        _retry_at = 0.0
+
+
+def create_hostel_index(es: Elasticsearch, recreate: bool = False) -> None:
+    if recreate:
+        es.indices.delete(index=HOSTEL_INDEX, ignore_unavailable=True)
+    if not es.indices.exists(index=HOSTEL_INDEX):
+        es.indices.create(index=HOSTEL_INDEX, **HOSTEL_INDEX_BODY)
+
+
+def init_elasticsearch_indices():
+    """Initialize Elasticsearch indices for hostel search"""
     es = get_elasticsearch()
     if not es:
-        return []
-    
+        logger.info("Elasticsearch not available - search will use PostgreSQL")
+        return
+
     try:
-        response = es.search(
-            index="hostels",
-            body={
-                "query": {
-                    "match": {
-                        f"{field}.autocomplete": {
-                            "query": query,
-                            "operator": "and"
-                        }
-                    }
-                },
-                "size": size,
-                "_source": [field, "city", "area"]
-            }
-        )
-        
-        return [hit['_source'] for hit in response['hits']['hits']]
+        create_hostel_index(es)
+        logger.info("Elasticsearch indices initialized successfully")
     except Exception as e:
-        print(f"Autocomplete error: {e}")
-        return []
\ No newline at end of file
+        logger.warning("Elasticsearch initialization failed: %s - search will use PostgreSQL", e)
@@ -0,0 +1,192 @@
+"""
+Hostel scope: the hostel ids a user may act on.
+
+Resolved per (user_id, role):
+ - superadmin: every hostel
+ - admin: the hostels mapped to the user in admin_hostel_mappings
+ - supervisor: the supervisor_hostels rows of the user's Supervisor record,
+   matched by user_id, else by the user's email, else by phone (rows created
+   before supervisors were linked to users)
+ - anyone else: the user's own hostel_id
+
+Resolving a supervisor used to cost up to five queries on every request.
+The resolved list is now kept for HOSTEL_SCOPE_CACHE_TTL seconds in the
+application cache, tagged with the tables it was derived from, so any
+committed write to them evicts it. The hostel-assignment endpoints also drop
+the affected user's entries with `invalidate_hostel_scope`.
+
+`resolve_hostel_ids_many` resolves a whole list of users (reports, exports)
+with a fixed number of queries per role instead of a chain per user.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import MISSING, get_cache
+from app.core.loaders import CHUNK_SIZE
+from app.core.roles import Role
+from app.models.admin_hostel_mapping import AdminHostelMapping
+from app.models.hostel import Hostel
+from app.models.supervisors import Supervisor, SupervisorHostel
+from app.models.user import User
+
+ScopeKey = Tuple[int, str]
+
+# Superadmin scope, as HostelRepository.get_all_hostels(limit=1000) returned it
+SUPERADMIN_HOSTEL_LIMIT = 1000
+
+# Tables each role's scope is derived from (writes to them evict it)
+SCOPE_TAGS = {
+    Role.SUPERADMIN.value: ("hostels",),
+    Role.ADMIN.value: ("hostels", "admin_hostel_mappings"),
+    Role.SUPERVISOR.value: ("users", "supervisors", "supervisor_hostels"),
+}
+DEFAULT_SCOPE_TAGS = ("users",)
+
+
+def _role(role) -> str:
+    return str(getattr(role, "value", role))
+
+
+def _scope_key(user_id: int, role: str) -> str:
+    return f"scope:hostels:{role}:{user_id}"
+
+
+def _enabled() -> bool:
+    return settings.CACHE_ENABLED and settings.HOSTEL_SCOPE_CACHE_TTL > 0
+
+
+def _chunks(ids: Sequence) -> Iterable[list]:
+    ids = list(ids)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+# ---------------------------------------------------------
+# RESOLUTION (one query per table, whatever the number of users)
+# ---------------------------------------------------------
+def _superadmin_scopes(db: Session, user_ids: List[int]) -> Dict[int, List[int]]:
+    hostel_ids = list(db.execute(
+        select(Hostel.id).order_by(Hostel.id.desc()).limit(SUPERADMIN_HOSTEL_LIMIT)
+    ).scalars())
+    return {user_id: list(hostel_ids) for user_id in user_ids}
+
+
+def _admin_scopes(db: Session, user_ids: List[int]) -> Dict[int, List[int]]:
+    scopes: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+    for chunk in _chunks(user_ids):
+        rows = db.execute(
+            select(AdminHostelMapping.admin_id, Hostel.id)
+            .join(Hostel, Hostel.id == AdminHostelMapping.hostel_id)
+            .where(AdminHostelMapping.admin_id.in_(chunk))
+        ).all()
+        for admin_id, hostel_id in rows:
+            scopes[admin_id].append(hostel_id)
+    return scopes
+
+
+def _users(db: Session, user_ids: Sequence[int]) -> Dict[int, User]:
+    users = {}
+    for chunk in _chunks(user_ids):
+        users.update({user.id: user for user in db.query(User).filter(User.id.in_(chunk))})
+    return users
+
+
+def _supervisors_by(db: Session, column, values: Iterable) -> Dict[object, Supervisor]:
+    """{value: supervisor} for the first supervisor found with each value"""
+    found: Dict[object, Supervisor] = {}
+    for chunk in _chunks(dict.fromkeys(v for v in values if v)):
+        for supervisor in db.query(Supervisor).filter(column.in_(chunk)):
+            found.setdefault(getattr(supervisor, column.key), supervisor)
+    return found
+
+
+def _supervisor_scopes(db: Session, user_ids: List[int]) -> Dict[int, List[int]]:
+    employee_ids = {user_id: sup.employee_id
+                    for user_id, sup in _supervisors_by(db, Supervisor.user_id, user_ids).items()}
+
+    # Fallback: match the User's email, then phone (handles pre-linked rows)
+    unlinked = [user_id for user_id in user_ids if user_id not in employee_ids]
+    if unlinked:
+        users = _users(db, unlinked)
+        by_email = _supervisors_by(db, Supervisor.supervisor_email, (u.email for u in users.values()))
+        for user in users.values():
+            if user.email in by_email:
+                employee_ids[user.id] = by_email[user.email].employee_id
+        by_phone = _supervisors_by(db, Supervisor.supervisor_phone, (
+            getattr(u, "phone_number", None) for u in users.values() if u.id not in employee_ids
+        ))
+        for user in users.values():
+            if user.id not in employee_ids and getattr(user, "phone_number", None) in by_phone:
+                employee_ids[user.id] = by_phone[user.phone_number].employee_id
+
+    hostels_by_employee: Dict[str, List[int]] = {}
+    for chunk in _chunks(set(employee_ids.values())):
+        rows = db.execute(
+            select(SupervisorHostel.employee_id, SupervisorHostel.hostel_id)
+            .where(SupervisorHostel.employee_id.in_(chunk))
+        ).all()
+        for employee_id, hostel_id in rows:
+            hostels_by_employee.setdefault(employee_id, []).append(hostel_id)
+    return {user_id: list(hostels_by_employee.get(employee_ids.get(user_id), [])) for user_id in user_ids}
+
+
+def _own_hostel_scopes(db: Session, user_ids: List[int]) -> Dict[int, List[int]]:
+    users = _users(db, user_ids)
+    return {
+        user_id: [users[user_id].hostel_id] if user_id in users and users[user_id].hostel_id else []
+        for user_id in user_ids
+    }
+
+
+_RESOLVERS = {
+    Role.SUPERADMIN.value: _superadmin_scopes,
+    Role.ADMIN.value: _admin_scopes,
+    Role.SUPERVISOR.value: _supervisor_scopes,
+}
+
+
+# ---------------------------------------------------------
+# CACHED LOOKUPS
+# ---------------------------------------------------------
+def resolve_hostel_ids_many(db: Session, users: Iterable[Tuple[int, str]]) -> Dict[ScopeKey, List[int]]:
+    """{(user_id, role): hostel ids} for many users, from the cache where fresh
+
+    Misses are resolved with a fixed number of queries per role and cached.
+    """
+    wanted = list(dict.fromkeys((user_id, _role(role)) for user_id, role in users))
+    scopes: Dict[ScopeKey, List[int]] = {}
+    misses: Dict[str, List[int]] = {}
+    cache = get_cache() if _enabled() else None
+    for user_id, role in wanted:
+        cached = cache.get(_scope_key(user_id, role)) if cache is not None else MISSING
+        if cached is MISSING:
+            misses.setdefault(role, []).append(user_id)
+        else:
+            scopes[(user_id, role)] = cached
+
+    for role, user_ids in misses.items():
+        resolved = _RESOLVERS.get(role, _own_hostel_scopes)(db, user_ids)
+        for user_id in user_ids:
+            scopes[(user_id, role)] = resolved[user_id]
+            if cache is not None:
+                cache.set(_scope_key(user_id, role), resolved[user_id], ttl=settings.HOSTEL_SCOPE_CACHE_TTL,
+                          tags=SCOPE_TAGS.get(role, DEFAULT_SCOPE_TAGS))
+    return scopes
+
+
+def resolve_hostel_ids(db: Session, user_id: int, role) -> List[int]:
+    """Hostel ids `user_id` may act on with `role`"""
+    return resolve_hostel_ids_many(db, [(user_id, role)])[(user_id, _role(role))]
+
+
+def invalidate_hostel_scope(user_id: Optional[int], role=None) -> None:
+    """Forget a user's cached scope, for one role or all of them"""
+    if user_id is None:
+        return
+    cache = get_cache()
+    for name in [_role(role)] if role is not None else [r.value for r in Role]:
+        cache.delete(_scope_key(user_id, name))
@@ -0,0 +1,54 @@
+"""
+Batch loaders for list endpoints.
+
+Rendering a page of rows that each reference another record (the student
+behind an attendance entry, a leave application, ...) used to cost one
+SELECT per row. A loader collects the ids of the whole page and fetches
+them with one `WHERE key IN (...)` per chunk.
+
+Loaders are memoized on the Session (`Session.info`), which get_db opens
+per request, so several handlers or helpers in one request share results
+and an id is never fetched twice. Ids that do not exist are remembered as
+missing too.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+# Keeps IN lists well below every backend's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+class Loader:
+    """`load_many(ids)` for one model, keyed on a column (the primary key by default)"""
+
+    def __init__(self, db: Session, model, key=None):
+        self.db = db
+        self.model = model
+        self.key = key if key is not None else model.__mapper__.primary_key[0]
+        self._loaded: Dict[Any, Optional[Any]] = {}
+
+    def load_many(self, ids: Iterable[Any]) -> Dict[Any, Any]:
+        """{id: row} for the ids that exist, in one query per CHUNK_SIZE unseen ids"""
+        ids = [i for i in dict.fromkeys(ids) if i is not None]
+        missing = [i for i in ids if i not in self._loaded]
+        for start in range(0, len(missing), CHUNK_SIZE):
+            chunk = missing[start:start + CHUNK_SIZE]
+            rows = self.db.query(self.model).filter(self.key.in_(chunk)).all()
+            found = {getattr(row, self.key.key): row for row in rows}
+            for i in chunk:
+                self._loaded[i] = found.get(i)
+        return {i: self._loaded[i] for i in ids if self._loaded[i] is not None}
+
+    def load(self, id: Any) -> Optional[Any]:
+        return self.load_many([id]).get(id)
+
+
+def get_loader(db: Session, model, key=None) -> Loader:
+    """The Session's loader for `model` (created on first use)"""
+    loaders = db.info.setdefault("loaders", {})
+    name = (model, key.key if key is not None else None)
+    if name not in loaders:
+        loaders[name] = Loader(db, model, key)
+    return loaders[name]
@@ -0,0 +1,217 @@
+"""
+Pagination for list endpoints.
+
+Two modes over the same ordered query:
+ - offset pages (`page` / `skip`): the total comes from one
+   `SELECT COUNT(*)` over the filtered query. On PostgreSQL, when the
+   planner estimates more than PAGINATION_ESTIMATE_THRESHOLD rows, the
+   estimate is returned instead (flagged `total_is_estimate`) so a page view
+   never scans a huge table just to count it
+ - keyset pages (`cursor`): rows strictly after the last row of the previous
+   page in the keyset order, e.g. (created_at, id) descending. Every page
+   costs the same however deep it is, rows inserted meanwhile do not shift
+   later pages, and no count is run at all
+
+Every page carries `next_cursor`, an opaque token (URL-safe base64 of the
+last row's key values and the key column names), so a client can switch to
+keyset paging after the first offset page. A token issued for a different
+ordering is rejected with 400.
+
+Key columns are expected to be NOT NULL; the last one must be unique (the
+primary key) so the order is total.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Response headers for list endpoints whose body is a bare JSON array
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_IS_ESTIMATE_HEADER = "X-Total-Is-Estimate"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PAGE_HEADERS = [TOTAL_COUNT_HEADER, TOTAL_IS_ESTIMATE_HEADER, NEXT_CURSOR_HEADER]
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    total: Optional[int]            # None for keyset pages
+    next_cursor: Optional[str]      # None on the last page
+    total_is_estimate: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+# ---------------------------------------------------------
+# CURSOR TOKENS
+# ---------------------------------------------------------
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(keys: Sequence[str], values: Sequence[Any]) -> str:
+    payload = json.dumps({"k": list(keys), "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, keys: Sequence[str]) -> List[Any]:
+    """Key values from a cursor token; InvalidCursor when malformed or issued for other keys"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["k"] != list(keys) or len(payload["v"]) != len(keys):
+            raise InvalidCursor("Pagination cursor does not match this listing's sort order")
+        return [_decode_value(v) for v in payload["v"]]
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor()
+
+
+# ---------------------------------------------------------
+# KEYSET
+# ---------------------------------------------------------
+class Keyset:
+    """An ordering usable for keyset pagination: columns, all ascending or all descending"""
+
+    def __init__(self, *columns, descending: bool = True):
+        self.columns = columns
+        self.descending = descending
+        self.keys = [f"{column.key}{':desc' if descending else ''}" for column in columns]
+
+    def order(self, query):
+        direction = (lambda c: c.desc()) if self.descending else (lambda c: c.asc())
+        return query.order_by(None).order_by(*(direction(column) for column in self.columns))
+
+    def after(self, query, cursor: str):
+        values = decode_cursor(cursor, self.keys)
+        key, bound = tuple_(*self.columns), tuple_(*values)
+        return query.filter(key < bound if self.descending else key > bound)
+
+    def cursor_for(self, row) -> str:
+        return encode_cursor(self.keys, [getattr(row, column.key) for column in self.columns])
+
+
+# ---------------------------------------------------------
+# COUNTING
+# ---------------------------------------------------------
+def _statement(query):
+    return query.statement if isinstance(query, Query) else query
+
+
+def estimate_rows(db: Session, query) -> Optional[int]:
+    """Planner row estimate (PostgreSQL only, None elsewhere or on failure)"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = _statement(query).order_by(None).compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    try:
+        # In a savepoint: a failed statement would otherwise abort the
+        # request's transaction and the COUNT(*) fallback along with it
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    except Exception:
+        logger.debug("Row estimate failed", exc_info=True)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, query, estimate_threshold: Optional[int] = None) -> Tuple[int, bool]:
+    """(total, is_estimate) for a filtered query
+
+    With a threshold (default PAGINATION_ESTIMATE_THRESHOLD, 0 disables),
+    sets the planner expects to be larger are not counted exactly.
+    """
+    threshold = settings.PAGINATION_ESTIMATE_THRESHOLD if estimate_threshold is None else estimate_threshold
+    if threshold:
+        estimate = estimate_rows(db, query)
+        if estimate is not None and estimate >= threshold:
+            return estimate, True
+    subquery = _statement(query).order_by(None).subquery()
+    return db.execute(select(func.count()).select_from(subquery)).scalar() or 0, False
+
+
+# ---------------------------------------------------------
+# PAGES
+# ---------------------------------------------------------
+def _fetch(db: Session, query) -> List[Any]:
+    if isinstance(query, Query):
+        return query.all()
+    return list(db.execute(query).scalars().all())
+
+
+def paginate(
+    db: Session,
+    query,
+    keyset: Keyset,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    with_total: Optional[bool] = None,
+) -> Page:
+    """One page of `query` (an ORM Query or a single-entity select) in keyset order
+
+    With a cursor the page starts after it and `offset` is ignored; without
+    one it is an offset page. The total is counted for offset pages unless
+    `with_total` says otherwise.
+    """
+    if with_total is None:
+        with_total = cursor is None
+    total, is_estimate = count_rows(db, query) if with_total else (None, False)
+
+    paged = keyset.order(query)
+    if cursor:
+        paged = keyset.after(paged, cursor)
+    elif offset:
+        paged = paged.offset(offset)
+    # one extra row tells whether there is a next page
+    rows = _fetch(db, paged.limit(limit + 1))
+    items = rows[:limit]
+    next_cursor = keyset.cursor_for(items[-1]) if len(rows) > limit else None
+    return Page(items=items, total=total, next_cursor=next_cursor, total_is_estimate=is_estimate)
+
+
+def set_page_headers(response: Response, page: Page) -> None:
+    """Expose a page's total and next cursor on endpoints that return a bare list"""
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
+        if page.total_is_estimate:
+            response.headers[TOTAL_IS_ESTIMATE_HEADER] = "true"
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
@@ -0,0 +1,111 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow (~50-250 ms per hash depending on the cost
+factor) and releases the GIL while it runs, so hashing on a small dedicated
+thread pool keeps the event loop free during logins and registrations
+without starving Starlette's shared threadpool that sync routes run on.
+
+The number of jobs waiting for a worker is capped: once MAX_QUEUE jobs are
+queued, further submissions fail fast with `HashingPoolFull` (the login
+routes answer 503) instead of piling up latency for everyone.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class HashingPoolFull(RuntimeError):
+    """Raised when the hashing queue is at capacity"""
+
+
+class HashingPool:
+    def __init__(self, max_workers: int = 4, max_queue: int = 256, name: str = "bcrypt"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "wait_ms_total": 0.0,
+            "run_ms_total": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool"
+                    )
+        return self._executor
+
+    def _reserve(self) -> float:
+        with self._lock:
+            if self._queued >= self.max_queue + max(0, self.max_workers - self._running):
+                self._counters["rejected"] += 1
+                raise HashingPoolFull(f"{self.name} pool queue is full ({self.max_queue} waiting)")
+            self._queued += 1
+            self._counters["submitted"] += 1
+            depth = max(0, self._queued - (self.max_workers - self._running))
+            if depth > self._counters["max_queue_depth"]:
+                self._counters["max_queue_depth"] = depth
+        return time.perf_counter()
+
+    def _run(self, enqueued_at: float, fn: Callable[..., Any], args: tuple) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._counters["wait_ms_total"] += (started - enqueued_at) * 1000
+        ok = False
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._counters["completed" if ok else "failed"] += 1
+                self._counters["run_ms_total"] += (time.perf_counter() - started) * 1000
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)` on the pool and await its result"""
+        enqueued_at = self._reserve()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._run, enqueued_at, fn, args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._counters)
+            queued, running = self._queued, self._running
+        finished = snapshot["completed"] + snapshot["failed"]
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queue_depth": max(0, queued - (self.max_workers - running)),
+            "submitted": snapshot["submitted"],
+            "completed": snapshot["completed"],
+            "failed": snapshot["failed"],
+            "rejected": snapshot["rejected"],
+            "max_queue_depth": snapshot["max_queue_depth"],
+            "avg_wait_ms": round(snapshot["wait_ms_total"] / finished, 3) if finished else 0.0,
+            "avg_run_ms": round(snapshot["run_ms_total"] / finished, 3) if finished else 0.0,
+        }
@@ -1,44 +1,41 @@
 """
-Rate limiting middleware for API endpoints
+Rate limiting for API endpoints
 Protects against brute force attacks and API abuse
+
+Limits are enforced with GCRA (generic cell rate algorithm): each key stores
+a single "theoretical arrival time", which gives a smooth sliding limit with
+no 2x burst at window edges. The state lives in a shared store so every
+worker sees the same counters:
+ - Redis (when REDIS_URL is set): one EVALSHA of a Lua script per check,
+   clocked by the Redis server so workers never disagree on time
+ - an in-process store otherwise (tests, single-worker development)
+
+In front of the store each worker keeps a small token bucket per key that
+only counts requests the store allowed from this worker. When that bucket is
+empty, or the store recently answered "retry after N seconds", the request is
+rejected locally without a store round trip, so hot clients cost nothing.
+
+Limits are named ("auth_login") and resolved at check time, so changes to
+RATE_LIMIT_OVERRIDES or the JSON file in RATE_LIMITS_FILE apply without a
+restart. Requests can be keyed by IP, user or tenant (hostel).
 """
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+import json
 import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
 
-logger = logging.getLogger(__name__)
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
 
-# Initialize rate limiter
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["1000/hour"],  # Default limit for all endpoints
-    storage_uri="memory://",  # Use Redis in production: "redis://localhost:6379"
-    strategy="fixed-window"
-)
+from app.config import settings
 
-# Custom rate limit exceeded handler
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
-    """
-    Custom handler for rate limit exceeded errors
-    Returns a JSON response with retry information
-    """
-    logger.warning(f"Rate limit exceeded for {get_remote_address(request)}: {exc}")
-    
-    return JSONResponse(
-        status_code=429,
-        content={
-            "error": "rate_limit_exceeded",
-            "message": "Too many requests. Please try again later.",
-            "detail": str(exc),
-            "retry_after": exc.detail if hasattr(exc, 'detail') else "60 seconds"
-        },
-        headers={
-            "Retry-After": "60"
-        }
-    )
+logger = logging.getLogger(__name__)
 
 # Rate limit configurations for different endpoint types
 RATE_LIMITS = {
@@ -54,22 +51,388 @@ RATE_LIMITS = {
     "public_api": "200/hour",           # Public API endpoints
     "admin_operations": "500/hour",     # Admin operations
 }
+DEFAULT_RATE_LIMIT = "100/hour"
+
+
+# ---------------------------------------------------------
+# LIMIT DEFINITIONS
+# ---------------------------------------------------------
+@dataclass(frozen=True)
+class RateLimit:
+    """`count` requests per `period` seconds"""
+    count: int
+    period: float
+
+    @property
+    def interval_ms(self) -> int:
+        """Emission interval: one request every `period / count`"""
+        return max(1, int(self.period * 1000 / self.count))
+
+    @property
+    def tolerance_ms(self) -> int:
+        """How far ahead of now the arrival time may run (the burst allowance)"""
+        return int(self.period * 1000) - self.interval_ms
+
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def parse_rate_limit(limit: str) -> RateLimit:
+    """Parse "5/minute", "100 per hour" or "10/30seconds" """
+    match = _LIMIT_PATTERN.match(limit)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid rate limit: {limit!r}")
+    count, multiplier, unit = match.groups()
+    return RateLimit(int(count), int(multiplier or 1) * _PERIODS[unit.lower()])
+
+
+class RateLimitRegistry:
+    """
+    Named limits. Lookup order: `update()` calls, the JSON file, the
+    RATE_LIMIT_OVERRIDES setting, then RATE_LIMITS.
+    """
+
+    def __init__(self, defaults: Dict[str, str], overrides: Optional[Dict[str, str]] = None,
+                 path: Optional[str] = None, reload_seconds: float = 5.0):
+        self.defaults = defaults
+        self.overrides = dict(overrides or {})
+        self._runtime: Dict[str, str] = {}
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._file_limits: Dict[str, str] = {}
+        self._file_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, limits: Dict[str, str]) -> None:
+        """Change limits at runtime; invalid definitions are rejected up front"""
+        for limit in limits.values():
+            parse_rate_limit(limit)
+        with self._lock:
+            self._runtime.update(limits)
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if not self.path or now - self._checked_at < self.reload_seconds:
+            return
+        with self._lock:
+            if now - self._checked_at < self.reload_seconds:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if mtime == self._file_mtime:
+                    return
+                with open(self.path) as handle:
+                    limits = json.load(handle)
+                for limit in limits.values():
+                    parse_rate_limit(limit)
+            except FileNotFoundError:
+                self._file_limits, self._file_mtime = {}, None
+                return
+            except (OSError, ValueError, AttributeError) as exc:
+                # Keep serving the last good limits
+                logger.warning("Ignoring rate limit file %s: %s", self.path, exc)
+                return
+            self._file_limits, self._file_mtime = limits, mtime
+            logger.info("Reloaded %d rate limits from %s", len(limits), self.path)
+
+    def get(self, name: str) -> str:
+        self._maybe_reload()
+        for source in (self._runtime, self._file_limits, self.overrides):
+            if name in source:
+                return source[name]
+        return self.defaults.get(name, DEFAULT_RATE_LIMIT)
+
+    def resolve(self, limit: str) -> RateLimit:
+        """Accept a limit name ("auth_login") or a literal limit ("5/minute")"""
+        try:
+            return parse_rate_limit(limit)
+        except ValueError:
+            return parse_rate_limit(self.get(limit))
+
+
+# ---------------------------------------------------------
+# STORES
+# ---------------------------------------------------------
+# KEYS[1]: arrival-time key; ARGV: emission interval, tolerance (ms)
+# Returns {allowed, retry_after_ms, remaining}
+GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+if tat - now > tolerance then
+    return {0, tat - now - tolerance, 0}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, 0, math.floor((tolerance + interval - (new_tat - now)) / interval)}
+"""
+
+
+class MemoryRateLimitStore:
+    """In-process GCRA store with the same semantics as the Redis script"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, int]:
+        now = int(time.time() * 1000)
+        interval, tolerance = limit.interval_ms, limit.tolerance_ms
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            if tat - now > tolerance:
+                return False, tat - now - tolerance, 0
+            new_tat = tat + interval
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+        return True, 0, (tolerance + interval - (new_tat - now)) // interval
+
+
+class RedisRateLimitStore:
+    """GCRA in Redis: one script call (EVALSHA) per check"""
+
+    def __init__(self, client, prefix: str = "hostel:rl:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, int]:
+        allowed, retry_after_ms, remaining = self._script(
+            keys=[self.prefix + key], args=[limit.interval_ms, limit.tolerance_ms]
+        )
+        return bool(allowed), int(retry_after_ms), int(remaining)
+
+
+# ---------------------------------------------------------
+# LIMITER
+# ---------------------------------------------------------
+class RateLimitExceeded(HTTPException):
+    def __init__(self, key: str, limit: RateLimit, retry_after: float):
+        self.key = key
+        self.limit = limit
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(
+            status_code=429,
+            detail=f"{limit.count} per {int(limit.period)} seconds",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+@dataclass
+class _LocalBucket:
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """Shared-store GCRA limiter with a per-worker token-bucket pre-check"""
+
+    def __init__(self, store, registry: RateLimitRegistry, local_keys: int = 10_000):
+        self.store = store
+        self.registry = registry
+        self.local_keys = local_keys
+        self._buckets: "OrderedDict[Tuple[str, RateLimit], _LocalBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"checks": 0, "allowed": 0, "rejected": 0, "local_rejections": 0,
+                       "store_calls": 0, "store_errors": 0}
+
+    def _local_check(self, key: str, limit: RateLimit, now: float) -> Optional[float]:
+        """Seconds to wait if this worker alone already used up the limit"""
+        bucket = self._buckets.get((key, limit))
+        if bucket is None:
+            return None
+        if now < bucket.blocked_until:
+            return bucket.blocked_until - now
+        rate = limit.count / limit.period
+        bucket.tokens = min(limit.count, bucket.tokens + (now - bucket.updated) * rate)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            return (1 - bucket.tokens) / rate
+        return None
+
+    def _local_record(self, key: str, limit: RateLimit, now: float, allowed: bool, retry_after: float) -> None:
+        bucket = self._buckets.get((key, limit))
+        if bucket is None:
+            bucket = self._buckets[(key, limit)] = _LocalBucket(tokens=limit.count, updated=now)
+            while len(self._buckets) > self.local_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end((key, limit))
+        if allowed:
+            bucket.tokens -= 1
+        else:
+            bucket.blocked_until = now + retry_after
+
+    def hit(self, limit: Union[str, RateLimit], key: str) -> Tuple[bool, float, int]:
+        """Count one request; returns (allowed, retry_after_seconds, remaining)"""
+        if isinstance(limit, str):
+            limit = self.registry.resolve(limit)
+        now = time.monotonic()
+        with self._lock:
+            self._stats["checks"] += 1
+            wait = self._local_check(key, limit, now)
+            if wait is not None:
+                self._stats["rejected"] += 1
+                self._stats["local_rejections"] += 1
+                return False, wait, 0
+            self._stats["store_calls"] += 1
+
+        try:
+            allowed, retry_after_ms, remaining = self.store.hit(key, limit)
+        except Exception as exc:
+            # A store outage must not take the API down with it
+            with self._lock:
+                self._stats["store_errors"] += 1
+            logger.warning("Rate limit store unavailable, allowing %s: %s", key, exc)
+            return True, 0.0, 0
+
+        with self._lock:
+            self._local_record(key, limit, now, allowed, retry_after_ms / 1000)
+            self._stats["allowed" if allowed else "rejected"] += 1
+        return allowed, retry_after_ms / 1000, remaining
+
+    def check(self, limit: Union[str, RateLimit], key: str) -> int:
+        """Count one request, raising RateLimitExceeded when over the limit; returns remaining"""
+        resolved = self.registry.resolve(limit) if isinstance(limit, str) else limit
+        allowed, retry_after, remaining = self.hit(resolved, key)
+        if not allowed:
+            raise RateLimitExceeded(key, resolved, retry_after)
+        return remaining
+
+    def info(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "backend": "redis" if isinstance(self.store, RedisRateLimitStore) else "memory",
+                "local_keys": len(self._buckets),
+                **self._stats,
+            }
+
+
+# ---------------------------------------------------------
+# GLOBAL INSTANCE
+# ---------------------------------------------------------
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def _build_limiter() -> RateLimiter:
+    store = None
+    if settings.REDIS_URL:
+        try:
+            import redis
+
+            store = RedisRateLimitStore(redis.Redis.from_url(settings.REDIS_URL), prefix=settings.RATE_LIMIT_KEY_PREFIX)
+        except Exception as exc:
+            logger.warning("Redis rate limit store disabled: %s", exc)
+    registry = RateLimitRegistry(
+        RATE_LIMITS,
+        overrides=settings.RATE_LIMIT_OVERRIDES,
+        path=settings.RATE_LIMITS_FILE,
+        reload_seconds=settings.RATE_LIMITS_RELOAD_SECONDS,
+    )
+    return RateLimiter(store or MemoryRateLimitStore(), registry, local_keys=settings.RATE_LIMIT_LOCAL_KEYS)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter, building it on first use"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = _build_limiter()
+    return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the process-wide limiter (tests, or to plug in another store)"""
+    global _limiter
+    _limiter = limiter
+
 
 def get_rate_limit(endpoint_type: str) -> str:
     """Get rate limit for specific endpoint type"""
-    return RATE_LIMITS.get(endpoint_type, "100/hour")
+    return get_rate_limiter().registry.get(endpoint_type)
+
+
+# ---------------------------------------------------------
+# REQUEST KEYS AND FASTAPI INTEGRATION
+# ---------------------------------------------------------
+def get_remote_address(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
 
-# Decorator for applying rate limits
-def rate_limit(limit: str):
+
+def _scope_key(request: Request, scope: str) -> str:
+    state = request.state
+    if scope == "user":
+        user_id = getattr(state, "user_id", None)
+        if user_id is not None:
+            return f"user:{user_id}"
+    elif scope == "tenant":
+        hostel_id = getattr(state, "active_hostel_id", None) or getattr(state, "hostel_id", None)
+        if hostel_id is not None:
+            return f"tenant:{hostel_id}"
+    elif scope != "ip":
+        raise ValueError(f"Unknown rate limit scope: {scope!r}")
+    # Anonymous requests (or no tenant) fall back to the client address
+    return f"ip:{get_remote_address(request)}"
+
+
+def rate_limit(limit: str, scope: Union[str, Sequence[str]] = "ip"):
     """
-    Decorator to apply rate limiting to endpoints
-    
+    Dependency applying a rate limit to an endpoint, per IP, user and/or
+    tenant. `limit` is a name from RATE_LIMITS or a literal like "5/minute".
+
     Usage:
-        @rate_limit("5/minute")
-        @router.post("/login")
+        @router.post("/login", dependencies=[Depends(rate_limit("auth_login"))])
         def login(...):
             ...
+
+        @router.post("/reviews", dependencies=[Depends(rate_limit("review_submission", scope=("user", "tenant")))])
     """
-    def decorator(func):
-        return limiter.limit(limit)(func)
-    return decorator
+    scopes = (scope,) if isinstance(scope, str) else tuple(scope)
+    for name in scopes:
+        if name not in ("ip", "user", "tenant"):
+            raise ValueError(f"Unknown rate limit scope: {name!r}")
+
+    def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        limiter = get_rate_limiter()
+        for name in scopes:
+            limiter.check(limit, f"{limit}:{_scope_key(request, name)}")
+
+    return dependency
+
+
+# Custom rate limit exceeded handler
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """
+    Custom handler for rate limit exceeded errors
+    Returns a JSON response with retry information
+    """
+    logger.warning(f"Rate limit exceeded for {exc.key} ({get_remote_address(request)}): {exc.detail}")
+
+    return JSONResponse(
+        status_code=429,
+        content={
+            "error": "rate_limit_exceeded",
+            "message": "Too many requests. Please try again later.",
+            "detail": exc.detail,
+            "retry_after": exc.retry_after,
+        },
+        headers={
+            "Retry-After": str(exc.retry_after)
+        }
+    )
@@ -1,7 +1,7 @@
 """
 Security utilities:
 - Safe bcrypt wrapper (handles >72 byte passwords)
-- Hash / verify
+- Hash / verify (sync, and async on a bounded worker pool)
 - JWT access + refresh tokens
 - Get current user
 """
@@ -19,6 +19,8 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.models.user import User
 from app.core.database import get_db
+from app.core.password_pool import HashingPool, HashingPoolFull
+from app.core.token_cache import get_cached_user, verified_tokens
 
 
 # ======================
@@ -29,10 +31,19 @@ class BcryptContext:
     """
     Custom bcrypt wrapper that safely handles long passwords.
     Anything >72 bytes is pre-hashed with SHA256 and tagged as `sha256$<digest>`.
+
+    `ahash` / `averify` run bcrypt on a bounded `HashingPool` so async routes
+    never block the event loop. The cost factor comes from BCRYPT_ROUNDS;
+    `needs_rehash` reports hashes made with a different cost so logins can
+    upgrade them transparently.
     """
 
-    def __init__(self):
+    def __init__(self, rounds: Optional[int] = None, pool: Optional[HashingPool] = None):
         self._bcrypt = bcrypt
+        self.rounds = rounds or settings.BCRYPT_ROUNDS
+        self.pool = pool or HashingPool(
+            max_workers=settings.BCRYPT_MAX_WORKERS, max_queue=settings.BCRYPT_MAX_QUEUE
+        )
 
     def _prepare(self, raw: str) -> bytes:
         raw_bytes = raw.encode("utf-8")
@@ -43,16 +54,37 @@ class BcryptContext:
 
     def hash(self, password: str) -> str:
         prepared = self._prepare(password)
-        hashed = self._bcrypt.hashpw(prepared, self._bcrypt.gensalt())
+        hashed = self._bcrypt.hashpw(prepared, self._bcrypt.gensalt(rounds=self.rounds))
         return hashed.decode("utf-8")
 
     def verify(self, plain: str, hashed: str) -> bool:
         try:
             prepared = self._prepare(plain)
-            return self._bcrypt.checkpw(prepared, hashed.encode("utf-8"))
+            if self._bcrypt.checkpw(prepared, hashed.encode("utf-8")):
+                return True
+            raw_bytes = plain.encode("utf-8")
+            if len(raw_bytes) > 72:
+                # Hashes made by auth_service before it shared this context
+                # truncated long passwords to bcrypt's 72-byte limit
+                return self._bcrypt.checkpw(raw_bytes[:72], hashed.encode("utf-8"))
+            return False
         except Exception:
             return False
 
+    def needs_rehash(self, hashed: Optional[str]) -> bool:
+        """True when `hashed` was made with a cost other than the configured one"""
+        try:
+            _, _, cost, _ = hashed.split("$", 3)
+            return int(cost) != self.rounds
+        except (AttributeError, ValueError):
+            return False
+
+    async def ahash(self, password: str) -> str:
+        return await self.pool.run(self.hash, password)
+
+    async def averify(self, plain: str, hashed: str) -> bool:
+        return await self.pool.run(self.verify, plain, hashed)
+
 
 pwd_context = BcryptContext()
 
@@ -69,6 +101,41 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def aget_password_hash(password: str) -> str:
+    return await pwd_context.ahash(password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await pwd_context.averify(plain_password, hashed_password)
+
+
+async def averify_and_upgrade(db: Session, user: User, plain_password: str) -> bool:
+    """
+    Verify a login password off the event loop. On success, re-hash it with
+    the current BCRYPT_ROUNDS when the stored hash used another cost; the
+    caller's commit persists the new hash.
+    """
+    try:
+        valid = await pwd_context.averify(plain_password, user.hashed_password)
+    except HashingPoolFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-ins, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    if valid and pwd_context.needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await pwd_context.ahash(plain_password)
+            db.add(user)
+        except HashingPoolFull:
+            pass  # upgrade on a later login
+    return valid
+
+
+def password_pool_stats() -> dict:
+    return {"rounds": pwd_context.rounds, **pwd_context.pool.stats()}
+
+
 # ======================
 #  JWT TOKENS
 # ======================
@@ -80,6 +147,9 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+ACCESS_TOKEN_TYPE = "access"
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
 
@@ -87,7 +157,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expires_delta if expires_delta else timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": ACCESS_TOKEN_TYPE})
 
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
@@ -102,20 +172,33 @@ def create_refresh_token(data: dict) -> str:
 
 
 def decode_token(token: str) -> dict:
+    """Claims of a valid access token; refresh tokens and other signed
+    claims are rejected"""
+    # Signature already verified and not yet expired: reuse the claims
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return dict(claims)
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
+    if claims.get("type") != ACCESS_TOKEN_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+    verified_tokens.put(token, claims)
+    return dict(claims)
 
 
 # ======================
 #  CURRENT USER
 # ======================
 
-async def get_current_user(
+def get_current_user(
     request: Request,
     token: Optional[str] = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -145,6 +228,12 @@ async def get_current_user(
             detail="Invalid credentials"
         )
 
+    if payload.get("type") != ACCESS_TOKEN_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+
     raw_sub = payload.get("sub")
     if raw_sub is None:
         raise HTTPException(
@@ -160,7 +249,7 @@ async def get_current_user(
             detail="Invalid token subject"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = get_cached_user(db, user_id)
 
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
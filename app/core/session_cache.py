@@ -0,0 +1,169 @@
+"""
+Active hostel session cache.
+
+The tenant filter needs the admin's active hostel on every request. It is
+resolved, cheapest first, from:
+ - a signed short-lived "active hostel" claim the client echoes back in the
+   X-Active-Hostel-Token header (minted when the session is switched)
+ - a per-worker cache keyed by user_id with a short TTL
+ - the session_contexts table
+
+SessionService invalidates the cache entry when a session is switched or
+cleared; the TTL bounds staleness on other workers.
+
+The claim is not an access token: it is signed with its own key (derived
+from SECRET_KEY unless ACTIVE_HOSTEL_CLAIM_SECRET is set) and audience, so
+`decode_token` can never accept it. It also carries a per-user version kept
+in the application cache; `invalidate_active_session` (hostel switch,
+session cleared, hostel unassigned, admin deactivated, logout) drops the
+version, which voids every claim minted before it.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple, Union
+
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.core.cache import MISSING as CACHE_MISSING, get_cache
+
+ACTIVE_HOSTEL_CLAIM_HEADER = "X-Active-Hostel-Token"
+ACTIVE_HOSTEL_CLAIM_TYPE = "active_hostel"
+ACTIVE_HOSTEL_CLAIM_AUDIENCE = "active-hostel"
+
+# Returned by cache lookups on a miss (None means "no active session")
+MISSING = object()
+
+UserId = Union[int, str]
+
+
+class ActiveSessionCache:
+    """user_id -> active hostel_id (None = no active session), with TTL"""
+
+    def __init__(self, ttl: int = 30, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Optional[int], float]] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "claim_hits": 0,
+            "cache_hits": 0,
+            "db_lookups": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, user_id: UserId):
+        """Cached hostel_id (possibly None), or MISSING"""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            hostel_id, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._counters["cache_hits"] += 1
+            return hostel_id
+
+    def set(self, user_id: UserId, hostel_id: Optional[int]) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict_expired()
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[str(user_id)] = (hostel_id, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: UserId) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+            self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot["size"] = len(self._entries)
+        snapshot["ttl"] = self.ttl
+        snapshot["lookups_saved"] = snapshot["claim_hits"] + snapshot["cache_hits"]
+        total = snapshot["lookups_saved"] + snapshot["db_lookups"]
+        snapshot["saved_ratio"] = round(snapshot["lookups_saved"] / total, 4) if total else 0.0
+        return snapshot
+
+
+active_session_cache = ActiveSessionCache(ttl=settings.ACTIVE_SESSION_CACHE_TTL)
+
+
+def invalidate_active_session(user_id: UserId) -> None:
+    """Forget the cached active hostel and void the user's outstanding claims"""
+    active_session_cache.invalidate(user_id)
+    get_cache().delete(_claim_version_key(user_id))
+
+
+# ---------------------------------------------------------
+# SIGNED ACTIVE HOSTEL CLAIM
+# ---------------------------------------------------------
+def _claim_key() -> str:
+    if settings.ACTIVE_HOSTEL_CLAIM_SECRET:
+        return settings.ACTIVE_HOSTEL_CLAIM_SECRET
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), b"active-hostel-claim", hashlib.sha256).hexdigest()
+
+
+def _claim_version_key(user_id: UserId) -> str:
+    return f"session:claim_version:{user_id}"
+
+
+def create_active_hostel_claim(user_id: UserId, hostel_id: int) -> str:
+    """Short-lived signed claim binding `user_id` to its active `hostel_id`"""
+    cache = get_cache()
+    version = cache.get(_claim_version_key(user_id))
+    if version is CACHE_MISSING:
+        version = secrets.token_hex(8)
+    # Kept as long as the newest claim that carries it
+    cache.set(_claim_version_key(user_id), version, ttl=settings.ACTIVE_HOSTEL_CLAIM_TTL)
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.ACTIVE_HOSTEL_CLAIM_TTL)
+    return jwt.encode(
+        {"sub": str(user_id), "hostel_id": hostel_id, "type": ACTIVE_HOSTEL_CLAIM_TYPE, "ver": version,
+         "aud": ACTIVE_HOSTEL_CLAIM_AUDIENCE, "exp": expire},
+        _claim_key(),
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def read_active_hostel_claim(token: Optional[str], user_id: UserId) -> Optional[int]:
+    """hostel_id from a valid claim issued to `user_id`, else None"""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, _claim_key(), algorithms=[settings.ALGORITHM],
+                             audience=ACTIVE_HOSTEL_CLAIM_AUDIENCE)
+    except JWTError:
+        return None
+    if payload.get("type") != ACTIVE_HOSTEL_CLAIM_TYPE or payload.get("sub") != str(user_id):
+        return None
+    # Voided by a switch / deactivation since it was minted (or unknown here)
+    version = get_cache().get(_claim_version_key(user_id))
+    if version is CACHE_MISSING or payload.get("ver") != version:
+        return None
+    hostel_id = payload.get("hostel_id")
+    if isinstance(hostel_id, int):
+        active_session_cache.record("claim_hits")
+        return hostel_id
+    return None
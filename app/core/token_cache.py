@@ -0,0 +1,162 @@
+"""
+Caches for request authentication.
+
+ - Verified token claims: a bounded per-worker LRU keyed by the SHA-256 of
+   the JWT, each entry expiring at the token's own `exp`, so a token's
+   signature is verified once rather than on every request (and twice when
+   both the security pipeline and `get_current_user` decode it).
+ - Resolved users: the `users` row columns, kept for USER_CACHE_TTL seconds
+   in the application cache under the "users" tag, so any committed write to
+   `users` evicts them. `get_current_user` re-attaches the cached row to the
+   request session without a SELECT. Secret columns (the password hash) are
+   never cached, since the cache may be a shared Redis; the few callers that
+   need them load them from the database on first access.
+
+`revoke_user_tokens(user_id)` drops both for a user, and voids the user's
+active-hostel claims; refresh-token revocation, logout and admin
+deactivation call it.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.core.cache import MISSING, get_cache
+from app.core.session_cache import invalidate_active_session
+from app.models.user import User
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """LRU of verified JWT claims; entries expire at the token's `exp`"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_subject: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "revocations": 0}
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = token_key(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                self._counters["misses"] += 1
+                return None
+            if claims["exp"] <= time.time():
+                self._remove(key)
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        if not isinstance(claims.get("exp"), (int, float)):
+            return  # only tokens that expire are cached
+        key = token_key(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            subject = claims.get("sub")
+            if subject is not None:
+                self._by_subject.setdefault(str(subject), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def revoke_token(self, token: str) -> None:
+        with self._lock:
+            self._remove(token_key(token))
+            self._counters["revocations"] += 1
+
+    def revoke_subject(self, subject: Any) -> int:
+        with self._lock:
+            keys = self._by_subject.pop(str(subject), set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self._counters["revocations"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def _remove(self, key: str) -> None:
+        claims = self._entries.pop(key, None)
+        if claims is not None and claims.get("sub") is not None:
+            keys = self._by_subject.get(str(claims["sub"]))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_subject[str(claims["sub"])]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot["size"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        return snapshot
+
+
+verified_tokens = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+# ---------------------------------------------------------
+# RESOLVED USERS
+# ---------------------------------------------------------
+# Columns kept out of the (possibly shared) cache
+UNCACHED_USER_COLUMNS = frozenset({"hashed_password"})
+
+
+def _user_key(user_id: int) -> str:
+    return f"auth:user:{user_id}"
+
+
+def _user_columns(user: User) -> Dict[str, Any]:
+    return {
+        attr.key: getattr(user, attr.key)
+        for attr in sa_inspect(User).column_attrs if attr.key not in UNCACHED_USER_COLUMNS
+    }
+
+
+def get_cached_user(db: Session, user_id: int) -> Optional[User]:
+    """The user row for `user_id`, from the cache when fresh, else the database"""
+    if settings.CACHE_ENABLED and settings.USER_CACHE_TTL > 0:
+        columns = get_cache().get(_user_key(user_id))
+        if columns is not MISSING:
+            user = User(**columns)
+            make_transient_to_detached(user)
+            # Attach to the request session without a SELECT
+            return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None and settings.CACHE_ENABLED and settings.USER_CACHE_TTL > 0:
+        get_cache().set(_user_key(user_id), _user_columns(user), ttl=settings.USER_CACHE_TTL, tags=("users",))
+    return user
+
+
+def revoke_user_tokens(user_id: Any) -> None:
+    """Forget cached claims and the cached row for a user (logout / revocation)"""
+    verified_tokens.revoke_subject(user_id)
+    invalidate_active_session(user_id)
+    try:
+        get_cache().delete(_user_key(int(user_id)))
+    except (TypeError, ValueError):
+        pass
+
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {"verified_tokens": verified_tokens.stats()}
@@ -14,9 +14,20 @@ from app.config import settings
 from app.core.logger import setup_logger
 from app.core.database import init_db
 from app.core.elasticsearch import init_elasticsearch_indices
+from app.services.hostel_search import get_search_sync, shutdown_search_sync
 
 from app.services.booking_expiry_service import BookingExpiryService
 from app.core.database import SessionLocal
+from app.core.async_database import dispose_async_engine
+from app.core.audit_pipeline import shutdown_audit_pipeline
+from app.core.security import pwd_context
+from app.services.push_broadcast import shutdown_broadcast_engine
+from app.services.sms_dispatch import shutdown_sms_dispatcher
+from app.services.email_outbox import get_email_outbox, shutdown_email_outbox
+from app.services.student_import import get_student_importer, shutdown_student_importer
+from app.core.session_cache import ACTIVE_HOSTEL_CLAIM_HEADER
+from app.core.pagination import PAGE_HEADERS
+from app.core.rate_limiter import RateLimitExceeded, rate_limit_exceeded_handler
 
 
 
@@ -37,6 +48,7 @@ from app.api.v1.supervisor.auth import router as supervisor_auth_router
 # Visitor Routers
 from app.api.v1.visitor.bookings import router as visitor_booking_router
 from app.api.v1.visitor.public_comparison import router as visitor_compare_router
+from app.api.v1.visitor.booking_calendar import router as visitor_calendar_router
 
 #  MISSING FROM YOUR OFFICIAL MAIN — NOW ADDED
 from app.api.v1.visitor import auth_router, booking_router, payment_routers, simple_payment_router
@@ -81,16 +93,13 @@ app = FastAPI(
 )
 
 # after app = FastAPI(...)
-from app.middleware.authentication import authentication_middleware
-from app.middleware.tenant_filter import tenant_filter_middleware
-from app.middleware.role_enforcer import role_enforcer_middleware
-from app.middleware.audit_trail import audit_trail_middleware
+from app.middleware.security_pipeline import SecurityPipelineMiddleware
 
-# register function-style middlewares in order:
-app.middleware("http")(authentication_middleware)
-app.middleware("http")(tenant_filter_middleware)
-app.middleware("http")(role_enforcer_middleware)
-app.middleware("http")(audit_trail_middleware)
+# auth -> tenant -> role -> audit, in one ASGI middleware
+app.add_middleware(SecurityPipelineMiddleware)
+
+# 429 with Retry-After for endpoints using core.rate_limiter.rate_limit
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 
 
@@ -103,6 +112,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[ACTIVE_HOSTEL_CLAIM_HEADER, *PAGE_HEADERS],
 )
 
 
@@ -156,14 +166,37 @@ async def startup_event():
     logger.info("Initializing Elasticsearch...")
     init_elasticsearch_indices()
     logger.info("Elasticsearch ready.")
+    if settings.ELASTICSEARCH_URL:
+        # Keep the hostel index in step with hostel / room / review writes
+        get_search_sync()
 
     #  Start expiry service
     expiry = BookingExpiryService(SessionLocal)
     expiry.start()
 
+    #  Deliver emails left in the outbox by the previous run
+    if settings.EMAIL_OUTBOX_ENABLED:
+        get_email_outbox()
+
+    #  Continue student imports interrupted by the previous run
+    get_student_importer().resume_interrupted()
+
     #  Start Notification Worker
     logger.info("Notification worker started.")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Write out audit rows still buffered in memory
+    shutdown_audit_pipeline()
+    pwd_context.pool.shutdown(wait=False)
+    shutdown_broadcast_engine(wait=False)
+    shutdown_sms_dispatcher()
+    shutdown_email_outbox()
+    shutdown_student_importer(wait=False)
+    shutdown_search_sync()
+    await dispose_async_engine()
+
 # ---------------------------------------------------------------------------
 # ROUTERS
 # ---------------------------------------------------------------------------
@@ -190,6 +223,7 @@ app.include_router(simple_payment_router.router, prefix="/api/v1/simple-payments
 # Additional routers
 app.include_router(visitor_booking_router)
 app.include_router(visitor_compare_router)
+app.include_router(visitor_calendar_router)
 app.include_router(admin_booking_router)
 app.include_router(admin_modify_booking_router)
 app.include_router(calendar_router)
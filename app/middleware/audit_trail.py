@@ -49,14 +49,15 @@
 
 """
 Audit trail middleware (function-style).
-Logs non-GET admin/supervisor actions. Failures are logged but do not block requests.
+Logs non-GET admin/supervisor actions through the buffered audit pipeline,
+so the request never waits on the audit insert. Failures are logged but do
+not block requests.
 """
 
 from fastapi import Request
 from typing import Callable
 from app.core.roles import Role
-from app.repositories.audit_repository import AuditRepository
-from app.core.database import get_db
+from app.core.audit_pipeline import submit_audit
 from starlette.responses import JSONResponse
 
 
@@ -75,39 +76,39 @@ def _is_public(path: str) -> bool:
     return False
 
 
-async def audit_trail_middleware(request: Request, call_next: Callable):
-    path = request.url.path
-
-    if _is_public(path):
-        return await call_next(request)
-
+def record_audit(request: Request) -> None:
+    """Queue an audit row for non-GET admin/supervisor/superadmin requests"""
     if not hasattr(request.state, "user_id"):
-        return await call_next(request)
+        return
 
     user_role = getattr(request.state, "user_role", None)
     if user_role not in [Role.ADMIN, Role.SUPERVISOR, Role.SUPERADMIN]:
-        return await call_next(request)
+        return
 
     # Optionally skip GETs
     if request.method == "GET":
-        return await call_next(request)
+        return
 
-    # Non-blocking audit log
+    # Non-blocking audit log (queued; written in batches by the pipeline)
     try:
-        db = next(get_db())
-        audit_repo = AuditRepository(db)
-        audit_repo.create_audit_log(
-            user_id=getattr(request.state, "user_id", None),
-            action=request.method,
-            resource=str(request.url.path),
-            hostel_id=getattr(request.state, "active_hostel_id", None),
-            ip_address=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent"),
-        )
+        submit_audit({
+            "user_id": getattr(request.state, "user_id", None),
+            "action": request.method,
+            "resource": str(request.url.path),
+            "hostel_id": getattr(request.state, "active_hostel_id", None),
+            "ip_address": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+        }, block=False)
     except Exception as e:
         # Log the error (print for now)
         print(f"Audit logging failed: {e}")
 
-    return await call_next(request)
 
+async def audit_trail_middleware(request: Request, call_next: Callable):
+    path = request.url.path
+
+    if _is_public(path):
+        return await call_next(request)
 
+    record_audit(request)
+    return await call_next(request)
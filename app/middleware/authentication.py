@@ -78,7 +78,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.security import decode_token
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_401_UNAUTHORIZED
-from typing import Callable
+from typing import Callable, Optional
 
 
 class AuthenticationMiddleware(BaseHTTPMiddleware):
@@ -93,7 +93,7 @@ PUBLIC_EXACT = {
     "/api/v1/auth/register",
     "/api/v1/auth/verify-otp",
     "/api/v1/auth/resend-otp",
-    "/api/v1/auth/logout"
+    "/api/v1/auth/logout",
     "/api/v1/auth/refresh",
     "/api/v1/auth/forgot-password",
     "/api/v1/auth/verify-reset-code",
@@ -117,13 +117,11 @@ def is_public(path: str) -> bool:
     return False
 
 
-async def authentication_middleware(request: Request, call_next: Callable):
-    path = request.url.path
-
-    # Skip auth for public paths
-    if is_public(path):
-        return await call_next(request)
+def authenticate(request: Request) -> Optional[JSONResponse]:
+    """Verify the bearer token and attach user info to request.state.
 
+    Returns the 401 response to send when the token is missing or invalid.
+    """
     # Validate Authorization header
     authorization = request.headers.get("Authorization")
     if not authorization or not authorization.startswith("Bearer "):
@@ -149,5 +147,19 @@ async def authentication_middleware(request: Request, call_next: Callable):
         code = getattr(exc, "status_code", HTTP_401_UNAUTHORIZED)
         return JSONResponse({"detail": msg}, status_code=code)
 
+    return None
+
+
+async def authentication_middleware(request: Request, call_next: Callable):
+    path = request.url.path
+
+    # Skip auth for public paths
+    if is_public(path):
+        return await call_next(request)
+
+    denied = authenticate(request)
+    if denied is not None:
+        return denied
+
     # Auth ok -> continue
-    return await call_next(request)
\ No newline at end of file
+    return await call_next(request)
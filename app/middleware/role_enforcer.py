@@ -38,8 +38,9 @@ Returns 403 JSON response for access violations (does not raise).
 from fastapi import Request
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_403_FORBIDDEN
-from typing import Callable
+from typing import Callable, Optional
 from app.core.roles import Role
+from app.middleware.route_classifier import RouteZone, classify_route
 
 
 PUBLIC_PREFIXES = (
@@ -57,26 +58,39 @@ def _is_public(path: str) -> bool:
     return False
 
 
-async def role_enforcer_middleware(request: Request, call_next: Callable):
-    path = request.url.path
+# Coarse role gate per route zone; routes still check exact roles with role_required
+# (e.g. /api/v1/supervisor/permissions is for admins).
+ZONE_ROLES = {
+    RouteZone.ADMIN: ((Role.ADMIN, Role.SUPERADMIN), "Admin access required"),
+    RouteZone.SUPERVISOR: ((Role.SUPERVISOR, Role.ADMIN, Role.SUPERADMIN), "Supervisor access required"),
+}
 
-    if _is_public(path):
-        return await call_next(request)
 
+def enforce_role(request: Request, zone: Optional[RouteZone] = None) -> Optional[JSONResponse]:
+    """Return the 403 response for access violations, None if allowed"""
     # If unauthenticated, skip enforcement (authentication middleware should run earlier)
     if not hasattr(request.state, "user_role"):
-        return await call_next(request)
+        return None
+
+    if zone is None:
+        zone = classify_route(request.url.path)
+    rule = ZONE_ROLES.get(zone)
+    if rule is not None:
+        allowed_roles, detail = rule
+        if request.state.user_role not in allowed_roles:
+            return JSONResponse({"detail": detail}, status_code=HTTP_403_FORBIDDEN)
 
-    user_role = request.state.user_role
+    return None
 
-    # Admin endpoints
-    if path.startswith("/api/v1/admin"):
-        if user_role not in [Role.ADMIN, Role.SUPERADMIN]:
-            return JSONResponse({"detail": "Admin access required"}, status_code=HTTP_403_FORBIDDEN)
 
-    # Supervisor endpoints
-    if path.startswith("/api/v1/supervisor"):
-        if user_role != Role.SUPERVISOR:
-            return JSONResponse({"detail": "Supervisor access required"}, status_code=HTTP_403_FORBIDDEN)
+async def role_enforcer_middleware(request: Request, call_next: Callable):
+    path = request.url.path
+
+    if _is_public(path):
+        return await call_next(request)
+
+    denied = enforce_role(request)
+    if denied is not None:
+        return denied
 
     return await call_next(request)
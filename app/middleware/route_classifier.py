@@ -0,0 +1,80 @@
+"""
+Route classification for the security pipeline.
+
+Paths are classified once per request into a zone (public, admin, supervisor,
+student or protected) by a prefix trie compiled at import time from the
+public route lists, instead of each middleware re-scanning its own prefixes.
+"""
+
+from enum import Enum
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.middleware.authentication import PUBLIC_EXACT, PUBLIC_PREFIXES
+
+
+class RouteZone(str, Enum):
+    PUBLIC = "public"
+    ADMIN = "admin"
+    SUPERVISOR = "supervisor"
+    STUDENT = "student"
+    PROTECTED = "protected"  # authenticated, no role zone
+
+
+ZONE_PREFIXES: Dict[str, RouteZone] = {
+    "/api/v1/admin": RouteZone.ADMIN,
+    "/api/v1/supervisor": RouteZone.SUPERVISOR,
+    "/api/v1/student": RouteZone.STUDENT,
+}
+
+_EXACT = "\x00exact"
+_PREFIX = "\x00prefix"
+
+
+class PrefixTrie:
+    """Character trie answering "longest registered prefix (or exact path) of `path`" """
+
+    def __init__(self):
+        self._root: dict = {}
+
+    def add(self, key: str, value, exact: bool = False) -> None:
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[_EXACT if exact else _PREFIX] = value
+
+    def match(self, path: str, default=None):
+        node = self._root
+        found = node.get(_PREFIX, default)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return found
+            if _PREFIX in node:
+                found = node[_PREFIX]
+        return node.get(_EXACT, found)
+
+
+class RouteClassifier:
+    def __init__(
+        self,
+        public_exact: Iterable[str],
+        public_prefixes: Iterable[str],
+        zone_prefixes: Optional[Dict[str, RouteZone]] = None,
+    ):
+        self._trie = PrefixTrie()
+        for prefix, zone in (zone_prefixes or ZONE_PREFIXES).items():
+            self._trie.add(prefix, zone)
+        for prefix in public_prefixes:
+            self._trie.add(prefix, RouteZone.PUBLIC)
+        for path in public_exact:
+            self._trie.add(path, RouteZone.PUBLIC, exact=True)
+
+    def classify(self, path: str) -> RouteZone:
+        return self._trie.match(path, RouteZone.PROTECTED)
+
+
+route_classifier = RouteClassifier(PUBLIC_EXACT, PUBLIC_PREFIXES)
+
+
+def classify_route(path: str) -> RouteZone:
+    return route_classifier.classify(path)
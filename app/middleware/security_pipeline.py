@@ -0,0 +1,53 @@
+"""
+Security pipeline (pure ASGI).
+
+Replaces the four function-style middlewares (authentication, tenant filter,
+role enforcer, audit trail) with one ASGI middleware. The route is classified
+once via the precompiled trie in `route_classifier`, then the stages run
+in-line, in order:
+
+    auth -> tenant -> role -> audit -> app
+
+There is no per-layer BaseHTTPMiddleware wrapper, so responses stream straight
+through without extra tasks or body buffering.
+"""
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.audit_trail import record_audit
+from app.middleware.authentication import authenticate
+from app.middleware.role_enforcer import enforce_role
+from app.middleware.route_classifier import RouteClassifier, RouteZone, route_classifier
+from app.middleware.tenant_filter import apply_tenant_filter
+
+
+class SecurityPipelineMiddleware:
+    def __init__(self, app: ASGIApp, classifier: RouteClassifier = route_classifier):
+        self.app = app
+        self.classifier = classifier
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        zone = self.classifier.classify(scope["path"])
+        if zone is RouteZone.PUBLIC:
+            await self.app(scope, receive, send)
+            return
+
+        # Shares scope["state"] with the Request objects the routes see
+        request = Request(scope)
+        request.state.route_zone = zone
+
+        denied = authenticate(request)
+        if denied is None:
+            await apply_tenant_filter(request)
+            denied = enforce_role(request, zone)
+        if denied is not None:
+            await denied(scope, receive, send)
+            return
+
+        record_audit(request)
+        await self.app(scope, receive, send)
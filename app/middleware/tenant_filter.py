@@ -58,13 +58,20 @@
 """
 Tenant filter middleware (function-style).
 Sets request.state.active_hostel_id and request.state.bypass_tenant_filter.
+The admin's active hostel comes from a signed claim header or the active
+session cache; the database is only read on a cache miss.
 """
 
 from fastapi import Request
-from typing import Callable
+from fastapi.concurrency import run_in_threadpool
+from typing import Callable, Optional
 from app.core.roles import Role
 from app.core.database import SessionLocal
 from app.repositories.session_repository import SessionRepository
+from app.core.cache import set_cache_tenant
+from app.core.session_cache import (
+    ACTIVE_HOSTEL_CLAIM_HEADER, active_session_cache, read_active_hostel_claim, MISSING,
+)
 
 
 PUBLIC_PREFIXES = (
@@ -83,16 +90,37 @@ def _is_public(path: str) -> bool:
     return False
 
 
-async def tenant_filter_middleware(request: Request, call_next: Callable):
-    path = request.url.path
+def _load_active_hostel_id(user_id) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        active_session = SessionRepository(db).get_active_session(user_id)
+        return active_session.hostel_id if active_session else None
+    finally:
+        db.close()
+
+
+async def _resolve_active_hostel_id(request: Request, user_id) -> Optional[int]:
+    hostel_id = read_active_hostel_claim(request.headers.get(ACTIVE_HOSTEL_CLAIM_HEADER), user_id)
+    if hostel_id is not None:
+        return hostel_id
+
+    hostel_id = active_session_cache.get(user_id)
+    if hostel_id is not MISSING:
+        return hostel_id
+
+    active_session_cache.record("db_lookups")
+    hostel_id = await run_in_threadpool(_load_active_hostel_id, user_id)
+    active_session_cache.set(user_id, hostel_id)
+    return hostel_id
 
-    if _is_public(path):
-        return await call_next(request)
 
+async def apply_tenant_filter(request: Request) -> None:
+    """Set the active hostel / superadmin bypass on request.state and the cache tenant"""
     # Superadmin bypass
     if hasattr(request.state, "user_role") and request.state.user_role == Role.SUPERADMIN:
         request.state.bypass_tenant_filter = True
-        return await call_next(request)
+        set_cache_tenant("all")
+        return
 
     active_hostel_id = None
     if hasattr(request.state, "user_id") and hasattr(request.state, "user_role"):
@@ -101,19 +129,10 @@ async def tenant_filter_middleware(request: Request, call_next: Callable):
 
         if user_role in [Role.ADMIN, Role.SUPERADMIN]:
             try:
-                db = SessionLocal()
-                session_repo = SessionRepository(db)
-                active_session = session_repo.get_active_session(user_id)
-                if active_session:
-                    active_hostel_id = active_session.hostel_id
+                active_hostel_id = await _resolve_active_hostel_id(request, user_id)
             except Exception:
                 # Don't fail request because of tenant lookup failure
                 pass
-            finally:
-                try:
-                    db.close()
-                except Exception:
-                    pass
 
     # Fallback to token hostel_id
     if not active_hostel_id and hasattr(request.state, "hostel_id") and request.state.hostel_id:
@@ -129,7 +148,14 @@ async def tenant_filter_middleware(request: Request, call_next: Callable):
 
     if active_hostel_id:
         request.state.active_hostel_id = active_hostel_id
+    set_cache_tenant(active_hostel_id)
 
-    return await call_next(request)
 
+async def tenant_filter_middleware(request: Request, call_next: Callable):
+    path = request.url.path
+
+    if _is_public(path):
+        return await call_next(request)
 
+    await apply_tenant_filter(request)
+    return await call_next(request)
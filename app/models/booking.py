@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -40,6 +40,11 @@ class Booking(Base):
     # relationship to room (used by services)
     room = relationship("Room", back_populates="bookings")
 
+    # The expiry sweep reads stale pending bookings by (status, created_at)
+    __table_args__ = (
+        Index("ix_bookings_status_created_at", "status", "created_at"),
+    )
+
 
 class BookingRequest(Base):
     __tablename__ = "booking_requests"
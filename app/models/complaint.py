@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Float, Boolean, ForeignKey, Index
 from datetime import datetime
 import enum
 from app.core.database import Base
@@ -38,6 +38,11 @@ class ComplaintStatus(str, enum.Enum):
 # ---------------------------------------------------------------------
 class Complaint(Base):
     __tablename__ = "complaints"
+    __table_args__ = (
+        # complaint statistics filter by hostel / assignee over a date range
+        Index("ix_complaints_hostel_name_created_at", "hostel_name", "created_at"),
+        Index("ix_complaints_assigned_to_email_created_at", "assigned_to_email", "created_at"),
+    )
  
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -90,6 +95,19 @@ class Complaint(Base):
     attachments = relationship("ComplaintAttachment", back_populates="complaint", cascade="all, delete-orphan")
     notes = relationship("ComplaintNote", back_populates="complaint", cascade="all, delete-orphan")
  
+    # Properties for compatibility with supervisor routes
+    @property
+    def complaint_title(self):
+        return self.title
+ 
+    @property
+    def complaint_category(self):
+        return self.category
+ 
+    @property
+    def user_id(self):
+        return self.student_id
+ 
  
  
 # ---------------------------------------------------------------------
@@ -40,6 +40,8 @@ class Hostel(Base):
     full_address = Column(Text, nullable=True)
     city = Column(String(100), nullable=True)
     pincode = Column(String(20), nullable=True)
+    latitude = Column(Numeric(9, 6), nullable=True)
+    longitude = Column(Numeric(9, 6), nullable=True)
 
     # ---------------------------------------------------
     # Metadata / Details
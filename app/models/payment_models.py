@@ -101,7 +101,7 @@ class Refund(Base):
 # app/models/payment_models.py
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Text, Boolean,
-    ForeignKey, Enum as SQLEnum
+    ForeignKey, Index, Enum as SQLEnum
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -150,6 +150,17 @@ class Invoice(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Reminder state; next_reminder_at is when the reminder job next needs to
+    # look at this invoice (NULL = never, e.g. paid or out of reminders)
+    reminder_count = Column(Integer, default=0, nullable=False)
+    last_reminder_sent = Column(DateTime, nullable=True)
+    escalation_level = Column(Integer, default=0, nullable=False)
+    next_reminder_at = Column(DateTime, default=datetime.utcnow, nullable=True)
+
+    __table_args__ = (
+        Index("ix_invoices_next_reminder_at_id", "next_reminder_at", "id"),
+    )
+
     # ✅ Relationships
     transactions = relationship(
         "Transaction", back_populates="invoice", cascade="all, delete-orphan"
@@ -98,6 +98,7 @@ class NotificationLog(Base):
     __tablename__ = "notification_logs"
 
     id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(Integer, nullable=True, index=True)
     user_id = Column(Integer)
     user_role = Column(SQLEnum(UserRole))
     hostel_id = Column(Integer, nullable=True)
@@ -133,6 +134,7 @@ class NotificationBatch(Base):
     failed_count = Column(Integer, default=0)
     delivered_count = Column(Integer, default=0)
     read_count = Column(Integer, default=0)
+    status = Column(String, default="queued")  # queued / running / completed / failed
     created_by = Column(Integer)
     created_by_role = Column(SQLEnum(UserRole))
     created_at = Column(DateTime, default=datetime.utcnow)
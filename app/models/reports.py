@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Boolean, Text, ForeignKey, UniqueConstraint
 from datetime import datetime
 from app.core.database import Base
 
@@ -50,6 +50,18 @@ class FinancialTransaction(Base):
     payment_status = Column(String(50), default='pending')
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class OccupancySnapshot(Base):
+    __tablename__ = "hostel_occupancy_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    hostel_id = Column(Integer, nullable=False, index=True)
+    snapshot_date = Column(Date, nullable=False, index=True)
+    occupied_beds = Column(Integer, nullable=False, default=0)
+    total_beds = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (UniqueConstraint('hostel_id', 'snapshot_date', name='unique_hostel_snapshot_date'),)
+
 class HostelBooking(Base):
     __tablename__ = "hostel_bookings"
     
@@ -79,6 +79,9 @@ class PaymentReminders(Base):
     due_date = Column(DateTime)
     invoice_number = Column(String, unique=True, index=True)
     reminder_sent = Column(Boolean, default=False)
+    # Set while the reminder sits in the SMS dispatch queue; cleared when its
+    # outcome is written (a claim older than SMS_REMINDER_CLAIM_TIMEOUT is stale)
+    queued_at = Column(DateTime, nullable=True, index=True)
     sms_log_id = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     sent_at = Column(DateTime, nullable=True)
@@ -0,0 +1,55 @@
+"""
+Bulk student import jobs and their staging rows
+"""
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, Date, DateTime, Index, Integer, String, Text
+
+from app.core.database import Base
+
+
+class StudentImportJob(Base):
+    __tablename__ = "student_import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, nullable=True)
+    file_path = Column(String, nullable=False)  # spooled upload, removed once the job completes
+    status = Column(String, nullable=False, default="pending")  # pending / running / completed / failed
+    total_rows = Column(Integer, nullable=True)
+    last_row = Column(Integer, nullable=False, default=1)  # checkpoint: last CSV line merged (header is line 1)
+    created_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)  # [{"row": n, "error": "..."}], capped
+    last_error = Column(Text, nullable=True)
+    created_by = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # refreshed by the running instance at every checkpoint
+
+
+class StudentImportRow(Base):
+    """Validated rows of one batch, bulk loaded before being merged into students"""
+    __tablename__ = "student_import_rows"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, nullable=False)
+    row_number = Column(Integer, nullable=False)
+    student_id = Column(String, nullable=False)
+    student_name = Column(String, nullable=False)
+    student_email = Column(String, nullable=False)
+    student_phone = Column(String, nullable=False)
+    date_of_birth = Column(Date, nullable=True)
+    guardian_name = Column(String, nullable=True)
+    guardian_phone = Column(String, nullable=True)
+    emergency_contact = Column(String, nullable=True)
+    check_in_date = Column(Date, nullable=True)
+    room_assignment = Column(String, nullable=True)
+    bed_assignment = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    user_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_student_import_rows_job_row", "job_id", "row_number"),
+    )
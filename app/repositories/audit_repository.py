@@ -4,9 +4,13 @@ Insert/view audit logs
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+from app.core.pagination import Keyset, Page, paginate
 from app.models.audit_log import AuditLog
 from app.schemas.audit import AuditLogFilter
 
+# Newest first; id breaks ties between entries written in the same instant
+AUDIT_LOG_KEYSET = Keyset(AuditLog.created_at, AuditLog.id)
+
 
 class AuditRepository:
     def __init__(self, db: Session):
@@ -45,9 +49,21 @@ class AuditRepository:
         self,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[AuditLogFilter] = None
+        filters: Optional[AuditLogFilter] = None,
+        cursor: Optional[str] = None
     ) -> List[AuditLog]:
         """Get audit logs with optional filters"""
+        return self.get_page(skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=False).items
+    
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[AuditLogFilter] = None,
+        cursor: Optional[str] = None,
+        with_total: Optional[bool] = None
+    ) -> Page:
+        """Page of audit logs (newest first) with total and next cursor"""
         query = self.db.query(AuditLog)
         
         if filters:
@@ -62,7 +78,7 @@ class AuditRepository:
             if filters.end_date:
                 query = query.filter(AuditLog.created_at <= filters.end_date)
         
-        return query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+        return paginate(self.db, query, AUDIT_LOG_KEYSET, limit, cursor=cursor, offset=skip, with_total=with_total)
     
     def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[AuditLog]:
         """Get audit logs for a specific user"""
@@ -1,10 +1,35 @@
 from sqlalchemy.future import select
-from sqlalchemy import func, and_
-from app.models.complaint import Complaint, ComplaintAttachment, ComplaintNote
-from typing import Optional, List, Tuple
+from sqlalchemy import func, and_, Float
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from app.models.complaint import Complaint, ComplaintAttachment, ComplaintNote, ComplaintStatus
+from app.models.hostel import Hostel
+from app.core.pagination import Keyset, Page, paginate
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
  
  
+COMPLAINT_KEYSET = Keyset(Complaint.created_at, Complaint.id)
+ 
+ 
+class seconds_between(FunctionElement):
+    """Seconds from the first timestamp to the second (NULL if either is NULL)"""
+    type = Float()
+    inherit_cache = True
+ 
+ 
+@compiles(seconds_between)
+def _seconds_between(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f"EXTRACT(EPOCH FROM ({compiler.process(end, **kw)} - {compiler.process(start, **kw)}))"
+ 
+ 
+@compiles(seconds_between, "sqlite")
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return f"((julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)})) * 86400.0)"
+ 
+ 
 class ComplaintRepository:
     def __init__(self, db):
         self.db = db
@@ -12,18 +37,18 @@ class ComplaintRepository:
     # -------------------------------------------------------------------------
     # CRUD OPERATIONS
     # -------------------------------------------------------------------------
-    async def create(self, data: dict) -> Complaint:
+    def create(self, data: dict) -> Complaint:
         complaint = Complaint(**data)
         self.db.add(complaint)
         self.db.commit()
         self.db.refresh(complaint)
         return complaint
  
-    async def get_by_id(self, complaint_id: int) -> Optional[Complaint]:
+    def get_by_id(self, complaint_id: int) -> Optional[Complaint]:
         result = self.db.execute(select(Complaint).where(Complaint.id == complaint_id))
         return result.scalar_one_or_none()
  
-    async def get_with_details(self, complaint_id: int):
+    def get_with_details(self, complaint_id: int):
         """Get complaint along with attachments and notes"""
         result = self.db.execute(select(Complaint).where(Complaint.id == complaint_id))
         complaint = result.scalar_one_or_none()
@@ -43,8 +68,8 @@ class ComplaintRepository:
             "notes": notes_result.scalars().all(),
         }
  
-    async def update(self, complaint_id: int, updates: dict):
-        complaint = await self.get_by_id(complaint_id)
+    def update(self, complaint_id: int, updates: dict):
+        complaint = self.get_by_id(complaint_id)
         if not complaint:
             return None
         for key, value in updates.items():
@@ -53,13 +78,13 @@ class ComplaintRepository:
         self.db.refresh(complaint)
         return complaint
  
-    async def update_fields(self, complaint_id: int, data):
+    def update_fields(self, complaint_id: int, data):
         updates = data if isinstance(data, dict) else data.dict(exclude_unset=True)
-        return await self.update(complaint_id, updates)
+        return self.update(complaint_id, updates)
  
-    async def delete(self, complaint_id: int) -> bool:
+    def delete(self, complaint_id: int) -> bool:
         """Delete a complaint by ID"""
-        complaint = await self.get_by_id(complaint_id)
+        complaint = self.get_by_id(complaint_id)
         if not complaint:
             return False
         self.db.delete(complaint)
@@ -69,7 +94,12 @@ class ComplaintRepository:
     # -------------------------------------------------------------------------
     # FILTERING / LISTING
     # -------------------------------------------------------------------------
-    async def list(self, filters) -> Tuple[List[Complaint], int]:
+    def list(self, filters) -> Tuple[List[Complaint], int]:
+        page = self.list_page(filters)
+        return page.items, page.total
+ 
+    def list_page(self, filters) -> Page:
+        """Newest first; keyset page when `filters.cursor` is set (no count), offset page otherwise"""
         query = select(Complaint)
  
         if filters.hostel_name:
@@ -83,18 +113,15 @@ class ComplaintRepository:
         if filters.assigned_to_email:
             query = query.where(Complaint.assigned_to_email == filters.assigned_to_email)
  
-        result_total = self.db.execute(query)
-        total_list = result_total.scalars().unique().all()
-        total = len(total_list)
-        query = query.offset((filters.page - 1) * filters.page_size).limit(filters.page_size)
- 
-        result = self.db.execute(query.order_by(Complaint.created_at.desc()))
-        return result.scalars().all(), total
+        return paginate(
+            self.db, query, COMPLAINT_KEYSET, filters.page_size,
+            cursor=filters.cursor, offset=(filters.page - 1) * filters.page_size,
+        )
  
     # -------------------------------------------------------------------------
     # ATTACHMENTS & NOTES
     # -------------------------------------------------------------------------
-    async def add_attachment(
+    def add_attachment(
         self, complaint_id: int, uploaded_by: str,
         file_path: str, file_name: str, file_type: str, file_size: int
     ):
@@ -111,7 +138,7 @@ class ComplaintRepository:
         self.db.refresh(attachment)
         return attachment
  
-    async def add_note(
+    def add_note(
         self, complaint_id: int, note: str, user_name: str,
         user_email: str, is_internal: bool
     ):
@@ -130,58 +157,64 @@ class ComplaintRepository:
     # -------------------------------------------------------------------------
     # ANALYTICS
     # -------------------------------------------------------------------------
-    async def get_performance(
-        self, supervisor_email: str,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ):
-        query = select(Complaint).where(Complaint.assigned_to_email == supervisor_email)
+    # Each figure below is computed by the database in a single aggregate
+    # statement; no complaint rows are loaded.
+    @staticmethod
+    def _within(query, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
         if start_date:
             query = query.where(Complaint.created_at >= start_date)
         if end_date:
             query = query.where(Complaint.created_at <= end_date)
+        return query
  
-        result = self.db.execute(query)
-        complaints = result.scalars().all()
+    def get_performance(
+        self, supervisor_email: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        is_resolved = Complaint.status == ComplaintStatus.RESOLVED
+        query = self._within(
+            select(
+                func.count().label("total"),
+                func.count().filter(is_resolved).label("resolved"),
+                func.sum(seconds_between(Complaint.created_at, Complaint.resolved_at)).filter(is_resolved)
+                .label("resolution_seconds"),
+            ).where(Complaint.assigned_to_email == supervisor_email),
+            start_date, end_date,
+        )
+        row = self.db.execute(query).one()
  
-        resolved = [c for c in complaints if c.status == "resolved"]
+        # Resolved complaints without a resolved_at still count in the average's denominator
         avg_time = None
-        if resolved:
-            avg_time = sum(
-                (c.resolved_at - c.created_at).total_seconds() for c in resolved if c.resolved_at
-            ) / len(resolved) / 3600
+        if row.resolved:
+            avg_time = float(row.resolution_seconds or 0) / row.resolved / 3600
  
         return {
             "supervisor_email": supervisor_email,
-            "total_complaints": len(complaints),
-            "resolved_complaints": len(resolved),
+            "total_complaints": row.total,
+            "resolved_complaints": row.resolved,
             "average_resolution_time_hours": round(avg_time, 2) if avg_time else None,
         }
  
-    async def get_analytics(
+    def get_analytics(
         self,
         hostel_name: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ):
-        query = select(Complaint)
+        query = select(Complaint.category, Complaint.status, func.count().label("count"))
         if hostel_name:
             query = query.where(Complaint.hostel_name.ilike(f"%{hostel_name}%"))
-        if start_date:
-            query = query.where(Complaint.created_at >= start_date)
-        if end_date:
-            query = query.where(Complaint.created_at <= end_date)
+        query = self._within(query, start_date, end_date).group_by(Complaint.category, Complaint.status)
  
-        result = self.db.execute(query)
-        complaints = result.scalars().all()
- 
-        total = len(complaints)
+        total = 0
         category_counts = {}
         status_counts = {}
  
-        for c in complaints:
-            category_counts[c.category.value] = category_counts.get(c.category.value, 0) + 1
-            status_counts[c.status.value] = status_counts.get(c.status.value, 0) + 1
+        for category, status, count in self.db.execute(query):
+            total += count
+            category_counts[category.value] = category_counts.get(category.value, 0) + count
+            status_counts[status.value] = status_counts.get(status.value, 0) + count
  
         return {
             "total_complaints": total,
@@ -189,49 +222,55 @@ class ComplaintRepository:
             "status_distribution": status_counts,
         }
  
+    @staticmethod
+    def _statistics_columns():
+        return (
+            func.count(Complaint.id).label("total"),
+            func.count(Complaint.resolved_at).label("resolved"),
+            func.avg(seconds_between(Complaint.created_at, Complaint.resolved_at)).label("resolution_seconds"),
+            func.avg(Complaint.student_rating).label("rating"),
+        )
+ 
+    @staticmethod
+    def _statistics(row) -> dict:
+        avg_hours = round(float(row.resolution_seconds) / 3600, 2) if row.resolution_seconds is not None else 0.0
+        return {
+            'total': row.total,
+            'resolved': row.resolved,
+            'average_resolution_hours': avg_hours,
+            'average_rating': round(float(row.rating), 2) if row.rating is not None else 0.0
+        }
+ 
     @staticmethod
     def get_statistics(db, hostel_ids, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
         """Return aggregated complaint statistics for the given hostel ids and date range.
  
         Note: complaints are linked to hostels by `hostel_name` in this schema,
-        so we look up hostel names for the provided ids and filter complaints by name.
+        so complaints are matched against the names of the given hostels.
         """
-        from app.models.complaint import Complaint
-        from app.models.hostel import Hostel
- 
-        # Map hostel ids to hostel names
-        hostel_names = []
+        query = select(*ComplaintRepository._statistics_columns())
         if hostel_ids:
-            hostels = db.query(Hostel).filter(Hostel.id.in_(hostel_ids)).all()
-            hostel_names = [h.hostel_name for h in hostels]
+            query = query.where(Complaint.hostel_name.in_(
+                select(Hostel.hostel_name).where(Hostel.id.in_(hostel_ids)).scalar_subquery()
+            ))
+        query = ComplaintRepository._within(query, start_date, end_date)
+        return ComplaintRepository._statistics(db.execute(query).one())
  
-        query = db.query(Complaint)
-        if hostel_names:
-            query = query.filter(Complaint.hostel_name.in_(hostel_names))
+    @staticmethod
+    def get_statistics_by_hostel(db, hostel_ids, start_date: Optional[datetime] = None,
+                                 end_date: Optional[datetime] = None) -> Dict[int, dict]:
+        """`get_statistics` for each hostel, keyed by hostel id, in one grouped statement"""
+        if not hostel_ids:
+            return {}
+        on = Complaint.hostel_name == Hostel.hostel_name
         if start_date:
-            query = query.filter(Complaint.created_at >= start_date)
+            on = and_(on, Complaint.created_at >= start_date)
         if end_date:
-            query = query.filter(Complaint.created_at <= end_date)
- 
-        complaints = query.all()
- 
-        total = len(complaints)
-        resolved_list = [c for c in complaints if c.resolved_at]
-        resolved = len(resolved_list)
- 
-        avg_hours = 0.0
-        if resolved_list:
-            avg_hours = sum((c.resolved_at - c.created_at).total_seconds() for c in resolved_list) / len(resolved_list) / 3600
-            avg_hours = round(avg_hours, 2)
- 
-        # Average student rating where available
-        ratings = [c.student_rating for c in complaints if c.student_rating is not None]
-        avg_rating = round(sum(ratings) / len(ratings), 2) if ratings else 0.0
- 
-        return {
-            'total': total,
-            'resolved': resolved,
-            'average_resolution_hours': avg_hours,
-            'average_rating': avg_rating
-        }
- 
\ No newline at end of file
+            on = and_(on, Complaint.created_at <= end_date)
+        query = (
+            select(Hostel.id.label("hostel_id"), *ComplaintRepository._statistics_columns())
+            .select_from(Hostel.__table__.outerjoin(Complaint.__table__, on))
+            .where(Hostel.id.in_(hostel_ids))
+            .group_by(Hostel.id)
+        )
+        return {row.hostel_id: ComplaintRepository._statistics(row) for row in db.execute(query)}
@@ -193,6 +193,14 @@ class HostelRepository:
         db = self.db
         return db.query(Hostel).filter(Hostel.id == hostel_id).first()
 
+    def get_missing_ids(self, hostel_ids: List[int]) -> List[int]:
+        """Return the ids from `hostel_ids` that have no hostel row (one query)."""
+        db = self.db
+        if not hostel_ids:
+            return []
+        found = {row[0] for row in db.query(Hostel.id).filter(Hostel.id.in_(set(hostel_ids))).all()}
+        return [hid for hid in hostel_ids if hid not in found]
+
     def delete_hostel(self, hostel_id: int):
         db = self.db
         try:
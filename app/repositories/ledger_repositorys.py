@@ -111,6 +111,21 @@ from app.models.hostel import Hostel
 from app.models.payment_models import Transaction, Invoice, Customer
 
 
+TRANSACTION_EXPORT_COLUMNS = {
+    "transaction_id": Transaction.transaction_id,
+    "invoice_number": Invoice.invoice_number,
+    "user_id": Invoice.user_id,
+    "hostel_id": Invoice.hostel_id,
+    "transaction_type": Transaction.transaction_type,
+    "amount": Transaction.amount,
+    "payment_method": Transaction.payment_method,
+    "payment_gateway": Transaction.payment_gateway,
+    "gateway_transaction_id": Transaction.gateway_transaction_id,
+    "status": Transaction.status,
+    "created_at": Transaction.created_at,
+}
+
+
 class LedgerRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -125,8 +140,38 @@ class LedgerRepository:
         limit: int,
         offset: int
     ):
-        query = self.db.query(Transaction).join(Invoice)
+        query = self._transaction_history_query(
+            self.db.query(Transaction).join(Invoice),
+            start_date, end_date, hostel_id, user_id, transaction_type,
+        )
+
+        total = query.count()
+        rows = (
+            query.order_by(Transaction.created_at.desc())
+                 .limit(limit)
+                 .offset(offset)
+                 .all()
+        )
+
+        return rows, total
 
+    def transaction_export_statement(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        hostel_id: Optional[int],
+        user_id: Optional[int],
+        transaction_type: Optional[str],
+    ):
+        """Column-only SELECT for the streamed transaction export, newest first"""
+        query = self.db.query(*TRANSACTION_EXPORT_COLUMNS.values()).select_from(Transaction).join(Invoice)
+        query = self._transaction_history_query(
+            query, start_date, end_date, hostel_id, user_id, transaction_type,
+        )
+        return query.order_by(Transaction.created_at.desc(), Transaction.id.desc()).statement
+
+    @staticmethod
+    def _transaction_history_query(query, start_date, end_date, hostel_id, user_id, transaction_type):
         if start_date:
             query = query.filter(Transaction.created_at >= start_date)
 
@@ -142,15 +187,7 @@ class LedgerRepository:
         if transaction_type:
             query = query.filter(Transaction.transaction_type == transaction_type)
 
-        total = query.count()
-        rows = (
-            query.order_by(Transaction.created_at.desc())
-                 .limit(limit)
-                 .offset(offset)
-                 .all()
-        )
-
-        return rows, total
+        return query
 
     def get_outstanding_payments(self, hostel_id: Optional[int], overdue_only: bool):
         query = self.db.query(Invoice).filter(Invoice.due_amount > 0)
@@ -10,6 +10,7 @@ from app.schemas.students import StudentCreate, StudentUpdate
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate as SchemaUserCreate
 from app.core.roles import Role as UserRole
+from app.core.pagination import InvalidCursor, Keyset, Page, count_rows, paginate
  
  
 def list_students(
@@ -38,8 +39,84 @@ def list_students(
     complaint_count_gt: Optional[int] = None,
     user_hostel_ids: Optional[List[int]] = None,
     active_hostel_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> List[Student]:
-    query = db.query(Student)
+    return list_students_page(
+        db, skip=skip, limit=limit, cursor=cursor, with_total=False,
+        name=name, room=room, payment_status=payment_status, attendance_status=attendance_status,
+        student_id=student_id, student_email=student_email, student_phone=student_phone,
+        hostel_id=hostel_id, bed=bed, status=status, checkin_from=checkin_from, checkin_to=checkin_to,
+        sort_by=sort_by, sort_order=sort_order, user_hostel_ids=user_hostel_ids,
+    ).items
+ 
+ 
+# NOT NULL sort columns; keyset pages follow (sort column, student_id)
+KEYSET_SORT_COLUMNS = ("student_id", "student_name", "student_email", "student_phone")
+ 
+ 
+def student_keyset(sort_by: Optional[str] = None, sort_order: Optional[str] = "asc") -> Optional[Keyset]:
+    """Keyset matching the students_query ordering; None for sorts that cannot take a cursor"""
+    if not sort_by:
+        return Keyset(Student.student_id, descending=False)
+    descending = bool(sort_order) and sort_order.lower() == "desc"
+    if sort_by == "student_id" or not hasattr(Student, sort_by):
+        return Keyset(Student.student_id, descending=descending)
+    if sort_by in KEYSET_SORT_COLUMNS:
+        return Keyset(getattr(Student, sort_by), Student.student_id, descending=descending)
+    return None
+ 
+ 
+def list_students_page(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc",
+    **filters,
+) -> Page:
+    """One page of students_query(**filters) with its total and next cursor.
+ 
+    Sorting by a nullable column (check-in date, room, ...) pages by offset only.
+    """
+    query = students_query(db, sort_by=sort_by, sort_order=sort_order, **filters)
+    keyset = student_keyset(sort_by, sort_order)
+    if keyset is not None:
+        return paginate(db, query, keyset, limit, cursor=cursor, offset=skip, with_total=with_total)
+    if cursor:
+        raise InvalidCursor(f"Cursor pagination needs sort_by in {', '.join(KEYSET_SORT_COLUMNS)}")
+    total, is_estimate = count_rows(db, query) if with_total is not False else (None, False)
+    items = query.offset(skip).limit(limit).all()
+    return Page(items=items, total=total, next_cursor=None, total_is_estimate=is_estimate)
+
+
+def students_query(
+    db: Session,
+    name: Optional[str] = None,
+    room: Optional[str] = None,
+    payment_status: Optional[str] = None,
+    attendance_status: Optional[str] = None,
+    student_id: Optional[str] = None,
+    student_email: Optional[str] = None,
+    student_phone: Optional[str] = None,
+    hostel_id: Optional[int] = None,
+    bed: Optional[str] = None,
+    status: Optional[str] = None,
+    checkin_from: Optional[date] = None,
+    checkin_to: Optional[date] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc",
+    user_hostel_ids: Optional[List[int]] = None,
+    columns: Optional[list] = None,
+):
+    """Filtered, sorted student query shared by listing and export.
+
+    With `columns`, selects only those columns (no ORM hydration) for streaming.
+    """
+    query = db.query(*columns) if columns else db.query(Student)
+    if columns:
+        query = query.select_from(Student)
    
     # Identity filters: treat name / id / email / phone as alternatives (OR)
     identity_filters = []
@@ -96,8 +173,7 @@ def list_students(
             query = query.order_by(sort_col.asc())
     else:
         query = query.order_by(Student.student_id)
- 
-    return query.offset(skip).limit(limit).all()
+    return query
  
  
 def get_student(db: Session, student_id: str) -> Optional[Student]:
@@ -6,6 +6,7 @@ from typing import Optional
 from datetime import datetime, timedelta, timezone
 from app.models.refresh_token import RefreshToken
 from app.config import settings
+from app.core.token_cache import revoke_user_tokens
 
 
 class TokenRepository:
@@ -40,6 +41,7 @@ class TokenRepository:
             return False
         refresh_token.is_active = False
         self.db.commit()
+        revoke_user_tokens(refresh_token.user_id)
         return True
     
     def revoke_all_user_tokens(self, user_id: int) -> int:
@@ -52,6 +54,7 @@ class TokenRepository:
         for token in tokens:
             token.is_active = False
         self.db.commit()
+        revoke_user_tokens(user_id)
         return count
     
     def cleanup_expired_tokens(self) -> int:
@@ -100,6 +100,8 @@ class ComplaintFilter(BaseModel):
     end_date: Optional[datetime] = None
     page: int = 1
     page_size: int = 10
+    # opaque token from a previous page's next_cursor; replaces `page`
+    cursor: Optional[str] = None
  
  
 # -------------------- RESPONSE SCHEMAS --------------------
@@ -152,11 +154,13 @@ class ComplaintDetailResponse(ComplaintResponse):
  
  
 class ComplaintListResponse(BaseModel):
-    total: int
+    total: Optional[int]            # not counted for cursor pages
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
     complaints: List[ComplaintResponse]
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
  
  
 # -------------------- ANALYTICS / PERFORMANCE --------------------
@@ -53,6 +53,15 @@ class OccupancyTrend(BaseModel):
     occupied_beds: int
     total_beds: int
 
+class OccupancyTrendSeries(BaseModel):
+    """Occupancy trend for one hostel as parallel per-day arrays"""
+    hostel_id: int
+    hostel_name: str
+    dates: List[date]
+    occupancy_rates: List[float]
+    occupied_beds: List[int]
+    total_beds: List[int]
+
 class ComplaintMetrics(BaseModel):
     hostel_id: int
     hostel_name: str
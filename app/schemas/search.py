@@ -18,7 +18,7 @@ class HostelSearchFilters(BaseModel):
     radius_km: Optional[float] = 5.0
     
 class HostelSearchSort(BaseModel):
-    sort_by: str = Field(default="rating", pattern="^(price_asc|price_desc|rating|distance|newest|popularity)$")
+    sort_by: str = Field(default="rating", pattern="^(relevance|price_asc|price_desc|rating|distance|newest|popularity)$")
     
 class HostelSearchRequest(BaseModel):
     filters: HostelSearchFilters
@@ -10,6 +10,8 @@ from app.schemas.admin_schemas import (
     BulkAssignmentResponse,
 )
 from app.models.admin import PermissionLevel
+from app.core.hostel_scope import invalidate_hostel_scope
+from app.core.session_cache import invalidate_active_session
 
 class AdminService:
     def __init__(self, admin_repository: AdminRepository):
@@ -50,7 +52,8 @@ class AdminService:
         logger.info(f"Assigning hostel with permission level: {assignment.permission_level} (type: {type(assignment.permission_level)})")
         
         # Verify admin exists
-        if not self.admin_repository.get_admin(admin_id):
+        admin = self.admin_repository.get_admin(admin_id)
+        if not admin:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Admin not found"
@@ -61,6 +64,7 @@ class AdminService:
             db_assignment = self.admin_repository.assign_hostel_to_admin(
                 admin_id, assignment
             )
+            invalidate_hostel_scope(admin.user_id)
             return AdminHostelAssignmentResponse.model_validate(db_assignment)
         except Exception as e:
             logger.error(f"Error in assign_hostel: {str(e)}")
@@ -74,7 +78,8 @@ class AdminService:
         
         try:
             # Verify admin exists
-            if not self.admin_repository.get_admin(assignment.admin_id):
+            admin = self.admin_repository.get_admin(assignment.admin_id)
+            if not admin:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Admin not found"
@@ -93,6 +98,7 @@ class AdminService:
                 assignment.hostel_ids,
                 perm_level
             )
+            invalidate_hostel_scope(admin.user_id)
 
             return BulkAssignmentResponse(
                 success=True,
@@ -142,13 +148,16 @@ class AdminService:
 
     def remove_hostel_assignment(self, admin_id: int, hostel_id: int) -> bool:
         # Verify admin exists
-        if not self.admin_repository.get_admin(admin_id):
+        admin = self.admin_repository.get_admin(admin_id)
+        if not admin:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Admin not found"
             )
 
         success = self.admin_repository.remove_hostel_assignment(admin_id, hostel_id)
+        invalidate_hostel_scope(admin.user_id)
+        invalidate_active_session(admin.user_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,20 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func
-from typing import List, Optional
+from sqlalchemy import text, func, bindparam
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta, date
 from decimal import Decimal
 from app.schemas.reports import *
 from app.repositories.complaint_repository import ComplaintRepository
 
+def _as_date(value) -> date:
+    """Normalise a DATE column value (drivers without native dates return strings)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
 class AnalyticsService:
     
     @staticmethod
@@ -13,13 +22,11 @@ class AnalyticsService:
                                    start_date: date, end_date: date) -> MultiHostelDashboard:
         """Get unified dashboard for multiple hostels"""
         
-        hostel_kpis = []
-        
-        for hostel_id in hostel_ids:
-            kpi = AnalyticsService._get_hostel_kpi(db, hostel_id, start_date, end_date)
-            if kpi:
-                hostel_kpis.append(kpi)
-            # if hostel not found, skip it silently
+        # All KPIs come from a fixed number of grouped queries, independent of
+        # how many hostels are requested; order (and duplicates) follow hostel_ids
+        kpis_by_id = AnalyticsService._get_hostel_kpis(db, hostel_ids, start_date, end_date)
+        hostel_kpis = [kpis_by_id[hostel_id] for hostel_id in hostel_ids if hostel_id in kpis_by_id]
+        # hostels that were not found are skipped silently
         
         # Calculate summary
         if not hostel_kpis:
@@ -69,55 +76,89 @@ class AnalyticsService:
     @staticmethod
     def _get_hostel_kpi(db: Session, hostel_id: int, start_date: date, end_date: date) -> HostelKPI:
         """Get KPI for a single hostel"""
+        return AnalyticsService._get_hostel_kpis(db, [hostel_id], start_date, end_date).get(hostel_id)
+    
+    @staticmethod
+    def _get_hostel_kpis(db: Session, hostel_ids: List[int],
+                         start_date: date, end_date: date) -> Dict[int, HostelKPI]:
+        """Get KPIs for many hostels at once, keyed by hostel id.
+
+        Runs three queries whatever the number of hostels: the hostel rows,
+        revenue/expenses grouped by hostel_id and complaint counts grouped by
+        hostel_name (complaints are linked to hostels by name, exactly as in
+        ``ComplaintRepository.get_statistics``).
+        """
+        if not hostel_ids:
+            return {}
+        
+        ids = list(set(hostel_ids))
         
-        # Get hostel info
-        hostel = db.execute(text("""
+        hostels = db.execute(text("""
             SELECT id, hostel_name, total_beds, current_occupancy
-            FROM hostels WHERE id = :hostel_id
-        """), {'hostel_id': hostel_id}).first()
+            FROM hostels WHERE id IN :hostel_ids
+        """).bindparams(bindparam('hostel_ids', expanding=True)), {'hostel_ids': ids}).fetchall()
         
-        if not hostel:
-            return None
+        if not hostels:
+            return {}
         
-        # Get financial data
-        financial = db.execute(text("""
+        financials = db.execute(text("""
             SELECT 
+                hostel_id,
                 SUM(CASE WHEN transaction_type IN ('fee', 'booking') THEN amount ELSE 0 END) as revenue,
                 SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END) as expenses
             FROM financial_transactions
-            WHERE hostel_id = :hostel_id 
+            WHERE hostel_id IN :hostel_ids
             AND transaction_date BETWEEN :start_date AND :end_date
-        """), {'hostel_id': hostel_id, 'start_date': start_date, 'end_date': end_date}).first()
+            GROUP BY hostel_id
+        """).bindparams(bindparam('hostel_ids', expanding=True)),
+            {'hostel_ids': ids, 'start_date': start_date, 'end_date': end_date}).fetchall()
+        financial_by_id = {row.hostel_id: row for row in financials}
         
-        revenue = financial.revenue or Decimal(0)
-        expenses = financial.expenses or Decimal(0)
-        
-        # Get complaint stats
-        complaint_stats = ComplaintRepository.get_statistics(
-            db, [hostel_id],
-            datetime.combine(start_date, datetime.min.time()),
-            datetime.combine(end_date, datetime.max.time())
-        )
+        complaints = db.execute(text("""
+            SELECT 
+                hostel_name,
+                COUNT(*) as total,
+                COUNT(resolved_at) as resolved
+            FROM complaints
+            WHERE hostel_name IN :hostel_names
+            AND created_at >= :start_date AND created_at <= :end_date
+            GROUP BY hostel_name
+        """).bindparams(bindparam('hostel_names', expanding=True)), {
+            'hostel_names': list({h.hostel_name for h in hostels}),
+            'start_date': datetime.combine(start_date, datetime.min.time()),
+            'end_date': datetime.combine(end_date, datetime.max.time())
+        }).fetchall()
+        complaints_by_name = {row.hostel_name: row for row in complaints}
+        
+        kpis = {}
+        for hostel in hostels:
+            financial = financial_by_id.get(hostel.id)
+            revenue = (financial.revenue if financial else None) or Decimal(0)
+            expenses = (financial.expenses if financial else None) or Decimal(0)
+            
+            complaint = complaints_by_name.get(hostel.hostel_name)
+            
+            # `current_occupancy` stores occupied beds; compute occupancy and available beds from it
+            current_occupancy = hostel.current_occupancy or 0
+            total_beds = hostel.total_beds or 0  # Default to 0 if NULL
+            occupied_beds = current_occupancy
+            occupancy_rate = (occupied_beds / total_beds * 100) if total_beds and total_beds > 0 else 0
+            
+            kpis[hostel.id] = HostelKPI(
+                hostel_id=hostel.id,
+                hostel_name=hostel.hostel_name,
+                revenue=revenue,
+                expenses=expenses,
+                profit=revenue - expenses,
+                occupancy_rate=occupancy_rate,
+                total_beds=total_beds,
+                occupied_beds=occupied_beds,
+                complaint_count=complaint.total if complaint else 0,
+                resolved_complaints=complaint.resolved if complaint else 0,
+                average_rating=0.0
+            )
         
-        # `current_occupancy` stores occupied beds; compute occupancy and available beds from it
-        current_occupancy = hostel.current_occupancy or 0
-        total_beds = hostel.total_beds or 0  # Default to 0 if NULL
-        occupied_beds = current_occupancy
-        occupancy_rate = (occupied_beds / total_beds * 100) if total_beds and total_beds > 0 else 0
-        
-        return HostelKPI(
-            hostel_id=hostel.id,
-            hostel_name=hostel.hostel_name,
-            revenue=revenue,
-            expenses=expenses,
-            profit=revenue - expenses,
-            occupancy_rate=occupancy_rate,
-            total_beds=total_beds,
-            occupied_beds=occupied_beds,
-            complaint_count=complaint_stats['total'],
-            resolved_complaints=complaint_stats['resolved'],
-            average_rating=0.0
-        )
+        return kpis
     
     @staticmethod
     def get_revenue_comparison(db: Session, hostel_ids: List[int], 
@@ -190,100 +231,186 @@ class AnalyticsService:
                             start_date: date, end_date: date) -> List[OccupancyTrend]:
         """Get occupancy trends over time"""
         
+        series = AnalyticsService.get_occupancy_trend_series(db, hostel_ids, start_date, end_date)
+        
+        # Flatten the per-hostel arrays into one row per (date, hostel), date-major
         trends = []
+        for day_index in range((end_date - start_date).days + 1):
+            for hostel_series in series:
+                trends.append(OccupancyTrend(
+                    hostel_id=hostel_series.hostel_id,
+                    hostel_name=hostel_series.hostel_name,
+                    date=hostel_series.dates[day_index],
+                    occupancy_rate=hostel_series.occupancy_rates[day_index],
+                    occupied_beds=hostel_series.occupied_beds[day_index],
+                    total_beds=hostel_series.total_beds[day_index]
+                ))
         
-        # Generate date range
-        current_date = start_date
-        while current_date <= end_date:
-            for hostel_id in hostel_ids:
-                hostel = db.execute(text("""
-                    SELECT hostel_name, total_beds, current_occupancy 
-                        FROM hostels WHERE id = :id
-                """), {'id': hostel_id}).first()
-                
-                if hostel:
-                    current_occupancy = hostel.current_occupancy or 0
-                    occupied = current_occupancy
-                    total_beds = hostel.total_beds or 0  # Default to 0 if NULL
-                    occupancy_rate = (occupied / total_beds * 100) if total_beds and total_beds > 0 else 0
+        return trends
+    
+    @staticmethod
+    def get_occupancy_trend_series(db: Session, hostel_ids: List[int],
+                                   start_date: date, end_date: date) -> List[OccupancyTrendSeries]:
+        """Get occupancy trends as one columnar series per hostel.
 
-                    trends.append(OccupancyTrend(
-                        hostel_id=hostel_id,
-                        hostel_name=hostel.hostel_name,
-                        date=current_date,
-                        occupancy_rate=occupancy_rate,
-                        occupied_beds=occupied,
-                        total_beds=total_beds
-                    ))
+        Two queries cover the whole date × hostel matrix: the hostel rows and
+        the daily snapshots in range (plus the last snapshot before
+        `start_date` so the first days can be carried forward). Past days use
+        the most recent snapshot on or before that day; today, future days and
+        hostels with no snapshot history fall back to the live
+        `current_occupancy`.
+        """
+        if not hostel_ids or end_date < start_date:
+            return []
+        
+        ids = list(set(hostel_ids))
+        
+        hostels = db.execute(text("""
+            SELECT id, hostel_name, total_beds, current_occupancy
+            FROM hostels WHERE id IN :hostel_ids
+        """).bindparams(bindparam('hostel_ids', expanding=True)), {'hostel_ids': ids}).fetchall()
+        hostels_by_id = {row.id: row for row in hostels}
+        
+        snapshots = db.execute(text("""
+            SELECT s.hostel_id, s.snapshot_date, s.occupied_beds, s.total_beds
+            FROM hostel_occupancy_snapshots s
+            WHERE s.hostel_id IN :hostel_ids
+            AND s.snapshot_date <= :end_date
+            AND s.snapshot_date >= COALESCE((
+                SELECT MAX(p.snapshot_date)
+                FROM hostel_occupancy_snapshots p
+                WHERE p.hostel_id = s.hostel_id AND p.snapshot_date <= :start_date
+            ), :start_date)
+            ORDER BY s.hostel_id, s.snapshot_date
+        """).bindparams(bindparam('hostel_ids', expanding=True)),
+            {'hostel_ids': ids, 'start_date': start_date, 'end_date': end_date}).fetchall()
+        
+        snapshots_by_hostel: Dict[int, list] = {}
+        for row in snapshots:
+            snapshots_by_hostel.setdefault(row.hostel_id, []).append(row)
+        
+        today = date.today()
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        
+        series = []
+        for hostel_id in hostel_ids:
+            hostel = hostels_by_id.get(hostel_id)
+            if not hostel:
+                continue
+            
+            live_occupied = hostel.current_occupancy or 0
+            live_total = hostel.total_beds or 0  # Default to 0 if NULL
+            history = snapshots_by_hostel.get(hostel_id, [])
+            
+            rates, occupied_list, total_list = [], [], []
+            position = -1
+            for day in days:
+                # Advance to the latest snapshot on or before `day` (rows are date-ordered)
+                while position + 1 < len(history) and _as_date(history[position + 1].snapshot_date) <= day:
+                    position += 1
+                
+                if day < today and position >= 0:
+                    occupied = history[position].occupied_beds or 0
+                    total_beds = history[position].total_beds or 0
+                else:
+                    occupied = live_occupied
+                    total_beds = live_total
+                
+                rates.append((occupied / total_beds * 100) if total_beds and total_beds > 0 else 0)
+                occupied_list.append(occupied)
+                total_list.append(total_beds)
             
-            current_date += timedelta(days=1)
+            series.append(OccupancyTrendSeries(
+                hostel_id=hostel_id,
+                hostel_name=hostel.hostel_name,
+                dates=days,
+                occupancy_rates=rates,
+                occupied_beds=occupied_list,
+                total_beds=total_list
+            ))
         
-        return trends
+        return series
+    
+    @staticmethod
+    def record_occupancy_snapshots(db: Session, snapshot_date: Optional[date] = None) -> int:
+        """Store every hostel's current occupancy as the snapshot for `snapshot_date`.
+
+        Re-running for the same day replaces that day's rows. Returns the
+        number of snapshots written.
+        """
+        snapshot_date = snapshot_date or date.today()
+        try:
+            db.execute(text("""
+                DELETE FROM hostel_occupancy_snapshots WHERE snapshot_date = :snapshot_date
+            """), {'snapshot_date': snapshot_date})
+            result = db.execute(text("""
+                INSERT INTO hostel_occupancy_snapshots
+                    (hostel_id, snapshot_date, occupied_beds, total_beds, created_at)
+                SELECT id, :snapshot_date, COALESCE(current_occupancy, 0), COALESCE(total_beds, 0), :created_at
+                FROM hostels
+            """), {'snapshot_date': snapshot_date, 'created_at': datetime.utcnow()})
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
     
     @staticmethod
     def get_complaint_metrics(db: Session, hostel_ids: List[int], 
                              start_date: date, end_date: date) -> List[ComplaintMetrics]:
-        """Get complaint metrics by hostel"""
+        """Get complaint metrics by hostel
+        
+        Three statements whatever the number of hostels: the hostel names,
+        complaint counts grouped by (hostel, category, status, priority) and
+        the resolution / rating aggregates from
+        ``ComplaintRepository.get_statistics_by_hostel``.
+        """
+        if not hostel_ids:
+            return []
+        
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.max.time())
+        
+        hostels = db.execute(text("""
+            SELECT id, hostel_name FROM hostels WHERE id IN :hostel_ids
+        """).bindparams(bindparam('hostel_ids', expanding=True)), {'hostel_ids': list(set(hostel_ids))}).fetchall()
+        names_by_id = {row.id: row.hostel_name for row in hostels}
+        if not names_by_id:
+            return []
+        
+        breakdown = {}
+        for row in db.execute(text("""
+            SELECT hostel_name, category, status, priority, COUNT(*) as count
+            FROM complaints
+            WHERE hostel_name IN :hostel_names
+            AND created_at BETWEEN :start_date AND :end_date
+            GROUP BY hostel_name, category, status, priority
+        """).bindparams(bindparam('hostel_names', expanding=True)), {
+            'hostel_names': list(set(names_by_id.values())),
+            'start_date': start,
+            'end_date': end
+        }):
+            counts = breakdown.setdefault(row.hostel_name, ({}, {}, {}))
+            for distribution, key in zip(counts, (row.category, row.status, row.priority)):
+                distribution[key] = distribution.get(key, 0) + row.count
+        
+        stats_by_id = ComplaintRepository.get_statistics_by_hostel(db, list(names_by_id), start, end)
         
         metrics = []
-        
         for hostel_id in hostel_ids:
-            hostel = db.execute(text("SELECT hostel_name FROM hostels WHERE id = :id"), 
-                              {'id': hostel_id}).first()
-            
-            if not hostel:
+            if hostel_id not in names_by_id:
                 continue
-            
-            # Get complaints by category, status, priority
-            by_category = db.execute(text("""
-                SELECT category, COUNT(*) as count
-                FROM complaints
-                WHERE hostel_name = :hostel_name
-                AND created_at BETWEEN :start_date AND :end_date
-                GROUP BY category
-            """), {
-                'hostel_name': hostel.hostel_name,
-                'start_date': datetime.combine(start_date, datetime.min.time()),
-                'end_date': datetime.combine(end_date, datetime.max.time())
-            }).fetchall()
-            
-            by_status = db.execute(text("""
-                SELECT status, COUNT(*) as count
-                FROM complaints
-                WHERE hostel_name = :hostel_name
-                AND created_at BETWEEN :start_date AND :end_date
-                GROUP BY status
-            """), {
-                'hostel_name': hostel.hostel_name,
-                'start_date': datetime.combine(start_date, datetime.min.time()),
-                'end_date': datetime.combine(end_date, datetime.max.time())
-            }).fetchall()
-            
-            by_priority = db.execute(text("""
-                SELECT priority, COUNT(*) as count
-                FROM complaints
-                WHERE hostel_name = :hostel_name
-                AND created_at BETWEEN :start_date AND :end_date
-                GROUP BY priority
-            """), {
-                'hostel_name': hostel.hostel_name,
-                'start_date': datetime.combine(start_date, datetime.min.time()),
-                'end_date': datetime.combine(end_date, datetime.max.time())
-            }).fetchall()
-            
-            stats = ComplaintRepository.get_statistics(
-                db, [hostel_id],
-                datetime.combine(start_date, datetime.min.time()),
-                datetime.combine(end_date, datetime.max.time())
-            )
+            hostel_name = names_by_id[hostel_id]
+            by_category, by_status, by_priority = breakdown.get(hostel_name, ({}, {}, {}))
+            stats = stats_by_id[hostel_id]
             
             metrics.append(ComplaintMetrics(
                 hostel_id=hostel_id,
-                hostel_name=hostel.hostel_name,
+                hostel_name=hostel_name,
                 total_complaints=stats['total'],
-                by_category={row.category: row.count for row in by_category},
-                by_status={row.status: row.count for row in by_status},
-                by_priority={row.priority: row.count for row in by_priority},
+                by_category=by_category,
+                by_status=by_status,
+                by_priority=by_priority,
                 average_resolution_time=stats['average_resolution_hours'],
                 satisfaction_rating=stats['average_rating']
             ))
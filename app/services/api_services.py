@@ -22,10 +22,10 @@ ROUTING_ENGINE_URL = "http://localhost:8004"
 # CHANNEL SERVICE HELPERS
 # ============================================================
 
-async def send_email(recipient_email: str, subject: str, body: str):
+def send_email(recipient_email: str, subject: str, body: str):
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{EMAIL_SERVICE_URL}/send/", json={
+        with httpx.Client() as client:
+            resp = client.post(f"{EMAIL_SERVICE_URL}/send/", json={
                 "recipient": recipient_email,
                 "subject": subject,
                 "html_content": body
@@ -37,10 +37,10 @@ async def send_email(recipient_email: str, subject: str, body: str):
         return {"success": False, "status": "failed"}
 
 
-async def send_sms(phone: str, message: str):
+def send_sms(phone: str, message: str):
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{SMS_SERVICE_URL}/send/", json={
+        with httpx.Client() as client:
+            resp = client.post(f"{SMS_SERVICE_URL}/send/", json={
                 "phone_number": phone,
                 "message": message
             })
@@ -51,10 +51,10 @@ async def send_sms(phone: str, message: str):
         return {"success": False, "status": "failed"}
 
 
-async def send_push(user_id: int, title: str, body: str, data: Dict):
+def send_push(user_id: int, title: str, body: str, data: Dict):
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{PUSH_SERVICE_URL}/send/", json={
+        with httpx.Client() as client:
+            resp = client.post(f"{PUSH_SERVICE_URL}/send/", json={
                 "user_ids": [user_id],
                 "title": title,
                 "body": body,
@@ -67,10 +67,10 @@ async def send_push(user_id: int, title: str, body: str, data: Dict):
         return {"success": False, "status": "failed"}
 
 
-async def route_notification(payload: Dict):
+def route_notification(payload: Dict):
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{ROUTING_ENGINE_URL}/notifications/", json=payload)
+        with httpx.Client() as client:
+            resp = client.post(f"{ROUTING_ENGINE_URL}/notifications/", json=payload)
             if resp.status_code == 200:
                 return {"success": True}
     except:
@@ -82,7 +82,7 @@ async def route_notification(payload: Dict):
 # MAIN ORCHESTRATION FUNCTION
 # ============================================================
 
-async def process_notification(
+def process_notification(
     db: Session,
     user_id: int,
     user_role: str,
@@ -125,7 +125,7 @@ async def process_notification(
 
     # Routing Engine
     if use_routing and template and template.requires_routing:
-        await route_notification({
+        route_notification({
             "title": title,
             "message": message,
             "category": category.value,
@@ -140,7 +140,7 @@ async def process_notification(
     if "email" in channels and email:
         content = template.email_template if template else message
         subject = template.email_subject if template else title
-        results["email"] = await send_email(email, subject, content)
+        results["email"] = send_email(email, subject, content)
         log.email_status = results["email"]["status"]
 
     # ======================
@@ -148,7 +148,7 @@ async def process_notification(
     # ======================
     if "sms" in channels and phone:
         sms_body = template.sms_template if template else message
-        results["sms"] = await send_sms(phone, sms_body)
+        results["sms"] = send_sms(phone, sms_body)
         log.sms_status = results["sms"]["status"]
 
     # ======================
@@ -157,7 +157,7 @@ async def process_notification(
     if "push" in channels:
         push_title = template.push_title if template else title
         push_body = template.push_body if template else message
-        results["push"] = await send_push(user_id, push_title, push_body, data)
+        results["push"] = send_push(user_id, push_title, push_body, data)
         log.push_status = results["push"]["status"]
 
     # ======================
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from fastapi import HTTPException, status
 
+from app.core.pagination import Page
 from app.core.roles import Role
 from app.repositories.audit_repository import AuditRepository
 from app.schemas.audit import AuditLogFilter, AuditLogResponse
@@ -54,9 +55,25 @@ class AuditService:
         viewer_user_id: int,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[AuditLogFilter] = None
+        filters: Optional[AuditLogFilter] = None,
+        cursor: Optional[str] = None
     ) -> List[AuditLogResponse]:
         """Get audit logs (with role-based filtering)"""
+        return self.get_audit_logs_page(
+            viewer_role, viewer_user_id, skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=False
+        ).items
+    
+    def get_audit_logs_page(
+        self,
+        viewer_role: str,
+        viewer_user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[AuditLogFilter] = None,
+        cursor: Optional[str] = None,
+        with_total: Optional[bool] = None
+    ) -> Page:
+        """Page of audit logs (with role-based filtering), total and next cursor"""
         # Only admin/supervisor/superadmin can view audit logs
         if viewer_role not in [Role.ADMIN, Role.SUPERVISOR, Role.SUPERADMIN]:
             raise HTTPException(
@@ -66,11 +83,11 @@ class AuditService:
         
         # Superadmin can see all logs
         if viewer_role == Role.SUPERADMIN:
-            logs = self.audit_repo.get_all(skip=skip, limit=limit, filters=filters)
+            page = self.audit_repo.get_page(skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total)
         else:
             # Admin/supervisor can only see logs for their hostel(s)
             if filters and filters.hostel_id:
-                logs = self.audit_repo.get_all(skip=skip, limit=limit, filters=filters)
+                page = self.audit_repo.get_page(skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total)
             else:
                 # Get user's hostel and filter
                 from app.repositories.user_repository import UserRepository
@@ -81,11 +98,11 @@ class AuditService:
                         filters.hostel_id = user.hostel_id
                     else:
                         filters = AuditLogFilter(hostel_id=user.hostel_id)
-                    logs = self.audit_repo.get_all(skip=skip, limit=limit, filters=filters)
+                    page = self.audit_repo.get_page(skip=skip, limit=limit, filters=filters, cursor=cursor, with_total=with_total)
                 else:
-                    logs = []
+                    page = Page(items=[], total=0, next_cursor=None)
         
-        return [
+        page.items = [
             AuditLogResponse(
                 id=log.id,
                 user_id=log.user_id,
@@ -97,8 +114,9 @@ class AuditService:
                 details=log.details,
                 created_at=log.created_at
             )
-            for log in logs
+            for log in page.items
         ]
+        return page
     
     def get_user_audit_logs(self, user_id: int, skip: int = 0, limit: int = 100) -> List[AuditLogResponse]:
         """Get audit logs for a specific user"""
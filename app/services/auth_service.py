@@ -6,15 +6,15 @@ Merged into one complete authentication module.
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
-import bcrypt
 import random
 import ssl
 import smtplib
 from email.mime.text import MIMEText
 from jose import jwt
 
-from app.core.security import decode_token     # Keeping decode_token if used elsewhere
+from app.core.security import decode_token, pwd_context, averify_and_upgrade     # Keeping decode_token if used elsewhere
 from app.repositories.user_repository import UserRepository
 from app.repositories.token_repository import TokenRepository
 from app.schemas.auth import UserLogin, UserRegister, Token
@@ -25,15 +25,20 @@ from app.config import settings
 # 🔐 PASSWORD HASHING & VERIFICATION
 # ============================================================
 
+# Shares the configured-cost bcrypt context (and its worker pool) with
+# app.core.security; it still verifies hashes made by the old 72-byte
+# truncating helpers that used to live here.
+
 def get_password_hash(password: str) -> str:
-    password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+    return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_bytes = plain_password.encode('utf-8')[:72]
-    return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    return await pwd_context.ahash(password)
 
 
 # ============================================================
@@ -64,7 +69,7 @@ def generate_otp() -> str:
     return f"{random.randint(100000, 999999):06d}"
 
 
-async def send_otp_email(email: str, otp_code: str) -> bool:
+def send_otp_email(email: str, otp_code: str) -> bool:
     subject = "Your OTP Code"
     # FIX: Use EXPIRY
     body = (
@@ -88,7 +93,7 @@ async def send_otp_email(email: str, otp_code: str) -> bool:
         return False
 
 
-async def send_otp_sms(phone: str, otp_code: str) -> bool:
+def send_otp_sms(phone: str, otp_code: str) -> bool:
     print(f"Sending SMS OTP to {phone}: {otp_code}")
     return True
 
@@ -170,16 +175,34 @@ class AuthService:
     # --------------------------------------------------------
     def login(self, credentials: UserLogin) -> Token:
 
+        user = self._find_login_user(credentials)
+
+        if not user or not verify_password(credentials.password, user.hashed_password):
+            raise HTTPException(401, "Incorrect credentials")
+
+        return self._issue_tokens(user)
+
+    async def alogin(self, credentials: UserLogin) -> Token:
+        """Same as login, with bcrypt on the hashing pool and rehash-on-login
+
+        The session work runs on the threadpool so the event loop never waits on the database.
+        """
+
+        user = await run_in_threadpool(self._find_login_user, credentials)
+
+        if not user or not user.hashed_password or not await averify_and_upgrade(self.db, user, credentials.password):
+            raise HTTPException(401, "Incorrect credentials")
+
+        return await run_in_threadpool(self._issue_tokens, user)
+
+    def _find_login_user(self, credentials: UserLogin):
         identifier = credentials.email_or_phone
-        user = None
 
         if identifier and "@" in identifier:
-            user = self.user_repo.get_by_email(identifier)
-        else:
-            user = self.user_repo.get_by_phone_number(identifier)
+            return self.user_repo.get_by_email(identifier)
+        return self.user_repo.get_by_phone_number(identifier)
 
-        if not user or not verify_password(credentials.password, user.hashed_password):
-            raise HTTPException(401, "Incorrect credentials")
+    def _issue_tokens(self, user) -> Token:
 
         if not user.is_active:
             raise HTTPException(403, "User account is inactive")
@@ -192,7 +215,7 @@ class AuthService:
             data={"sub": str(user.id), "role": user.role}
         )
 
-        # Store refresh token
+        # Store refresh token (commits a re-hashed password along with it)
         self.token_repo.create_token(user.id, refresh_token)
 
         return Token(
@@ -1,17 +1,176 @@
 """
 Booking Expiry Service - Handles automatic expiration of pending bookings
+
+`BookingExpirySweeper` is the one expiry engine, used by the background
+thread below and by `app.services.scheduler`. Each sweep works in chunks;
+a chunk is one transaction that
+
+ 1. claims up to `chunk_size` stale pending bookings with
+    `SELECT ... FOR UPDATE SKIP LOCKED` and cancels them in a single
+    `UPDATE ... RETURNING` (rows another instance is already sweeping are
+    skipped, so several app instances can run the sweep at once),
+ 2. looks up the room types of the affected rooms with one SELECT.
+
+Pending bookings never hold a bed (`available_beds` only drops when a
+booking is confirmed), so expiring them leaves room capacity untouched.
+
+After a chunk commits, a `BookingExpired` event per booking is handed to the
+sweeper's listeners; the default listener offers the expired bookings' room
+types to the waitlist, which only books rooms with a bed actually free.
 """
 
 import threading
 import time
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.core.logger import setup_logger
 from app.models.booking import Booking, BookingStatus
+from app.models.rooms import Room
 from app.repositories.booking_repository import BookingRepository
+from app.services.waitlist_service import WaitlistService
 
 logger = setup_logger()
 
+PENDING = BookingStatus.pending.value
+EXPIRED = BookingStatus.cancelled.value
+
+
+@dataclass(frozen=True)
+class BookingExpired:
+    """Emitted once per booking the sweep cancelled"""
+    booking_id: int
+    visitor_id: int
+    hostel_id: int
+    room_id: int
+    room_type: Optional[str]
+
+
+BookingExpiryListener = Callable[[List[BookingExpired]], None]
+
+
+class WaitlistPromoter:
+    """Expiry listener: tries one waitlist promotion per expired booking
+
+    `WaitlistService.try_promote` only books a room with `available_beds > 0`,
+    so this never creates capacity; it just retries the waitlist when a
+    pending booking gives up its claim on a room type.
+    """
+
+    def __init__(self, db_session_factory):
+        self.db_session_factory = db_session_factory
+
+    def __call__(self, events: List[BookingExpired]):
+        freed = Counter((e.hostel_id, e.room_type) for e in events if e.room_type is not None)
+        db: Session = self.db_session_factory()
+        try:
+            for (hostel_id, room_type), beds in freed.items():
+                for _ in range(beds):
+                    booking, _entry = WaitlistService.try_promote(db, hostel_id, room_type)
+                    if booking is None:
+                        break
+                    logger.info(f"Promoted waitlist entry into booking {booking.id} (hostel {hostel_id})")
+        finally:
+            db.close()
+
+
+class BookingExpirySweeper:
+    """Set-based expiry of stale pending bookings, safe to run from several instances"""
+
+    def __init__(
+        self,
+        db_session_factory,
+        expiry_hours: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        listeners: Optional[Iterable[BookingExpiryListener]] = None,
+    ):
+        self.db_session_factory = db_session_factory
+        self.expiry_hours = expiry_hours or settings.BOOKING_EXPIRY_HOURS
+        self.chunk_size = chunk_size or settings.BOOKING_EXPIRY_CHUNK_SIZE
+        self.listeners: List[BookingExpiryListener] = (
+            list(listeners) if listeners is not None else [WaitlistPromoter(db_session_factory)]
+        )
+
+    def sweep(self, now: Optional[datetime] = None) -> Dict:
+        """Expire every pending booking older than `expiry_hours`; returns a run report"""
+        started = time.perf_counter()
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=self.expiry_hours)
+        report = {"expired": 0, "rooms": 0, "chunks": 0, "cutoff": cutoff.isoformat()}
+
+        while True:
+            db: Session = self.db_session_factory()
+            try:
+                events, rooms = self._expire_chunk(db, cutoff)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            if not events:
+                break
+            report["chunks"] += 1
+            report["expired"] += len(events)
+            report["rooms"] += rooms
+            self._emit(events)
+            # A short chunk means nothing unclaimed is left (or the rest is
+            # held by another instance's sweep)
+            if len(events) < self.chunk_size:
+                break
+
+        report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if report["expired"]:
+            logger.info(
+                f"Expired {report['expired']} pending bookings older than {self.expiry_hours}h "
+                f"in {report['chunks']} chunks ({report['duration_ms']} ms)"
+            )
+        return report
+
+    def _expire_chunk(self, db: Session, cutoff: datetime):
+        claimed = (
+            select(Booking.id)
+            .where(Booking.status == PENDING, Booking.created_at < cutoff)
+            .order_by(Booking.created_at, Booking.id)
+            .limit(self.chunk_size)
+            .with_for_update(skip_locked=True)
+        )
+        expired = db.execute(
+            update(Booking)
+            .where(Booking.id.in_(claimed.scalar_subquery()), Booking.status == PENDING)
+            .values(status=EXPIRED)
+            .returning(Booking.id, Booking.visitor_id, Booking.hostel_id, Booking.room_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not expired:
+            return [], 0
+
+        # Pending bookings hold no bed, so no capacity is given back; the
+        # room types are only needed for the events
+        room_ids = sorted({row.room_id for row in expired if row.room_id is not None})
+        room_types = {}
+        if room_ids:
+            room_types = dict(db.execute(select(Room.id, Room.room_type).where(Room.id.in_(room_ids))).all())
+
+        events = [
+            BookingExpired(row.id, row.visitor_id, row.hostel_id, row.room_id, room_types.get(row.room_id))
+            for row in expired
+        ]
+        return events, len(room_types)
+
+    def _emit(self, events: List[BookingExpired]):
+        for listener in self.listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                # Listener failures never undo the committed expiry
+                logger.error(f"Booking expiry listener {listener!r} failed: {str(e)}")
+
 
 class BookingExpiryService:
     """
@@ -19,14 +178,16 @@ class BookingExpiryService:
     Runs as a background thread to check and expire bookings.
     """
 
-    def __init__(self, db_session_factory):
+    def __init__(self, db_session_factory, sweeper: Optional[BookingExpirySweeper] = None):
         """
         Initialize the booking expiry service.
-        
+
         Args:
             db_session_factory: SQLAlchemy SessionLocal factory
+            sweeper: expiry engine to run (defaults to one built from settings)
         """
         self.db_session_factory = db_session_factory
+        self.sweeper = sweeper or BookingExpirySweeper(db_session_factory)
         self.running = False
         self.thread = None
         self.check_interval = 300  # Check every 5 minutes (300 seconds)
@@ -59,59 +220,25 @@ class BookingExpiryService:
                 self._check_and_expire_bookings()
             except Exception as e:
                 logger.error(f"Error in booking expiry checker: {str(e)}")
-            
+
             # Sleep before next check
             time.sleep(self.check_interval)
 
     def _check_and_expire_bookings(self):
         """
-        Check for pending bookings that should be expired.
-        A booking is expired if:
-        1. Status is PENDING
-        2. Created more than 24 hours ago (configurable)
+        Expire pending bookings created more than `BOOKING_EXPIRY_HOURS` ago
+        (see BookingExpirySweeper).
         """
-        try:
-            db: Session = self.db_session_factory()
-            
-            # Calculate expiry threshold (24 hours ago)
-            expiry_threshold = datetime.utcnow() - timedelta(hours=24)
-            
-            # Find pending bookings that are older than 24 hours
-            # FIX: Use .value to ensure we compare String to String
-            expired_bookings = db.query(Booking).filter(
-                Booking.status == BookingStatus.pending.value,
-                Booking.created_at < expiry_threshold
-            ).all()
-            
-            if expired_bookings:
-                logger.info(f"Found {len(expired_bookings)} bookings to expire")
-                
-                for booking in expired_bookings:
-                    try:
-                        # FIX: Use .value for assignment as well
-                        booking.status = BookingStatus.cancelled.value
-                        db.add(booking)
-                        logger.info(f"Expired booking {booking.id}")
-                    except Exception as e:
-                        logger.error(f"Error expiring booking {booking.id}: {str(e)}")
-                        db.rollback()
-                        continue
-                
-                db.commit()
-                logger.info(f"Successfully expired {len(expired_bookings)} bookings")
-            
-            db.close()
-        except Exception as e:
-            logger.error(f"Error in _check_and_expire_bookings: {str(e)}")
+        return self.sweeper.sweep()
 
     def manually_expire_booking(self, db: Session, booking_id: int):
         """
         Manually expire a specific booking.
-        
+
         Args:
             db: Database session
             booking_id: ID of booking to expire
-            
+
         Returns:
             Updated booking object or None if not found
         """
@@ -129,4 +256,4 @@ class BookingExpiryService:
         except Exception as e:
             logger.error(f"Error manually expiring booking: {str(e)}")
             db.rollback()
-            return None
\ No newline at end of file
+            return None
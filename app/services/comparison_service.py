@@ -1,14 +1,19 @@
 from typing import List
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached
 from app.repositories.comparison_repository import get_hostel_comparison as repo_get_hostel_comparison
 from app.models.hostel import Hostel
 from app.models.rooms import Room
 
+# Tables both comparison paths read (available beds come from `beds`)
+COMPARISON_CACHE_TAGS = ("hostels", "rooms", "beds")
+
 
 # ---------------------------------------------------------
 # VERSION 1: (Simple repository pass-through)
 # ---------------------------------------------------------
+@cached(ttl=120, tags=COMPARISON_CACHE_TAGS)
 def compare_hostels(db: Session, hostel_ids: List[int]) -> List[dict]:
     return repo_get_hostel_comparison(db, hostel_ids)
 
@@ -19,6 +24,7 @@ def compare_hostels(db: Session, hostel_ids: List[int]) -> List[dict]:
 class ComparisonService:
 
     @staticmethod
+    @cached(ttl=120, tags=COMPARISON_CACHE_TAGS)
     def compare_hostels(db: Session, hostel_ids: list[int]):
         if len(hostel_ids) > 4:
             raise Exception("You can compare only up to 4 hostels")
@@ -23,7 +23,7 @@ class ComplaintService:
     # STUDENT ACTIONS
     # -------------------------------------------------------------------------
  
-    async def create_complaint(self, data):
+    def create_complaint(self, data):
         """Create a new complaint (student).
  
         Accepts either a Pydantic `ComplaintCreate` or a plain `dict` payload.
@@ -52,28 +52,31 @@ class ComplaintService:
         payload["status"] = ComplaintStatus.PENDING
         payload["created_at"] = datetime.utcnow()
         payload["sla_deadline"] = datetime.utcnow() + timedelta(days=3)
-        return await self.repo.create(payload)
+        return self.repo.create(payload)
  
-    async def list_complaints(self, filters: ComplaintFilter) -> Tuple[List, int]:
-        return await self.repo.list(filters)
+    def list_complaints(self, filters: ComplaintFilter) -> Tuple[List, int]:
+        return self.repo.list(filters)
  
-    async def get_complaint(self, complaint_id: int):
-        return await self.repo.get_by_id(complaint_id)
+    def list_complaints_page(self, filters: ComplaintFilter):
+        return self.repo.list_page(filters)
  
-    async def get_complaint_with_details(self, complaint_id: int):
-        return await self.repo.get_with_details(complaint_id)
+    def get_complaint(self, complaint_id: int):
+        return self.repo.get_by_id(complaint_id)
  
-    async def submit_feedback(self, complaint_id: int, data: ComplaintFeedback):
+    def get_complaint_with_details(self, complaint_id: int):
+        return self.repo.get_with_details(complaint_id)
+ 
+    def submit_feedback(self, complaint_id: int, data: ComplaintFeedback):
         updates = {
             "student_feedback": data.student_feedback,
             "student_rating": data.student_rating,
             "status": ComplaintStatus.CLOSED,
             "closed_at": datetime.utcnow()
         }
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
-    async def reopen_complaint(self, complaint_id: int, data: ComplaintReopen):
-        complaint = await self.repo.get_by_id(complaint_id)
+    def reopen_complaint(self, complaint_id: int, data: ComplaintReopen):
+        complaint = self.repo.get_by_id(complaint_id)
         if not complaint:
             raise ValueError("Complaint not found")
  
@@ -86,10 +89,10 @@ class ComplaintService:
             "reopen_reason": data.reopen_reason,
             "updated_at": datetime.utcnow()
         }
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
-    async def add_note(self, complaint_id: int, note_data: ComplaintNoteCreate):
-        return await self.repo.add_note(
+    def add_note(self, complaint_id: int, note_data: ComplaintNoteCreate):
+        return self.repo.add_note(
             complaint_id,
             note_data.note,
             note_data.user_name,
@@ -97,11 +100,11 @@ class ComplaintService:
             note_data.is_internal
         )
  
-    async def add_attachment(
+    def add_attachment(
         self, complaint_id: int, uploaded_by: str, file_path: str,
         file_name: str, file_type: str, file_size: int
     ):
-        return await self.repo.add_attachment(
+        return self.repo.add_attachment(
             complaint_id, uploaded_by, file_path, file_name, file_type, file_size
         )
  
@@ -109,65 +112,65 @@ class ComplaintService:
     # SUPERVISOR ACTIONS
     # -------------------------------------------------------------------------
  
-    async def update_complaint(self, complaint_id: int, data: ComplaintUpdate):
+    def update_complaint(self, complaint_id: int, data: ComplaintUpdate):
         """Fix: use dict(exclude_unset=True) to prevent overwriting with None."""
-        return await self.repo.update_fields(
+        return self.repo.update_fields(
             complaint_id,
             data.dict(exclude_unset=True)
         )
  
-    async def assign_complaint(self, complaint_id: int, data: ComplaintAssignment):
+    def assign_complaint(self, complaint_id: int, data: ComplaintAssignment):
         updates = data.dict(exclude_unset=True)
         updates["status"] = ComplaintStatus.IN_PROGRESS
         updates["assigned_at"] = datetime.utcnow()
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
-    async def resolve_complaint(self, complaint_id: int, data: ComplaintResolution):
+    def resolve_complaint(self, complaint_id: int, data: ComplaintResolution):
         updates = data.dict(exclude_unset=True)
         updates["status"] = ComplaintStatus.RESOLVED
         updates["resolved_at"] = datetime.utcnow()
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
-    async def close_complaint(self, complaint_id: int):
+    def close_complaint(self, complaint_id: int):
         updates = {
             "status": ComplaintStatus.CLOSED,
             "closed_at": datetime.utcnow()
         }
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
-    async def get_supervisor_performance(
+    def get_supervisor_performance(
         self,
         supervisor_email: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ):
-        return await self.repo.get_performance(supervisor_email, start_date, end_date)
+        return self.repo.get_performance(supervisor_email, start_date, end_date)
  
     # -------------------------------------------------------------------------
     # ADMIN ACTIONS
     # -------------------------------------------------------------------------
  
-    async def reassign_complaint(self, complaint_id: int, new_name: str, new_email: str):
+    def reassign_complaint(self, complaint_id: int, new_name: str, new_email: str):
         updates = {
             "assigned_to_name": new_name,
             "assigned_to_email": new_email,
             "status": ComplaintStatus.IN_PROGRESS,
             "assigned_at": datetime.utcnow()
         }
-        return await self.repo.update(complaint_id, updates)
+        return self.repo.update(complaint_id, updates)
  
     # -------------------------------------------------------------------------
     # ANALYTICS FIX (must match schema)
     # -------------------------------------------------------------------------
  
-    async def get_analytics(
+    def get_analytics(
         self,
         hostel_name: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ):
         """Fix: Ensure response matches ComplaintAnalytics schema exactly."""
-        raw = await self.repo.get_analytics(hostel_name, start_date, end_date)
+        raw = self.repo.get_analytics(hostel_name, start_date, end_date)
  
         return {
             "total_complaints": raw.get("total_complaints", 0),
@@ -1,5 +1,6 @@
-from sqlalchemy import text, func
+from sqlalchemy import text, func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 import logging
 from typing import Dict, Any, List
@@ -7,65 +8,99 @@ from app.models.hostel import Hostel, Location
 from app.models.admin import Admin
 from app.models.complaint import Complaint, ComplaintStatus
 from app.models.admin_hostel_mapping import AdminHostelMapping
+from app.core.cache import cached
 
 logger = logging.getLogger(__name__)
 
 class DashboardService:
     @staticmethod
+    @cached(ttl=60, tags=("hostels", "admins", "complaints", "locations"))
     def get_dashboard_and_activities(db: Session) -> Dict[str, Any]:
         try:
-            # Get summary statistics using ORM queries on available tables
-            total_hostels = db.query(func.count(Hostel.id)).scalar() or 0
-            active_admins = db.query(func.count(Admin.id)).filter(Admin.is_active == True).scalar() or 0
-            
-            # Compute average occupancy from hostels
-            avg_occupancy_result = db.query(func.avg(Hostel.current_occupancy)).scalar() or 0.0
-            avg_occupancy = round(float(avg_occupancy_result), 2) if avg_occupancy_result else 0.0
-            
-            # Compute complaint resolution rate as proxy for health
-            total_complaints = db.query(func.count(Complaint.id)).scalar() or 0
-            resolved_complaints = db.query(func.count(Complaint.id)).filter(
-                Complaint.status == ComplaintStatus.RESOLVED
-            ).scalar() or 0
-            resolution_rate = round(
-                (resolved_complaints / total_complaints * 100) if total_complaints > 0 else 0.0, 2
-            )
-            
-            dashboard_data = {
-                "summary": {
-                    "total_hostels": total_hostels,
-                    "active_admins": active_admins,
-                    "average_occupancy": avg_occupancy,
-                    "complaint_resolution_rate": resolution_rate,
-                },
-                "recent_activities": [],
-            }
-
-            # Get top performing hostels by occupancy and total beds
-            top_result = db.query(
-                Hostel.hostel_name,
-                func.coalesce(Location.city, "Unknown").label("city"),
-                Hostel.total_beds,
-                Hostel.current_occupancy,
-                func.round(
-                    (Hostel.current_occupancy / func.nullif(Hostel.total_beds, 0) * 100), 2
-                ).label("occupancy_rate")
-            ).outerjoin(Location, Hostel.location_id == Location.id).order_by(Hostel.current_occupancy.desc()).limit(5).all()
-
-            top_hostels = [
-                {
-                    "rank": idx + 1,
-                    "hostel_name": r[0] or "Unknown",
-                    "city": r[1] or "Unknown",
-                    "total_beds": r[2] or 0,
-                    "current_occupancy": r[3] or 0,
-                    "occupancy_rate": float(r[4] or 0.0),
-                }
-                for idx, r in enumerate(top_result)
-            ]
+            statements = DashboardService._dashboard_statements()
+            scalars = {name: db.execute(stmt).scalar() for name, stmt in statements["scalars"].items()}
+            top_result = db.execute(statements["top_hostels"]).all()
+            return DashboardService._build_dashboard(scalars, top_result)
+        except Exception as e:
+            logger.exception("Error fetching dashboard")
+            raise
 
-            dashboard_data["top_hostels"] = top_hostels
-            return dashboard_data
+    @staticmethod
+    @cached(ttl=60, tags=("hostels", "admins", "complaints", "locations"))
+    async def get_dashboard_and_activities_async(db: AsyncSession) -> Dict[str, Any]:
+        try:
+            statements = DashboardService._dashboard_statements()
+            scalars = {}
+            for name, stmt in statements["scalars"].items():
+                scalars[name] = (await db.execute(stmt)).scalar()
+            top_result = (await db.execute(statements["top_hostels"])).all()
+            return DashboardService._build_dashboard(scalars, top_result)
         except Exception as e:
             logger.exception("Error fetching dashboard")
             raise
+
+    @staticmethod
+    def _dashboard_statements() -> Dict[str, Any]:
+        """Select statements shared by the sync and async dashboard paths"""
+        # Summary statistics on available tables; complaint resolution rate is a proxy for health
+        scalars = {
+            "total_hostels": select(func.count(Hostel.id)),
+            "active_admins": select(func.count(Admin.id)).where(Admin.is_active == True),
+            "avg_occupancy": select(func.avg(Hostel.current_occupancy)),
+            "total_complaints": select(func.count(Complaint.id)),
+            "resolved_complaints": select(func.count(Complaint.id)).where(
+                Complaint.status == ComplaintStatus.RESOLVED
+            ),
+        }
+
+        # Top performing hostels by occupancy and total beds
+        top_hostels = select(
+            Hostel.hostel_name,
+            func.coalesce(Location.city, "Unknown").label("city"),
+            Hostel.total_beds,
+            Hostel.current_occupancy,
+            func.round(
+                (Hostel.current_occupancy / func.nullif(Hostel.total_beds, 0) * 100), 2
+            ).label("occupancy_rate")
+        ).outerjoin(Location, Hostel.location_id == Location.id).order_by(Hostel.current_occupancy.desc()).limit(5)
+
+        return {"scalars": scalars, "top_hostels": top_hostels}
+
+    @staticmethod
+    def _build_dashboard(scalars: Dict[str, Any], top_result: List[Any]) -> Dict[str, Any]:
+        total_hostels = scalars["total_hostels"] or 0
+        active_admins = scalars["active_admins"] or 0
+
+        avg_occupancy_result = scalars["avg_occupancy"] or 0.0
+        avg_occupancy = round(float(avg_occupancy_result), 2) if avg_occupancy_result else 0.0
+
+        total_complaints = scalars["total_complaints"] or 0
+        resolved_complaints = scalars["resolved_complaints"] or 0
+        resolution_rate = round(
+            (resolved_complaints / total_complaints * 100) if total_complaints > 0 else 0.0, 2
+        )
+
+        dashboard_data = {
+            "summary": {
+                "total_hostels": total_hostels,
+                "active_admins": active_admins,
+                "average_occupancy": avg_occupancy,
+                "complaint_resolution_rate": resolution_rate,
+            },
+            "recent_activities": [],
+        }
+
+        top_hostels = [
+            {
+                "rank": idx + 1,
+                "hostel_name": r[0] or "Unknown",
+                "city": r[1] or "Unknown",
+                "total_beds": r[2] or 0,
+                "current_occupancy": r[3] or 0,
+                "occupancy_rate": float(r[4] or 0.0),
+            }
+            for idx, r in enumerate(top_result)
+        ]
+
+        dashboard_data["top_hostels"] = top_hostels
+        return dashboard_data
@@ -0,0 +1,402 @@
+"""
+Email outbox.
+
+`EmailService.send_email` hands messages to `enqueue_email`, which only appends
+to an in-memory buffer and wakes the worker, so request paths (OTP, password
+reset) never wait on SMTP. The background worker:
+
+ - writes buffered messages to the `email_outbox` table in one multi-row
+   INSERT (from then on they survive restarts)
+ - claims due "pending" rows in batches (FOR UPDATE SKIP LOCKED on Postgres),
+   marking them "sending" with a claimed_at lease. Several instances share
+   the outbox; a "sending" row is only claimed again once its lease
+   (EMAIL_OUTBOX_LEASE_SECONDS) has expired, i.e. the instance sending it
+   died, never just because some instance restarted
+ - delivers them over a small pool of logged-in SMTP connections, several
+   messages per connection, reconnecting when the server drops one
+ - records sent / failed / retry-later outcomes with one executemany UPDATE;
+   4xx and connection errors are retried with exponential backoff up to
+   EMAIL_OUTBOX_MAX_ATTEMPTS, 5xx rejections fail at once
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+
+from app.config import settings
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, OSError)
+
+
+# ---------------------------------------------------------
+# SMTP CONNECTION POOL
+# ---------------------------------------------------------
+class PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Up to `size` logged-in SMTP connections, reused across messages. Idle
+    connections are checked with NOOP before reuse and recycled after
+    `max_messages` messages, since servers cap messages per session.
+    """
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP], size: int = 2,
+                 max_idle: float = 30.0, max_messages: int = 100):
+        self.connect = connect
+        self.size = max(1, size)
+        self.max_idle = max_idle
+        self.max_messages = max_messages
+        self._idle: List[PooledConnection] = []
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._counters = {"connects": 0, "reconnects": 0, "reused": 0}
+
+    def _open(self) -> PooledConnection:
+        connection = PooledConnection(self.connect())
+        with self._lock:
+            self._counters["connects"] += 1
+        return connection
+
+    def acquire(self) -> PooledConnection:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is not None and time.monotonic() - connection.last_used > self.max_idle:
+                try:
+                    connection.smtp.noop()
+                except Exception:
+                    self._close(connection)
+                    connection = None
+            if connection is None:
+                return self._open()
+            with self._lock:
+                self._counters["reused"] += 1
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def reconnect(self, connection: PooledConnection) -> PooledConnection:
+        self._close(connection)
+        with self._lock:
+            self._counters["reconnects"] += 1
+        return self._open()
+
+    def release(self, connection: Optional[PooledConnection], broken: bool = False) -> None:
+        try:
+            if connection is None:
+                return
+            if broken or connection.messages >= self.max_messages:
+                self._close(connection)
+                return
+            connection.last_used = time.monotonic()
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _close(connection: PooledConnection) -> None:
+        try:
+            connection.smtp.quit()
+        except Exception:
+            try:
+                connection.smtp.close()
+            except Exception:
+                pass
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "idle": len(self._idle), "size": self.size}
+
+
+# ---------------------------------------------------------
+# OUTBOX WORKER
+# ---------------------------------------------------------
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        connect: Callable[[], smtplib.SMTP],
+        build_message: Callable[..., Any],
+        pool_size: int = 2,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        poll_interval: float = 1.0,
+        retry_base: float = 30.0,
+        lease_seconds: float = 600.0,
+    ):
+        self.session_factory = session_factory
+        self.build_message = build_message
+        self.pool = SMTPConnectionPool(connect, size=pool_size)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.lease_seconds = lease_seconds
+        self._incoming: deque = deque()
+        self._wake = threading.Event()
+        self._senders = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp-send")
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._counters = {"persisted": 0, "sent": 0, "failed": 0, "retried": 0}
+
+    # ---------------------------------------------------------
+    # PRODUCERS
+    # ---------------------------------------------------------
+    def enqueue(self, to_email: str, subject: str, html_body: str, text_body: Optional[str] = None) -> None:
+        """Buffer a message for the worker (no I/O on the caller's thread)"""
+        self._incoming.append({
+            "to_email": to_email,
+            "subject": subject,
+            "html_body": html_body,
+            "text_body": text_body,
+        })
+        self._wake.set()
+
+    # ---------------------------------------------------------
+    # LIFECYCLE
+    # ---------------------------------------------------------
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+        logger.info("Email outbox worker started (%d SMTP connections)", self.pool.size)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        # Whatever is still buffered is at least persisted for the next start
+        self._persist_incoming()
+        self._senders.shutdown(wait=True)
+        self.pool.close_all()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wake.clear()
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Email outbox cycle failed")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """Persist buffered messages, then deliver one batch of due rows"""
+        self._persist_incoming()
+        rows = self._claim()
+        if not rows:
+            return 0
+        chunks = [rows[i::self.pool.size] for i in range(self.pool.size)]
+        outcomes = []
+        for result in self._senders.map(self._deliver_chunk, [c for c in chunks if c]):
+            outcomes.extend(result)
+        self._record(outcomes)
+        return len(rows)
+
+    # ---------------------------------------------------------
+    # STAGES
+    # ---------------------------------------------------------
+    def _persist_incoming(self) -> int:
+        batch = []
+        while self._incoming:
+            try:
+                batch.append(self._incoming.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return 0
+        now = datetime.utcnow()
+        for row in batch:
+            row.update(status="pending", attempts=0, next_attempt_at=now, created_at=now)
+        with self.session_factory() as db:
+            db.execute(insert(EmailOutbox.__table__), batch)
+            db.commit()
+        with self._lock:
+            self._counters["persisted"] += len(batch)
+        return len(batch)
+
+    def _claim(self) -> List[Any]:
+        """Due pending rows, plus rows whose sending lease expired"""
+        outbox = EmailOutbox.__table__
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(outbox.c.id, outbox.c.to_email, outbox.c.subject, outbox.c.html_body,
+                       outbox.c.text_body, outbox.c.attempts)
+                .where(or_(
+                    and_(outbox.c.status == "pending", outbox.c.next_attempt_at <= now),
+                    and_(outbox.c.status == "sending",
+                         or_(outbox.c.claimed_at.is_(None),
+                             outbox.c.claimed_at < now - timedelta(seconds=self.lease_seconds))),
+                ))
+                .order_by(outbox.c.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if rows:
+                db.execute(
+                    update(outbox).where(outbox.c.id.in_([r.id for r in rows]))
+                    .values(status="sending", claimed_at=now)
+                )
+            db.commit()
+        return rows
+
+    def _deliver_chunk(self, rows) -> List[Tuple[Any, Optional[str], bool]]:
+        """Send rows over one pooled connection; returns (row, error, permanent)"""
+        outcomes = []
+        connection = None
+        try:
+            connection = self.pool.acquire()
+        except Exception as e:
+            return [(row, f"SMTP connect failed: {e}", False) for row in rows]
+        broken = False
+        for row in rows:
+            message = self.build_message(row.to_email, row.subject, row.html_body, row.text_body)
+            for reconnected in (False, True):
+                try:
+                    connection.smtp.send_message(message)
+                    connection.messages += 1
+                    outcomes.append((row, None, False))
+                    break
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    code = getattr(e, "smtp_code", None) or _first_recipient_code(e)
+                    outcomes.append((row, f"SMTP rejected: {e}", bool(code and code >= 500)))
+                    break
+                except CONNECTION_ERRORS as e:
+                    if reconnected:
+                        outcomes.append((row, f"SMTP connection lost: {e}", False))
+                        broken = True
+                        break
+                    try:
+                        connection = self.pool.reconnect(connection)
+                    except Exception as reconnect_error:
+                        outcomes.append((row, f"SMTP reconnect failed: {reconnect_error}", False))
+                        broken = True
+                        break
+            if broken:
+                # Leave the rest of this chunk for the next cycle
+                outcomes.extend((r, "SMTP connection unavailable", False) for r in rows[len(outcomes):])
+                break
+        self.pool.release(connection, broken=broken)
+        return outcomes
+
+    def _record(self, outcomes) -> None:
+        now = datetime.utcnow()
+        rows = []
+        sent = failed = retried = 0
+        for row, error, permanent in outcomes:
+            attempts = row.attempts + 1
+            if error is None:
+                sent += 1
+                rows.append({"row_id": row.id, "new_status": "sent", "attempts": attempts,
+                             "error": None, "sent": now, "next": now})
+            elif permanent or attempts >= self.max_attempts:
+                failed += 1
+                rows.append({"row_id": row.id, "new_status": "failed", "attempts": attempts,
+                             "error": error, "sent": None, "next": now})
+            else:
+                retried += 1
+                delay = self.retry_base * (2 ** (attempts - 1))
+                rows.append({"row_id": row.id, "new_status": "pending", "attempts": attempts,
+                             "error": error, "sent": None, "next": now + timedelta(seconds=delay)})
+        outbox = EmailOutbox.__table__
+        with self.session_factory() as db:
+            db.execute(
+                update(outbox).where(outbox.c.id == bindparam("row_id")).values(
+                    status=bindparam("new_status"),
+                    attempts=bindparam("attempts"),
+                    last_error=bindparam("error"),
+                    sent_at=bindparam("sent"),
+                    next_attempt_at=bindparam("next"),
+                ),
+                rows,
+            )
+            db.commit()
+        with self._lock:
+            self._counters["sent"] += sent
+            self._counters["failed"] += failed
+            self._counters["retried"] += retried
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot["buffered"] = len(self._incoming)
+        snapshot["smtp_pool"] = self.pool.stats()
+        return snapshot
+
+
+def _first_recipient_code(error: Exception) -> Optional[int]:
+    recipients = getattr(error, "recipients", None) or {}
+    for code, _ in recipients.values():
+        return code
+    return None
+
+
+_worker: Optional[EmailOutboxWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_email_outbox() -> EmailOutboxWorker:
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                from app.config import SessionLocal
+                from app.services.email_service import EmailService
+                service = EmailService()
+                _worker = EmailOutboxWorker(
+                    SessionLocal,
+                    connect=service.open_connection,
+                    build_message=service.build_message,
+                    pool_size=settings.EMAIL_SMTP_POOL_SIZE,
+                    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+                    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+                    poll_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL_MS / 1000,
+                    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+                )
+                _worker.start()
+    return _worker
+
+
+def enqueue_email(to_email: str, subject: str, html_body: str, text_body: Optional[str] = None) -> None:
+    get_email_outbox().enqueue(to_email, subject, html_body, text_body)
+
+
+def shutdown_email_outbox(timeout: float = 10.0) -> None:
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop(timeout)
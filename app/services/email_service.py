@@ -43,7 +43,10 @@ class EmailService:
         html_body: str,
         text_body: Optional[str] = None
     ) -> bool:
-        """Send email via SMTP"""
+        """
+        Send email via SMTP. With EMAIL_OUTBOX_ENABLED (default) the message is
+        queued for the background outbox worker and True means "accepted".
+        """
         if not self.is_configured():
             logger.warning("Email service not configured. Email not sent.")
             # Provide masked SMTP config to help debugging without leaking secrets
@@ -66,32 +69,15 @@ class EmailService:
                 logger.info(f"Would send email to {to_email}: {subject}")
             return False
         
+        if settings.EMAIL_OUTBOX_ENABLED:
+            # Delivered by the outbox worker over a pooled SMTP connection
+            from app.services.email_outbox import enqueue_email
+            enqueue_email(to_email, subject, html_body, text_body)
+            return True
+
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text and HTML parts
-            if text_body:
-                text_part = MIMEText(text_body, 'plain')
-                msg.attach(text_part)
-            
-            html_part = MIMEText(html_body, 'html')
-            msg.attach(html_part)
-            
-            # Connect to SMTP server
-            if self.use_ssl:
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
-            else:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                if self.use_tls:
-                    server.starttls()
-            
-            # Login and send
-            server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
+            server = self.open_connection()
+            server.send_message(self.build_message(to_email, subject, html_body, text_body))
             server.quit()
             
             logger.info(f"Email sent successfully to {to_email}")
@@ -103,6 +89,40 @@ class EmailService:
                 logger.exception("Email sending error details:")
             return False
     
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_body: str,
+        text_body: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Build the multipart (text + HTML) message"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        
+        # Add text and HTML parts
+        if text_body:
+            text_part = MIMEText(text_body, 'plain')
+            msg.attach(text_part)
+        
+        html_part = MIMEText(html_body, 'html')
+        msg.attach(html_part)
+        return msg
+    
+    def open_connection(self) -> smtplib.SMTP:
+        """Connect (SSL or STARTTLS per settings) and log in"""
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+            if self.use_tls:
+                server.starttls()
+        
+        server.login(self.smtp_username, self.smtp_password)
+        return server
+    
     def send_otp_email(self, to_email: str, otp_code: str, otp_type: str = "registration") -> bool:
         """Send OTP via email"""
         # OTP delivery has been disabled by administrator request.
@@ -0,0 +1,509 @@
+"""
+Hostel search engine (Elasticsearch).
+
+Querying:
+ - `search_hostels` runs one request per search: relevance from a fuzzy
+   multi_match plus edge-n-gram prefix matches on name / location, filters
+   (city, gender, amenities, price, rating, availability, geo radius), the
+   requested sort (distance sorts by `_geo_distance`) and the facet
+   aggregations the visitor filters are built from
+ - `autocomplete_hostels` matches the typed prefix against the edge-n-gram
+   subfields
+ Both return None when Elasticsearch is unavailable or the request fails;
+ callers then use the database search in SearchService.
+
+Indexing:
+ - `HostelSearchIndexer` builds documents with three set-based queries per
+   chunk (hostels, room prices, review ratings) and writes them with
+   `helpers.bulk`; hostels that were deleted or are no longer public are
+   removed from the index in the same bulk request
+ - change-data sync: hostel, room and review writes flushed through an ORM
+   session record the affected hostel ids; on commit they are handed to the
+   `HostelSearchSync` worker, which debounces them for
+   SEARCH_SYNC_FLUSH_SECONDS and re-indexes the batch in one bulk call.
+   Ids of a failed call are retried every ELASTICSEARCH_RETRY_SECONDS.
+   Writes that bypass the ORM (Core / raw SQL) are picked up by `reindex_all`
+"""
+
+import logging
+import threading
+import time
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from elasticsearch import helpers
+from sqlalchemy import event, func, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.elasticsearch import HOSTEL_INDEX, get_elasticsearch, mark_elasticsearch_down
+from app.models.hostel import Hostel, Location
+from app.models.review import Review
+from app.models.rooms import Room
+from app.schemas.search import HostelSearchFilters, HostelSearchSort
+
+logger = logging.getLogger(__name__)
+
+# Facet buckets for the starting price of a hostel
+PRICE_RANGES = [
+    {"key": "under_5000", "to": 5000},
+    {"key": "5000_10000", "from": 5000, "to": 10000},
+    {"key": "10000_15000", "from": 10000, "to": 15000},
+    {"key": "above_15000", "from": 15000},
+]
+
+# Fields returned with every hit (geo_location is only used for queries)
+_RESULT_FIELDS = [
+    "id", "name", "description", "location", "city", "area", "pincode", "latitude", "longitude", "gender",
+    "contact_phone", "contact_email", "available_beds", "total_beds", "price_range_min", "price_range_max",
+    "rating", "review_count", "amenities",
+]
+
+
+# ---------------------------------------------------------
+# DOCUMENTS
+# ---------------------------------------------------------
+def hostel_documents(db: Session, hostel_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Index documents for the given hostels, keyed by id
+
+    Hostels that do not exist or are not public are left out.
+    """
+    ids = sorted(set(hostel_ids))
+    if not ids:
+        return {}
+    hostels, locations = Hostel.__table__, Location.__table__
+    rooms, reviews = Room.__table__, Review.__table__
+
+    hostel_rows = db.execute(
+        select(
+            hostels.c.id, hostels.c.hostel_name, hostels.c.description, hostels.c.full_address,
+            func.coalesce(locations.c.city, hostels.c.city).label("city"), hostels.c.pincode,
+            hostels.c.gender_type, hostels.c.contact_phone, hostels.c.contact_email, hostels.c.amenities,
+            hostels.c.total_beds, hostels.c.current_occupancy, hostels.c.latitude, hostels.c.longitude,
+            hostels.c.created_at,
+        )
+        .select_from(hostels.outerjoin(locations, locations.c.id == hostels.c.location_id))
+        .where(hostels.c.id.in_(ids), hostels.c.visibility == "public")
+    ).all()
+    if not hostel_rows:
+        return {}
+
+    room_price = func.coalesce(rooms.c.monthly_price, rooms.c.price)
+    prices = {
+        row.hostel_id: row
+        for row in db.execute(
+            select(rooms.c.hostel_id, func.min(room_price).label("low"), func.max(room_price).label("high"))
+            .where(rooms.c.hostel_id.in_(ids))
+            .group_by(rooms.c.hostel_id)
+        )
+    }
+    ratings = {
+        row.hostel_id: row
+        for row in db.execute(
+            select(reviews.c.hostel_id, func.avg(reviews.c.rating).label("rating"), func.count().label("count"))
+            .where(
+                reviews.c.hostel_id.in_(ids),
+                reviews.c.is_approved.is_(True),
+                reviews.c.is_spam.is_(False),
+            )
+            .group_by(reviews.c.hostel_id)
+        )
+    }
+
+    documents = {}
+    for row in hostel_rows:
+        price, rating = prices.get(row.id), ratings.get(row.id)
+        total_beds = row.total_beds or 0
+        latitude = float(row.latitude) if row.latitude is not None else None
+        longitude = float(row.longitude) if row.longitude is not None else None
+        document = {
+            "id": row.id,
+            "name": row.hostel_name or "",
+            "description": row.description or "",
+            "location": row.full_address or "",
+            "city": row.city or "",
+            "area": "",
+            "pincode": row.pincode or "",
+            "gender": row.gender_type or "",
+            "contact_phone": row.contact_phone or "",
+            "contact_email": row.contact_email or "",
+            "amenities": [a.strip() for a in (row.amenities or "").split(",") if a.strip()],
+            "total_beds": total_beds,
+            "available_beds": max(total_beds - (row.current_occupancy or 0), 0),
+            "price_range_min": float(price.low) if price is not None and price.low is not None else 0.0,
+            "price_range_max": float(price.high) if price is not None and price.high is not None else 0.0,
+            "rating": round(float(rating.rating), 2) if rating is not None else 0.0,
+            "review_count": rating.count if rating is not None else 0,
+            "latitude": latitude,
+            "longitude": longitude,
+            "created_at": row.created_at.isoformat() if row.created_at is not None else None,
+        }
+        if latitude is not None and longitude is not None:
+            document["geo_location"] = {"lat": latitude, "lon": longitude}
+        documents[row.id] = document
+    return documents
+
+
+# ---------------------------------------------------------
+# QUERIES
+# ---------------------------------------------------------
+def build_search_body(filters: HostelSearchFilters, sort: Optional[HostelSearchSort],
+                      page: int, page_size: int) -> Dict[str, Any]:
+    """Request body for one search: hits, exact total and facets"""
+    must: List[Dict[str, Any]] = []
+    filter_clauses: List[Dict[str, Any]] = []
+
+    if filters.query:
+        must.append({
+            "bool": {
+                "should": [
+                    # whole words, typo tolerant
+                    {"multi_match": {
+                        "query": filters.query,
+                        "fields": ["name^3", "name.fuzzy^2", "location", "description"],
+                        "fuzziness": "AUTO",
+                        "prefix_length": 1,
+                    }},
+                    # words being typed: "sunr" matches "Sunrise"
+                    {"match": {"name.autocomplete": {"query": filters.query, "operator": "and", "boost": 2}}},
+                    {"match": {"location.autocomplete": {"query": filters.query, "operator": "and"}}},
+                ],
+                "minimum_should_match": 1,
+            }
+        })
+
+    if filters.city:
+        filter_clauses.append({"term": {"city": filters.city}})
+    if filters.area:
+        filter_clauses.append({"match": {"location": {"query": filters.area, "operator": "and"}}})
+    if filters.pincode:
+        filter_clauses.append({"term": {"pincode": filters.pincode}})
+    if filters.gender:
+        filter_clauses.append({"term": {"gender": filters.gender}})
+    for amenity in filters.amenities or []:
+        filter_clauses.append({"term": {"amenities": amenity}})
+    # hostels whose room prices overlap the requested range
+    if filters.min_price is not None:
+        filter_clauses.append({"range": {"price_range_max": {"gte": float(filters.min_price)}}})
+    if filters.max_price is not None:
+        filter_clauses.append({"range": {"price_range_min": {"lte": float(filters.max_price)}}})
+    if filters.min_rating:
+        filter_clauses.append({"range": {"rating": {"gte": filters.min_rating}}})
+    if filters.available_only:
+        filter_clauses.append({"range": {"available_beds": {"gt": 0}}})
+
+    origin = None
+    if filters.latitude is not None and filters.longitude is not None:
+        origin = {"lat": filters.latitude, "lon": filters.longitude}
+        filter_clauses.append({
+            "geo_distance": {"distance": f"{filters.radius_km or 5}km", "geo_location": origin}
+        })
+
+    sort_by = sort.sort_by if sort else "rating"
+    sort_clauses: List[Any] = {
+        "price_asc": [{"price_range_min": "asc"}],
+        "price_desc": [{"price_range_max": "desc"}],
+        "rating": [{"rating": "desc"}, {"review_count": "desc"}],
+        "newest": [{"created_at": {"order": "desc", "missing": "_last"}}],
+        "popularity": [{"review_count": "desc"}, {"rating": "desc"}],
+        "relevance": [],
+        "distance": [],
+    }.get(sort_by, [])
+    if sort_by == "distance" and origin is not None:
+        sort_clauses = [{"_geo_distance": {"geo_location": origin, "order": "asc", "unit": "km"}}]
+    # relevance breaks ties (and is the order when nothing else applies), id keeps pages stable
+    sort_clauses = sort_clauses + ["_score", {"id": "asc"}]
+
+    return {
+        "query": {
+            "bool": {
+                "must": must or [{"match_all": {}}],
+                "filter": filter_clauses,
+            }
+        },
+        "sort": sort_clauses,
+        "from": (page - 1) * page_size,
+        "size": page_size,
+        "track_total_hits": True,
+        "_source": _RESULT_FIELDS,
+        "aggs": {
+            "cities": {"terms": {"field": "city", "size": 50}},
+            "genders": {"terms": {"field": "gender", "size": 10}},
+            "amenities": {"terms": {"field": "amenities", "size": 30}},
+            "price_ranges": {"range": {"field": "price_range_min", "ranges": PRICE_RANGES}},
+        },
+    }
+
+
+def parse_search_response(response: Dict[str, Any], distance_sorted: bool = False) -> Dict[str, Any]:
+    """Turn a search response into HostelSearchResult dicts, the total and facets"""
+    results = []
+    for hit in response["hits"]["hits"]:
+        source = dict(hit["_source"])
+        for field in ("description", "location", "city", "area", "pincode", "gender", "contact_phone",
+                      "contact_email"):
+            source[field] = source.get(field) or ""
+        source.setdefault("amenities", [])
+        source["photos"] = []
+        source["distance_km"] = round(hit["sort"][0], 3) if distance_sorted and hit.get("sort") else None
+        results.append(source)
+
+    aggregations = response.get("aggregations", {})
+    facets = {
+        name: [{"value": bucket["key"], "count": bucket["doc_count"]} for bucket in aggregations[name]["buckets"]]
+        for name in ("cities", "genders", "amenities")
+        if name in aggregations
+    }
+    if "price_ranges" in aggregations:
+        facets["price_ranges"] = {
+            bucket["key"]: bucket["doc_count"] for bucket in aggregations["price_ranges"]["buckets"]
+        }
+    return {"results": results, "total": response["hits"]["total"]["value"], "facets": facets}
+
+
+def search_hostels(filters: HostelSearchFilters, sort: Optional[HostelSearchSort], page: int,
+                   page_size: int, es=None) -> Optional[Dict[str, Any]]:
+    """Search the hostel index; None when Elasticsearch cannot answer"""
+    es = es or get_elasticsearch()
+    if es is None:
+        return None
+    body = build_search_body(filters, sort, page, page_size)
+    try:
+        response = es.search(index=HOSTEL_INDEX, **body)
+    except Exception as e:
+        logger.warning("Elasticsearch search failed, using the database: %s", e)
+        mark_elasticsearch_down()
+        return None
+    distance_sorted = "_geo_distance" in body["sort"][0]
+    return parse_search_response(response.body, distance_sorted)
+
+
+def autocomplete_hostels(query: str, field: str = "name", limit: int = 10, es=None) -> Optional[List[dict]]:
+    """Suggestions for a typed prefix; None when Elasticsearch cannot answer"""
+    es = es or get_elasticsearch()
+    if es is None:
+        return None
+    try:
+        response = es.search(
+            index=HOSTEL_INDEX,
+            query={"match": {f"{field}.autocomplete": {"query": query, "operator": "and"}}},
+            size=limit,
+            _source=[field, "city"],
+        )
+    except Exception as e:
+        logger.warning("Elasticsearch autocomplete failed, using the database: %s", e)
+        mark_elasticsearch_down()
+        return None
+    suggestions, seen = [], set()
+    for hit in response.body["hits"]["hits"]:
+        source = hit["_source"]
+        value = source.get(field)
+        if value and value not in seen:
+            seen.add(value)
+            suggestions.append({field: value, "city": source.get("city")})
+    return suggestions
+
+
+# ---------------------------------------------------------
+# INDEXING
+# ---------------------------------------------------------
+class HostelSearchIndexer:
+    def __init__(self, session_factory: Callable[[], Any], es_factory: Callable[[], Any] = get_elasticsearch,
+                 chunk_size: Optional[int] = None):
+        self.session_factory = session_factory
+        self.es_factory = es_factory
+        self.chunk_size = chunk_size or settings.SEARCH_INDEX_CHUNK_SIZE
+
+    def sync(self, hostel_ids: Iterable[int]) -> bool:
+        """Re-index (or remove) the given hostels; False when Elasticsearch is unavailable"""
+        ids = sorted(set(hostel_ids))
+        if not ids:
+            return True
+        es = self.es_factory()
+        if es is None:
+            return False
+        with self.session_factory() as db:
+            documents = hostel_documents(db, ids)
+        try:
+            self._bulk(es, self._actions(ids, documents))
+        except Exception as e:
+            logger.warning("Hostel search sync of %d hostels failed: %s", len(ids), e)
+            mark_elasticsearch_down()
+            return False
+        return True
+
+    def reindex_all(self) -> int:
+        """Index every public hostel, one bulk request per chunk; returns the number indexed"""
+        es = self.es_factory()
+        if es is None:
+            return 0
+        hostels = Hostel.__table__
+        indexed, last_id = 0, 0
+        with self.session_factory() as db:
+            while True:
+                ids = db.execute(
+                    select(hostels.c.id).where(hostels.c.id > last_id).order_by(hostels.c.id).limit(self.chunk_size)
+                ).scalars().all()
+                if not ids:
+                    break
+                last_id = ids[-1]
+                documents = hostel_documents(db, ids)
+                self._bulk(es, self._actions(ids, documents))
+                indexed += len(documents)
+        logger.info("Hostel search index rebuilt: %d hostels", indexed)
+        return indexed
+
+    @staticmethod
+    def _actions(ids: List[int], documents: Dict[int, Dict[str, Any]]):
+        for hostel_id in ids:
+            document = documents.get(hostel_id)
+            if document is None:
+                yield {"_op_type": "delete", "_index": HOSTEL_INDEX, "_id": hostel_id}
+            else:
+                yield {"_index": HOSTEL_INDEX, "_id": hostel_id, "_source": document}
+
+    def _bulk(self, es, actions) -> None:
+        # deleting a hostel that was never indexed is not an error
+        _, errors = helpers.bulk(es, actions, chunk_size=self.chunk_size, raise_on_error=False, ignore_status=(404,))
+        if errors:
+            logger.warning("Hostel search bulk request rejected %d documents: %s", len(errors), errors[:3])
+
+
+# ---------------------------------------------------------
+# CHANGE-DATA SYNC
+# ---------------------------------------------------------
+class HostelSearchSync:
+    """Background worker that re-indexes hostels changed by committed writes"""
+
+    def __init__(self, indexer: HostelSearchIndexer, flush_seconds: Optional[float] = None,
+                 retry_seconds: Optional[float] = None):
+        self.indexer = indexer
+        self.flush_seconds = settings.SEARCH_SYNC_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.retry_seconds = settings.ELASTICSEARCH_RETRY_SECONDS if retry_seconds is None else retry_seconds
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._counters = {"enqueued": 0, "synced": 0, "failed_batches": 0}
+
+    def enqueue(self, hostel_ids: Iterable[int]) -> None:
+        with self._lock:
+            before = len(self._pending)
+            self._pending.update(hostel_ids)
+            self._counters["enqueued"] += len(self._pending) - before
+        self._wake.set()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="hostel-search-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while self._running:
+            # Ids left by a failed flush are retried even if no write comes in
+            with self._lock:
+                retrying = bool(self._pending)
+            self._wake.wait(self.retry_seconds if retrying else None)
+            self._wake.clear()
+            # let a burst of writes (e.g. rooms added one by one) collapse into one request
+            if self._running and self.flush_seconds:
+                time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Hostel search sync failed")
+
+    def flush(self) -> int:
+        """Sync everything pending now; ids are kept for the next try if Elasticsearch is down"""
+        with self._lock:
+            ids, self._pending = self._pending, set()
+        if not ids:
+            return 0
+        if self.indexer.sync(ids):
+            with self._lock:
+                self._counters["synced"] += len(ids)
+            return len(ids)
+        with self._lock:
+            self._pending |= ids
+            self._counters["failed_batches"] += 1
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters, pending=len(self._pending))
+
+
+def _changed_hostel_ids(obj) -> List[int]:
+    if isinstance(obj, Hostel):
+        return [obj.id]
+    if isinstance(obj, (Room, Review)):
+        # a room or review moved to another hostel changes both documents
+        return [obj.hostel_id, *sa_inspect(obj).attrs.hostel_id.history.deleted]
+    return []
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_search_changes(session, flush_context):
+    if _sync is None:
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        for hostel_id in _changed_hostel_ids(obj):
+            if hostel_id is not None:
+                session.info.setdefault("search_hostel_ids", set()).add(hostel_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_search_changes(session):
+    ids = session.info.pop("search_hostel_ids", None)
+    if ids and _sync is not None:
+        _sync.enqueue(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_search_changes(session):
+    session.info.pop("search_hostel_ids", None)
+
+
+_sync: Optional[HostelSearchSync] = None
+_sync_lock = threading.Lock()
+
+
+def get_search_sync() -> HostelSearchSync:
+    global _sync
+    if _sync is None:
+        with _sync_lock:
+            if _sync is None:
+                from app.config import SessionLocal
+                sync = HostelSearchSync(HostelSearchIndexer(SessionLocal))
+                sync.start()
+                _sync = sync
+    return _sync
+
+
+def set_search_sync(sync: Optional[HostelSearchSync]) -> None:
+    """Install a sync worker (or disable change capture with None), mainly for tests"""
+    global _sync
+    with _sync_lock:
+        _sync = sync
+
+
+def shutdown_search_sync(timeout: float = 10.0) -> None:
+    global _sync
+    with _sync_lock:
+        sync, _sync = _sync, None
+    if sync is not None:
+        sync.stop(timeout)
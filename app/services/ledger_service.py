@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
 from typing import Optional, Dict
 from datetime import date
-from app.repositories.ledger_repositorys import LedgerRepository, ReportRepository
+from app.repositories.ledger_repositorys import LedgerRepository, ReportRepository, TRANSACTION_EXPORT_COLUMNS
+from app.utils.streaming_export import stream_rows, streaming_export_response
 
 class LedgerService:
     def __init__(self, db: Session):
@@ -41,6 +42,26 @@ class LedgerService:
             }
         }
 
+    def export_transaction_history(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        hostel_id: Optional[int],
+        user_id: Optional[int],
+        transaction_type: Optional[str],
+        export_format: str = "csv",
+    ):
+        statement = self.ledger_repo.transaction_export_statement(
+            start_date=start_date,
+            end_date=end_date,
+            hostel_id=hostel_id,
+            user_id=user_id,
+            transaction_type=transaction_type,
+        )
+        return streaming_export_response(
+            list(TRANSACTION_EXPORT_COLUMNS), stream_rows(statement), export_format, "transactions"
+        )
+
     def get_outstanding_payments_report(self, hostel_id, overdue_only):
         invoices = self.ledger_repo.get_outstanding_payments(hostel_id, overdue_only)
 
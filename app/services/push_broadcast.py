@@ -0,0 +1,312 @@
+"""
+Push broadcast fan-out engine.
+
+`POST /notifications/broadcast/` only creates the NotificationBatch row and
+queues it here; the HTTP call returns the batch id at once and progress is
+read back from the batch row. A broadcast is processed in bulk:
+
+ 1. the audience's device tokens are read in one query (one token per user)
+ 2. all NotificationLog rows are inserted in one multi-row INSERT
+ 3. tokens are sent through FCM multicast in chunks of
+    PUSH_MULTICAST_CHUNK_SIZE (max 500) on a pool of PUSH_SEND_WORKERS
+    threads, which caps the FCM calls in flight
+ 4. after each chunk, log statuses / message ids / timestamps are written back
+    in one executemany UPDATE, the batch counters are bumped and tokens FCM
+    reported as unregistered are deactivated
+
+Only a token's own UnregisteredError deactivates it. When the multicast call
+itself fails (bad credentials, wrong project, transport error, invalid
+payload), nothing is known about the individual tokens: the chunk is retried
+with backoff and, if it keeps failing, its logs are marked failed while every
+token stays active.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert, select, update
+
+from app.config import settings
+from app.models.push_models import (
+    DeviceToken, NotificationBatch, NotificationLog, NotificationStatus,
+    TargetAudience, UserRole,
+)
+
+logger = logging.getLogger(__name__)
+
+# (device_tokens, title, body, data, priority) -> [(message_id, error, unregistered), ...]
+MulticastSender = Callable[..., List[Tuple[Optional[str], Optional[str], bool]]]
+
+FCM_MAX_MULTICAST = 500
+
+
+class BroadcastEngine:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        sender: Optional[MulticastSender] = None,
+        chunk_size: int = FCM_MAX_MULTICAST,
+        send_workers: int = 4,
+        batch_workers: int = 2,
+        send_retries: int = 2,
+        retry_backoff: float = 1.0,
+    ):
+        if sender is None:
+            from app.services.push_services import send_fcm_multicast
+            sender = send_fcm_multicast
+        self.session_factory = session_factory
+        self.sender = sender
+        self.chunk_size = max(1, min(chunk_size, FCM_MAX_MULTICAST))
+        self.send_retries = max(0, send_retries)
+        self.retry_backoff = retry_backoff
+        self._send_pool = ThreadPoolExecutor(max_workers=max(1, send_workers), thread_name_prefix="push-send")
+        self._batch_pool = ThreadPoolExecutor(max_workers=max(1, batch_workers), thread_name_prefix="push-batch")
+        self._lock = threading.Lock()
+        self._counters = {
+            "batches_submitted": 0,
+            "batches_completed": 0,
+            "batches_failed": 0,
+            "chunks_sent": 0,
+            "chunk_retries": 0,
+            "messages_sent": 0,
+            "messages_failed": 0,
+            "tokens_deactivated": 0,
+        }
+
+    # ---------------------------------------------------------
+    # SUBMISSION
+    # ---------------------------------------------------------
+    def submit(self, batch_id: int, request: Dict[str, Any]):
+        """Queue a created NotificationBatch for fan-out; returns a Future"""
+        with self._lock:
+            self._counters["batches_submitted"] += 1
+        return self._batch_pool.submit(self.run_batch, batch_id, request)
+
+    def run_batch(self, batch_id: int, request: Dict[str, Any]) -> Dict[str, int]:
+        batches = NotificationBatch.__table__
+        try:
+            with self.session_factory() as db:
+                db.execute(update(batches).where(batches.c.id == batch_id).values(status="running"))
+                recipients = self._load_recipients(db, request)
+                db.execute(
+                    update(batches).where(batches.c.id == batch_id)
+                    .values(total_recipients=len(recipients))
+                )
+                pending = self._insert_logs(db, batch_id, request, recipients)
+                db.commit()
+
+                sent = failed = 0
+                futures = [
+                    self._send_pool.submit(self._send_chunk, pending[i:i + self.chunk_size], request)
+                    for i in range(0, len(pending), self.chunk_size)
+                ]
+                for future in as_completed(futures):
+                    chunk_sent, chunk_failed = self._write_back(db, batch_id, future.result())
+                    db.commit()
+                    sent += chunk_sent
+                    failed += chunk_failed
+
+                db.execute(
+                    update(batches).where(batches.c.id == batch_id)
+                    .values(status="completed", completed_at=datetime.utcnow())
+                )
+                db.commit()
+        except Exception:
+            logger.exception("Broadcast batch %s failed", batch_id)
+            with self._lock:
+                self._counters["batches_failed"] += 1
+            with self.session_factory() as db:
+                db.execute(
+                    update(batches).where(batches.c.id == batch_id)
+                    .values(status="failed", completed_at=datetime.utcnow())
+                )
+                db.commit()
+            raise
+
+        with self._lock:
+            self._counters["batches_completed"] += 1
+        return {"total": len(recipients), "sent": sent, "failed": failed}
+
+    # ---------------------------------------------------------
+    # STAGES
+    # ---------------------------------------------------------
+    @staticmethod
+    def _load_recipients(db, request: Dict[str, Any]) -> List[Any]:
+        tokens = DeviceToken.__table__
+        q = (
+            select(tokens.c.user_id, tokens.c.user_role, tokens.c.hostel_id, tokens.c.device_token)
+            .where(tokens.c.is_active == True)  # noqa: E712
+            .order_by(tokens.c.id)
+        )
+        audience = request["target_audience"]
+        if audience == TargetAudience.specific_hostel:
+            q = q.where(tokens.c.hostel_id.in_(request.get("hostel_ids") or []))
+        if audience == TargetAudience.specific_users:
+            q = q.where(tokens.c.user_id.in_(request.get("user_ids") or []))
+        if audience == TargetAudience.all_students:
+            q = q.where(tokens.c.user_role == UserRole.student)
+
+        # One token per user (the most recently registered one)
+        return list({row.user_id: row for row in db.execute(q)}.values())
+
+    @staticmethod
+    def _insert_logs(db, batch_id: int, request: Dict[str, Any], recipients: List[Any]) -> List[Tuple[int, str]]:
+        """Insert one pending log per recipient; returns [(log_id, device_token), ...]"""
+        if not recipients:
+            return []
+        logs = NotificationLog.__table__
+        now = datetime.utcnow()
+        db.execute(insert(logs), [
+            {
+                "batch_id": batch_id,
+                "user_id": r.user_id,
+                "user_role": r.user_role,
+                "hostel_id": r.hostel_id,
+                "notification_type": request["notification_type"],
+                "title": request["title"],
+                "body": request["body"],
+                "data": request.get("data"),
+                "priority": request["priority"],
+                "status": NotificationStatus.pending,
+                "created_at": now,
+            }
+            for r in recipients
+        ])
+        token_by_user = {r.user_id: r.device_token for r in recipients}
+        rows = db.execute(
+            select(logs.c.id, logs.c.user_id).where(logs.c.batch_id == batch_id).order_by(logs.c.id)
+        )
+        return [(row.id, token_by_user[row.user_id]) for row in rows]
+
+    def _send_chunk(self, chunk: List[Tuple[int, str]], request: Dict[str, Any]):
+        """[(log_id, token, message_id, error, unregistered), ...] for one chunk"""
+        tokens = [token for _, token in chunk]
+        for attempt in range(self.send_retries + 1):
+            try:
+                results = self.sender(
+                    tokens, request["title"], request["body"], request.get("data"), request["priority"]
+                )
+                break
+            except Exception as e:
+                if attempt < self.send_retries:
+                    logger.warning("FCM multicast of %d tokens failed (attempt %d), retrying: %s",
+                                   len(tokens), attempt + 1, e)
+                    with self._lock:
+                        self._counters["chunk_retries"] += 1
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                # Says nothing about the individual tokens: fail their logs,
+                # never deactivate them
+                logger.error("FCM multicast of %d tokens failed after %d attempts: %s",
+                             len(tokens), attempt + 1, e)
+                results = [(None, str(e), False)] * len(tokens)
+        return [
+            (log_id, token, message_id, error, bool(unregistered))
+            for (log_id, token), (message_id, error, unregistered) in zip(chunk, results)
+        ]
+
+    def _write_back(self, db, batch_id: int, outcomes) -> Tuple[int, int]:
+        logs = NotificationLog.__table__
+        now = datetime.utcnow()
+        rows, dead_tokens, sent = [], [], 0
+        for log_id, token, message_id, error, unregistered in outcomes:
+            if message_id:
+                sent += 1
+                rows.append({"log_id": log_id, "new_status": NotificationStatus.sent,
+                             "message_id": message_id, "error": None, "sent": now})
+            else:
+                rows.append({"log_id": log_id, "new_status": NotificationStatus.failed,
+                             "message_id": None, "error": error, "sent": None})
+                if unregistered:
+                    dead_tokens.append(token)
+        failed = len(rows) - sent
+
+        if rows:
+            db.execute(
+                update(logs).where(logs.c.id == bindparam("log_id")).values(
+                    status=bindparam("new_status"),
+                    fcm_message_id=bindparam("message_id"),
+                    error_message=bindparam("error"),
+                    sent_at=bindparam("sent"),
+                ),
+                rows,
+            )
+        batches = NotificationBatch.__table__
+        db.execute(
+            update(batches).where(batches.c.id == batch_id).values(
+                sent_count=batches.c.sent_count + sent,
+                failed_count=batches.c.failed_count + failed,
+            )
+        )
+        if dead_tokens:
+            tokens = DeviceToken.__table__
+            db.execute(
+                update(tokens).where(tokens.c.device_token.in_(dead_tokens)).values(is_active=False)
+            )
+
+        with self._lock:
+            self._counters["chunks_sent"] += 1
+            self._counters["messages_sent"] += sent
+            self._counters["messages_failed"] += failed
+            self._counters["tokens_deactivated"] += len(dead_tokens)
+        return sent, failed
+
+    # ---------------------------------------------------------
+    # LIFECYCLE
+    # ---------------------------------------------------------
+    def shutdown(self, wait: bool = True) -> None:
+        self._batch_pool.shutdown(wait=wait)
+        self._send_pool.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters)
+
+
+def batch_progress(batch: NotificationBatch) -> Dict[str, Any]:
+    total = batch.total_recipients or 0
+    done = (batch.sent_count or 0) + (batch.failed_count or 0)
+    return {
+        "batch_id": batch.id,
+        "status": batch.status,
+        "total": total,
+        "sent": batch.sent_count or 0,
+        "failed": batch.failed_count or 0,
+        "pending": max(0, total - done),
+        "progress": round(done / total, 4) if total else (1.0 if batch.status == "completed" else 0.0),
+        "created_at": batch.created_at,
+        "completed_at": batch.completed_at,
+    }
+
+
+_engine: Optional[BroadcastEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_broadcast_engine() -> BroadcastEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from app.config import SessionLocal
+                _engine = BroadcastEngine(
+                    SessionLocal,
+                    chunk_size=settings.PUSH_MULTICAST_CHUNK_SIZE,
+                    send_workers=settings.PUSH_SEND_WORKERS,
+                    batch_workers=settings.PUSH_BATCH_WORKERS,
+                    send_retries=settings.PUSH_SEND_RETRIES,
+                    retry_backoff=settings.PUSH_RETRY_BACKOFF_SECONDS,
+                )
+    return _engine
+
+
+def shutdown_broadcast_engine(wait: bool = True) -> None:
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.shutdown(wait=wait)
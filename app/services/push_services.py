@@ -1,9 +1,11 @@
+from typing import List, Optional, Tuple
+
 import firebase_admin
 from firebase_admin import messaging
 from app.models.push_models import NotificationPriority
 
 
-async def send_fcm_notification(
+def send_fcm_notification(
     device_token: str,
     title: str,
     body: str,
@@ -25,3 +27,37 @@ async def send_fcm_notification(
 
     except Exception as e:
         return None, str(e)
+
+
+def send_fcm_multicast(
+    device_tokens: List[str],
+    title: str,
+    body: str,
+    data: Optional[dict],
+    priority: NotificationPriority
+) -> List[Tuple[Optional[str], Optional[str], bool]]:
+    """
+    Send one notification to up to 500 device tokens in a single FCM
+    multicast call (blocking). Returns (message_id, error, unregistered) per
+    token, in order; `unregistered` is set only when FCM reported that token
+    itself as no longer registered.
+    """
+    fcm_priority = "high" if priority in [NotificationPriority.high, NotificationPriority.urgent] else "normal"
+
+    message = messaging.MulticastMessage(
+        notification=messaging.Notification(title=title, body=body),
+        data={k: str(v) for k, v in (data or {}).items()},
+        android=messaging.AndroidConfig(priority=fcm_priority),
+        tokens=list(device_tokens),
+    )
+
+    response = messaging.send_each_for_multicast(message)
+    return [
+        (r.message_id, None, False) if r.success else (None, str(r.exception), is_unregistered(r.exception))
+        for r in response.responses
+    ]
+
+
+def is_unregistered(exc: Optional[BaseException]) -> bool:
+    """True when FCM rejected a token because it is no longer registered"""
+    return isinstance(exc, messaging.UnregisteredError) or getattr(exc, "code", None) == "registration-token-not-registered"
@@ -1,9 +1,15 @@
 # app/services/reminder_service.py
 
-from datetime import datetime
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import uuid
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, bindparam, insert, or_, update
+from sqlalchemy.orm import Session, selectinload
+from app.core.advisory_lock import advisory_lock
 from app.models.payment_models import (
     Invoice, ReminderConfiguration, PaymentReminder, ReminderType,
     ReminderChannel, ReminderStatus, ReminderTemplate
@@ -12,13 +18,23 @@ from app.utils.email_utilss import send_email_reminder
 from app.utils.sms_utilss import send_sms_reminder
 from app.utils.template_utilss import render_template
 
+logger = logging.getLogger(__name__)
+
+OPEN_INVOICE_STATUSES = ("pending", "partial", "overdue")
+# pg_try_advisory_lock key held while the automated reminder job runs
+REMINDER_JOB_LOCK_KEY = 7_310_016
+# Invoices of hostels without a reminder configuration are looked at again daily
+NO_CONFIG_RECHECK = timedelta(days=1)
+# A reminder that was due but not delivered is retried on the next hourly run
+RETRY_AFTER = timedelta(hours=1)
+
 
 # -----------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------
 
 def generate_reminder_id():
-    return f"REM-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}"
+    return f"REM-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12].upper()}"
 
 
 def get_template_context(invoice: Invoice):
@@ -37,9 +53,9 @@ def get_template_context(invoice: Invoice):
         "paid_amount": f"₹{invoice.paid_amount:.2f}",
         "due_date": invoice.due_date.strftime("%d-%b-%Y"),
         "days_overdue": days_overdue,
-        "hostel_name": hostel.name,
-        "hostel_phone": hostel.phone or "N/A",
-        "hostel_email": hostel.email or "N/A",
+        "hostel_name": hostel.name or hostel.hostel_name,
+        "hostel_phone": getattr(hostel, "contact_phone", None) or "N/A",
+        "hostel_email": getattr(hostel, "contact_email", None) or "N/A",
         "payment_link": f"https://hostelpay.com/pay/{invoice.invoice_number}"
     }
 
@@ -75,7 +91,7 @@ def create_and_schedule_reminder(invoice: Invoice, reminder_type: ReminderType,
         reminder_type=reminder_type,
         channel=channel,
         recipient_email=user.email,
-        recipient_phone=user.phone,
+        recipient_phone=user.phone_number,
         subject=subject,
         message_body=email_body,
         scheduled_at=datetime.utcnow(),
@@ -103,61 +119,76 @@ def process_single_reminder(reminder_id: int, db: Session):
     invoice = reminder.invoice
     user = invoice.user
 
-    email_success = False
-    sms_success = False
-
-    # EMAIL
-    if reminder.channel in [ReminderChannel.EMAIL, ReminderChannel.BOTH]:
-        if user.email and user.email_notifications:
-            email_success = send_email_reminder(
-                reminder.recipient_email,
-                reminder.subject,
-                reminder.message_body
-            )
-
-    # SMS
-    if reminder.channel in [ReminderChannel.SMS, ReminderChannel.BOTH]:
-        if user.phone and user.sms_notifications:
-            sms_success = send_sms_reminder(reminder.recipient_phone, reminder.message_body)
+    delivered = deliver_reminder(reminder.channel, reminder.recipient_email, reminder.recipient_phone,
+                                 reminder.subject, reminder.message_body, user)
 
     # Update status
-    if email_success or sms_success:
+    if delivered:
         reminder.status = ReminderStatus.SENT
         reminder.sent_at = datetime.utcnow()
         invoice.last_reminder_sent = datetime.utcnow()
-        invoice.reminder_count += 1
+        invoice.reminder_count = (invoice.reminder_count or 0) + 1
     else:
         reminder.status = ReminderStatus.FAILED
 
     db.commit()
 
 
+def deliver_reminder(channel, email: Optional[str], phone: Optional[str], subject: str, body: str, user) -> bool:
+    """Send one reminder over its channel(s); True if any channel succeeded"""
+    email_success = False
+    sms_success = False
+
+    # EMAIL
+    if channel in [ReminderChannel.EMAIL, ReminderChannel.BOTH]:
+        if email and getattr(user, "email_notifications", True):
+            result = send_email_reminder(email, subject, body)
+            # send_email_reminder is a coroutine function (fastapi-mail)
+            email_success = asyncio.run(result) if asyncio.iscoroutine(result) else bool(result)
+
+    # SMS
+    if channel in [ReminderChannel.SMS, ReminderChannel.BOTH]:
+        if phone and getattr(user, "sms_notifications", True):
+            sms_success = send_sms_reminder(phone, body)
+
+    return bool(email_success or sms_success)
+
+
 # -----------------------------------------------------------
 # Automated Invoice Processing
 # -----------------------------------------------------------
 
 def process_invoice_reminders(invoice: Invoice, db: Session):
-    now = datetime.utcnow()
     config = db.query(ReminderConfiguration).filter(
         ReminderConfiguration.hostel_id == invoice.hostel_id
     ).first()
 
+    reminder_type, channel = decide_reminder(invoice, config, datetime.utcnow())
+
+    # 4️⃣ If reminder needed, create it
+    if reminder_type and channel:
+        create_and_schedule_reminder(invoice, reminder_type, channel, db)
+
+
+def decide_reminder(invoice: Invoice, config: Optional[ReminderConfiguration],
+                    now: datetime) -> Tuple[Optional[ReminderType], Optional[ReminderChannel]]:
+    """Which reminder (if any) the invoice is due for at `now`; bumps escalation_level on escalation"""
     if not config:
-        return
+        return None, None
 
-    if invoice.reminder_count >= config.max_reminders:
-        return
+    if config.max_reminders is not None and (invoice.reminder_count or 0) >= config.max_reminders:
+        return None, None
 
     days_until_due = (invoice.due_date - now).days
     days_overdue = (now - invoice.due_date).days if now > invoice.due_date else 0
+    escalation_level = invoice.escalation_level or 0
 
     reminder_type = None
     channel = None
 
     # 1️⃣ Pre-due reminders
     if days_until_due > 0:
-        days_list = [int(d.strip()) for d in config.pre_due_days.split(",")]
-        if days_until_due in days_list:
+        if days_until_due in _pre_due_days(config):
             reminder_type = ReminderType.PRE_DUE
             channel = config.pre_due_channels
 
@@ -171,22 +202,22 @@ def process_invoice_reminders(invoice: Invoice, db: Session):
 
         if config.escalation_enabled:
 
-            if days_overdue >= config.final_notice_days and invoice.escalation_level < 4:
+            if days_overdue >= config.final_notice_days and escalation_level < 4:
                 reminder_type = ReminderType.FINAL_NOTICE
                 channel = ReminderChannel.BOTH
                 invoice.escalation_level = 4
 
-            elif days_overdue >= config.escalation_3_days and invoice.escalation_level < 3:
+            elif days_overdue >= config.escalation_3_days and escalation_level < 3:
                 reminder_type = ReminderType.ESCALATION_3
                 channel = ReminderChannel.BOTH
                 invoice.escalation_level = 3
 
-            elif days_overdue >= config.escalation_2_days and invoice.escalation_level < 2:
+            elif days_overdue >= config.escalation_2_days and escalation_level < 2:
                 reminder_type = ReminderType.ESCALATION_2
                 channel = ReminderChannel.BOTH
                 invoice.escalation_level = 2
 
-            elif days_overdue >= config.escalation_1_days and invoice.escalation_level < 1:
+            elif days_overdue >= config.escalation_1_days and escalation_level < 1:
                 reminder_type = ReminderType.ESCALATION_1
                 channel = ReminderChannel.BOTH
                 invoice.escalation_level = 1
@@ -198,21 +229,190 @@ def process_invoice_reminders(invoice: Invoice, db: Session):
                 reminder_type = ReminderType.OVERDUE
                 channel = config.overdue_channels
 
-    # 4️⃣ If reminder needed, create it
-    if reminder_type and channel:
-        create_and_schedule_reminder(invoice, reminder_type, channel, db)
+    return reminder_type, channel
+
+
+def _pre_due_days(config: ReminderConfiguration) -> List[int]:
+    return [int(d.strip()) for d in (config.pre_due_days or "").split(",") if d.strip()]
+
+
+def next_reminder_due(invoice: Invoice, config: Optional[ReminderConfiguration], now: datetime,
+                      retry: bool = False) -> Optional[datetime]:
+    """Earliest time after `now` at which decide_reminder could pick this invoice.
+
+    Mirrors the day arithmetic of decide_reminder: a pre-due reminder for k
+    days is due once fewer than k+1 whole days remain, the due-date reminder
+    in the last day before due_date, overdue ones from one whole day past it.
+    Overdue rules that are already eligible but produced nothing (no template,
+    failed delivery) and failed deliveries (`retry`) come back after RETRY_AFTER.
+    """
+    if invoice.status not in OPEN_INVOICE_STATUSES:
+        return None
+    if not config:
+        return now + NO_CONFIG_RECHECK
+    if config.max_reminders is not None and (invoice.reminder_count or 0) >= config.max_reminders:
+        return None
+
+    day = timedelta(days=1)
+    just_after = timedelta(seconds=1)
+    due = invoice.due_date
+    candidates = [due - (k + 1) * day + just_after for k in _pre_due_days(config) if k > 0]
+    if config.due_date_enabled:
+        candidates.append(due - day + just_after)
+    candidates = [at for at in candidates if at > now]
+
+    overdue = []
+    if config.escalation_enabled:
+        thresholds = (config.escalation_1_days, config.escalation_2_days,
+                      config.escalation_3_days, config.final_notice_days)
+        overdue += [due + max(days or 0, 1) * day
+                    for level, days in enumerate(thresholds, start=1)
+                    if days is not None and (invoice.escalation_level or 0) < level]
+    regular = due + day
+    if invoice.last_reminder_sent:
+        regular = max(regular, invoice.last_reminder_sent + (config.overdue_frequency_days or 0) * day)
+    overdue.append(regular)
+    candidates += [at if at > now else now + RETRY_AFTER for at in overdue]
+
+    if retry:
+        candidates.append(now + RETRY_AFTER)
+    return min(candidates) if candidates else None
+
+
+def reschedule_hostel_reminders(db: Session, hostel_id: int, now: Optional[datetime] = None) -> int:
+    """Have the next run re-evaluate a hostel's open invoices (e.g. after its config changed)"""
+    return db.execute(
+        update(Invoice)
+        .where(Invoice.hostel_id == hostel_id, Invoice.status.in_(OPEN_INVOICE_STATUSES))
+        .values(next_reminder_at=now or datetime.utcnow())
+    ).rowcount
 
 
 # -----------------------------------------------------------
 # Scheduler Processing Loop
 # -----------------------------------------------------------
 
-def process_automated_reminders(db: Session):
-    invoices = db.query(Invoice).filter(
-        Invoice.status.in_(["pending", "partial", "overdue"])
-    ).all()
+def process_automated_reminders(
+    db: Session,
+    now: Optional[datetime] = None,
+    batch_size: int = 500,
+    deliver: Optional[Callable[..., bool]] = None,
+) -> Dict[str, Any]:
+    """Send the reminders that are due, touching only invoices whose next_reminder_at has passed.
+
+    Due invoices are read in keyset order on (next_reminder_at, id), a batch
+    at a time; each batch's reminders are inserted in one statement, delivered,
+    and their statuses and the invoices' next_reminder_at written back before
+    the batch commits. The advisory lock keeps overlapping runs (hourly and
+    9 AM jobs, several workers) from sending the same reminders twice.
+    """
+    now = now or datetime.utcnow()
+    deliver = deliver or deliver_reminder
+    report = {"scanned": 0, "created": 0, "sent": 0, "failed": 0, "closed": 0, "batches": 0, "locked": False}
+    started = time.perf_counter()
+
+    with advisory_lock(db.get_bind(), REMINDER_JOB_LOCK_KEY) as acquired:
+        if not acquired:
+            report["locked"] = True
+            logger.info("Reminder job already running elsewhere, skipping this run")
+            return report
+
+        after: Optional[Tuple[datetime, int]] = None
+        while True:
+            query = (
+                db.query(Invoice)
+                .options(selectinload(Invoice.user), selectinload(Invoice.hostel))
+                .filter(Invoice.next_reminder_at <= now)
+            )
+            if after:
+                query = query.filter(or_(
+                    Invoice.next_reminder_at > after[0],
+                    and_(Invoice.next_reminder_at == after[0], Invoice.id > after[1]),
+                ))
+            invoices = query.order_by(Invoice.next_reminder_at, Invoice.id).limit(batch_size).all()
+            if not invoices:
+                break
+            after = (invoices[-1].next_reminder_at, invoices[-1].id)
+
+            _process_reminder_batch(db, invoices, now, deliver, report)
+            db.commit()
+            report["batches"] += 1
+            report["scanned"] += len(invoices)
+
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Reminder run: scanned %(scanned)s invoices, created %(created)s reminders "
+                "(%(sent)s sent, %(failed)s failed) in %(batches)s batches", report)
+    return report
+
+
+def _process_reminder_batch(db: Session, invoices: List[Invoice], now: datetime,
+                            deliver: Callable[..., bool], report: Dict[str, Any]):
+    hostel_ids = {inv.hostel_id for inv in invoices}
+    configs: Dict[int, ReminderConfiguration] = {
+        config.hostel_id: config
+        for config in db.query(ReminderConfiguration).filter(ReminderConfiguration.hostel_id.in_(hostel_ids))
+    }
+    templates: Dict[ReminderType, Optional[ReminderTemplate]] = {}
 
+    pending = []  # (invoice, reminder row)
     for invoice in invoices:
-        process_invoice_reminders(invoice, db)
+        if invoice.status not in OPEN_INVOICE_STATUSES:
+            report["closed"] += 1
+            continue
+        reminder_type, channel = decide_reminder(invoice, configs.get(invoice.hostel_id), now)
+        if not (reminder_type and channel):
+            continue
+        if reminder_type not in templates:
+            templates[reminder_type] = get_default_template(reminder_type, db)
+        template = templates[reminder_type]
+        if not template:
+            logger.warning("No default reminder template for %s", reminder_type)
+            continue
+        context = get_template_context(invoice)
+        pending.append((invoice, {
+            "reminder_id": generate_reminder_id(),
+            "invoice_id": invoice.id,
+            "reminder_type": reminder_type,
+            "channel": channel,
+            "recipient_email": invoice.user.email,
+            "recipient_phone": invoice.user.phone_number,
+            "subject": render_template(template.email_subject, context),
+            "message_body": render_template(template.email_body, context),
+            "scheduled_at": now,
+            "status": ReminderStatus.PENDING,
+        }))
+
+    if pending:
+        db.execute(insert(PaymentReminder), [row for _, row in pending])
+        report["created"] += len(pending)
+
+    failed_ids = set()
+    outcomes = []
+    for invoice, row in pending:
+        delivered = deliver(row["channel"], row["recipient_email"], row["recipient_phone"],
+                            row["subject"], row["message_body"], invoice.user)
+        if delivered:
+            invoice.reminder_count = (invoice.reminder_count or 0) + 1
+            invoice.last_reminder_sent = now
+            report["sent"] += 1
+        else:
+            failed_ids.add(invoice.id)
+            report["failed"] += 1
+        outcomes.append({
+            "b_reminder_id": row["reminder_id"],
+            "status": ReminderStatus.SENT if delivered else ReminderStatus.FAILED,
+            "sent_at": now if delivered else None,
+        })
+    if outcomes:
+        reminders = PaymentReminder.__table__
+        db.execute(
+            update(reminders)
+            .where(reminders.c.reminder_id == bindparam("b_reminder_id"))
+            .values(status=bindparam("status"), sent_at=bindparam("sent_at")),
+            outcomes,
+        )
 
-    db.commit()
+    for invoice in invoices:
+        invoice.next_reminder_at = next_reminder_due(
+            invoice, configs.get(invoice.hostel_id), now, retry=invoice.id in failed_ids
+        )
@@ -1,16 +1,11 @@
 # app/services/scheduler.py
-from datetime import datetime, timedelta
 import logging
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
 from app.core.database import SessionLocal
-from app.models.booking import Booking, BookingStatus
-from app.models.rooms import Room
+from app.services.booking_expiry_service import BookingExpirySweeper
 
 logger = logging.getLogger("hostel_scheduler")
 logger.setLevel(logging.INFO)
@@ -27,70 +22,18 @@ DEFAULT_RUN_INTERVAL_SECONDS = 60  # run every minute. Change to 3600 for hourly
 
 def expire_pending_bookings_once(expiry_hours: int = DEFAULT_EXPIRY_HOURS):
     """
-    One-off run: finds bookings with status PENDING older than expiry_hours
-    and marks them as rejected. Releases any bed if necessary.
+    One-off run: cancels bookings still PENDING after expiry_hours and gives
+    their beds back, in chunks (see BookingExpirySweeper). Freed beds are
+    offered to the waitlist.
     """
-    cutoff = datetime.utcnow() - timedelta(hours=expiry_hours)
-    db: Session = SessionLocal()
-
-    expired_count = 0
     try:
-        # Find pending bookings older than cutoff
-        pending_q = db.query(Booking).filter(
-            Booking.status == BookingStatus.pending.value,
-            Booking.created_at < cutoff
-        )
-
-        pending_list = pending_q.all()
-
-        if not pending_list:
-            logger.info("No pending bookings to expire (cutoff=%s)", cutoff.isoformat())
-            return {"expired": 0, "cutoff": cutoff.isoformat()}
-
-        for booking in pending_list:
-            try:
-                # Extra-safety: if booking was somehow confirmed already, skip expiry
-                if booking.status != BookingStatus.pending.value:
-                    continue
-
-                # mark booking as rejected (store string value)
-                booking.status = BookingStatus.rejected.value
-
-                # If the booking had reserved/consumed a bed (shouldn't for pending),
-                # ensure bed counts are correct. This is defensive: only decrement/increment
-                # when consistent with your app's confirm flow.
-                # We'll increment available_beds if booking was confirmed earlier (defensive)
-                if booking.room_id:
-                    room = db.query(Room).filter(Room.id == booking.room_id).first()
-                    if room:
-                        # only adjust if available_beds would logically increase
-                        # (we don't want available_beds > total_beds; keep defensive checks)
-                        try:
-                            room.available_beds = min(room.total_beds, (room.available_beds + 1))
-                        except Exception:
-                            # fallback: try set to total_beds if anything weird
-                            room.available_beds = room.total_beds
-
-                # Placeholder: refund handling (if advance was paid & policy allows)
-                # call_refund_processor(booking)  -> implement when integrating payment gateway
-
-                db.add(booking)
-                expired_count += 1
-            except Exception as inner:
-                logger.exception("Failed to expire booking id=%s: %s", getattr(booking, "id", None), str(inner))
-                db.rollback()
-                continue
-
-        db.commit()
-        logger.info("Expired %d pending bookings older than %d hours", expired_count, expiry_hours)
-        return {"expired": expired_count, "cutoff": cutoff.isoformat()}
-
+        report = BookingExpirySweeper(SessionLocal, expiry_hours=expiry_hours).sweep()
     except Exception as e:
-        db.rollback()
         logger.exception("Error during expire_pending_bookings_once: %s", str(e))
         raise
-    finally:
-        db.close()
+    if not report["expired"]:
+        logger.info("No pending bookings to expire (cutoff=%s)", report["cutoff"])
+    return report
 
 
 # Scheduler control API
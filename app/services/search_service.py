@@ -1,23 +1,81 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, and_, or_
 from typing import List, Tuple
 from app.schemas.search import HostelSearchFilters, HostelSearchSort, HostelSearchResult
+from app.core.cache import cached
 import math
 from decimal import Decimal
 
 class SearchService:
     
     @staticmethod
+    @cached(ttl=120, tags=("hostels", "locations"))
     def search_hostels(db: Session, filters: HostelSearchFilters, 
                       sort: HostelSearchSort, page: int, page_size: int) -> Tuple[List[dict], int]:
         """Search hostels with filters and sorting"""
         
+        query, count_query, params = SearchService._build_search_queries(
+            filters, sort, page, page_size, db.get_bind().dialect.name
+        )
+        
+        rows = db.execute(text(query), params).fetchall()
+        if rows:
+            total_count = rows[0].total_count
+        else:
+            # Past the last page the window count is not available
+            total_count = db.execute(text(count_query), params).scalar() if page > 1 else 0
+        hostels = [SearchService._to_search_result(row._mapping) for row in rows]
+        
+        return hostels, int(total_count or 0)
+    
+    @staticmethod
+    @cached(ttl=120, tags=("hostels", "locations"))
+    async def search_hostels_async(db: AsyncSession, filters: HostelSearchFilters,
+                                   sort: HostelSearchSort, page: int, page_size: int) -> Tuple[List[dict], int]:
+        """Async variant of `search_hostels` for the AsyncSession read path"""
+        
+        query, count_query, params = SearchService._build_search_queries(
+            filters, sort, page, page_size, db.get_bind().dialect.name
+        )
+        
+        rows = (await db.execute(text(query), params)).fetchall()
+        if rows:
+            total_count = rows[0].total_count
+        else:
+            total_count = (await db.execute(text(count_query), params)).scalar() if page > 1 else 0
+        hostels = [SearchService._to_search_result(row._mapping) for row in rows]
+        
+        return hostels, int(total_count or 0)
+    
+    # Full-text document for the Postgres fallback; must stay identical to the
+    # ix_hostels_search_document expression index (20261018_hostel_search_indexes)
+    _search_document = (
+        "to_tsvector('simple', coalesce(h.hostel_name, '') || ' ' || "
+        "coalesce(h.description, '') || ' ' || coalesce(h.full_address, ''))"
+    )
+    
+    @staticmethod
+    def _build_search_queries(filters: HostelSearchFilters, sort: HostelSearchSort,
+                              page: int, page_size: int, dialect: str = "postgresql") -> Tuple[str, str, dict]:
+        """Build the (page query, count query, params) for a hostel search
+        
+        The page query carries the total as a `COUNT(*) OVER ()` column, so a
+        search is one statement; the count query is only needed when a page
+        past the end comes back empty. On PostgreSQL the text query uses the
+        full-text and trigram indexes instead of a sequential LIKE scan.
+        """
+        
+        postgres = dialect == "postgresql"
+        
         # Use current schema: hostels has `hostel_name`, `full_address`, `total_beds`, `current_occupancy`,
         # and `location_id` referencing `locations.city`. There is no `name`, `location` or `is_active`.
-        base_query = """
+        select_columns = """
             SELECT h.id, h.hostel_name, h.description, h.full_address, l.city as city,
+                   h.pincode, h.gender_type as gender, h.latitude, h.longitude,
                    h.total_beds, h.current_occupancy, h.monthly_revenue, h.visibility,
-                   h.contact_phone, h.contact_email, h.amenities, h.created_at
+                   h.contact_phone, h.contact_email, h.amenities, h.created_at"""
+        from_clause = """
             FROM hostels h
             LEFT JOIN locations l ON l.id = h.location_id
             WHERE h.visibility = 'public'
@@ -33,19 +91,20 @@ class SearchService:
             conditions.append("LOWER(l.city) = LOWER(:city)")
             params['city'] = filters.city
         
-        # area/pincode/gender/price/rating/geo are not present in current schema; apply what we can
+        # area/price/rating/geo are not present in current schema; apply what we can
         if filters.area:
-            # no area column available — ignore or match against full_address
+            # no area column available — match against full_address
             conditions.append("LOWER(h.full_address) LIKE LOWER(:area)")
             params['area'] = f"%{filters.area}%"
 
         if filters.pincode:
-            conditions.append("h.full_address LIKE :pincode")
+            conditions.append("(h.pincode = :pincode_exact OR h.full_address LIKE :pincode)")
+            params['pincode_exact'] = filters.pincode
             params['pincode'] = f"%{filters.pincode}%"
 
         if filters.gender:
-            # no gender column defined on hostels; ignore filter
-            pass
+            conditions.append("LOWER(h.gender_type) = LOWER(:gender)")
+            params['gender'] = filters.gender
 
         if filters.min_price or filters.max_price:
             # price fields are not present; ignore price filtering
@@ -59,11 +118,30 @@ class SearchService:
             # available if total_beds > current_occupancy
             conditions.append("(h.total_beds IS NOT NULL AND COALESCE(h.current_occupancy, 0) < h.total_beds)")
 
+        rank = None
         if filters.query:
-            conditions.append(
-                "(LOWER(h.hostel_name) LIKE LOWER(:query) OR LOWER(h.description) LIKE LOWER(:query) OR LOWER(h.full_address) LIKE LOWER(:query))"
-            )
-            params['query'] = f"%{filters.query}%"
+            params['query'] = filters.query
+            if postgres:
+                # Words anywhere in name / description / address (GIN full-text
+                # index), or a name close to the query (trigram index: typos,
+                # partial words); ILIKE on the trigram-indexed columns covers
+                # substrings the other two miss
+                conditions.append(
+                    f"({SearchService._search_document} @@ plainto_tsquery('simple', :query)"
+                    " OR h.hostel_name % :query"
+                    " OR h.hostel_name ILIKE :query_like OR h.full_address ILIKE :query_like)"
+                )
+                params['query_like'] = f"%{filters.query}%"
+                rank = (
+                    f"ts_rank({SearchService._search_document}, plainto_tsquery('simple', :query))"
+                    " + similarity(h.hostel_name, :query)"
+                )
+            else:
+                conditions.append(
+                    "(LOWER(h.hostel_name) LIKE LOWER(:query_like) OR LOWER(h.description) LIKE LOWER(:query_like)"
+                    " OR LOWER(h.full_address) LIKE LOWER(:query_like))"
+                )
+                params['query_like'] = f"%{filters.query}%"
 
         if filters.amenities:
             # amenities stored as TEXT; check substring match for each amenity
@@ -72,91 +150,106 @@ class SearchService:
                 params[f'amenity_{i}'] = f"%{amenity}%"
         
         if conditions:
-            base_query += " AND " + " AND ".join(conditions)
+            from_clause += " AND " + " AND ".join(conditions)
 
         # Sorting - limited options supported on current schema
         order_by = {
             'newest': 'h.created_at DESC',
             'distance': 'h.id ASC',
-            'rating': 'h.id ASC'
+            'rating': 'h.id ASC',
+            'relevance': f'{rank} DESC, h.id ASC' if rank else 'h.created_at DESC',
         }
         sort_clause = order_by.get(sort.sort_by, 'h.created_at DESC')
 
-        # Wrap with simple query and pagination
         query = f"""
-            {base_query}
+            {select_columns}, COUNT(*) OVER () AS total_count
+            {from_clause}
             ORDER BY {sort_clause}
             LIMIT :limit OFFSET :offset
         """
 
         # Count query
-        count_query = f"SELECT COUNT(*) FROM ({base_query}) as sub"
-
-        total_count = db.execute(text(count_query), params).scalar() or 0
+        count_query = f"SELECT COUNT(*) {from_clause}"
 
         # Pagination
         offset = (page - 1) * page_size
         params['limit'] = page_size
         params['offset'] = offset
 
-        # Execute query and map rows to expected result keys
-        result = db.execute(text(query), params)
-        hostels = []
-        for row in result.fetchall():
-            r = row._mapping
-            total_beds = r.get('total_beds') or 0
-            current_occupancy = r.get('current_occupancy') or 0
-            available_beds = max(total_beds - current_occupancy, 0)
-            amenities_raw = r.get('amenities') or ''
-            amenities_list = [a.strip() for a in amenities_raw.split(',')] if isinstance(amenities_raw, str) and amenities_raw else []
-
-            hostels.append({
-                'id': r.get('id'),
-                'name': r.get('hostel_name') or "",
-                'description': r.get('description') or "",
-                'location': r.get('full_address') or "",
-                'city': r.get('city') or "",
-                'area': r.get('area') if r.get('area') is not None else "",
-                'pincode': r.get('pincode') if r.get('pincode') is not None else "",
-                'latitude': r.get('latitude'),
-                'longitude': r.get('longitude'),
-                'gender': r.get('gender') or "",
-                'contact_phone': r.get('contact_phone') or "",
-                'contact_email': r.get('contact_email') or "",
-                'available_beds': available_beds,
-                'total_beds': total_beds,
-                'price_range_min': Decimal(0),
-                'price_range_max': Decimal(0),
-                'rating': 0.0,
-                'review_count': 0,
-                'amenities': amenities_list,
-                'photos': [],
-                'distance_km': None
-            })
-
-        return hostels, int(total_count)
+        return query, count_query, params
+    
+    # Autocomplete column per field accepted by the visitor autocomplete route
+    _autocomplete_columns = {
+        'name': 'h.hostel_name',
+        'location': 'h.full_address',
+        'city': 'l.city',
+    }
+    
+    @staticmethod
+    def autocomplete(db: Session, query: str, field: str = "name", limit: int = 10) -> List[dict]:
+        """Database autocomplete (used while Elasticsearch is unavailable)
+        
+        Prefix matches first, then (PostgreSQL) names within trigram
+        similarity of the typed text, so "hostle" still suggests "Hostel ...".
+        """
+        column = SearchService._autocomplete_columns[field]
+        params = {'query': query, 'prefix': f"{query}%", 'contains': f"%{query}%", 'limit': limit}
+        if db.get_bind().dialect.name == "postgresql":
+            condition = f"({column} ILIKE :contains OR {column} % :query)"
+            ordering = f"({column} ILIKE :prefix) DESC, similarity({column}, :query) DESC"
+        else:
+            condition = f"LOWER({column}) LIKE LOWER(:contains)"
+            ordering = f"(LOWER({column}) LIKE LOWER(:prefix)) DESC"
+        rows = db.execute(text(f"""
+            SELECT {column} AS value, MIN(l.city) AS city
+            FROM hostels h
+            LEFT JOIN locations l ON l.id = h.location_id
+            WHERE h.visibility = 'public' AND {condition}
+            GROUP BY {column}
+            ORDER BY {ordering}, {column}
+            LIMIT :limit
+        """), params).fetchall()
+        return [{field: row.value, 'city': row.city} for row in rows]
+    
+    @staticmethod
+    def _to_search_result(r) -> dict:
+        """Map a search row to the keys expected by HostelSearchResult"""
+        total_beds = r.get('total_beds') or 0
+        current_occupancy = r.get('current_occupancy') or 0
+        available_beds = max(total_beds - current_occupancy, 0)
+        amenities_raw = r.get('amenities') or ''
+        amenities_list = [a.strip() for a in amenities_raw.split(',')] if isinstance(amenities_raw, str) and amenities_raw else []
+
+        return {
+            'id': r.get('id'),
+            'name': r.get('hostel_name') or "",
+            'description': r.get('description') or "",
+            'location': r.get('full_address') or "",
+            'city': r.get('city') or "",
+            'area': r.get('area') if r.get('area') is not None else "",
+            'pincode': r.get('pincode') if r.get('pincode') is not None else "",
+            'latitude': r.get('latitude'),
+            'longitude': r.get('longitude'),
+            'gender': r.get('gender') or "",
+            'contact_phone': r.get('contact_phone') or "",
+            'contact_email': r.get('contact_email') or "",
+            'available_beds': available_beds,
+            'total_beds': total_beds,
+            'price_range_min': Decimal(0),
+            'price_range_max': Decimal(0),
+            'rating': 0.0,
+            'review_count': 0,
+            'amenities': amenities_list,
+            'photos': [],
+            'distance_km': None
+        }
     
     @staticmethod
     def log_search(db: Session, filters: HostelSearchFilters, results_count: int):
         """Log search query for analytics"""
-        from app.models.search import SearchQuery
-        import json
-        from decimal import Decimal
-        from sqlalchemy import text
         from sqlalchemy.exc import IntegrityError
 
-        # Convert Decimal to float for JSON serialization
-        filters_dict = filters.model_dump(exclude_none=True)
-        for key, value in filters_dict.items():
-            if isinstance(value, Decimal):
-                filters_dict[key] = float(value)
-
-        search_log = SearchQuery(
-            query_text=filters.query or "",
-            city=filters.city,
-            filters=json.dumps(filters_dict),
-            results_count=results_count,
-        )
+        search_log = SearchService._search_log(filters, results_count)
 
         db.add(search_log)
         try:
@@ -166,11 +259,7 @@ class SearchService:
             # advance the sequence to max(id) so next inserts won't conflict, then retry.
             db.rollback()
             try:
-                db.execute(
-                    text(
-                        "SELECT setval(pg_get_serial_sequence('search_queries','id'), (SELECT COALESCE(MAX(id), 1) FROM search_queries))"
-                    )
-                )
+                db.execute(text(SearchService._RESYNC_SEARCH_QUERY_SEQUENCE))
                 db.commit()
             except Exception:
                 db.rollback()
@@ -180,6 +269,50 @@ class SearchService:
             db.add(search_log)
             db.commit()
     
+    @staticmethod
+    async def log_search_async(db: AsyncSession, filters: HostelSearchFilters, results_count: int):
+        """Async variant of `log_search`"""
+        from sqlalchemy.exc import IntegrityError
+
+        search_log = SearchService._search_log(filters, results_count)
+
+        db.add(search_log)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            try:
+                await db.execute(text(SearchService._RESYNC_SEARCH_QUERY_SEQUENCE))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+            db.add(search_log)
+            await db.commit()
+    
+    _RESYNC_SEARCH_QUERY_SEQUENCE = (
+        "SELECT setval(pg_get_serial_sequence('search_queries','id'), (SELECT COALESCE(MAX(id), 1) FROM search_queries))"
+    )
+    
+    @staticmethod
+    def _search_log(filters: HostelSearchFilters, results_count: int):
+        from app.models.search import SearchQuery
+        import json
+
+        # Convert Decimal to float for JSON serialization
+        filters_dict = filters.model_dump(exclude_none=True)
+        for key, value in filters_dict.items():
+            if isinstance(value, Decimal):
+                filters_dict[key] = float(value)
+
+        return SearchQuery(
+            query_text=filters.query or "",
+            city=filters.city,
+            filters=json.dumps(filters_dict),
+            results_count=results_count,
+        )
+    
     @staticmethod
     def log_profile_view(db: Session, hostel_id: int, source: str = "direct", visitor_ip: str = None, session_id: str = None):
         """Log hostel profile view for analytics"""
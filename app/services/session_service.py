@@ -10,6 +10,7 @@ from app.repositories.hostel_repository import HostelRepository
 from app.services.tenant_service import TenantService
 from app.schemas.session import SwitchSessionRequest, SessionContextResponse
 from app.core.roles import Role
+from app.core.session_cache import invalidate_active_session
 
 
 class SessionService:
@@ -26,6 +27,7 @@ class SessionService:
         
         # Create/activate session
         session = self.session_repo.create_session(user_id, request.hostel_id)
+        invalidate_active_session(user_id)
         
         return SessionContextResponse(
             id=session.id,
@@ -70,5 +72,8 @@ class SessionService:
     
     def deactivate_session(self, user_id: int, session_id: int) -> bool:
         """Deactivate a session"""
-        return self.session_repo.deactivate_session(user_id, session_id)
+        deactivated = self.session_repo.deactivate_session(user_id, session_id)
+        if deactivated:
+            invalidate_active_session(user_id)
+        return deactivated
 
@@ -0,0 +1,470 @@
+"""
+SMS dispatch pipeline.
+
+Bulk SMS (emergency alerts, due payment reminders) are queued here instead
+of being sent one awaited call at a time with a commit per message:
+
+ - a priority queue orders work, so emergency alerts are sent ahead of OTPs,
+   transactional messages and payment reminders already waiting
+ - SMS_SEND_CONCURRENCY worker threads call the (blocking) provider clients
+ - each provider is rate-shaped by a token bucket (SMS_RATE_LIMITS, messages
+   per second) so bursts stay under the Twilio / SNS account limits
+ - failed sends are retried up to SMS_MAX_RETRIES times with full-jitter
+   exponential backoff; configuration errors are not retried
+ - final outcomes are written by one writer thread: SMSLog rows in a single
+   multi-row INSERT per flush, then EmergencyAlert counters and
+   PaymentReminders links in bulk UPDATEs. A flush that fails is retried
+   with the same backoff until it commits; a message only counts as done
+   (and `drain` only returns) once its outcome is committed
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, bindparam, case, insert, update
+
+from app.config import settings
+from app.models.sms_models import (
+    EmergencyAlert, MessageType, PaymentReminders, SMSLog, SMSProvider, SMSStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lower is sent first
+MESSAGE_PRIORITY = {
+    MessageType.emergency_alert: 0,
+    MessageType.otp: 1,
+    MessageType.transactional: 2,
+    MessageType.payment_reminder: 3,
+    MessageType.promotional: 4,
+}
+
+# Errors a retry will not fix
+PERMANENT_ERROR_MARKERS = ("not configured", "credentials missing", "invalid", "unsubscribed", "blacklist")
+
+
+@dataclass(order=True)
+class SMSJob:
+    priority: int
+    seq: int
+    phone_number: str = field(compare=False)
+    message: str = field(compare=False)
+    provider: SMSProvider = field(compare=False)
+    message_type: MessageType = field(compare=False)
+    template_id: Optional[int] = field(default=None, compare=False)
+    alert_id: Optional[int] = field(default=None, compare=False)
+    reminder_id: Optional[int] = field(default=None, compare=False)
+    attempt: int = field(default=0, compare=False)
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, up to `burst` at once"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _default_provider_client(provider: SMSProvider):
+    from app.services.sms_services import AWSSNSService, TwilioService
+    return TwilioService() if provider == SMSProvider.twilio else AWSSNSService()
+
+
+def _error_text(exc: Exception) -> str:
+    return str(getattr(exc, "detail", None) or exc)
+
+
+class SMSDispatcher:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        client_factory: Callable[[SMSProvider], Any] = _default_provider_client,
+        concurrency: int = 16,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_retries: int = 3,
+        retry_base: float = 0.5,
+        retry_cap: float = 30.0,
+        flush_size: int = 500,
+        flush_interval: float = 0.2,
+    ):
+        self.session_factory = session_factory
+        self.client_factory = client_factory
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buckets = {
+            provider: TokenBucket(rate)
+            for provider, rate in (rate_limits or {}).items()
+        }
+        self._clients: Dict[SMSProvider, Any] = {}
+        self._queue: "queue.PriorityQueue[SMSJob]" = queue.PriorityQueue()
+        self._delayed: List[Tuple[float, SMSJob]] = []
+        self._results: "queue.Queue[Tuple[SMSJob, SMSStatus, Optional[str], Optional[str], Optional[datetime]]]" = queue.Queue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._alert_outstanding: Dict[int, int] = {}
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._counters = {
+            "queued": 0, "sent": 0, "failed": 0, "retries": 0,
+            "rate_limited_ms": 0.0, "flushes": 0, "rows_written": 0,
+            "write_retries": 0, "outcomes_lost": 0,
+        }
+
+    # ---------------------------------------------------------
+    # LIFECYCLE
+    # ---------------------------------------------------------
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._threads = [
+            threading.Thread(target=self._send_loop, name=f"sms-send-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        self._threads.append(threading.Thread(target=self._retry_loop, name="sms-retry", daemon=True))
+        self._threads.append(threading.Thread(target=self._write_loop, name="sms-writer", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info("SMSDispatcher started with %d senders", self.concurrency)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting work, drain what is queued and flush the outcomes"""
+        self.drain(timeout)
+        with self._lock:
+            self._running = False
+        for _ in range(self.concurrency):
+            self._queue.put(SMSJob(priority=10 ** 9, seq=next(self._seq), phone_number="",
+                                   message="", provider=SMSProvider.twilio, message_type=MessageType.promotional))
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted message has a persisted final outcome"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    # ---------------------------------------------------------
+    # SUBMISSION
+    # ---------------------------------------------------------
+    def submit(
+        self,
+        phone_number: str,
+        message: str,
+        provider: SMSProvider,
+        message_type: MessageType,
+        template_id: Optional[int] = None,
+        alert_id: Optional[int] = None,
+        reminder_id: Optional[int] = None,
+    ) -> None:
+        self.submit_many([(phone_number, message, reminder_id)], provider, message_type,
+                         template_id=template_id, alert_id=alert_id)
+
+    def submit_many(
+        self,
+        messages: Iterable[Tuple[str, str, Optional[int]]],
+        provider: SMSProvider,
+        message_type: MessageType,
+        template_id: Optional[int] = None,
+        alert_id: Optional[int] = None,
+    ) -> int:
+        """Queue (phone_number, message, reminder_id) tuples; returns how many"""
+        self.start()
+        priority = MESSAGE_PRIORITY.get(message_type, 5)
+        jobs = [
+            SMSJob(priority, next(self._seq), phone, text, provider, message_type,
+                   template_id=template_id, alert_id=alert_id, reminder_id=reminder_id)
+            for phone, text, reminder_id in messages
+        ]
+        with self._lock:
+            self._outstanding += len(jobs)
+            self._counters["queued"] += len(jobs)
+            if alert_id is not None:
+                self._alert_outstanding[alert_id] = self._alert_outstanding.get(alert_id, 0) + len(jobs)
+        for job in jobs:
+            self._queue.put(job)
+        return len(jobs)
+
+    # ---------------------------------------------------------
+    # SENDING
+    # ---------------------------------------------------------
+    def _client(self, provider: SMSProvider):
+        client = self._clients.get(provider)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(provider)
+                if client is None:
+                    client = self._clients[provider] = self.client_factory(provider)
+        return client
+
+    def _send_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if not self._running and not job.phone_number:
+                return
+            bucket = self._buckets.get(job.provider.value)
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    with self._lock:
+                        self._counters["rate_limited_ms"] += waited * 1000
+            try:
+                sid, status = self._client(job.provider).send_sms(job.phone_number, job.message)
+            except Exception as exc:
+                error = _error_text(exc)
+                if job.attempt < self.max_retries and not any(m in error.lower() for m in PERMANENT_ERROR_MARKERS):
+                    self._schedule_retry(job)
+                    continue
+                self._results.put((job, SMSStatus.failed, None, error, None))
+                continue
+            delivered = status in ("sent", "queued")
+            self._results.put((
+                job,
+                SMSStatus.sent if delivered else SMSStatus.failed,
+                sid,
+                None if delivered else f"Provider status: {status}",
+                datetime.utcnow() if delivered else None,
+            ))
+
+    def _schedule_retry(self, job: SMSJob) -> None:
+        due = time.monotonic() + backoff_delay(job.attempt, self.retry_base, self.retry_cap)
+        job.attempt += 1
+        with self._lock:
+            self._counters["retries"] += 1
+            heapq.heappush(self._delayed, (due, job))
+
+    def _retry_loop(self) -> None:
+        while self._running:
+            now = time.monotonic()
+            ready = []
+            with self._lock:
+                while self._delayed and self._delayed[0][0] <= now:
+                    ready.append(heapq.heappop(self._delayed)[1])
+                next_due = self._delayed[0][0] if self._delayed else now + 0.05
+            for job in ready:
+                self._queue.put(job)
+            time.sleep(min(0.05, max(0.001, next_due - time.monotonic())))
+
+    # ---------------------------------------------------------
+    # WRITING
+    # ---------------------------------------------------------
+    def _write_loop(self) -> None:
+        while self._running or not self._results.empty():
+            batch = []
+            try:
+                batch.append(self._results.get(timeout=self.flush_interval))
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._results.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if self._write_with_retry(batch):
+                self._finish(batch)
+
+    def _write_with_retry(self, batch) -> bool:
+        """Write a flush until it commits; gives up only once stopping"""
+        attempt = 0
+        while True:
+            try:
+                self.write_outcomes(batch)
+                return True
+            except Exception:
+                if not self._running and attempt >= self.max_retries:
+                    logger.exception("Lost %d SMS outcomes: database still failing at shutdown", len(batch))
+                    with self._lock:
+                        self._counters["outcomes_lost"] += len(batch)
+                    return False
+                logger.exception("Failed to persist %d SMS outcomes (attempt %d), retrying",
+                                 len(batch), attempt + 1)
+                with self._lock:
+                    self._counters["write_retries"] += 1
+                time.sleep(max(0.001, backoff_delay(attempt, self.retry_base, self.retry_cap)))
+                attempt += 1
+
+    def write_outcomes(self, batch) -> None:
+        logs = SMSLog.__table__
+        now = datetime.utcnow()
+        rows = [
+            {
+                "phone_number": job.phone_number,
+                "message": job.message,
+                "message_type": job.message_type,
+                "template_id": job.template_id,
+                "provider": job.provider,
+                "status": status,
+                "message_sid": sid,
+                "error_message": error,
+                "sent_at": sent_at,
+                "created_at": now,
+            }
+            for job, status, sid, error, sent_at in batch
+        ]
+
+        alert_counts: Dict[int, List[int]] = {}
+        for job, status, *_ in batch:
+            if job.alert_id is not None:
+                counts = alert_counts.setdefault(job.alert_id, [0, 0])
+                counts[0 if status == SMSStatus.sent else 1] += 1
+
+        with self.session_factory() as db:
+            log_ids = [None] * len(rows)
+            if any(job.reminder_id is not None for job, *_ in batch):
+                # Reminders link to their log row, so fetch the generated ids
+                log_ids = db.execute(
+                    insert(logs).returning(logs.c.id, sort_by_parameter_order=True), rows
+                ).scalars().all()
+            else:
+                db.execute(insert(logs), rows)
+
+            finished = set()
+            if alert_counts:
+                # Outstanding counts are only updated once this flush commits
+                with self._lock:
+                    for alert_id, (sent, failed) in alert_counts.items():
+                        if self._alert_outstanding.get(alert_id, 0) - sent - failed <= 0:
+                            finished.add(alert_id)
+                alerts = EmergencyAlert.__table__
+                db.execute(
+                    update(alerts).where(alerts.c.id == bindparam("alert_id")).values(
+                        sent_count=alerts.c.sent_count + bindparam("sent"),
+                        failed_count=alerts.c.failed_count + bindparam("failed"),
+                        sent_at=case(
+                            (bindparam("finished", type_=Boolean), bindparam("now", type_=DateTime)),
+                            else_=alerts.c.sent_at,
+                        ),
+                    ),
+                    [
+                        {"alert_id": alert_id, "sent": sent, "failed": failed,
+                         "finished": alert_id in finished, "now": now}
+                        for alert_id, (sent, failed) in alert_counts.items()
+                    ],
+                )
+
+            reminder_rows = [
+                {"reminder_id": job.reminder_id, "log_id": log_id,
+                 "delivered": status == SMSStatus.sent, "sent": sent_at}
+                for (job, status, _, _, sent_at), log_id in zip(batch, log_ids)
+                if job.reminder_id is not None
+            ]
+            if reminder_rows:
+                reminders = PaymentReminders.__table__
+                # Releases the queued claim; a failed reminder stays unsent so
+                # it can be queued again
+                db.execute(
+                    update(reminders).where(reminders.c.id == bindparam("reminder_id")).values(
+                        sms_log_id=bindparam("log_id"),
+                        reminder_sent=bindparam("delivered"),
+                        sent_at=bindparam("sent"),
+                        queued_at=None,
+                    ),
+                    reminder_rows,
+                )
+            db.commit()
+
+        with self._lock:
+            for alert_id, (sent, failed) in alert_counts.items():
+                if alert_id in finished:
+                    self._alert_outstanding.pop(alert_id, None)
+                else:
+                    self._alert_outstanding[alert_id] -= sent + failed
+            self._counters["flushes"] += 1
+            self._counters["rows_written"] += len(rows)
+
+    def _finish(self, batch) -> None:
+        sent = sum(1 for _, status, *_ in batch if status == SMSStatus.sent)
+        with self._idle:
+            self._counters["sent"] += sent
+            self._counters["failed"] += len(batch) - sent
+            self._outstanding -= len(batch)
+            if self._outstanding <= 0:
+                self._idle.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot["outstanding"] = self._outstanding
+            snapshot["retry_waiting"] = len(self._delayed)
+        snapshot["queue_depth"] = self._queue.qsize()
+        snapshot["rate_limited_ms"] = round(snapshot["rate_limited_ms"], 1)
+        return snapshot
+
+
+_dispatcher: Optional[SMSDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_sms_dispatcher() -> SMSDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                from app.config import SessionLocal
+                _dispatcher = SMSDispatcher(
+                    SessionLocal,
+                    concurrency=settings.SMS_SEND_CONCURRENCY,
+                    rate_limits=settings.SMS_RATE_LIMITS,
+                    max_retries=settings.SMS_MAX_RETRIES,
+                    retry_base=settings.SMS_RETRY_BASE_MS / 1000,
+                    retry_cap=settings.SMS_RETRY_CAP_MS / 1000,
+                )
+    return _dispatcher
+
+
+def shutdown_sms_dispatcher(timeout: float = 5.0) -> None:
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.stop(timeout)
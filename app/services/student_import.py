@@ -0,0 +1,587 @@
+"""
+Bulk student import engine.
+
+`POST /admin/students/bulk` spools the upload to STUDENT_IMPORT_DIR, creates a
+StudentImportJob and returns its id; the file is imported here on a worker
+thread and progress is read back from the job row. A job works through the
+CSV in batches of STUDENT_IMPORT_BATCH_SIZE rows:
+
+ 1. the header is mapped to student fields once per file, then each batch is
+    validated column by column (required fields, dates, emails, duplicates
+    within the file); invalid rows are reported with their CSV line number
+ 2. rows whose student_id / email already exist are skipped in one query,
+    linked users are found in one query and missing ones created in one
+    multi-row INSERT (existing users are promoted to student in one UPDATE)
+ 3. the valid rows are loaded into the student_import_rows staging table
+    (COPY on psycopg2, a bulk INSERT elsewhere) and merged into students with
+    a single INSERT ... SELECT that re-checks for existing students
+ 4. the job's counters, errors and checkpoint (`last_row`) are updated in the
+    same transaction as the merge
+
+If a batch hits a database error it is split in halves until the offending
+rows are isolated and reported, so one bad row does not fail its neighbours.
+A failed or interrupted job resumes after its checkpoint; because merging
+skips students that already exist, re-running a batch cannot duplicate rows.
+
+A running job's heartbeat_at is refreshed at every checkpoint. At start-up an
+instance only takes over running jobs whose heartbeat is older than
+STUDENT_IMPORT_HEARTBEAT_TIMEOUT (their instance died), and only jobs whose
+spooled file exists on this host.
+"""
+
+import csv
+import io
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from email_validator import EmailNotValidError, validate_email
+from sqlalchemy import and_, case, delete, exists, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.core.roles import Role
+from app.models.student_import import StudentImportJob, StudentImportRow
+from app.models.students import Student
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+ALIAS_MAP = {
+    "id": "student_id",
+    "student id": "student_id",
+    "student_id": "student_id",
+    "name": "student_name",
+    "student name": "student_name",
+    "student_name": "student_name",
+    "email": "student_email",
+    "student email": "student_email",
+    "student_email": "student_email",
+    "phone": "student_phone",
+    "mobile": "student_phone",
+    "student phone": "student_phone",
+    "student_phone": "student_phone",
+    "dob": "date_of_birth",
+    "date of birth": "date_of_birth",
+    "date_of_birth": "date_of_birth",
+    "guardian": "guardian_name",
+    "guardian_name": "guardian_name",
+    "guardian phone": "guardian_phone",
+    "guardian_phone": "guardian_phone",
+    "emergency": "emergency_contact",
+    "emergency_contact": "emergency_contact",
+    "checkin": "check_in_date",
+    "check_in": "check_in_date",
+    "check_in_date": "check_in_date",
+    "room": "room_assignment",
+    "room_assignment": "room_assignment",
+    "bed": "bed_assignment",
+    "bed_assignment": "bed_assignment",
+    "status": "status",
+}
+REQUIRED_FIELDS = ("student_id", "student_name", "student_email", "student_phone")
+DATE_FIELDS = ("date_of_birth", "check_in_date")
+IMPORT_FIELDS = [
+    "student_id", "student_name", "student_email", "student_phone", "date_of_birth", "guardian_name",
+    "guardian_phone", "emergency_contact", "check_in_date", "room_assignment", "bed_assignment", "status",
+]
+STAGED_COLUMNS = IMPORT_FIELDS + ["user_id"]
+
+# {field: value, ..., "row_number": n} after validation
+ImportRow = Dict[str, Any]
+
+
+def map_header(header: List[str]) -> Dict[str, int]:
+    """Student field -> CSV column index (first matching column wins)"""
+    mapping: Dict[str, int] = {}
+    for index, name in enumerate(header):
+        field = ALIAS_MAP.get((name or "").strip().lower())
+        if field and field not in mapping:
+            mapping[field] = index
+    return mapping
+
+
+class RowValidator:
+    """Validates batches of raw CSV rows column by column.
+
+    Keeps the student ids / emails / phones seen so far, so duplicates later
+    in the same file are reported against the row that came first.
+    """
+
+    def __init__(self, mapping: Dict[str, int]):
+        self.mapping = mapping
+        self.seen: Dict[str, Dict[str, int]] = {"student_id": {}, "student_email": {}, "student_phone": {}}
+        self._dates: Dict[str, Optional[date]] = {}
+
+    def _column(self, rows: List[List[str]], field: str) -> List[Optional[str]]:
+        index = self.mapping.get(field)
+        if index is None:
+            return [None] * len(rows)
+        return [(row[index].strip() or None) if index < len(row) else None for row in rows]
+
+    def _parse_date(self, value: str) -> Optional[date]:
+        if value not in self._dates:
+            try:
+                self._dates[value] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                self._dates[value] = None
+        return self._dates[value]
+
+    def validate(self, batch: List[Tuple[int, List[str]]]) -> Tuple[List[ImportRow], List[Dict[str, Any]]]:
+        numbers = [number for number, _ in batch]
+        raw = [row for _, row in batch]
+        columns = {field: self._column(raw, field) for field in IMPORT_FIELDS}
+        problems: Dict[int, str] = {}
+
+        for i in range(len(batch)):
+            missing = [field for field in REQUIRED_FIELDS if not columns[field][i]]
+            if missing:
+                problems[i] = f"missing required: {', '.join(missing)}"
+
+        for field in DATE_FIELDS:
+            values = columns[field]
+            for i, value in enumerate(values):
+                if value is None or i in problems:
+                    continue
+                parsed = self._parse_date(value)
+                if parsed is None:
+                    problems[i] = f"invalid date format for {field} (use YYYY-MM-DD)"
+                values[i] = parsed
+
+        emails = columns["student_email"]
+        for i, value in enumerate(emails):
+            if i in problems:
+                continue
+            try:
+                emails[i] = validate_email(value, check_deliverability=False).normalized
+            except EmailNotValidError as exc:
+                problems[i] = f"invalid student_email: {exc}"
+
+        for i in range(len(batch)):
+            if i in problems:
+                continue
+            keys = {field: columns[field][i].lower() if field == "student_email" else columns[field][i]
+                    for field in self.seen}
+            duplicate = next((field for field, key in keys.items() if key in self.seen[field]), None)
+            if duplicate:
+                problems[i] = f"duplicate {duplicate} (first seen on row {self.seen[duplicate][keys[duplicate]]})"
+                continue
+            for field, key in keys.items():
+                self.seen[field][key] = numbers[i]
+
+        valid = [
+            dict({field: columns[field][i] for field in IMPORT_FIELDS}, row_number=numbers[i])
+            for i in range(len(batch)) if i not in problems
+        ]
+        errors = [{"row": numbers[i], "error": problems[i]} for i in sorted(problems)]
+        return valid, errors
+
+
+def _batches(reader: Iterator[List[str]], size: int, start_after: int) -> Iterator[List[Tuple[int, List[str]]]]:
+    batch: List[Tuple[int, List[str]]] = []
+    for number, row in enumerate(reader, start=2):
+        if number <= start_after or not any(cell.strip() for cell in row):
+            continue
+        batch.append((number, row))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _db_error(exc: SQLAlchemyError) -> str:
+    detail = getattr(exc, "orig", None) or exc
+    return str(detail).strip().splitlines()[0][:300]
+
+
+class StudentImporter:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        batch_size: int = 1000,
+        workers: int = 1,
+        max_errors: int = 1000,
+        heartbeat_timeout: float = 600.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.max_errors = max_errors
+        self.heartbeat_timeout = heartbeat_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="student-import")
+        self._lock = threading.Lock()
+        self._counters = {
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "batches": 0,
+            "batches_split": 0,
+            "rows_created": 0,
+        }
+
+    # ---------------------------------------------------------
+    # JOBS
+    # ---------------------------------------------------------
+    def create_job(self, file_path: str, filename: Optional[str] = None, total_rows: Optional[int] = None,
+                   created_by: Optional[int] = None) -> int:
+        with self.session_factory() as db:
+            job = StudentImportJob(file_path=file_path, filename=filename, total_rows=total_rows,
+                                   created_by=created_by, status="pending", last_row=1,
+                                   created_count=0, skipped_count=0, failed_count=0, errors=[])
+            db.add(job)
+            db.commit()
+            return job.id
+
+    def submit(self, job_id: int):
+        """Queue a pending (or failed) job; returns a Future"""
+        with self._lock:
+            self._counters["jobs_submitted"] += 1
+        return self._pool.submit(self.run_job, job_id)
+
+    def resume(self, job_id: int) -> bool:
+        """Re-queue a failed job from its checkpoint"""
+        jobs = StudentImportJob.__table__
+        with self.session_factory() as db:
+            resumed = db.execute(
+                update(jobs).where(jobs.c.id == job_id, jobs.c.status == "failed")
+                .values(status="pending", last_error=None, finished_at=None)
+            ).rowcount
+            db.commit()
+        if resumed:
+            self.submit(job_id)
+        return bool(resumed)
+
+    def resume_interrupted(self) -> int:
+        """Re-queue pending jobs and running jobs whose instance stopped heart-beating
+
+        Jobs whose spooled file is not on this host are left to the instance
+        that has it.
+        """
+        jobs = StudentImportJob.__table__
+        stale = or_(jobs.c.heartbeat_at.is_(None),
+                    jobs.c.heartbeat_at < datetime.utcnow() - timedelta(seconds=self.heartbeat_timeout))
+        with self.session_factory() as db:
+            candidates = db.execute(
+                select(jobs.c.id, jobs.c.status, jobs.c.file_path)
+                .where(or_(jobs.c.status == "pending", and_(jobs.c.status == "running", stale)))
+            ).all()
+            local = [job for job in candidates if os.path.exists(job.file_path)]
+            abandoned = [job.id for job in local if job.status == "running"]
+            if abandoned:
+                db.execute(
+                    update(jobs).where(jobs.c.id.in_(abandoned), jobs.c.status == "running", stale)
+                    .values(status="pending")
+                )
+            db.commit()
+        if len(local) < len(candidates):
+            logger.info("Leaving %d student import jobs whose files are not on this host",
+                        len(candidates) - len(local))
+        for job in local:
+            self.submit(job.id)
+        return len(local)
+
+    def run_job(self, job_id: int) -> Dict[str, Any]:
+        jobs = StudentImportJob.__table__
+        with self.session_factory() as db:
+            claimed = db.execute(
+                update(jobs).where(jobs.c.id == job_id, jobs.c.status == "pending")
+                .values(status="running", started_at=datetime.utcnow(), heartbeat_at=datetime.utcnow())
+            ).rowcount
+            db.commit()
+            job = db.get(StudentImportJob, job_id)
+            if not claimed or job is None:
+                return {"job_id": job_id, "status": job.status if job else "missing"}
+            file_path, start_after = job.file_path, job.last_row
+
+        try:
+            with open(file_path, newline="", encoding="utf-8-sig") as handle:
+                reader = csv.reader(handle)
+                mapping = map_header(next(reader, []))
+                missing = [field for field in REQUIRED_FIELDS if field not in mapping]
+                if missing:
+                    raise ValueError(f"missing required columns: {', '.join(missing)}")
+                validator = RowValidator(mapping)
+                for batch in _batches(reader, self.batch_size, start_after):
+                    valid, errors = validator.validate(batch)
+                    self._commit_batch(job_id, valid, errors, last_row=batch[-1][0])
+        except Exception as exc:
+            logger.exception("Student import job %s failed", job_id)
+            with self.session_factory() as db:
+                db.execute(update(jobs).where(jobs.c.id == job_id).values(
+                    status="failed", last_error=str(exc)[:1000], finished_at=datetime.utcnow()))
+                db.commit()
+            with self._lock:
+                self._counters["jobs_failed"] += 1
+        else:
+            with self.session_factory() as db:
+                db.execute(update(jobs).where(jobs.c.id == job_id).values(
+                    status="completed", finished_at=datetime.utcnow()))
+                db.commit()
+            with self._lock:
+                self._counters["jobs_completed"] += 1
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+        with self.session_factory() as db:
+            return job_progress(db.get(StudentImportJob, job_id))
+
+    # ---------------------------------------------------------
+    # BATCHES
+    # ---------------------------------------------------------
+    def _commit_batch(self, job_id: int, rows: List[ImportRow], errors: List[Dict[str, Any]], last_row: int):
+        with self._lock:
+            self._counters["batches"] += 1
+        try:
+            with self.session_factory() as db:
+                created, skipped = self._merge_rows(db, job_id, rows)
+                self._checkpoint(db, job_id, last_row, created, skipped, errors)
+                db.commit()
+            return
+        except SQLAlchemyError:
+            logger.warning("Student import job %s: batch ending at row %s failed, isolating rows",
+                           job_id, last_row, exc_info=True)
+        with self._lock:
+            self._counters["batches_split"] += 1
+        errors = list(errors)
+        created, skipped = self._merge_isolated(job_id, rows, errors)
+        with self.session_factory() as db:
+            self._checkpoint(db, job_id, last_row, created, skipped, errors)
+            db.commit()
+
+    def _merge_isolated(self, job_id: int, rows: List[ImportRow], errors: List[Dict[str, Any]]) -> Tuple[int, int]:
+        try:
+            with self.session_factory() as db:
+                created, skipped = self._merge_rows(db, job_id, rows)
+                db.commit()
+            return created, skipped
+        except SQLAlchemyError as exc:
+            if len(rows) == 1:
+                errors.append({"row": rows[0]["row_number"], "error": _db_error(exc)})
+                return 0, 0
+        middle = len(rows) // 2
+        first = self._merge_isolated(job_id, rows[:middle], errors)
+        second = self._merge_isolated(job_id, rows[middle:], errors)
+        return first[0] + second[0], first[1] + second[1]
+
+    def _merge_rows(self, db, job_id: int, rows: List[ImportRow]) -> Tuple[int, int]:
+        """Stage and merge validated rows; returns (created, skipped). Caller commits."""
+        if not rows:
+            return 0, 0
+        students = Student.__table__
+        ids = [row["student_id"] for row in rows]
+        emails = [row["student_email"] for row in rows]
+        existing = db.execute(
+            select(students.c.student_id, students.c.student_email)
+            .where(or_(students.c.student_id.in_(ids), students.c.student_email.in_(emails)))
+        ).all()
+        taken_ids = {r.student_id for r in existing}
+        taken_emails = {r.student_email for r in existing}
+        fresh = [row for row in rows if row["student_id"] not in taken_ids and row["student_email"] not in taken_emails]
+        skipped = len(rows) - len(fresh)
+        if not fresh:
+            return 0, skipped
+
+        self._link_users(db, fresh)
+        self._load_staging(db, [dict(row, job_id=job_id) for row in fresh])
+
+        staging = StudentImportRow.__table__
+        source = (
+            select(*[staging.c[name] for name in STAGED_COLUMNS])
+            .where(staging.c.job_id == job_id)
+            .where(~exists().where(or_(students.c.student_id == staging.c.student_id,
+                                       students.c.student_email == staging.c.student_email)))
+            .order_by(staging.c.row_number)
+        )
+        created = db.execute(insert(students).from_select(STAGED_COLUMNS, source)).rowcount
+        db.execute(delete(staging).where(staging.c.job_id == job_id))
+        with self._lock:
+            self._counters["rows_created"] += created
+        return created, skipped + len(fresh) - created
+
+    def _link_users(self, db, rows: List[ImportRow]):
+        """Attach a user_id to every row: reuse users by email / phone, create the rest in one INSERT"""
+        users = User.__table__
+        emails = [row["student_email"] for row in rows]
+        phones = [row["student_phone"] for row in rows]
+        found = db.execute(
+            select(users.c.id, users.c.email, users.c.phone_number)
+            .where(or_(users.c.email.in_(emails), users.c.phone_number.in_(phones)))
+        ).all()
+        by_email = {r.email: r.id for r in found if r.email}
+        by_phone = {r.phone_number: r.id for r in found if r.phone_number}
+
+        reused, new_rows = set(), []
+        for row in rows:
+            user_id = by_email.get(row["student_email"]) or by_phone.get(row["student_phone"])
+            if user_id:
+                row["user_id"] = user_id
+                reused.add(user_id)
+            else:
+                new_rows.append(row)
+
+        if reused:
+            # Same promotion create_student applies to a reused account
+            db.execute(
+                update(users).where(users.c.id.in_(reused)).values(
+                    role=Role.STUDENT.value,
+                    is_active=True,
+                    is_verified=True,
+                    is_email_verified=case((users.c.email.isnot(None), True), else_=users.c.is_email_verified),
+                    is_phone_verified=case((users.c.phone_number.isnot(None), True), else_=users.c.is_phone_verified),
+                )
+            )
+        if new_rows:
+            usernames = self._unique_usernames(db, [row["student_email"].split("@")[0] for row in new_rows])
+            db.execute(
+                insert(users),
+                [
+                    {"email": row["student_email"], "phone_number": row["student_phone"], "username": username,
+                     "full_name": row["student_name"], "name": row["student_name"], "role": Role.STUDENT.value,
+                     "is_active": True, "is_verified": True, "is_email_verified": True, "is_phone_verified": True}
+                    for row, username in zip(new_rows, usernames)
+                ],
+            )
+            # Read the ids back by (unique) email: RETURNING with parameter order
+            # degrades to one INSERT per row on some backends
+            created = dict(db.execute(
+                select(users.c.email, users.c.id).where(users.c.email.in_([row["student_email"] for row in new_rows]))
+            ).all())
+            for row in new_rows:
+                row["user_id"] = created[row["student_email"]]
+
+    @staticmethod
+    def _unique_usernames(db, bases: List[str]) -> List[str]:
+        """base, base1, base2... skipping names taken in the database or earlier in the batch"""
+        users = User.__table__
+        names = list(bases)
+        suffixes = [0] * len(bases)
+        pending = set(range(len(bases)))
+        used: set = set()
+        while pending:
+            taken = set(db.execute(
+                select(users.c.username).where(users.c.username.in_({names[i] for i in pending}))
+            ).scalars())
+            retry = set()
+            for i in sorted(pending):
+                if names[i] in taken or names[i] in used:
+                    suffixes[i] += 1
+                    names[i] = f"{bases[i]}{suffixes[i]}"
+                    retry.add(i)
+                else:
+                    used.add(names[i])
+            pending = retry
+        return names
+
+    @staticmethod
+    def _load_staging(db, rows: List[Dict[str, Any]]):
+        staging = StudentImportRow.__table__
+        columns = ["job_id", "row_number"] + STAGED_COLUMNS
+        cursor = None
+        if db.get_bind().dialect.name == "postgresql":
+            cursor = db.connection().connection.cursor()
+        if cursor is not None and hasattr(cursor, "copy_expert"):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([row.get(name) for name in columns])  # None -> unquoted empty -> NULL
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            return
+        db.execute(insert(staging), [{name: row.get(name) for name in columns} for row in rows])
+
+    def _checkpoint(self, db, job_id: int, last_row: int, created: int, skipped: int,
+                    errors: List[Dict[str, Any]]):
+        job = db.get(StudentImportJob, job_id)
+        job.last_row = last_row
+        job.heartbeat_at = datetime.utcnow()
+        job.created_count = (job.created_count or 0) + created
+        job.skipped_count = (job.skipped_count or 0) + skipped
+        job.failed_count = (job.failed_count or 0) + len(errors)
+        stored = list(job.errors or [])
+        if errors and len(stored) < self.max_errors:
+            job.errors = stored + sorted(errors, key=lambda e: e["row"])[: self.max_errors - len(stored)]
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+# ---------------------------------------------------------
+# UPLOADS & PROGRESS
+# ---------------------------------------------------------
+def spool_upload(source, directory: str, chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """Copy an uploaded file to disk in chunks; returns (path, data rows counted by line breaks)"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.csv")
+    lines, last = 0, b"\n"
+    with open(path, "wb") as target:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            target.write(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    return path, max(0, lines - 1)
+
+
+def job_progress(job: StudentImportJob) -> Dict[str, Any]:
+    created, skipped, failed = job.created_count or 0, job.skipped_count or 0, job.failed_count or 0
+    processed = created + skipped + failed
+    total = job.total_rows or 0
+    if job.status == "completed":
+        progress = 1.0
+    else:
+        progress = round(min(processed / total, 1.0), 4) if total else 0.0
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "total_rows": job.total_rows,
+        "processed_rows": processed,
+        "created": created,
+        "skipped": skipped,
+        "failed": failed,
+        "progress": progress,
+        "errors": job.errors or [],
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+_importer: Optional[StudentImporter] = None
+_importer_lock = threading.Lock()
+
+
+def get_student_importer() -> StudentImporter:
+    global _importer
+    if _importer is None:
+        with _importer_lock:
+            if _importer is None:
+                from app.config import SessionLocal
+                _importer = StudentImporter(SessionLocal, batch_size=settings.STUDENT_IMPORT_BATCH_SIZE,
+                                            heartbeat_timeout=settings.STUDENT_IMPORT_HEARTBEAT_TIMEOUT)
+    return _importer
+
+
+def shutdown_student_importer(wait: bool = True) -> None:
+    global _importer
+    with _importer_lock:
+        importer, _importer = _importer, None
+    if importer is not None:
+        importer.shutdown(wait=wait)
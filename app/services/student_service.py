@@ -3,6 +3,8 @@ from datetime import date, datetime, time as time_type
 from sqlalchemy.orm import Session
 from app.repositories.student_repository import (
     list_students as repo_list_students,
+    list_students_page as repo_list_students_page,
+    students_query as repo_students_query,
     get_student as repo_get_student,
     create_student as repo_create_student,
     update_student as repo_update_student,
@@ -28,7 +30,7 @@ from app.schemas.students import (
     AttendanceOut,
     AttendanceCreate,
 )
-from app.models.students import PaymentType, PaymentMethod, AttendanceMode
+from app.models.students import Student, PaymentType, PaymentMethod, AttendanceMode
 
 
 # ---- Student CRUD / status / transfer ----
@@ -59,6 +61,7 @@ def list_students(
     complaint_count_gt: Optional[int] = None,
     user_hostel_ids: Optional[List[int]] = None,
     active_hostel_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> List:
     return repo_list_students(
         db,
@@ -86,9 +89,21 @@ def list_students(
         complaint_count_gt=complaint_count_gt,
         user_hostel_ids=user_hostel_ids,
         active_hostel_id=active_hostel_id,
+        cursor=cursor,
     )
 
 
+def list_students_page(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters):
+    """Students page (items, total, next_cursor) for the listing endpoints"""
+    return repo_list_students_page(db, skip=skip, limit=limit, cursor=cursor, **filters)
+
+
+def export_students_statement(db: Session, headers: List[str], **filters):
+    """Column-only SELECT of `headers` for the student export, same filters as listing"""
+    columns = [getattr(Student, h) for h in headers]
+    return repo_students_query(db, columns=columns, **filters).statement
+
+
 def get_student(db: Session, student_id: str):
     return repo_get_student(db, student_id)
 
@@ -9,6 +9,7 @@ from app.core.roles import Role
 from app.repositories.hostel_repository import HostelRepository
 from app.repositories.user_repository import UserRepository
 from app.core.exceptions import InvalidHostelException
+from app.core.hostel_scope import invalidate_hostel_scope
  
  
 class TenantService:
@@ -129,6 +130,7 @@ class TenantService:
                 continue
             # perform idempotent assignment
             self.hostel_repo.assign_admin(admin_id, hid)
+        invalidate_hostel_scope(admin_id, Role.ADMIN)
  
         # After assignments, return the actual hostels assigned to the admin from the DB
         assigned_hostels = self.hostel_repo.get_by_admin(admin_id)
@@ -184,6 +184,29 @@ def cleanup_old_reports_task():
         db.close()
 
 
+@celery_app.task(name='record_occupancy_snapshots')
+def record_occupancy_snapshots_task(snapshot_date: Optional[str] = None):
+    """
+    Store today's occupancy for every hostel so trends show real history
+    """
+    from app.core.database import SessionLocal
+    from app.services.analytics_service import AnalyticsService
+    
+    db = SessionLocal()
+    try:
+        snapshot_date_obj = datetime.strptime(snapshot_date, '%Y-%m-%d').date() if snapshot_date else None
+        recorded = AnalyticsService.record_occupancy_snapshots(db, snapshot_date_obj)
+        
+        print(f"Recorded {recorded} occupancy snapshots")
+        
+        return {
+            "status": "success",
+            "recorded": recorded
+        }
+    finally:
+        db.close()
+
+
 @celery_app.task(name='send_report_notifications')
 def send_report_notifications_task(report_type: str, hostel_id: int, recipients: list):
     """
@@ -229,6 +252,13 @@ def setup_periodic_tasks(sender, **kwargs):
         name='monthly-reports-generation'
     )
     
+    # Snapshot hostel occupancy every day at 11:55 PM
+    sender.add_periodic_task(
+        crontab(hour=23, minute=55),
+        record_occupancy_snapshots_task.s(),
+        name='daily-occupancy-snapshots'
+    )
+    
     # Cleanup old reports every Sunday at 3:00 AM
     sender.add_periodic_task(
         crontab(hour=3, minute=0, day_of_week=0),
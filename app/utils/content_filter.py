@@ -1,8 +1,19 @@
 """
 Content filtering and spam detection utilities for reviews
+
+Everything the filters look for is compiled once at import time into
+`_KEYWORD_TABLE` (each distinct keyword with the signal lists it feeds) and a
+few precompiled patterns. `scan_text` makes a single pass over a review and
+returns every signal, so `moderate_content` and `moderate_many` read each
+text once; the single-purpose helpers only check their own keywords.
+
+Keywords match as plain substrings of the lowercased text (as they always
+have, so "visited" counts as "visit"). The table is checked with `in`, which
+runs a C substring search per keyword; on CPython that measured faster than a
+single regex alternation over the same words.
 """
 import re
-from typing import Tuple, List
+from typing import Dict, Iterable, List, Tuple
 
 # Spam detection keywords
 SPAM_KEYWORDS = [
@@ -24,75 +35,86 @@ QUALITY_INDICATORS = {
     "specific": ["room", "bathroom", "kitchen", "wifi", "food", "staff", "location", "price", "facilities"]
 }
 
-def detect_spam(text: str) -> Tuple[bool, List[str]]:
+# Keywords that make a review spam on their own
+_STRONG_SPAM_KEYWORDS = frozenset(["advertisement", "promo", "click here"])
+
+
+def _build_keyword_table() -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Keyword -> signals it feeds, in the order the lists above declare them"""
+    signals: Dict[str, List[str]] = {}
+    sources = [("spam", SPAM_KEYWORDS), ("inappropriate", INAPPROPRIATE_KEYWORDS)]
+    sources += list(QUALITY_INDICATORS.items())
+    for signal, keywords in sources:
+        for keyword in keywords:
+            targets = signals.setdefault(keyword, [])
+            if signal not in targets:
+                targets.append(signal)
+    return tuple((keyword, tuple(targets)) for keyword, targets in signals.items())
+
+
+_KEYWORD_TABLE = _build_keyword_table()
+
+_KEYWORDS = tuple(keyword for keyword, _ in _KEYWORD_TABLE)
+_KEYWORD_SIGNALS = dict(_KEYWORD_TABLE)
+
+# Long numbers (phone numbers), URLs, repeated characters (aaaaa); email
+# addresses are only looked for when the text has an "@"
+_SUSPICIOUS_PATTERN = re.compile(r"\b\d{10,}\b|http[s]?://\S+|(?P<repeated>.)(?P=repeated){4,}")
+_EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_PROFANITY_WORDS = ("fuck", "shit", "damn")
+_PROFANITY_PATTERN = re.compile(r"\b(?:%s)\b" % "|".join(_PROFANITY_WORDS))
+
+
+def _is_suspicious(text: str) -> bool:
+    return _SUSPICIOUS_PATTERN.search(text) is not None or ("@" in text and _EMAIL_PATTERN.search(text) is not None)
+
+
+def _has_excessive_caps(text: str) -> bool:
+    return len(text) > 20 and sum(map(str.isupper, text)) / len(text) > 0.5
+
+
+def _has_profanity(text_lower: str) -> bool:
+    return any(word in text_lower for word in _PROFANITY_WORDS) and _PROFANITY_PATTERN.search(text_lower) is not None
+
+
+def scan_text(text: str) -> dict:
     """
-    Detect potential spam content in review text
-    Returns: (is_spam, found_keywords)
+    Collect every moderation signal from one pass over the review text.
+    Returns keyword hits per signal ("spam", "inappropriate", "positive",
+    "negative", "specific"), plus "suspicious_pattern", "excessive_caps" and
+    "profanity" flags.
     """
     text_lower = text.lower()
-    found_keywords = []
-    
-    for keyword in SPAM_KEYWORDS:
-        if keyword in text_lower:
-            found_keywords.append(keyword)
-    
-    # Additional spam patterns
-    spam_patterns = [
-        r'\b\d{10,}\b',  # Long numbers (phone numbers)
-        r'http[s]?://\S+',  # URLs
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email addresses
-        r'(.)\1{4,}',  # Repeated characters (aaaaa)
-    ]
-    
-    for pattern in spam_patterns:
-        if re.search(pattern, text):
-            found_keywords.append("suspicious_pattern")
-            break
-    
-    # Check for excessive capitalization
-    if len(text) > 20 and sum(1 for c in text if c.isupper()) / len(text) > 0.5:
+    hits: Dict[str, List[str]] = {"spam": [], "inappropriate": [], "positive": [], "negative": [], "specific": []}
+    for keyword in [keyword for keyword in _KEYWORDS if keyword in text_lower]:
+        for signal in _KEYWORD_SIGNALS[keyword]:
+            hits[signal].append(keyword)
+    hits["suspicious_pattern"] = _is_suspicious(text)
+    hits["excessive_caps"] = _has_excessive_caps(text)
+    hits["profanity"] = _has_profanity(text_lower)
+    return hits
+
+
+def _spam_result(hits: dict) -> Tuple[bool, List[str]]:
+    found_keywords = list(hits["spam"])
+    if hits["suspicious_pattern"]:
+        found_keywords.append("suspicious_pattern")
+    if hits["excessive_caps"]:
         found_keywords.append("excessive_caps")
-    
-    is_spam = len(found_keywords) >= 2 or any(keyword in ["advertisement", "promo", "click here"] for keyword in found_keywords)
-    
+    is_spam = len(found_keywords) >= 2 or not _STRONG_SPAM_KEYWORDS.isdisjoint(found_keywords)
     return is_spam, found_keywords
 
-def detect_inappropriate_content(text: str) -> Tuple[bool, List[str]]:
-    """
-    Detect inappropriate content in review text
-    Returns: (is_inappropriate, found_keywords)
-    """
-    text_lower = text.lower()
-    found_keywords = []
-    
-    for keyword in INAPPROPRIATE_KEYWORDS:
-        if keyword in text_lower:
-            found_keywords.append(keyword)
-    
-    # Check for excessive profanity patterns
-    profanity_patterns = [
-        r'\b[f][u][c][k]\b',
-        r'\b[s][h][i][t]\b',
-        r'\b[d][a][m][n]\b'
-    ]
-    
-    for pattern in profanity_patterns:
-        if re.search(pattern, text_lower):
-            found_keywords.append("profanity")
-            break
-    
-    is_inappropriate = len(found_keywords) > 0
-    
-    return is_inappropriate, found_keywords
 
-def content_quality_score(text: str, rating: int) -> float:
-    """
-    Calculate content quality score (0.0 to 1.0)
-    Higher score indicates better quality content
-    """
+def _inappropriate_result(hits: dict) -> Tuple[bool, List[str]]:
+    found_keywords = list(hits["inappropriate"])
+    if hits["profanity"]:
+        found_keywords.append("profanity")
+    return len(found_keywords) > 0, found_keywords
+
+
+def _quality_score(text: str, rating: int, hits: dict) -> float:
     score = 0.0
-    text_lower = text.lower()
-    
+
     # Length factor (optimal length 50-500 characters)
     length = len(text)
     if 50 <= length <= 500:
@@ -101,20 +123,19 @@ def content_quality_score(text: str, rating: int) -> float:
         score += 0.2
     elif length < 20:
         score += 0.1
-    
+
     # Specific details factor
-    specific_count = sum(1 for word in QUALITY_INDICATORS["specific"] if word in text_lower)
-    score += min(specific_count * 0.1, 0.3)
-    
+    score += min(len(hits["specific"]) * 0.1, 0.3)
+
     # Balanced sentiment (not all positive or all negative)
-    positive_count = sum(1 for word in QUALITY_INDICATORS["positive"] if word in text_lower)
-    negative_count = sum(1 for word in QUALITY_INDICATORS["negative"] if word in text_lower)
-    
+    positive_count = len(hits["positive"])
+    negative_count = len(hits["negative"])
+
     if positive_count > 0 and negative_count > 0:
         score += 0.2  # Balanced review
     elif positive_count > 0 or negative_count > 0:
         score += 0.1  # Some sentiment
-    
+
     # Rating consistency (extreme ratings should have strong sentiment)
     if rating in [1, 2] and negative_count > 0:
         score += 0.1
@@ -122,23 +143,57 @@ def content_quality_score(text: str, rating: int) -> float:
         score += 0.1
     elif rating == 3:  # Neutral rating
         score += 0.1
-    
-    # Grammar and structure (basic check)
-    sentences = text.split('.')
-    if len(sentences) > 1:
-        score += 0.1  # Multiple sentences
-    
+
+    # Grammar and structure (basic check: more than one sentence)
+    if "." in text:
+        score += 0.1
+
     return min(score, 1.0)
 
-def moderate_content(text: str, rating: int) -> dict:
+
+def detect_spam(text: str) -> Tuple[bool, List[str]]:
     """
-    Comprehensive content moderation
-    Returns moderation results and recommendations
+    Detect potential spam content in review text
+    Returns: (is_spam, found_keywords)
+    """
+    text_lower = text.lower()
+    return _spam_result({
+        "spam": [keyword for keyword in SPAM_KEYWORDS if keyword in text_lower],
+        "suspicious_pattern": _is_suspicious(text),
+        "excessive_caps": _has_excessive_caps(text),
+    })
+
+
+def detect_inappropriate_content(text: str) -> Tuple[bool, List[str]]:
+    """
+    Detect inappropriate content in review text
+    Returns: (is_inappropriate, found_keywords)
+    """
+    text_lower = text.lower()
+    return _inappropriate_result({
+        "inappropriate": [keyword for keyword in INAPPROPRIATE_KEYWORDS if keyword in text_lower],
+        "profanity": _has_profanity(text_lower),
+    })
+
+
+def content_quality_score(text: str, rating: int) -> float:
     """
-    is_spam, spam_keywords = detect_spam(text)
-    is_inappropriate, inappropriate_keywords = detect_inappropriate_content(text)
-    quality_score = content_quality_score(text, rating)
-    
+    Calculate content quality score (0.0 to 1.0)
+    Higher score indicates better quality content
+    """
+    text_lower = text.lower()
+    hits = {
+        signal: [word for word in words if word in text_lower]
+        for signal, words in QUALITY_INDICATORS.items()
+    }
+    return _quality_score(text, rating, hits)
+
+
+def _moderate(text: str, rating: int, hits: dict) -> dict:
+    is_spam, spam_keywords = _spam_result(hits)
+    is_inappropriate, inappropriate_keywords = _inappropriate_result(hits)
+    quality_score = _quality_score(text, rating, hits)
+
     # Determine action
     if is_inappropriate:
         action = "reject"
@@ -155,7 +210,7 @@ def moderate_content(text: str, rating: int) -> dict:
     else:
         action = "flag_low_quality"
         reason = "Low quality content detected"
-    
+
     return {
         "action": action,
         "reason": reason,
@@ -165,3 +220,27 @@ def moderate_content(text: str, rating: int) -> dict:
         "spam_keywords": spam_keywords,
         "inappropriate_keywords": inappropriate_keywords
     }
+
+
+def moderate_content(text: str, rating: int) -> dict:
+    """
+    Comprehensive content moderation
+    Returns moderation results and recommendations
+    """
+    return _moderate(text, rating, scan_text(text))
+
+
+def moderate_many(texts: Iterable[str], ratings: Iterable[int]) -> List[dict]:
+    """
+    Moderate a batch of reviews (e.g. re-moderating the backlog after a
+    keyword change). Results line up with `texts`; identical texts are
+    scanned once.
+    """
+    scans: Dict[str, dict] = {}
+    results = []
+    for text, rating in zip(texts, ratings, strict=True):
+        hits = scans.get(text)
+        if hits is None:
+            hits = scans[text] = scan_text(text)
+        results.append(_moderate(text, rating, hits))
+    return results
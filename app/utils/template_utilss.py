@@ -1,5 +1,13 @@
+from functools import lru_cache
+
 from jinja2 import Template
 
+
+@lru_cache(maxsize=256)
+def _compile(template_text: str) -> Template:
+    return Template(template_text)
+
+
 def render_template(template_text: str, context: dict) -> str:
-    template = Template(template_text)
+    template = _compile(template_text or "")
     return template.render(**context)
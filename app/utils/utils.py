@@ -1,9 +1,11 @@
 import io
+from typing import Iterator
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-import pandas as pd
 from openpyxl import Workbook
 
+from app.utils.streaming_export import encode_csv
+
 def generate_pdf_report(data: dict) -> io.BytesIO:
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
@@ -79,27 +81,20 @@ def generate_pdf_report(data: dict) -> io.BytesIO:
     return buffer
 
 
-def generate_csv_report(data: dict) -> io.BytesIO:
+def generate_csv_report(data: dict) -> Iterator[bytes]:
+    """Summary as Key/Value rows, a blank line, then the by_hostel table, streamed in chunks"""
     summary = data.get("result_data", {}).get("summary", {})
     by_hostel = data.get("result_data", {}).get("by_hostel", [])
 
-    csv_buffer = io.StringIO()
-
     # Write summary as key-value pairs
     if summary:
-        df_summary = pd.DataFrame([summary])
-        df_summary = df_summary.melt(var_name="Key", value_name="Value")  # reshape to two columns
-        df_summary.to_csv(csv_buffer, index=False)
-        csv_buffer.write("\n")  # blank line between tables
+        yield from encode_csv(["Key", "Value"], summary.items())
+        yield b"\n"  # blank line between tables
 
     # Write by_hostel table
     if by_hostel:
-        df_hostel = pd.DataFrame(by_hostel)
-        df_hostel.to_csv(csv_buffer, index=False)
-
-    bytes_buffer = io.BytesIO(csv_buffer.getvalue().encode("utf-8"))
-    bytes_buffer.seek(0)
-    return bytes_buffer
+        headers = list(dict.fromkeys(key for row in by_hostel for key in row))
+        yield from encode_csv(headers, ([row.get(h) for h in headers] for row in by_hostel))
 
 
 def generate_excel_report(data: dict) -> io.BytesIO:
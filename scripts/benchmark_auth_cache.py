@@ -0,0 +1,89 @@
+"""
+Benchmark CPU spent authenticating a request.
+
+Replays the per-request work of `get_current_user` (JWT verification plus
+the users lookup) for a pool of active users, the way a busy dashboard sends
+the same tokens over and over:
+ - uncached: `jwt.decode` and a users SELECT every time (previous behaviour)
+ - cached: `decode_token` (verified-claims LRU) and `get_cached_user`
+
+Each request decodes the token twice, as the security pipeline and
+`get_current_user` both do. Reports CPU time per request (process time).
+
+Usage: python scripts/benchmark_auth_cache.py [requests] [users]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from jose import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.hostel  # noqa: F401  (users.hostel_id foreign key)
+from app.config import settings
+from app.core.cache import MemoryCache, TieredCache, set_cache
+from app.core.database import Base
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import get_cached_user, verified_tokens
+from app.models.user import User
+
+
+def seed(path: str, users: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "username": f"user{i}", "name": f"User {i}", "role": "admin", "is_active": True}
+            for i in range(1, users + 1)
+        ])
+    return sessionmaker(bind=engine)
+
+
+def uncached_request(Session, token):
+    for _ in range(2):
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    with Session() as db:
+        return db.query(User).filter(User.id == int(payload["sub"])).first()
+
+
+def cached_request(Session, token):
+    for _ in range(2):
+        payload = decode_token(token)
+    with Session() as db:
+        return get_cached_user(db, int(payload["sub"]))
+
+
+def measure(fn, Session, tokens, requests):
+    random.seed(7)
+    started = time.process_time()
+    for _ in range(requests):
+        assert fn(Session, random.choice(tokens)) is not None
+    return (time.process_time() - started) / requests * 1e6
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    set_cache(TieredCache(MemoryCache(), default_ttl=60))
+    verified_tokens.clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session = seed(os.path.join(tmp, "auth.db"), users)
+        tokens = [create_access_token({"sub": str(i), "role": "admin"}) for i in range(1, users + 1)]
+
+        before = measure(uncached_request, Session, tokens, requests)
+        after = measure(cached_request, Session, tokens, requests)
+
+    print(f"{requests} requests over {users} active users")
+    print(f"uncached: {before:8.1f} us CPU / request")
+    print(f"cached:   {after:8.1f} us CPU / request")
+    print(f"saved:    {before - after:8.1f} us CPU / request ({(1 - after / before) * 100:.0f}%)")
+    print(f"token cache: {verified_tokens.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark one pending-booking expiry run over N stale bookings.
+
+Bookings are spread over 2000 rooms. Compares, each on a fresh SQLite file:
+ - per-row: the previous expire_pending_bookings_once loop, every stale
+   booking loaded and its Room queried and updated one at a time
+ - sweeper: BookingExpirySweeper, one UPDATE ... RETURNING per chunk plus a
+   room-type lookup; pending bookings hold no beds, so rooms are not updated
+   (listeners disabled)
+
+Usage: python scripts/benchmark_booking_expiry.py [bookings] [chunk_size]
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.booking import Booking, BookingStatus
+from app.models.hostel import Hostel
+from app.models.rooms import Room
+from app.models.user import User
+from app.services.booking_expiry_service import BookingExpirySweeper
+
+ROOMS = 2000
+
+
+def populate(path: str, bookings: int, now: datetime):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[User.__table__, Hostel.__table__, Room.__table__, Booking.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(Hostel), [{"id": 1, "hostel_name": "H1", "city": "Pune"}])
+        conn.execute(insert(User), [{"id": 1, "email": "v@example.com", "username": "v", "name": "V"}])
+        conn.execute(insert(Room), [{"id": r, "hostel_id": 1, "room_number": str(r), "room_type": "DORM",
+                                     "total_beds": 200, "available_beds": 0} for r in range(1, ROOMS + 1)])
+        for start in range(0, bookings, 20000):
+            conn.execute(insert(Booking), [
+                {"visitor_id": 1, "hostel_id": 1, "room_id": 1 + i % ROOMS, "check_in": now, "check_out": now,
+                 "status": "pending", "created_at": now - timedelta(hours=25, seconds=i)}
+                for i in range(start, min(start + 20000, bookings))
+            ])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    return sessionmaker(bind=engine), statements
+
+
+def per_row(Session, now: datetime):
+    cutoff = now - timedelta(hours=24)
+    started = time.perf_counter()
+    with Session() as db:
+        pending = db.query(Booking).filter(
+            Booking.status == BookingStatus.pending.value, Booking.created_at < cutoff
+        ).all()
+        for booking in pending:
+            booking.status = BookingStatus.rejected.value
+            room = db.query(Room).filter(Room.id == booking.room_id).first()
+            room.available_beds = min(room.total_beds, room.available_beds + 1)
+        db.commit()
+    return time.perf_counter() - started, len(pending)
+
+
+def main():
+    bookings = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    now = datetime(2026, 10, 18, 10, 0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session, statements = populate(os.path.join(tmp, "per_row.db"), bookings, now)
+        elapsed, expired = per_row(Session, now)
+        print(f"{bookings} stale pending bookings over {ROOMS} rooms")
+        print(f"per-row loop:          {elapsed:7.2f} s, expired {expired:7d}, {len(statements):7d} statements")
+
+        Session, statements = populate(os.path.join(tmp, "sweeper.db"), bookings, now)
+        report = BookingExpirySweeper(Session, expiry_hours=24, chunk_size=chunk_size, listeners=[]).sweep(now=now)
+        print(f"sweeper ({chunk_size}/chunk):   {report['duration_ms'] / 1000:7.2f} s, expired {report['expired']:7d}, "
+              f"{len(statements):7d} statements ({report['chunks']} chunks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark complaint statistics over N complaints (10 hostels, 20 assignees).
+
+Each figure is computed twice on the same SQLite file:
+ - python: every matching Complaint loaded as an ORM object and counted /
+   averaged in Python, as ComplaintRepository used to do
+ - sql: the aggregate statements ComplaintRepository runs now
+
+Usage: python scripts/benchmark_complaint_statistics.py [complaints]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.complaint import Complaint, ComplaintCategory, ComplaintPriority, ComplaintStatus
+from app.models.hostel import Hostel
+from app.repositories.complaint_repository import ComplaintRepository
+
+HOSTELS = 10
+START = datetime(2024, 1, 1)
+END = datetime(2026, 12, 31)
+
+
+def populate(path: str, count: int):
+    rng = random.Random(9)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Hostel.__table__, Complaint.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(Hostel), [{"id": i, "hostel_name": f"Hostel {i}", "visibility": "public",
+                                       "is_featured": False} for i in range(1, HOSTELS + 1)])
+        for offset in range(0, count, 20000):
+            rows = []
+            for _ in range(offset, min(offset + 20000, count)):
+                created = START + timedelta(minutes=rng.randint(0, 60 * 24 * 900))
+                rows.append({
+                    "title": "Complaint", "description": "Something is broken",
+                    "category": rng.choice(list(ComplaintCategory)).name,
+                    "priority": rng.choice(list(ComplaintPriority)).name,
+                    "status": rng.choice(list(ComplaintStatus)).name,
+                    "hostel_name": f"Hostel {rng.randint(1, HOSTELS)}",
+                    "assigned_to_email": f"supervisor{rng.randint(1, 20)}@example.com",
+                    "created_at": created,
+                    "resolved_at": created + timedelta(hours=rng.randint(1, 200)) if rng.random() < 0.5 else None,
+                    "student_rating": rng.choice([None, 1, 2, 3, 4, 5]),
+                })
+            conn.execute(insert(Complaint), rows)
+    return sessionmaker(bind=engine)()
+
+
+def python_statistics(db, hostel_ids):
+    names = [h.hostel_name for h in db.query(Hostel).filter(Hostel.id.in_(hostel_ids))]
+    complaints = db.query(Complaint).filter(Complaint.hostel_name.in_(names), Complaint.created_at >= START,
+                                            Complaint.created_at <= END).all()
+    resolved = [c for c in complaints if c.resolved_at]
+    ratings = [c.student_rating for c in complaints if c.student_rating is not None]
+    return (len(complaints), len(resolved),
+            sum((c.resolved_at - c.created_at).total_seconds() for c in resolved) / max(len(resolved), 1) / 3600,
+            sum(ratings) / max(len(ratings), 1))
+
+
+def python_performance(db, email):
+    complaints = db.query(Complaint).filter(Complaint.assigned_to_email == email).all()
+    resolved = [c for c in complaints if c.status == ComplaintStatus.RESOLVED]
+    return len(complaints), len(resolved), sum(
+        (c.resolved_at - c.created_at).total_seconds() for c in resolved if c.resolved_at
+    )
+
+
+def python_analytics(db):
+    categories, statuses = {}, {}
+    for c in db.query(Complaint).all():
+        categories[c.category.value] = categories.get(c.category.value, 0) + 1
+        statuses[c.status.value] = statuses.get(c.status.value, 0) + 1
+    return categories, statuses
+
+
+def timed(label: str, db, statements, fn):
+    db.expunge_all()
+    statements.clear()
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"  {label:7s} {elapsed:9.1f} ms, {len(statements)} statements")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = populate(os.path.join(tmp, "complaints.db"), count)
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(1))
+        repo = ComplaintRepository(db)
+        all_hostels = list(range(1, HOSTELS + 1))
+        print(f"{count} complaints")
+
+        print("get_statistics (all hostels)")
+        timed("python", db, statements, lambda: python_statistics(db, all_hostels))
+        timed("sql", db, statements, lambda: ComplaintRepository.get_statistics(db, all_hostels, START, END))
+
+        print("get_performance (one supervisor)")
+        timed("python", db, statements, lambda: python_performance(db, "supervisor1@example.com"))
+        timed("sql", db, statements, lambda: repo.get_performance("supervisor1@example.com"))
+
+        print("get_analytics (all complaints)")
+        timed("python", db, statements, lambda: python_analytics(db))
+        timed("sql", db, statements, lambda: repo.get_analytics())
+
+        print(f"per-hostel statistics ({HOSTELS} hostels)")
+        timed("loop", db, statements,
+              lambda: [ComplaintRepository.get_statistics(db, [i], START, END) for i in all_hostels])
+        timed("grouped", db, statements,
+              lambda: ComplaintRepository.get_statistics_by_hostel(db, all_hostels, START, END))
+
+
+if __name__ == "__main__":
+    main()
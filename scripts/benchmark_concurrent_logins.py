@@ -0,0 +1,72 @@
+"""
+Benchmark concurrent password logins.
+
+Fires N concurrent logins (one bcrypt verify each) at an event loop:
+ - inline: `verify_password` called straight from the async handler, which
+   blocks the loop for the whole hash (previous behaviour)
+ - pool: `averify` on the bounded bcrypt HashingPool
+
+Reports logins per second and how late a 10 ms heartbeat task ran while the
+logins were in flight (how stalled every other request on the worker was).
+On a multi-core machine the pool also adds throughput, since bcrypt releases
+the GIL.
+
+Usage: python scripts/benchmark_concurrent_logins.py [logins] [rounds] [workers]
+"""
+import sys
+import os
+import asyncio
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.password_pool import HashingPool
+from app.core.security import BcryptContext
+
+PASSWORD = "Sup3r-secret-pass"
+
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.01
+        await asyncio.sleep(0.01)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(mode: str, context: BcryptContext, hashed: str, logins: int):
+    async def login():
+        if mode == "inline":
+            ok = context.verify(PASSWORD, hashed)
+        else:
+            ok = await context.averify(PASSWORD, hashed)
+        assert ok
+
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    lags.sort()
+    return logins / elapsed, (lags[-1] if lags else 0.0) * 1000
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    context = BcryptContext(rounds=rounds, pool=HashingPool(max_workers=workers, max_queue=logins))
+    hashed = context.hash(PASSWORD)
+
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, {workers} pool workers, {os.cpu_count()} CPUs")
+    print(f"{'mode':>8} {'logins/s':>10} {'max loop stall ms':>18}")
+    for mode in ("inline", "pool"):
+        rate, stall = asyncio.run(run(mode, context, hashed, logins))
+        print(f"{mode:>8} {rate:>10.1f} {stall:>18.1f}")
+    print(f"pool: {context.pool.stats()}")
+    context.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
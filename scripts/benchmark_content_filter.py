@@ -0,0 +1,71 @@
+"""
+Benchmark review moderation throughput (reviews per second).
+
+Builds a synthetic backlog of N reviews (10% exact duplicates, as spam tends
+to be) and runs it through:
+ - separate checks: detect_spam + detect_inappropriate_content +
+   content_quality_score per review, as the review route used to call them
+ - moderate_content: one scan per review
+ - moderate_many: the whole backlog in one call
+
+Usage: python scripts/benchmark_content_filter.py [reviews]
+"""
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.utils.content_filter import (
+    content_quality_score, detect_inappropriate_content, detect_spam, moderate_content, moderate_many,
+)
+
+WORDS = (
+    "the room was clean and staff friendly but wifi was bad and noisy at night we stayed two weeks "
+    "near the station price was fair kitchen good bathroom dirty location great food terrible "
+    "visit our website for a free discount call 98765432100 management helpful facilities amazing"
+).split()
+
+
+def make_backlog(reviews: int):
+    rng = random.Random(11)
+    texts, ratings = [], []
+    for i in range(reviews):
+        if texts and rng.random() < 0.1:
+            texts.append(rng.choice(texts))
+        else:
+            sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 18))) for _ in range(rng.randint(1, 5))]
+            texts.append(". ".join(sentences).capitalize() + ".")
+        ratings.append(rng.randint(1, 5))
+    return texts, ratings
+
+
+def timed(label: str, reviews: int, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:18s} {elapsed:6.2f} s, {reviews / elapsed:9.0f} reviews/s")
+
+
+def main():
+    reviews = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    texts, ratings = make_backlog(reviews)
+    print(f"{reviews} reviews, {sum(map(len, texts)) // reviews} characters on average")
+
+    def separate():
+        for text, rating in zip(texts, ratings):
+            detect_spam(text)
+            detect_inappropriate_content(text)
+            content_quality_score(text, rating)
+
+    def single():
+        for text, rating in zip(texts, ratings):
+            moderate_content(text, rating)
+
+    timed("separate checks:", reviews, separate)
+    timed("moderate_content:", reviews, single)
+    timed("moderate_many:", reviews, lambda: moderate_many(texts, ratings))
+
+
+if __name__ == "__main__":
+    main()
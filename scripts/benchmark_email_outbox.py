@@ -0,0 +1,91 @@
+"""
+Benchmark email delivery against a local aiosmtpd server.
+
+Compares:
+ - connect-per-message: the previous `EmailService.send_email` path (open
+   connection, send, quit for every message, on the caller's thread)
+ - outbox: `enqueue` on the caller's thread, delivery by EmailOutboxWorker
+   over a pool of persistent SMTP connections
+
+Reports messages per second end to end, and the caller-side cost of one send.
+
+Usage: python scripts/benchmark_email_outbox.py [messages] [pool_size]
+"""
+import sys
+import os
+import smtplib
+import socket
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from aiosmtpd.controller import Controller
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.email_service import EmailService
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted"
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    port = free_port()
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    service = EmailService()
+    connect = lambda: smtplib.SMTP("127.0.0.1", port)  # noqa: E731
+
+    try:
+        started = time.perf_counter()
+        for i in range(messages):
+            server = connect()
+            server.send_message(service.build_message(f"s{i}@example.com", "Notice", "<p>Hi</p>", "Hi"))
+            server.quit()
+        direct = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'outbox.db')}")
+            Base.metadata.create_all(engine, tables=[EmailOutbox.__table__])
+            worker = EmailOutboxWorker(sessionmaker(bind=engine), connect=connect,
+                                       build_message=service.build_message, pool_size=pool_size,
+                                       batch_size=200, poll_interval=0.05)
+            worker.start()
+            started = time.perf_counter()
+            for i in range(messages):
+                worker.enqueue(f"s{i}@example.com", "Notice", "<p>Hi</p>", "Hi")
+            enqueue_cost = (time.perf_counter() - started) / messages
+            while worker.stats()["sent"] < messages:
+                time.sleep(0.01)
+            outbox = time.perf_counter() - started
+            stats = worker.stats()
+            worker.stop()
+    finally:
+        controller.stop()
+
+    print(f"{messages} messages to a local aiosmtpd server")
+    print(f"connect-per-message: {messages / direct:8.0f} msg/s, caller blocked {direct / messages * 1e6:8.0f} us / message")
+    print(f"outbox ({pool_size} conns):   {messages / outbox:8.0f} msg/s, caller blocked {enqueue_cost * 1e6:8.1f} us / message")
+    print(f"smtp pool: {stats['smtp_pool']}")
+
+
+if __name__ == "__main__":
+    main()
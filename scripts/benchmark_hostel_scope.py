@@ -0,0 +1,131 @@
+"""
+Benchmark queries spent resolving hostel scope (`get_user_hostel_ids`).
+
+Replays scoped requests from a pool of supervisors and admins, a third of
+the supervisors being rows not yet linked to their user (matched by email or
+phone), each request in its own session as get_db opens them:
+ - previous: the per-request query chain (Supervisor by user_id, the user,
+   Supervisor by email, by phone, then supervisor_hostels; admins through
+   HostelRepository.get_by_admin)
+ - cached: `get_user_hostel_ids` (app.core.hostel_scope)
+
+Then resolves every user's scope for a report, one user at a time with the
+previous chain versus `get_users_hostel_ids` in one call.
+
+Usage: python scripts/benchmark_hostel_scope.py [requests] [users]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.api.deps import get_user_hostel_ids, get_users_hostel_ids
+from app.core.cache import MemoryCache, TieredCache, set_cache
+from app.core.database import Base
+from app.models.admin_hostel_mapping import AdminHostelMapping
+from app.models.hostel import Hostel
+from app.models.supervisors import Supervisor, SupervisorHostel
+from app.models.user import User
+from app.repositories.hostel_repository import HostelRepository
+
+HOSTELS = 50
+
+
+def seed(path: str, users: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[
+        Hostel.__table__, User.__table__, Supervisor.__table__, SupervisorHostel.__table__,
+        AdminHostelMapping.__table__,
+    ])
+    rng = random.Random(5)
+    roles = {i: "admin" if i % 4 == 0 else "supervisor" for i in range(1, users + 1)}
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "visibility": "public", "is_featured": False}
+            for i in range(1, HOSTELS + 1)
+        ])
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "username": f"user{i}", "name": f"User {i}", "role": role, "email": f"u{i}@x.com",
+             "phone_number": f"555-{i}"} for i, role in roles.items()
+        ])
+        supervisors = [i for i, role in roles.items() if role == "supervisor"]
+        conn.execute(Supervisor.__table__.insert(), [
+            {"employee_id": f"E{i}", "supervisor_name": f"S{i}", "role": "SUPERVISOR",
+             "supervisor_email": f"u{i}@x.com" if i % 3 == 1 else f"s{i}@x.com",
+             "supervisor_phone": f"555-{i}", "user_id": i if i % 3 == 0 else None}
+            for i in supervisors
+        ])
+        conn.execute(SupervisorHostel.__table__.insert(), [
+            {"employee_id": f"E{i}", "hostel_id": hostel_id}
+            for i in supervisors for hostel_id in rng.sample(range(1, HOSTELS + 1), 3)
+        ])
+        conn.execute(AdminHostelMapping.__table__.insert(), [
+            {"admin_id": i, "hostel_id": hostel_id}
+            for i, role in roles.items() if role == "admin" for hostel_id in rng.sample(range(1, HOSTELS + 1), 5)
+        ])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    return sessionmaker(bind=engine), list(roles.items()), statements
+
+
+def previous_hostel_ids(user_id: int, user_role: str, db):
+    if user_role == "admin":
+        return [h.id for h in HostelRepository(db).get_by_admin(user_id)]
+    sup = db.query(Supervisor).filter(Supervisor.user_id == user_id).first()
+    if not sup:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            if user.email:
+                sup = db.query(Supervisor).filter(Supervisor.supervisor_email == user.email).first()
+            if not sup and user.phone_number:
+                sup = db.query(Supervisor).filter(Supervisor.supervisor_phone == user.phone_number).first()
+    if not sup:
+        return []
+    return [r.hostel_id for r in db.query(SupervisorHostel).filter(SupervisorHostel.employee_id == sup.employee_id)]
+
+
+def replay(label, resolve, Session, requests, statements):
+    statements.clear()
+    started = time.perf_counter()
+    for user_id, role in requests:
+        with Session() as db:
+            resolve(user_id, role, db)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:8s} {len(statements) / len(requests):6.2f} queries/request, "
+          f"{elapsed / len(requests) * 1e6:8.1f} us/request")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    set_cache(TieredCache(MemoryCache(max_entries=10000), default_ttl=60))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session, user_roles, statements = seed(os.path.join(tmp, "scope.db"), users)
+        rng = random.Random(9)
+        replayed = [rng.choice(user_roles) for _ in range(requests)]
+
+        print(f"{requests} scoped requests from {users} users")
+        replay("previous", previous_hostel_ids, Session, replayed, statements)
+        replay("cached", get_user_hostel_ids, Session, replayed, statements)
+
+        print(f"report over all {users} users")
+        set_cache(TieredCache(MemoryCache(max_entries=10000), default_ttl=60))
+        with Session() as db:
+            statements.clear()
+            previous = {(user_id, role): previous_hostel_ids(user_id, role, db) for user_id, role in user_roles}
+            print(f"  {'previous':8s} {len(statements):6d} queries")
+            statements.clear()
+            bulk = get_users_hostel_ids(user_roles, db)
+            print(f"  {'bulk':8s} {len(statements):6d} queries")
+        assert {k: sorted(v) for k, v in bulk.items()} == {k: sorted(v) for k, v in previous.items()}
+
+
+if __name__ == "__main__":
+    main()
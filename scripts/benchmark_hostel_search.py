@@ -0,0 +1,230 @@
+"""
+Benchmark hostel search over a synthetic corpus (default 50k hostels, each
+with two rooms and a few reviews) in a fresh SQLite file.
+
+Indexing, through a mocked Elasticsearch transport (no cluster needed; the
+numbers are client-side cost and request counts):
+ - per-document: one `es.index` request per hostel, as index_hostel did
+ - HostelSearchIndexer.reindex_all: documents built per chunk with three
+   queries, written with helpers.bulk
+
+Database fallback (the path taken while Elasticsearch is down):
+ - separate COUNT(*) + page query, as SearchService used to run
+ - one page query carrying COUNT(*) OVER ()
+ plus hit@10 / MRR for prefix ("sunrise resi") and typo ("sunrsie") queries.
+ On SQLite the fallback is a LIKE scan; the trigram / full-text path needs
+ PostgreSQL with the 20261018_hostel_search_indexes migration.
+
+Relevance and latency on Elasticsearch (only with an elasticsearch_url; the
+`hostels` index on that cluster is DROPPED and rebuilt): hit@10, MRR and
+p50 / p95 latency for the same prefix and typo queries.
+
+Usage: python scripts/benchmark_hostel_search.py [hostels] [elasticsearch_url]
+"""
+import sys
+import os
+import json
+import random
+import statistics
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from elastic_transport import ApiResponseMeta, BaseNode, HttpHeaders
+from elastic_transport._node._base import NodeApiResponse
+from elasticsearch import Elasticsearch
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.elasticsearch import HOSTEL_INDEX, create_hostel_index
+from app.models.hostel import Hostel, Location
+from app.models.review import Review
+from app.models.rooms import Room
+from app.schemas.search import HostelSearchFilters, HostelSearchSort
+from app.services.hostel_search import HostelSearchIndexer, hostel_documents, search_hostels
+from app.services.search_service import SearchService
+
+FIRST = ("Sunrise", "Green", "Royal", "Silver", "Lotus", "Comfort", "Urban", "Galaxy", "Shanti", "Crystal",
+         "Maple", "Orchid", "Heritage", "Skyline", "Harmony", "Emerald", "Saffron", "Palm", "Coral", "Zenith")
+SECOND = ("Residency", "Valley", "Heights", "Nest", "Homes", "Stay", "Enclave", "Villa", "Court", "Manor",
+          "Gardens", "Plaza", "Lodge", "Towers", "Retreat")
+KIND = ("Hostel", "PG", "Boys Hostel", "Girls Hostel", "Co-living")
+CITIES = ("Pune", "Mumbai", "Bengaluru", "Hyderabad", "Chennai", "Delhi", "Kolkata", "Jaipur", "Indore", "Nagpur")
+AREAS = ("MG Road", "Station Road", "University Road", "Camp", "Old Town", "IT Park", "Lake Side", "Market Yard")
+AMENITIES = ("wifi", "laundry", "ac", "mess", "gym", "parking", "cctv", "power backup")
+QUERIES = 300
+
+
+def populate(path: str, hostels: int):
+    rng = random.Random(7)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Location.__table__, Hostel.__table__, Room.__table__,
+                                             Review.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(Location), [{"id": i + 1, "city": city} for i, city in enumerate(CITIES)])
+        rows = []
+        for i in range(1, hostels + 1):
+            city = rng.randrange(len(CITIES))
+            rows.append({
+                "id": i, "hostel_name": f"{rng.choice(FIRST)} {rng.choice(SECOND)} {rng.choice(KIND)}",
+                "location_id": city + 1, "full_address": f"{rng.randint(1, 400)} {rng.choice(AREAS)}, {CITIES[city]}",
+                "description": "Near the station with " + ", ".join(rng.sample(AMENITIES, 3)),
+                "amenities": ", ".join(rng.sample(AMENITIES, 4)), "gender_type": rng.choice(("Boys", "Girls", "Co-ed")),
+                "total_beds": 40, "current_occupancy": rng.randint(20, 40),
+                "latitude": round(18.4 + rng.random(), 6), "longitude": round(73.7 + rng.random(), 6),
+                "visibility": "public", "is_featured": False,
+            })
+        conn.execute(insert(Hostel), rows)
+        conn.execute(insert(Room), [
+            {"hostel_id": i, "room_number": str(n), "room_type": "DOUBLE", "monthly_price": float(rng.randint(30, 180) * 100),
+             "price": None, "total_beds": 2, "available_beds": 1}
+            for i in range(1, hostels + 1) for n in (1, 2)
+        ])
+        conn.execute(insert(Review), [
+            {"hostel_id": rng.randint(1, hostels), "rating": rng.randint(1, 5), "text": "ok", "is_approved": True,
+             "is_spam": False}
+            for _ in range(hostels * 2)
+        ])
+    return engine, sessionmaker(bind=engine), rows
+
+
+def make_queries(rows):
+    """(query, ids of hostels with the intended name) for prefix and typo searches"""
+    rng = random.Random(3)
+    by_name = {}
+    for row in rows:
+        by_name.setdefault(row["hostel_name"], set()).add(row["id"])
+    prefix, typo = [], []
+    for row in rng.sample(rows, QUERIES):
+        first, second = row["hostel_name"].split()[:2]
+        prefix.append((f"{first} {second[:4]}".lower(), {i for name, ids in by_name.items()
+                                                        if name.startswith(f"{first} {second}") for i in ids}))
+        swap = rng.randrange(1, len(first) - 2)
+        misspelt = first[:swap] + first[swap + 1] + first[swap] + first[swap + 2:]
+        typo.append((f"{misspelt} {second}".lower(), {i for name, ids in by_name.items()
+                                                     if name.startswith(f"{first} {second}") for i in ids}))
+    return {"prefix": prefix, "typo": typo}
+
+
+def mocked_elasticsearch():
+    """Client whose transport acknowledges every request without a cluster"""
+    requests = []
+
+    class AckNode(BaseNode):
+        def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+            requests.append(len(body or b""))
+            if target.startswith("/_bulk"):
+                items = [{"index": {"_id": json.loads(line)["index"]["_id"], "status": 201}}
+                         for line in body.decode().splitlines() if line.startswith('{"index"')]
+                payload = {"took": 1, "errors": False, "items": items}
+            else:
+                payload = {"_id": "1", "result": "created"}
+            meta = ApiResponseMeta(200, "1.1", HttpHeaders({"x-elastic-product": "Elasticsearch"}), 0.0, self.config)
+            return NodeApiResponse(meta, json.dumps(payload).encode())
+
+    return Elasticsearch("http://es:9200", node_class=AckNode), requests
+
+
+def bench_indexing(Session, hostels: int):
+    print("indexing (mocked transport)")
+    es, requests = mocked_elasticsearch()
+    started = time.perf_counter()
+    with Session() as db:
+        documents = hostel_documents(db, range(1, hostels + 1))
+    for hostel_id, document in documents.items():
+        es.index(index=HOSTEL_INDEX, id=hostel_id, document=document)
+    elapsed = time.perf_counter() - started
+    print(f"  per-document:  {elapsed:7.2f} s, {len(requests):6d} requests")
+
+    es, requests = mocked_elasticsearch()
+    started = time.perf_counter()
+    indexed = HostelSearchIndexer(Session, es_factory=lambda: es).reindex_all()
+    elapsed = time.perf_counter() - started
+    print(f"  helpers.bulk:  {elapsed:7.2f} s, {len(requests):6d} requests "
+          f"({sum(requests) / len(requests) / 1024:.0f} KiB each, {indexed} hostels)")
+
+
+def score(ranked_ids, relevant):
+    for rank, hostel_id in enumerate(ranked_ids[:10], 1):
+        if hostel_id in relevant:
+            return 1, 1 / rank
+    return 0, 0.0
+
+
+def report(label: str, outcomes, latencies):
+    hits = sum(hit for hit, _ in outcomes) / len(outcomes)
+    mrr = sum(rr for _, rr in outcomes) / len(outcomes)
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:7s} hit@10 {hits:5.2f}  MRR {mrr:5.2f}  "
+          f"p50 {statistics.median(latencies):7.1f} ms  p95 {p95:7.1f} ms")
+
+
+def bench_database(engine, Session, queries):
+    print("database fallback (SQLite, LIKE)")
+    relevance = HostelSearchSort(sort_by="relevance")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    filters = HostelSearchFilters(query="residency", available_only=False)
+    query, count_query, params = SearchService._build_search_queries(filters, relevance, 1, 20, "sqlite")
+    page_only = query.replace(", COUNT(*) OVER () AS total_count", "")
+    with Session() as db:
+        for label, run in (
+            ("COUNT + page", lambda: (db.execute(text(count_query), params).scalar(),
+                                      db.execute(text(page_only), params).all())),
+            ("COUNT OVER ()", lambda: SearchService.search_hostels.__wrapped__(db, filters, relevance, 1, 20)),
+        ):
+            statements.clear()
+            started = time.perf_counter()
+            for _ in range(20):
+                run()
+            elapsed = (time.perf_counter() - started) / 20 * 1000
+            print(f"  {label:14s} {elapsed:7.1f} ms per search, {len(statements) // 20} statements")
+
+        for kind, cases in queries.items():
+            outcomes, latencies = [], []
+            for query_text, relevant in cases[:50]:
+                started = time.perf_counter()
+                hostels, _ = SearchService.search_hostels.__wrapped__(
+                    db, HostelSearchFilters(query=query_text, available_only=False), relevance, 1, 10)
+                latencies.append((time.perf_counter() - started) * 1000)
+                outcomes.append(score([h["id"] for h in hostels], relevant))
+            report(kind, outcomes, latencies)
+
+
+def bench_elasticsearch(url: str, Session, queries):
+    print(f"elasticsearch ({url})")
+    es = Elasticsearch(url, request_timeout=60)
+    create_hostel_index(es, recreate=True)
+    started = time.perf_counter()
+    HostelSearchIndexer(Session, es_factory=lambda: es).reindex_all()
+    es.indices.refresh(index=HOSTEL_INDEX)
+    print(f"  indexed in {time.perf_counter() - started:.1f} s")
+    relevance = HostelSearchSort(sort_by="relevance")
+    for kind, cases in queries.items():
+        outcomes, latencies = [], []
+        for query_text, relevant in cases:
+            started = time.perf_counter()
+            result = search_hostels(HostelSearchFilters(query=query_text, available_only=False), relevance, 1, 10, es=es)
+            latencies.append((time.perf_counter() - started) * 1000)
+            outcomes.append(score([h["id"] for h in result["results"]], relevant))
+        report(kind, outcomes, latencies)
+
+
+def main():
+    hostels = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    es_url = sys.argv[2] if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        engine, Session, rows = populate(os.path.join(tmp, "search.db"), hostels)
+        print(f"{hostels} hostels generated in {time.perf_counter() - started:.1f} s")
+        queries = make_queries(rows)
+        bench_indexing(Session, hostels)
+        bench_database(engine, Session, queries)
+        if es_url:
+            bench_elasticsearch(es_url, Session, queries)
+
+
+if __name__ == "__main__":
+    main()
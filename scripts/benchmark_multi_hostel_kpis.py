@@ -0,0 +1,87 @@
+"""
+Benchmark the multi-hostel KPI queries.
+
+Compares the set-based `AnalyticsService._get_hostel_kpis` (constant number of
+grouped queries) with the old one-hostel-at-a-time loop on a seeded in-memory
+SQLite database, for a growing number of hostels.
+
+Usage: python scripts/benchmark_multi_hostel_kpis.py [hostel counts...]
+"""
+import sys
+import os
+import time
+from datetime import date, datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.complaint import Complaint
+from app.models.hostel import Hostel
+from app.models.reports import FinancialTransaction
+from app.services.analytics_service import AnalyticsService
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 31)
+
+
+def seed(hostel_count: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[Hostel.__table__, FinancialTransaction.__table__, Complaint.__table__],
+    )
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "total_beds": 100, "current_occupancy": i % 100,
+             "visibility": "public", "is_featured": False}
+            for i in range(1, hostel_count + 1)
+        ])
+        conn.execute(FinancialTransaction.__table__.insert(), [
+            {"hostel_id": i, "transaction_type": t, "amount": 100, "transaction_date": date(2025, 1, d)}
+            for i in range(1, hostel_count + 1)
+            for t in ("fee", "booking", "expense")
+            for d in range(1, 29, 3)
+        ])
+        conn.execute(Complaint.__table__.insert(), [
+            {"title": "t", "description": "d", "category": "OTHER", "hostel_name": f"Hostel {i}",
+             "created_at": datetime(2025, 1, 10), "resolved_at": datetime(2025, 1, 12) if n % 2 else None}
+            for i in range(1, hostel_count + 1)
+            for n in range(10)
+        ])
+    counter = {"queries": 0}
+
+    def count(*args):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    return sessionmaker(bind=engine)(), counter
+
+
+def measure(fn, counter, repeat: int = 5):
+    best = None
+    for _ in range(repeat):
+        counter["queries"] = 0
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, counter["queries"]
+
+
+def main(sizes):
+    print(f"{'hostels':>8} | {'set-based ms':>12} {'queries':>8} | {'per-hostel ms':>13} {'queries':>8}")
+    for size in sizes:
+        db, counter = seed(size)
+        ids = list(range(1, size + 1))
+        batch_ms, batch_q = measure(lambda: AnalyticsService._get_hostel_kpis(db, ids, START, END), counter)
+        loop_ms, loop_q = measure(
+            lambda: [AnalyticsService._get_hostel_kpis(db, [i], START, END) for i in ids], counter
+        )
+        print(f"{size:>8} | {batch_ms:>12.2f} {batch_q:>8} | {loop_ms:>13.2f} {loop_q:>8}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 100, 300, 1000])
@@ -0,0 +1,95 @@
+"""
+Benchmark complaint listing pages over N complaints in a fresh SQLite file.
+
+For a shallow and a deep page:
+ - previous: every matching Complaint loaded to take len() as the total,
+   then an OFFSET page, as ComplaintRepository.list used to do
+ - offset: COUNT(*) for the total, then the OFFSET page (ComplaintRepository.list)
+ - cursor: the same page reached through next_cursor; no count, and no rows
+   skipped (ComplaintRepository.list_page with filters.cursor)
+
+Usage: python scripts/benchmark_pagination.py [complaints]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.complaint import Complaint, ComplaintCategory
+from app.repositories.complaint_repository import COMPLAINT_KEYSET, ComplaintRepository
+from app.schemas.complaint import ComplaintFilter
+
+PAGE_SIZE = 20
+START = datetime(2024, 1, 1)
+
+
+def populate(path: str, count: int):
+    rng = random.Random(11)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Complaint.__table__])
+    with engine.begin() as conn:
+        for offset in range(0, count, 20000):
+            conn.execute(insert(Complaint), [
+                {"title": "Complaint", "description": "Something is broken",
+                 "category": rng.choice(list(ComplaintCategory)).name, "hostel_name": f"Hostel {rng.randint(1, 5)}",
+                 "created_at": START + timedelta(seconds=rng.randint(0, 86400 * 700))}
+                for _ in range(offset, min(offset + 20000, count))
+            ])
+    return sessionmaker(bind=engine)()
+
+
+def previous_list(db, page: int):
+    query = select(Complaint).where(Complaint.hostel_name.ilike("hostel 1"))
+    total = len(db.execute(query).scalars().unique().all())
+    paged = query.offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).order_by(Complaint.created_at.desc())
+    return db.execute(paged).scalars().all(), total
+
+
+def cursor_before(db, page: int) -> str:
+    """next_cursor of the page preceding `page` (set up outside the timing)"""
+    row = db.execute(
+        COMPLAINT_KEYSET.order(select(Complaint).where(Complaint.hostel_name.ilike("hostel 1")))
+        .offset((page - 1) * PAGE_SIZE - 1).limit(1)
+    ).scalar_one()
+    return COMPLAINT_KEYSET.cursor_for(row)
+
+
+def timed(label: str, db, statements, fn, runs: int = 5):
+    statements.clear()
+    started = time.perf_counter()
+    for _ in range(runs):
+        db.expunge_all()
+        fn()
+    elapsed = (time.perf_counter() - started) / runs * 1000
+    print(f"  {label:8s} {elapsed:9.1f} ms, {len(statements) // runs} statements")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = populate(os.path.join(tmp, "complaints.db"), count)
+        repo = ComplaintRepository(db)
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(1))
+        matching = count // 5
+        print(f"{count} complaints, ~{matching} in the listed hostel, {PAGE_SIZE} per page")
+
+        for page in (2, max(2, matching * 9 // 10 // PAGE_SIZE)):
+            cursor = cursor_before(db, page)
+            print(f"page {page}")
+            timed("previous", db, statements, lambda: previous_list(db, page))
+            timed("offset", db, statements, lambda: repo.list(
+                ComplaintFilter(hostel_name="hostel 1", page=page, page_size=PAGE_SIZE)))
+            timed("cursor", db, statements, lambda: repo.list_page(
+                ComplaintFilter(hostel_name="hostel 1", page_size=PAGE_SIZE, cursor=cursor)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark push broadcast throughput against a local FCM stub.
+
+The stub sleeps like a network round trip: SEND_MS per single-token
+`messaging.send`, MULTICAST_MS per multicast call of up to 500 tokens.
+Compares:
+ - per-token: the previous route loop (insert log, commit, send, commit for
+   each recipient), run on a sample of recipients since it is linear
+ - engine: BroadcastEngine (bulk insert, 500-token multicast chunks on a
+   worker pool, bulk status write-back)
+
+Reports messages per second for each.
+
+Usage: python scripts/benchmark_push_broadcast.py [recipients] [send_ms] [multicast_ms]
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.push_models import (
+    DeviceToken, NotificationBatch, NotificationLog, NotificationPriority,
+    NotificationStatus, NotificationType, TargetAudience, UserRole,
+)
+from app.services.push_broadcast import BroadcastEngine
+
+REQUEST = {
+    "target_audience": TargetAudience.all_students,
+    "title": "Hostel notice",
+    "body": "Fire drill at 5pm",
+    "data": {"kind": "notice"},
+    "priority": NotificationPriority.normal,
+    "notification_type": NotificationType.announcement,
+}
+
+
+def seed(path: str, recipients: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[
+        DeviceToken.__table__, NotificationLog.__table__, NotificationBatch.__table__,
+    ])
+    with engine.begin() as conn:
+        conn.execute(DeviceToken.__table__.insert(), [
+            {"user_id": i, "user_role": UserRole.student, "hostel_id": 1, "device_token": f"tok-{i}",
+             "device_type": "android", "is_active": True, "last_used": datetime.utcnow()}
+            for i in range(1, recipients + 1)
+        ])
+        conn.execute(NotificationBatch.__table__.insert(), [
+            {"id": 1, "batch_name": "bench", "status": "queued",
+             "total_recipients": 0, "sent_count": 0, "failed_count": 0},
+        ])
+    return sessionmaker(bind=engine)
+
+
+def per_token_loop(Session, sample: int, send_ms: float) -> float:
+    started = time.perf_counter()
+    with Session() as db:
+        tokens = db.query(DeviceToken).filter(DeviceToken.is_active == True).limit(sample).all()  # noqa: E712
+        for t in tokens:
+            log = NotificationLog(user_id=t.user_id, user_role=t.user_role, hostel_id=t.hostel_id,
+                                  notification_type=REQUEST["notification_type"], title=REQUEST["title"],
+                                  body=REQUEST["body"], data=REQUEST["data"], priority=REQUEST["priority"],
+                                  status=NotificationStatus.pending)
+            db.add(log)
+            db.commit()
+            time.sleep(send_ms / 1000)  # messaging.send
+            log.status = NotificationStatus.sent
+            log.sent_at = datetime.utcnow()
+            db.commit()
+    return len(tokens) / (time.perf_counter() - started)
+
+
+def engine_broadcast(Session, multicast_ms: float, workers: int):
+    def fcm_stub(tokens, title, body, data, priority):
+        time.sleep(multicast_ms / 1000)
+        return [(f"msg-{token}", None, False) for token in tokens]
+
+    broadcaster = BroadcastEngine(Session, sender=fcm_stub, chunk_size=500, send_workers=workers)
+    started = time.perf_counter()
+    result = broadcaster.submit(1, REQUEST).result()
+    elapsed = time.perf_counter() - started
+    broadcaster.shutdown()
+    return result, elapsed
+
+
+def main():
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    send_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+    multicast_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 250
+    sample = min(recipients, 200)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rate = per_token_loop(seed(os.path.join(tmp, "loop.db"), recipients), sample, send_ms)
+        print(f"per-token loop: {rate:8.0f} msg/s (sample of {sample}; {recipients} would take {recipients / rate:.0f} s)")
+
+        for workers in (1, 4):
+            result, elapsed = engine_broadcast(seed(os.path.join(tmp, f"engine{workers}.db"), recipients),
+                                               multicast_ms, workers)
+            print(f"engine, {workers} send worker(s): {result['sent'] / elapsed:8.0f} msg/s "
+                  f"({result['sent']} sent in {elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark one hourly payment-reminder run over N open invoices.
+
+Due dates are spread over +/- 60 days around now. Compares:
+ - full scan: the previous loop, every open invoice loaded and evaluated with
+   its own ReminderConfiguration query (nothing is sent)
+ - due-time index: process_automated_reminders, which reads only invoices
+   whose next_reminder_at has passed, in keyset batches
+
+The indexed job's first run schedules every invoice; the number reported is
+the following hourly run. Delivery is stubbed.
+
+Usage: python scripts/benchmark_reminder_scheduler.py [invoices] [batch_size]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.hostel import Hostel
+from app.models.payment_models import (
+    Invoice, PaymentReminder, ReminderConfiguration, ReminderTemplate, ReminderType,
+)
+from app.models.user import User
+from app.services.reminder_services import OPEN_INVOICE_STATUSES, decide_reminder, process_automated_reminders
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def populate(path: str, invoices: int, now: datetime):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Hostel.__table__, Invoice.__table__, ReminderConfiguration.__table__,
+        PaymentReminder.__table__, ReminderTemplate.__table__,
+    ])
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        conn.execute(insert(Hostel), [{"id": h, "hostel_name": f"H{h}", "city": "Pune"} for h in range(1, 21)])
+        conn.execute(insert(User), [{"id": u, "email": f"u{u}@example.com", "username": f"u{u}", "name": f"U{u}"}
+                                    for u in range(1, 1001)])
+        conn.execute(insert(ReminderConfiguration), [{"hostel_id": h, "max_reminders": 10} for h in range(1, 21)])
+        conn.execute(insert(ReminderTemplate), [
+            {"hostel_id": 1, "reminder_type": t, "is_default": True, "email_subject": "{{ invoice_number }}",
+             "email_body": "Due {{ amount }}", "sms_body": "Due"} for t in ReminderType
+        ])
+        for start in range(0, invoices, 20000):
+            conn.execute(insert(Invoice), [
+                {"invoice_number": f"INV{i}", "user_id": 1 + i % 1000, "hostel_id": 1 + i % 20,
+                 "total_amount": 100, "paid_amount": 0, "due_amount": 100, "status": "pending",
+                 "due_date": now + timedelta(minutes=rng.randint(-60 * 24 * 60, 60 * 24 * 60)),
+                 "next_reminder_at": now - timedelta(minutes=1), "reminder_count": 0, "escalation_level": 0}
+                for i in range(start, min(start + 20000, invoices))
+            ])
+    return sessionmaker(bind=engine)
+
+
+def full_scan(Session, now: datetime):
+    started = time.perf_counter()
+    due = 0
+    with Session() as db:
+        invoices = db.query(Invoice).filter(Invoice.status.in_(OPEN_INVOICE_STATUSES)).all()
+        for invoice in invoices:
+            config = db.query(ReminderConfiguration).filter(
+                ReminderConfiguration.hostel_id == invoice.hostel_id
+            ).first()
+            reminder_type, channel = decide_reminder(invoice, config, now)
+            due += bool(reminder_type and channel)
+        db.rollback()
+    return time.perf_counter() - started, len(invoices), due
+
+
+def main():
+    invoices = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    now = datetime(2026, 10, 18, 10, 0)
+    deliver = lambda *args: True  # noqa: E731
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session = populate(os.path.join(tmp, "reminders.db"), invoices, now)
+        with Session() as db:
+            first = process_automated_reminders(db, now=now, batch_size=batch_size, deliver=deliver)
+
+        later = now + timedelta(hours=1)
+        elapsed, scanned, due = full_scan(Session, later)
+        with Session() as db:
+            report = process_automated_reminders(db, now=later, batch_size=batch_size, deliver=deliver)
+
+    print(f"{invoices} open invoices, hourly run")
+    print(f"full scan:       {elapsed:7.2f} s, scanned {scanned:7d}, reminders due {due}")
+    print(f"due-time index:  {report['duration_ms'] / 1000:7.2f} s, scanned {report['scanned']:7d}, "
+          f"reminders created {report['created']} ({report['batches']} batches)")
+    print(f"(first indexed run scheduled all invoices: {first['duration_ms'] / 1000:.2f} s, "
+          f"{first['created']} reminders)")
+
+
+if __name__ == "__main__":
+    main()
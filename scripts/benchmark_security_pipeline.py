@@ -0,0 +1,100 @@
+"""
+Benchmark per-request overhead of the security middleware.
+
+Runs the same trivial endpoints behind:
+ - no middleware (baseline)
+ - the four function-style middlewares (authentication, tenant filter, role
+   enforcer, audit trail), registered so all four stages run in order
+ - the single ASGI SecurityPipelineMiddleware
+
+and reports p50/p99 latency per request, plus the overhead over the baseline.
+The active-session lookup and the audit queue are stubbed so only middleware
+cost is measured.
+
+Usage: python scripts/benchmark_security_pipeline.py [requests]
+"""
+import sys
+import os
+import asyncio
+import statistics
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import httpx
+from fastapi import FastAPI
+from starlette.responses import PlainTextResponse
+
+from app.core.security import create_access_token
+from app.middleware import audit_trail, tenant_filter
+from app.middleware.audit_trail import audit_trail_middleware
+from app.middleware.authentication import authentication_middleware
+from app.middleware.role_enforcer import role_enforcer_middleware
+from app.middleware.security_pipeline import SecurityPipelineMiddleware
+from app.middleware.tenant_filter import tenant_filter_middleware
+
+LARGE_BODY = "x" * (1024 * 1024)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/admin/students")
+    def small():
+        return {"ok": True}
+
+    @app.get("/api/v1/admin/export")
+    def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    if stack == "function-style":
+        # Last registered runs first: this executes auth -> tenant -> role -> audit
+        app.middleware("http")(audit_trail_middleware)
+        app.middleware("http")(role_enforcer_middleware)
+        app.middleware("http")(tenant_filter_middleware)
+        app.middleware("http")(authentication_middleware)
+    elif stack == "pipeline":
+        app.add_middleware(SecurityPipelineMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, method: str, path: str, headers: dict, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # warm up
+            await client.request(method, path, headers=headers)
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+    latencies.sort()
+    return statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99) - 1] * 1e6
+
+
+async def run(requests: int):
+    audit_trail.submit_audit = lambda record, block=True: True
+    tenant_filter._load_active_hostel_id = lambda user_id: 1
+    token = create_access_token({"sub": "1", "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for label, method, path in (("POST small JSON", "POST", "/api/v1/admin/students"),
+                                ("GET 1 MB body", "GET", "/api/v1/admin/export")):
+        print(f"{label}, {requests} sequential requests")
+        print(f"{'stack':>16} {'p50 us':>10} {'p99 us':>10} {'p50 overhead':>14} {'p99 overhead':>14}")
+        baseline = None
+        for stack in ("none", "function-style", "pipeline"):
+            p50, p99 = await measure(build_app(stack), method, path, headers, requests)
+            if baseline is None:
+                baseline = (p50, p99)
+            print(f"{stack:>16} {p50:>10.0f} {p99:>10.0f} {p50 - baseline[0]:>14.0f} {p99 - baseline[1]:>14.0f}")
+        print()
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    asyncio.run(run(requests))
+
+
+if __name__ == "__main__":
+    main()
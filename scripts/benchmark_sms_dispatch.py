@@ -0,0 +1,102 @@
+"""
+Benchmark time-to-last-delivery of an SMS emergency alert.
+
+A stub provider sleeps PROVIDER_MS per message like a Twilio API round trip.
+Compares, for N recipients:
+ - sequential: the previous `create_alert` loop (log insert + commit, send,
+   commit per message), timed on a sample and extrapolated since it is linear
+ - pipeline: SMSDispatcher with bounded concurrency and batched SMSLog writes
+ - pipeline, alert queued behind N payment reminders: emergency priority
+   lets the alert overtake the reminder backlog
+
+Usage: python scripts/benchmark_sms_dispatch.py [recipients] [provider_ms] [concurrency]
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.sms_models import EmergencyAlert, MessageType, SMSLog, SMSProvider, SMSStatus
+from app.services.sms_dispatch import SMSDispatcher
+
+
+class StubProvider:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.last_delivery = {}
+        self.lock = threading.Lock()
+
+    def send_sms(self, phone, message):
+        time.sleep(self.latency)
+        with self.lock:
+            self.last_delivery[message] = time.perf_counter()
+        return f"SM{phone}", "queued"
+
+
+def make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[SMSLog.__table__, EmergencyAlert.__table__])
+    with engine.begin() as conn:
+        conn.execute(EmergencyAlert.__table__.insert(), [
+            {"id": 1, "title": "Fire", "message": "Evacuate", "severity": "critical",
+             "total_recipients": 0, "sent_count": 0, "failed_count": 0},
+        ])
+    return sessionmaker(bind=engine)
+
+
+def sequential(Session, provider: StubProvider, sample: int) -> float:
+    started = time.perf_counter()
+    with Session() as db:
+        for i in range(sample):
+            log = SMSLog(phone_number=f"+91{i:010d}", message="alert", message_type=MessageType.emergency_alert,
+                         provider=SMSProvider.twilio, status=SMSStatus.pending)
+            db.add(log)
+            db.commit()
+            sid, _ = provider.send_sms(log.phone_number, log.message)
+            log.status, log.message_sid, log.sent_at = SMSStatus.sent, sid, datetime.utcnow()
+            db.commit()
+    return (time.perf_counter() - started) / sample
+
+
+def pipeline(Session, provider: StubProvider, recipients: int, concurrency: int, backlog: int = 0):
+    dispatcher = SMSDispatcher(Session, client_factory=lambda p: provider, concurrency=concurrency)
+    if backlog:
+        dispatcher.submit_many(((f"+92{i:010d}", "reminder", None) for i in range(backlog)),
+                               SMSProvider.twilio, MessageType.payment_reminder)
+    started = time.perf_counter()
+    dispatcher.submit_many(((f"+91{i:010d}", "alert", None) for i in range(recipients)),
+                           SMSProvider.twilio, MessageType.emergency_alert, alert_id=1)
+    dispatcher.drain()
+    dispatcher.stop()
+    return provider.last_delivery["alert"] - started, dispatcher.stats()
+
+
+def main():
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+
+    with tempfile.TemporaryDirectory() as tmp:
+        per_message = sequential(make_session(os.path.join(tmp, "seq.db")), StubProvider(latency), 100)
+        print(f"{recipients} recipients, provider latency {latency * 1000:.0f} ms")
+        print(f"sequential loop:                 last delivery after ~{per_message * recipients:8.1f} s (extrapolated)")
+
+        elapsed, stats = pipeline(make_session(os.path.join(tmp, "p1.db")), StubProvider(latency),
+                                  recipients, concurrency)
+        print(f"pipeline, {concurrency} senders:            last delivery after  {elapsed:8.1f} s "
+              f"({stats['flushes']} log flushes)")
+
+        elapsed, _ = pipeline(make_session(os.path.join(tmp, "p2.db")), StubProvider(latency),
+                              recipients, concurrency, backlog=recipients)
+        print(f"pipeline, behind {recipients} reminders: last delivery after  {elapsed:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark the student CSV export at scale.
+
+Compares, over N students in a SQLite file:
+ - buffered: the previous export (ORM `list_students(limit=...)`, every
+   object hydrated, whole CSV written to a StringIO before the first byte)
+ - streamed: column-only select through `stream_rows` (server-side cursor,
+   `yield_per`) encoded by `encode_csv` chunk by chunk
+
+Reports time to first byte, total time and peak Python heap (tracemalloc).
+
+Usage: python scripts/benchmark_streaming_export.py [rows] [batch_size]
+"""
+import sys
+import os
+import csv
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.students import Student
+from app.repositories.student_repository import list_students
+from app.services.student_service import export_students_statement
+from app.utils.streaming_export import encode_csv, stream_rows
+
+HEADERS = [
+    "student_id", "student_name", "student_email", "student_phone", "date_of_birth", "guardian_name",
+    "guardian_phone", "emergency_contact", "check_in_date", "room_assignment", "bed_assignment", "status",
+]
+
+
+def populate(engine, rows: int):
+    Base.metadata.create_all(engine, tables=[Student.__table__])
+    with engine.begin() as conn:
+        for start in range(0, rows, 50000):
+            conn.execute(insert(Student), [
+                {"student_id": f"S{i:07d}", "student_name": f"Student {i}", "student_email": f"s{i}@example.com",
+                 "student_phone": f"{i:010d}", "guardian_name": f"Guardian {i}", "guardian_phone": f"9{i:09d}",
+                 "room_assignment": f"R{i % 500}", "bed_assignment": f"B{i % 4}", "hostel_id": 1 + i % 20,
+                 "status": "active"}
+                for i in range(start, min(start + 50000, rows))
+            ])
+
+
+def buffered(Session, rows: int):
+    started = time.perf_counter()
+    with Session() as db:
+        students = list_students(db, skip=0, limit=rows)
+        buf = StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(HEADERS)
+        for s in students:
+            writer.writerow([getattr(s, h, None) for h in HEADERS])
+        body = buf.getvalue()
+    first = time.perf_counter() - started  # nothing could be sent before this point
+    size = len(body.encode("utf-8"))
+    return first, time.perf_counter() - started, size
+
+
+def streamed(Session, batch_size: int):
+    started = time.perf_counter()
+    with Session() as db:
+        statement = export_students_statement(db, HEADERS)
+    first, size = None, 0
+    for chunk in encode_csv(HEADERS, stream_rows(statement, session_factory=Session, batch_size=batch_size)):
+        if first is None and size:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    return first, time.perf_counter() - started, size
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'export.db')}")
+        populate(engine, rows)
+        Session = sessionmaker(bind=engine)
+
+        print(f"{rows} students, {len(HEADERS)} columns")
+        for label, fn, args in (("buffered (ORM + StringIO)", buffered, (Session, rows)),
+                                (f"streamed (yield_per={batch_size})", streamed, (Session, batch_size))):
+            (first, total, size), peak = measure(fn, *args)
+            print(f"{label:30s} first byte {first * 1000:9.1f} ms, total {total:6.1f} s, "
+                  f"peak heap {peak / 2**20:8.1f} MiB, {size / 2**20:.0f} MiB written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark a bulk student import (semester intake CSV).
+
+Compares, for N rows into a SQLite file:
+ - per-row: the previous import loop, `create_student` for every CSV row
+   (lookups, linked user creation and several commits per student; password
+   hashing is left out, which only flatters this path)
+ - engine: StudentImporter (batched validation, one user INSERT and one
+   staged INSERT ... SELECT merge per batch)
+
+Usage: python scripts/benchmark_student_import.py [rows] [batch_size]
+"""
+import sys
+import os
+import csv
+import io
+import tempfile
+import time
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.student_import import StudentImportJob, StudentImportRow
+from app.models.students import Student
+from app.models.user import User
+from app.repositories.student_repository import create_student
+from app.schemas.students import StudentCreate
+from app.services.student_import import StudentImporter, spool_upload
+
+
+def make_csv(rows: int) -> bytes:
+    lines = ["student_id,student_name,student_email,student_phone,date_of_birth,room_assignment"]
+    lines += [f"S{i:06d},Student {i},s{i}@example.com,9{i:09d},2004-0{1 + i % 9}-1{i % 9},R{i % 300}"
+              for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Student.__table__, StudentImportJob.__table__, StudentImportRow.__table__,
+    ])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    return sessionmaker(bind=engine), statements
+
+
+def per_row(Session, data: bytes):
+    started = time.perf_counter()
+    with Session() as db:
+        for row in csv.DictReader(io.StringIO(data.decode())):
+            row["date_of_birth"] = datetime.strptime(row["date_of_birth"], "%Y-%m-%d").date()
+            create_student(db, StudentCreate.model_construct(**row, password=None, confirm_password=None))
+    return time.perf_counter() - started
+
+
+def engine_import(Session, data: bytes, batch_size: int, spool_dir: str):
+    started = time.perf_counter()
+    path, total = spool_upload(io.BytesIO(data), spool_dir)
+    importer = StudentImporter(Session, batch_size=batch_size)
+    progress = importer.run_job(importer.create_job(path, total_rows=total))
+    return time.perf_counter() - started, progress
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    data = make_csv(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session, statements = make_session(os.path.join(tmp, "per_row.db"))
+        elapsed = per_row(Session, data)
+        print(f"{rows} rows")
+        print(f"per-row create_student: {elapsed:7.2f} s, {rows / elapsed:8.0f} rows/s, {len(statements):6d} statements")
+
+        Session, statements = make_session(os.path.join(tmp, "engine.db"))
+        elapsed, progress = engine_import(Session, data, batch_size, os.path.join(tmp, "spool"))
+        print(f"import engine ({batch_size}/batch): {elapsed:5.2f} s, {rows / elapsed:8.0f} rows/s, "
+              f"{len(statements):6d} statements, created {progress['created']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Load test how a slow supervisor query affects every other endpoint.
+
+Serves the real supervisor attendance handler (`routes.get_attendance_records`)
+twice against a temporary SQLite database whose attendance queries are made to
+take `--latency-ms` in the driver (standing in for a slow plan or a remote
+database):
+ - /threadpool: the handler as it is registered, a plain `def`, so FastAPI
+   runs it on the threadpool
+ - /event-loop: the same handler called from an `async def` route, as the
+   supervisor routes used to be declared, so the query runs on the event loop
+
+While slow requests are in flight, a cheap `/ping` endpoint is polled and its
+p50/p99 latency reported for each mode.
+
+Usage: python scripts/loadtest_event_loop_blocking.py [--slow 40] [--pings 200]
+       [--concurrency 20] [--latency-ms 50]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.api.v1.supervisor import routes
+from app.core.database import Base, get_db
+from app.models.hostel import Hostel
+from app.models.reports import Attendance
+from app.models.user import User
+
+
+def seed_sqlite(path: str) -> str:
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[Hostel.__table__, User.__table__, Attendance.__table__])
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [{"id": 1, "hostel_name": "Hostel 1", "visibility": "public",
+                                                  "is_featured": False}])
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "username": f"user{i}", "name": f"User {i}", "role": "student", "hostel_id": 1}
+            for i in range(1, 51)
+        ])
+        conn.execute(Attendance.__table__.insert(), [
+            {"hostel_id": 1, "student_id": 1 + i % 50, "student_name": f"User {1 + i % 50}",
+             "date": date(2025, 1, 1) + timedelta(days=i % 300), "is_present": True} for i in range(2000)
+        ])
+    engine.dispose()
+    return url
+
+
+def build_app(database_url: str, latency_ms: int):
+    engine = create_engine(database_url, poolclass=QueuePool, pool_size=100, max_overflow=0,
+                           connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_attendance(conn, cursor, statement, parameters, context, executemany):
+        if "FROM attendance" in statement:
+            time.sleep(latency_ms / 1000.0)
+
+    SessionFactory = sessionmaker(bind=engine)
+    supervisor = User(id=500, username="sup", name="Supervisor", role="supervisor", hostel_id=1)
+
+    def get_test_db():
+        db = SessionFactory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[routes.get_supervisor_user] = lambda: supervisor
+
+    app.add_api_route("/threadpool", routes.get_attendance_records)
+
+    @app.get("/event-loop")
+    async def attendance_on_event_loop(page: int = 1, size: int = 20, db: Session = Depends(get_db),
+                                       supervisor: User = Depends(routes.get_supervisor_user)):
+        return routes.get_attendance_records(page=page, size=size, date_from=None, date_to=None, user_id=None,
+                                             status=None, cursor=None, supervisor=supervisor, db=db)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app, engine.dispose
+
+
+async def drive(app, slow_path: str, slow: int, pings: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+
+        async def slow_request():
+            async with semaphore:
+                response = await client.get(slow_path, params={"size": 50})
+                response.raise_for_status()
+
+        async def ping(sent: float):
+            response = await client.get("/ping")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - sent)
+
+        async def pinger():
+            # Pings are due on a fixed schedule and timed from when they were
+            # due, so a blocked event loop that sends one late counts against it
+            tasks, first = [], time.perf_counter()
+            for i in range(pings):
+                due = first + i * 0.005
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                tasks.append(asyncio.create_task(ping(due)))
+            await asyncio.gather(*tasks)
+
+        started = time.perf_counter()
+        await asyncio.gather(pinger(), *(slow_request() for _ in range(slow)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def run(args, database_url: str):
+    app, dispose = build_app(database_url, args.latency_ms)
+    try:
+        print(f"{args.slow} slow supervisor requests ({args.latency_ms} ms per attendance query, "
+              f"concurrency {args.concurrency}) alongside {args.pings} pings")
+        print(f"{'mode':>12} {'elapsed s':>10} {'ping p50 ms':>12} {'ping p99 ms':>12}")
+        for path in ("/event-loop", "/threadpool"):
+            result = await drive(app, path, args.slow, args.pings, args.concurrency)
+            print(f"{path[1:]:>12} {result['elapsed_s']:>10.2f} {result['p50_ms']:>12.1f} {result['p99_ms']:>12.1f}")
+    finally:
+        dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slow", type=int, default=40, help="slow supervisor requests")
+    parser.add_argument("--pings", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(args, seed_sqlite(os.path.join(tmp, "loadtest.db"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Load test the sync (threadpool) and async (AsyncSession) hostel search paths.
+
+Builds a small FastAPI app exposing the same `SearchService` search twice, once
+through `get_db`-style sync sessions and once through an AsyncSession, and
+drives both with concurrent clients over ASGI. Each request first waits
+`--latency-ms` inside the database (pg_sleep on Postgres, a sleeping SQL
+function on SQLite) to stand in for network round trips and slow plans, which
+is where threadpool exhaustion shows up.
+
+By default a temporary SQLite database is seeded; pass --database-url to run
+against an existing (already populated) database instead.
+
+Usage: python scripts/loadtest_sync_vs_async.py [--requests 400] [--concurrency 100]
+       [--latency-ms 20] [--hostels 200] [--database-url postgresql://...]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.async_database import async_database_url
+from app.config import settings
+from app.core.database import Base
+from app.models.hostel import Hostel, Location
+from app.schemas.search import HostelSearchFilters, HostelSearchSort
+from app.services.search_service import SearchService
+
+
+def _sleep_ms(ms):
+    time.sleep(ms / 1000.0)
+    return ms
+
+
+def seed_sqlite(path: str, hostel_count: int) -> str:
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[Location.__table__, Hostel.__table__])
+    with engine.begin() as conn:
+        conn.execute(Location.__table__.insert(), [{"id": i, "city": f"City {i}"} for i in range(1, 21)])
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "location_id": 1 + i % 20, "total_beds": 50,
+             "current_occupancy": i % 50, "amenities": "wifi, laundry", "visibility": "public",
+             "is_featured": False}
+            for i in range(1, hostel_count + 1)
+        ])
+    engine.dispose()
+    return url
+
+
+def build_app(database_url: str, latency_ms: int):
+    is_sqlite = make_url(database_url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        latency_sql, latency_params = "SELECT sleep_ms(:ms)", {"ms": latency_ms}
+    else:
+        latency_sql, latency_params = "SELECT pg_sleep(:s)", {"s": latency_ms / 1000.0}
+
+    # Same pool limits on both paths, so only the concurrency model differs
+    # (aiosqlite defaults to NullPool, i.e. a new connection and thread per request)
+    pool = {"pool_size": 100, "max_overflow": 0}
+    sync_engine = create_engine(database_url, poolclass=QueuePool, **pool)
+    async_engine = create_async_engine(async_database_url(database_url), poolclass=AsyncAdaptedQueuePool, **pool)
+    if is_sqlite:
+        for engine in (sync_engine, async_engine.sync_engine):
+            event.listen(engine, "connect", lambda conn, record: conn.create_function("sleep_ms", 1, _sleep_ms))
+
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSessionFactory = async_sessionmaker(async_engine)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    filters = HostelSearchFilters(city="City 3")
+    sort = HostelSearchSort()
+    app = FastAPI()
+
+    @app.get("/sync")
+    def search_sync(db: Session = Depends(get_sync_db)):
+        db.execute(text(latency_sql), latency_params)
+        hostels, total = SearchService.search_hostels(db, filters, sort, 1, 20)
+        return {"total": total, "count": len(hostels)}
+
+    @app.get("/async")
+    async def search_async(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(text(latency_sql), latency_params)
+        hostels, total = await SearchService.search_hostels_async(db, filters, sort, 1, 20)
+        return {"total": total, "count": len(hostels)}
+
+    async def dispose():
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+    return app, dispose
+
+
+async def drive(app, path: str, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "req_s": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def run(args):
+    app, dispose = build_app(args.database_url, args.latency_ms)
+    try:
+        await drive(app, "/sync", 20, 10)  # warm up pools
+        await drive(app, "/async", 20, 10)
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {args.latency_ms} ms DB latency")
+        print(f"{'path':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for path in ("/sync", "/async"):
+            result = await drive(app, path, args.requests, args.concurrency)
+            print(f"{path:>8} {result['req_s']:>10.1f} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}")
+    finally:
+        await dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    parser.add_argument("--hostels", type=int, default=200, help="rows to seed in the SQLite database")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    # Measure the database path, not the result cache
+    settings.CACHE_ENABLED = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.database_url:
+            args.database_url = seed_sqlite(os.path.join(tmp, "loadtest.db"), args.hostels)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
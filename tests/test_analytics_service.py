@@ -0,0 +1,113 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.complaint import Complaint
+from app.models.hostel import Hostel
+from app.models.reports import FinancialTransaction, OccupancySnapshot
+from app.services.analytics_service import AnalyticsService
+
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 31)
+
+
+def _make_session(hostel_count):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[Hostel.__table__, FinancialTransaction.__table__, Complaint.__table__,
+                OccupancySnapshot.__table__],
+    )
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "total_beds": 10, "current_occupancy": i % 10,
+             "visibility": "public", "is_featured": False}
+            for i in range(1, hostel_count + 1)
+        ])
+        conn.execute(FinancialTransaction.__table__.insert(), [
+            {"hostel_id": i, "transaction_type": t, "amount": amount, "transaction_date": date(2025, 1, 15)}
+            for i in range(1, hostel_count + 1)
+            for t, amount in (("fee", 100 * i), ("booking", 50), ("expense", 30))
+        ])
+        conn.execute(Complaint.__table__.insert(), [
+            {"title": "t", "description": "d", "category": "WIFI", "hostel_name": f"Hostel {i}",
+             "created_at": datetime(2025, 1, 10), "resolved_at": datetime(2025, 1, 11) if n == 0 else None}
+            for i in range(1, hostel_count + 1)
+            for n in range(2)
+        ])
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return sessionmaker(bind=engine)(), statements
+
+
+def test_hostel_kpis_are_computed_per_hostel():
+    db, _ = _make_session(3)
+
+    kpis = AnalyticsService._get_hostel_kpis(db, [2, 3, 99], START, END)
+
+    assert set(kpis) == {2, 3}
+    kpi = kpis[2]
+    assert kpi.hostel_name == "Hostel 2"
+    assert kpi.revenue == 250
+    assert kpi.expenses == 30
+    assert kpi.profit == 220
+    assert kpi.occupied_beds == 2
+    assert kpi.occupancy_rate == 20
+    assert kpi.complaint_count == 2
+    assert kpi.resolved_complaints == 1
+
+
+def test_hostel_kpis_query_count_is_constant():
+    small_db, small_statements = _make_session(2)
+    large_db, large_statements = _make_session(200)
+
+    AnalyticsService._get_hostel_kpis(small_db, list(range(1, 3)), START, END)
+    AnalyticsService._get_hostel_kpis(large_db, list(range(1, 201)), START, END)
+
+    assert len(small_statements) == len(large_statements) == 3
+
+
+def test_single_hostel_kpi_matches_batch():
+    db, _ = _make_session(3)
+
+    assert AnalyticsService._get_hostel_kpi(db, 1, START, END) == \
+        AnalyticsService._get_hostel_kpis(db, [1, 2, 3], START, END)[1]
+    assert AnalyticsService._get_hostel_kpi(db, 42, START, END) is None
+
+
+def test_occupancy_trends_use_snapshots_and_constant_queries():
+    db, statements = _make_session(3)
+    start = date.today() - timedelta(days=4)
+    db.execute(OccupancySnapshot.__table__.insert(), [
+        {"hostel_id": 1, "snapshot_date": start - timedelta(days=10), "occupied_beds": 1, "total_beds": 10},
+        {"hostel_id": 1, "snapshot_date": start + timedelta(days=2), "occupied_beds": 5, "total_beds": 10},
+    ])
+    db.commit()
+    statements.clear()
+
+    series = AnalyticsService.get_occupancy_trend_series(db, [1, 2], start, date.today())
+
+    assert len(statements) == 2
+    hostel_1, hostel_2 = series
+    # carried forward from before the range, then the newer snapshot, then live for today
+    assert hostel_1.occupied_beds == [1, 1, 5, 5, 1]
+    assert hostel_1.occupancy_rates[2] == 50
+    # no history: live occupancy for every day
+    assert hostel_2.occupied_beds == [2] * 5
+    assert hostel_2.dates[0] == start
+
+    trends = AnalyticsService.get_occupancy_trends(db, [1, 2], start, date.today())
+    assert [(t.date, t.hostel_id) for t in trends[:3]] == [(start, 1), (start, 2), (start + timedelta(days=1), 1)]
+
+
+def test_record_occupancy_snapshots_replaces_the_day():
+    db, _ = _make_session(3)
+    day = date(2025, 1, 5)
+
+    assert AnalyticsService.record_occupancy_snapshots(db, day) == 3
+    assert AnalyticsService.record_occupancy_snapshots(db, day) == 3
+    assert db.query(OccupancySnapshot).count() == 3
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.async_database import async_database_url
+from app.core.cache import MemoryCache, TieredCache, set_cache
+from app.core.database import Base
+from app.models.hostel import Hostel, Location
+from app.schemas.search import HostelSearchFilters, HostelSearchSort
+from app.services.search_service import SearchService
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    set_cache(TieredCache(MemoryCache(), default_ttl=60))
+    yield
+    set_cache(None)
+
+
+def test_async_database_url_swaps_driver():
+    assert async_database_url("postgresql://u:p@db:5432/hostel") == "postgresql+asyncpg://u:p@db:5432/hostel"
+    assert async_database_url("postgresql+psycopg2://u:p@db/hostel") == "postgresql+asyncpg://u:p@db/hostel"
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql+asyncpg://u:p@db/hostel") == "postgresql+asyncpg://u:p@db/hostel"
+
+
+def test_async_search_matches_sync_search(tmp_path):
+    url = f"sqlite:///{tmp_path / 'search.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=[Location.__table__, Hostel.__table__])
+    with engine.begin() as conn:
+        conn.execute(Location.__table__.insert(), [{"id": 1, "city": "Pune"}, {"id": 2, "city": "Delhi"}])
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "location_id": 1 + i % 2, "total_beds": 20,
+             "current_occupancy": i, "amenities": "wifi, laundry", "visibility": "public", "is_featured": False}
+            for i in range(1, 8)
+        ])
+
+    filters = HostelSearchFilters(city="Pune")
+    sort = HostelSearchSort()
+
+    with sessionmaker(bind=engine)() as db:
+        expected = SearchService.search_hostels(db, filters, sort, 1, 3)
+
+    async def run_async():
+        async_engine = create_async_engine(async_database_url(url))
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                return await SearchService.search_hostels_async(db, filters, sort, 1, 3)
+        finally:
+            await async_engine.dispose()
+
+    hostels, total = asyncio.run(run_async())
+
+    assert total == expected[1] == 3
+    assert hostels == expected[0]
+    assert hostels[0]["amenities"] == ["wifi", "laundry"]
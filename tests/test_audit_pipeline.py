@@ -0,0 +1,115 @@
+import functools
+import json
+import time
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.exc import IntegrityError
+
+import app.models.hostel  # noqa: F401  (audit_logs foreign keys)
+import app.models.user  # noqa: F401
+from app.core.audit_pipeline import AuditPipeline, insert_audit_rows
+from app.core.database import Base
+from app.models.audit_log import AuditLog
+
+
+def _record(i):
+    return {"user_id": 1, "action": "POST", "resource": f"/api/v1/admin/items/{i}"}
+
+
+def test_rows_are_written_in_batches(tmp_path):
+    # File database: the flusher thread gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(engine, tables=[AuditLog.__table__])
+    inserts = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statement.startswith("INSERT") and inserts.append(statement))
+
+    pipeline = AuditPipeline(functools.partial(insert_audit_rows, bind=engine), batch_size=50, flush_interval=0.05)
+    pipeline.start()
+    for i in range(120):
+        assert pipeline.submit(_record(i))
+    pipeline.stop()
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(AuditLog.__table__)).scalar() == 120
+        assert conn.execute(select(AuditLog.__table__.c.created_at)).first()[0] is not None
+    assert len(inserts) <= 5
+    assert pipeline.stats()["written"] == 120
+
+
+def test_full_queue_spills_to_disk_and_replays(tmp_path):
+    written = []
+    spill_path = str(tmp_path / "audit_spill.jsonl")
+    pipeline = AuditPipeline(written.extend, max_size=2, enqueue_timeout=0, spill_path=spill_path,
+                             flush_interval=0.02)
+
+    results = [pipeline.submit(_record(i), block=False) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert pipeline.stats()["spilled"] == 3
+
+    pipeline.start()
+    deadline = time.monotonic() + 2
+    while len(written) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+
+    assert sorted(r["resource"] for r in written) == [f"/api/v1/admin/items/{i}" for i in range(5)]
+    assert pipeline.stats()["replayed"] == 3
+
+
+def test_drop_policy_counts_failed_batches():
+    def failing_writer(rows):
+        raise RuntimeError("database down")
+
+    pipeline = AuditPipeline(failing_writer, overflow_policy="drop")
+    pipeline.submit(_record(1))
+    pipeline.submit(_record(2))
+    assert pipeline.flush() == 0
+
+    stats = pipeline.stats()
+    assert stats["dropped"] == 2 and stats["failed_batches"] == 1 and stats["queue_depth"] == 0
+
+
+def test_rejected_rows_are_dead_lettered_and_the_rest_written(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(engine, tables=[AuditLog.__table__])
+    dead_letter_path = tmp_path / "audit_dead_letter.jsonl"
+    pipeline = AuditPipeline(functools.partial(insert_audit_rows, bind=engine), batch_size=64,
+                             spill_path=str(tmp_path / "audit_spill.jsonl"), dead_letter_path=str(dead_letter_path))
+
+    for i in range(64):
+        # Anonymous rows violate audit_logs.user_id NOT NULL
+        pipeline.submit(dict(_record(i), user_id=None) if i in (5, 40) else _record(i))
+    assert pipeline.flush() == 62
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(AuditLog.__table__)).scalar() == 62
+    dead = [json.loads(line) for line in dead_letter_path.read_text().splitlines()]
+    assert sorted(entry["record"]["resource"] for entry in dead) == ["/api/v1/admin/items/40",
+                                                                     "/api/v1/admin/items/5"]
+    assert all("NOT NULL" in entry["error"] for entry in dead)
+    stats = pipeline.stats()
+    assert stats["dead_lettered"] == 2 and stats["spilled"] == 0 and stats["failed_batches"] == 0
+
+
+def test_outage_during_bisection_spills_only_unwritten_rows(tmp_path):
+    written, calls = [], []
+
+    def writer(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise IntegrityError("INSERT", {}, Exception("NOT NULL constraint failed"))
+        if len(calls) == 3:
+            raise RuntimeError("database down")
+        written.extend(rows)
+
+    spill_path = tmp_path / "audit_spill.jsonl"
+    pipeline = AuditPipeline(writer, spill_path=str(spill_path))
+    for i in range(4):
+        pipeline.submit(_record(i))
+    assert pipeline.flush() == 2
+
+    assert calls == [4, 2, 2]
+    spilled = [json.loads(line)["resource"] for line in spill_path.read_text().splitlines()]
+    assert sorted(spilled + [r["resource"] for r in written]) == [f"/api/v1/admin/items/{i}" for i in range(4)]
+    assert pipeline.stats()["spilled"] == 2
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.api.v1.supervisor import routes
+from app.core.database import Base
+from app.core.loaders import get_loader
+from app.models.complaint import Complaint
+from app.models.hostel import Hostel
+from app.models.leave import LeaveRequest
+from app.models.reports import Attendance
+from app.models.students import Student
+from app.models.user import User
+
+ROWS = 40
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Hostel.__table__, User.__table__, Student.__table__, Complaint.__table__, Attendance.__table__,
+        LeaveRequest.__table__,
+    ])
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [{"id": 1, "hostel_name": "Hostel 1", "visibility": "public",
+                                                  "is_featured": False}])
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "username": f"user{i}", "name": f"User {i}", "role": "student", "hostel_id": 1}
+            for i in range(1, 11)
+        ])
+        conn.execute(Student.__table__.insert(), [
+            {"student_id": f"S{i}", "student_name": f"Student {i}", "student_email": f"s{i}@x.com",
+             "student_phone": "555", "hostel_id": 1} for i in range(1, 6)
+        ])
+        conn.execute(Complaint.__table__.insert(), [
+            {"title": "t", "description": "d", "category": "ROOM_MAINTENANCE", "hostel_id": 1,
+             "student_id": f"S{i % 6}" if i % 6 else None, "student_name": "Walk-in",
+             "created_at": datetime(2025, 1, 1) + timedelta(hours=i)} for i in range(ROWS)
+        ])
+        # user 99 does not exist
+        conn.execute(Attendance.__table__.insert(), [
+            {"hostel_id": 1, "student_id": 99 if i == 0 else 1 + i % 10, "student_name": "Ghost",
+             "date": date(2025, 1, 1) + timedelta(days=i), "is_present": True} for i in range(ROWS)
+        ])
+        conn.execute(LeaveRequest.__table__.insert(), [
+            {"hostel_id": 1, "student_id": 1 + i % 10, "start_date": date(2025, 2, 1), "end_date": date(2025, 2, 3),
+             "reason": "home", "status": "PENDING"} for i in range(ROWS)
+        ])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def supervisor(db):
+    return User(id=500, username="sup", name="Supervisor", role="supervisor", hostel_id=1)
+
+
+def run(db, handler, **params):
+    db.statements.clear()
+    result = handler(db=db, **params)
+    return result, len(db.statements)
+
+
+def test_list_endpoints_load_related_users_in_one_query(db, supervisor):
+    # COUNT + page + one batch, whatever the page size
+    result, statements = run(db, routes.get_attendance_records, page=1, size=ROWS, date_from=None, date_to=None,
+                             user_id=None, status=None, cursor=None, supervisor=supervisor)
+    assert statements == 3
+    names = {item["user_id"]: item["user_name"] for item in result["items"]}
+    assert names[99] == "Ghost" and names[4] == "User 4"
+
+    result, statements = run(db, routes.get_leave_applications, page=1, size=ROWS, status=None,
+                             pending_only=False, supervisor=supervisor)
+    assert statements == 2             # every user is already loaded for this request
+    assert result["items"][0]["student_name"] == "User 1" and result["total"] == ROWS
+
+    result, statements = run(db, routes.get_complaints, page=1, size=ROWS, status=None, priority=None,
+                             assigned_to_me=False, cursor=None, supervisor=supervisor)
+    assert statements == 3
+    by_student = {item["user_id"]: item["user_name"] for item in result["items"]}
+    assert by_student["S3"] == "Student 3" and by_student[None] == "Walk-in"
+
+
+def test_loader_memoizes_per_session(db):
+    loader = get_loader(db, User)
+    db.statements.clear()
+    assert sorted(loader.load_many([3, 1, 3, None, 42])) == [1, 3]
+    assert loader.load(1).name == "User 1" and loader.load(42) is None
+    assert get_loader(db, User) is loader
+    assert len(db.statements) == 1
+
+    students = get_loader(db, Student)
+    assert students.load("S2").student_name == "Student 2"
+    assert get_loader(db, User, User.username).load("user7").id == 7
@@ -0,0 +1,104 @@
+import ast
+import asyncio
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+from app.core.database import get_db
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+# Session methods that talk to the database (add/add_all only stage objects)
+BLOCKING_METHODS = {"query", "execute", "commit", "flush", "refresh", "rollback", "get", "scalar", "scalars",
+                    "merge", "delete"}
+SESSION_NAMES = {"db", "session"}
+
+# Coroutines that take a sync Session only to await bcrypt on the hashing
+# pool; their session work goes through run_in_threadpool
+HASHING_POOL_HANDLERS = {
+    "app.api.v1.auth.login.login_user",
+    "app.api.v1.auth.login_enhanced.login_user_enhanced",
+    "app.api.v1.supervisor.auth.supervisor_login",
+    "app.api.v1.visitor.auth_router.register",
+}
+
+
+class BlockingCallFinder(ast.NodeVisitor):
+    """Un-awaited session calls made directly in an `async def` body
+
+    Flags `db.query(...)`-style calls (on `db`, `session`, `self.db`, ...) and
+    plain function calls handed the session (`get_user(db, ...)`), which run
+    their queries on the event loop. Class instantiations only keep a
+    reference, and nested functions and lambdas are what run_in_threadpool is
+    given, so neither is flagged.
+    """
+
+    def __init__(self):
+        self.scopes = []
+        self.awaited = set()
+        self.hits = []
+
+    def _scoped(self, node):
+        self.scopes.append(node)
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _scoped
+
+    def visit_Await(self, node):
+        self.awaited.add(id(node.value))
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if self.scopes and isinstance(self.scopes[-1], ast.AsyncFunctionDef) and id(node) not in self.awaited:
+            func = node.func
+            receiver = func.value if isinstance(func, ast.Attribute) else None
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+            on_session = (isinstance(receiver, ast.Name) and receiver.id in SESSION_NAMES) or (
+                isinstance(receiver, ast.Attribute) and receiver.attr in SESSION_NAMES)
+            args = list(node.args) + [keyword.value for keyword in node.keywords]
+            passes_session = any(isinstance(arg, ast.Name) and arg.id in SESSION_NAMES for arg in args)
+            if (on_session and name in BLOCKING_METHODS) or (passes_session and not name[:1].isupper()):
+                self.hits.append(f"{node.lineno}: {self.scopes[-1].name} calls {name}()")
+        self.generic_visit(node)
+
+
+def test_coroutines_do_not_run_session_calls_on_the_event_loop():
+    hits = []
+    for path in sorted(APP_DIR.rglob("*.py")):
+        if "copy" in path.name or "tests" in path.parts:
+            continue
+        finder = BlockingCallFinder()
+        finder.visit(ast.parse(path.read_text(encoding="utf-8")))
+        hits += [f"{path.relative_to(APP_DIR.parent)}:{hit}" for hit in finder.hits]
+    assert hits == []
+
+
+def test_finder_flags_blocking_calls_only():
+    finder = BlockingCallFinder()
+    finder.visit(ast.parse(
+        "async def handler(db):\n"
+        "    db.query(User).all()\n"
+        "    self.db.commit()\n"
+        "    repo.get_user(db, 1)\n"
+        "    db.add(user)\n"
+        "    await db.execute(stmt)\n"
+        "    Service(db)\n"
+        "    await run_in_threadpool(lambda: db.query(User).all())\n"
+        "def sync_handler(db):\n"
+        "    db.commit()\n"
+    ))
+    assert finder.hits == ["2: handler calls query()", "3: handler calls commit()", "4: handler calls get_user()"]
+
+
+def test_routes_with_a_sync_session_are_not_coroutines():
+    from app.main import app
+
+    offenders = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not asyncio.iscoroutinefunction(route.endpoint):
+            continue
+        name = f"{route.endpoint.__module__}.{route.endpoint.__name__}"
+        if name not in HASHING_POOL_HANDLERS and any(d.call is get_db for d in route.dependant.dependencies):
+            offenders.append(f"{route.path} ({name})")
+    assert offenders == []
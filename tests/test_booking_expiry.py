@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.booking import Booking
+from app.models.hostel import Hostel
+from app.models.rooms import Room, RoomType
+from app.models.user import User
+from app.models.waitlist import Waitlist
+from app.services.booking_expiry_service import BookingExpiryService, BookingExpirySweeper
+
+NOW = datetime(2026, 10, 18, 10, 0)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bookings.db'}")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Hostel.__table__, Room.__table__, Booking.__table__, Waitlist.__table__,
+    ])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Hostel(id=1, hostel_name="North Block", city="Pune"))
+        db.add(User(id=1, email="v@example.com", username="v", name="Visitor"))
+        db.add(Room(id=1, hostel_id=1, room_number="101", room_type=RoomType.DOUBLE, total_beds=4, available_beds=1))
+        db.add(Room(id=2, hostel_id=1, room_number="102", room_type=RoomType.SINGLE, total_beds=1, available_beds=1))
+        db.add(Room(id=3, hostel_id=1, room_number="103", room_type=RoomType.DORM, total_beds=6, available_beds=0))
+        db.commit()
+    return Session
+
+
+def add_booking(db, room_id: int, age: timedelta, status: str = "pending", now: datetime = NOW):
+    db.add(Booking(visitor_id=1, hostel_id=1, room_id=room_id, check_in=now, check_out=now + timedelta(days=30),
+                   status=status, created_at=now - age))
+
+
+def test_sweep_expires_stale_bookings_without_adding_beds(Session):
+    with Session() as db:
+        add_booking(db, 1, timedelta(hours=30))
+        add_booking(db, 1, timedelta(hours=25))
+        add_booking(db, 2, timedelta(hours=48))
+        add_booking(db, 3, timedelta(hours=26))
+        add_booking(db, 3, timedelta(hours=2))                # too recent
+        add_booking(db, 1, timedelta(hours=40), status="confirmed")
+        db.commit()
+
+    events = []
+    report = BookingExpirySweeper(Session, expiry_hours=24, chunk_size=3, listeners=[events.extend]).sweep(now=NOW)
+    assert (report["expired"], report["chunks"], report["rooms"]) == (4, 2, 4)
+    assert sorted(e.booking_id for e in events) == [1, 2, 3, 4]
+    assert {e.room_id: e.room_type for e in events} == {1: RoomType.DOUBLE, 2: RoomType.SINGLE, 3: RoomType.DORM}
+
+    with Session() as db:
+        assert [b.status for b in db.query(Booking).order_by(Booking.id)] == [
+            "cancelled", "cancelled", "cancelled", "cancelled", "pending", "confirmed",
+        ]
+        beds = {r.id: r.available_beds for r in db.query(Room)}
+        # pending bookings never took a bed, so expiring them frees none
+        assert beds == {1: 1, 2: 1, 3: 0}
+
+    # Nothing left to expire
+    assert BookingExpirySweeper(Session, expiry_hours=24, listeners=[]).sweep(now=NOW)["expired"] == 0
+
+
+def test_sweep_uses_one_statement_per_chunk_and_leaves_rooms_alone(Session):
+    with Session() as db:
+        for i in range(40):
+            add_booking(db, 1 + i % 3, timedelta(hours=30))
+        db.commit()
+
+    engine = Session.kw["bind"]
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, many: statements.append(sql))
+    report = BookingExpirySweeper(Session, expiry_hours=24, chunk_size=100, listeners=[]).sweep(now=NOW)
+
+    assert report["expired"] == 40
+    assert len([s for s in statements if s.startswith("UPDATE bookings")]) == 1
+    assert not [s for s in statements if s.startswith("UPDATE rooms")]
+    # one room-type lookup for the events
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+
+def test_expiry_events_promote_the_waitlist(Session):
+    with Session() as db:
+        add_booking(db, 2, timedelta(hours=30), now=datetime.utcnow())
+        add_booking(db, 3, timedelta(hours=30), now=datetime.utcnow())
+        db.add(Waitlist(hostel_id=1, room_type=RoomType.SINGLE.value, visitor_id=1, priority=1, created_at=NOW))
+        db.add(Waitlist(hostel_id=1, room_type=RoomType.SINGLE.value, visitor_id=1, priority=2, created_at=NOW))
+        db.add(Waitlist(hostel_id=1, room_type=RoomType.DORM.value, visitor_id=1, priority=1, created_at=NOW))
+        db.commit()
+
+    service = BookingExpiryService(Session, sweeper=BookingExpirySweeper(Session, expiry_hours=24))
+    report = service._check_and_expire_bookings()
+    assert report["expired"] == 2
+
+    with Session() as db:
+        # The single room's free bed went to the first single entry; the full
+        # dorm got no bed out of the expiry, so its entry keeps waiting
+        assert sorted(w.room_type for w in db.query(Waitlist)) == [RoomType.DORM.value, RoomType.SINGLE.value]
+        assert db.query(Booking).filter(Booking.status == "confirmed").count() == 1
+        assert (db.get(Room, 2).available_beds, db.get(Room, 3).available_beds) == (0, 0)
+
+
+def test_failing_listener_does_not_undo_expiry(Session):
+    with Session() as db:
+        add_booking(db, 1, timedelta(hours=30))
+        db.commit()
+
+    def broken(events):
+        raise RuntimeError("listener down")
+
+    report = BookingExpirySweeper(Session, expiry_hours=24, listeners=[broken]).sweep(now=NOW)
+    assert report["expired"] == 1
+    with Session() as db:
+        assert db.query(Booking).one().status == "cancelled"
@@ -0,0 +1,152 @@
+import fnmatch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    MISSING, MemoryCache, RedisCache, TieredCache, cached, set_cache, set_cache_tenant,
+)
+
+
+class FakeRedis:
+    """Just enough of redis-py for RedisCache"""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    def expire(self, key, ttl):
+        pass
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += int(self.values.pop(key, None) is not None)
+            removed += int(self.sets.pop(key, None) is not None)
+        return removed
+
+    def scan_iter(self, match):
+        return [k for k in list(self.values) + list(self.sets) if fnmatch.fnmatch(k, match)]
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def memory_cache():
+    cache = TieredCache(MemoryCache(max_entries=3), default_ttl=60)
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+def test_memory_cache_evicts_least_recently_used(memory_cache):
+    for i in range(3):
+        memory_cache.set(f"k{i}", i)
+    assert memory_cache.get("k0") == 0  # k0 becomes most recently used
+    memory_cache.set("k3", 3)
+
+    assert memory_cache.get("k1") is MISSING
+    assert memory_cache.get("k0") == 0
+    assert memory_cache.stats.snapshot()["evictions"] == 1
+
+
+def test_memory_cache_expires_entries(memory_cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    memory_cache.set("k", "v", ttl=10)
+
+    now[0] += 11
+    assert memory_cache.get("k") is MISSING
+
+
+def test_cached_decorator_counts_hits_and_partitions_by_tenant(memory_cache):
+    calls = []
+
+    @cached(ttl=30, tags=("hostels",))
+    def lookup(db, hostel_id):
+        calls.append(hostel_id)
+        return {"id": hostel_id}
+
+    assert lookup(object(), 1) == {"id": 1}
+    assert lookup(object(), 1) == {"id": 1}
+    assert calls == [1]
+
+    token = set_cache_tenant(7)
+    try:
+        lookup(None, 1)
+    finally:
+        cache_module._current_tenant.reset(token)
+    assert calls == [1, 1]
+
+    stats = memory_cache.stats.snapshot()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_committed_writes_invalidate_tagged_entries(memory_cache):
+    calls = []
+
+    @cached(ttl=30, tags=("hostels",), tenant_aware=False)
+    def count_hostels(db):
+        calls.append(1)
+        return db.execute(text("SELECT COUNT(*) FROM hostels")).scalar()
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE hostels (id INTEGER PRIMARY KEY)"))
+        assert count_hostels(conn) == 0
+        assert count_hostels(conn) == 0
+    assert len(calls) == 1
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO hostels (id) VALUES (1)"))
+    with engine.connect() as conn:
+        assert count_hostels(conn) == 1
+    assert len(calls) == 2
+
+
+def test_redis_tier_is_shared_and_invalidated():
+    redis = FakeRedis()
+    worker_a = TieredCache(MemoryCache(), RedisCache(redis), default_ttl=60)
+    worker_b = TieredCache(MemoryCache(), RedisCache(redis), default_ttl=60)
+
+    worker_a.set("dashboard", {"total": 3}, tags=("hostels",))
+    assert worker_b.get("dashboard") == {"total": 3}
+    assert worker_b.stats.snapshot()["remote_hits"] == 1
+
+    worker_a.invalidate_tags("hostels")
+    worker_b.local.clear()
+    assert worker_b.get("dashboard") is MISSING
+
+
+def test_remote_hits_keep_their_tags_and_ttl_locally(monkeypatch):
+    redis = FakeRedis()
+    worker_a = TieredCache(MemoryCache(), RedisCache(redis), default_ttl=60)
+    worker_b = TieredCache(MemoryCache(), RedisCache(redis), default_ttl=60)
+    worker_a.set("dashboard", {"total": 3}, ttl=300, tags=("hostels",))
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    assert worker_b.get("dashboard") == {"total": 3}
+    now[0] += 120  # past the default TTL, within the entry's own
+    assert worker_b.get("dashboard") == {"total": 3}
+    assert worker_b.stats.snapshot()["local_hits"] == 1
+
+    worker_b.invalidate_tags("hostels")  # e.g. a commit on worker_b
+    assert worker_b.get("dashboard") is MISSING
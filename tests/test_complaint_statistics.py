@@ -0,0 +1,123 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.complaint import Complaint, ComplaintCategory, ComplaintPriority, ComplaintStatus
+from app.models.hostel import Hostel
+from app.repositories.complaint_repository import ComplaintRepository
+from app.services.analytics_service import AnalyticsService
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 3, 31, 23, 59, 59)
+
+
+@pytest.fixture
+def db():
+    rng = random.Random(5)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Hostel.__table__, Complaint.__table__])
+    rows = []
+    for i in range(400):
+        created = datetime(2024, 12, 1) + timedelta(hours=rng.randint(0, 24 * 150))
+        status = rng.choice(list(ComplaintStatus))
+        rows.append({
+            "title": "t", "description": "d", "category": rng.choice(list(ComplaintCategory)).name,
+            "priority": rng.choice(list(ComplaintPriority)).name, "status": status.name,
+            "hostel_name": f"Hostel {rng.randint(1, 4)}", "assigned_to_email": rng.choice(["a@x.com", "b@x.com"]),
+            "created_at": created,
+            # some resolved complaints have no resolved_at, some others do
+            "resolved_at": created + timedelta(minutes=rng.randint(10, 5000)) if rng.random() < 0.6 else None,
+            "student_rating": rng.choice([None, 1, 2, 3, 4, 5]),
+        })
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "visibility": "public", "is_featured": False} for i in range(1, 6)
+        ])
+        conn.execute(Complaint.__table__.insert(), rows)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def complaints(db, **where):
+    result = db.query(Complaint).filter(Complaint.created_at >= START, Complaint.created_at <= END)
+    return [c for c in result if all(getattr(c, k) == v for k, v in where.items())]
+
+
+def expected_statistics(rows):
+    """The figures as the previous Python implementation computed them"""
+    resolved = [c for c in rows if c.resolved_at]
+    ratings = [c.student_rating for c in rows if c.student_rating is not None]
+    return {
+        "total": len(rows),
+        "resolved": len(resolved),
+        "average_resolution_hours": round(
+            sum((c.resolved_at - c.created_at).total_seconds() for c in resolved) / len(resolved) / 3600, 2
+        ) if resolved else 0.0,
+        "average_rating": round(sum(ratings) / len(ratings), 2) if ratings else 0.0,
+    }
+
+
+def test_statistics_match_python_figures_in_one_statement(db):
+    db.statements.clear()
+    stats = ComplaintRepository.get_statistics(db, [1, 3], START, END)
+    assert len(db.statements) == 1
+
+    rows = [c for c in complaints(db) if c.hostel_name in ("Hostel 1", "Hostel 3")]
+    assert stats == expected_statistics(rows)
+    assert ComplaintRepository.get_statistics(db, None, START, END) == expected_statistics(complaints(db))
+
+    db.statements.clear()
+    by_hostel = ComplaintRepository.get_statistics_by_hostel(db, [1, 2, 5, 99], START, END)
+    assert len(db.statements) == 1
+    assert by_hostel[2] == expected_statistics(complaints(db, hostel_name="Hostel 2"))
+    assert by_hostel[5] == {"total": 0, "resolved": 0, "average_resolution_hours": 0.0, "average_rating": 0.0}
+    assert set(by_hostel) == {1, 2, 5}
+
+
+def test_performance_and_analytics_match_python_figures(db):
+    repo = ComplaintRepository(db)
+    db.statements.clear()
+    performance = repo.get_performance("a@x.com", START, END)
+    analytics = repo.get_analytics("hostel 2", START, END)
+    assert len(db.statements) == 2
+
+    mine = complaints(db, assigned_to_email="a@x.com")
+    resolved = [c for c in mine if c.status == ComplaintStatus.RESOLVED]
+    hours = sum((c.resolved_at - c.created_at).total_seconds() for c in resolved if c.resolved_at) / len(resolved) / 3600
+    assert performance == {
+        "supervisor_email": "a@x.com",
+        "total_complaints": len(mine),
+        "resolved_complaints": len(resolved),
+        "average_resolution_time_hours": round(hours, 2),
+    }
+
+    rows = complaints(db, hostel_name="Hostel 2")
+    assert analytics["total_complaints"] == len(rows)
+    assert analytics["category_distribution"] == {
+        c.value: n for c in ComplaintCategory if (n := sum(r.category == c for r in rows))
+    }
+    assert analytics["status_distribution"]["resolved"] == sum(r.status == ComplaintStatus.RESOLVED for r in rows)
+
+    assert repo.get_performance("nobody@x.com")["average_resolution_time_hours"] is None
+
+
+def test_complaint_metrics_use_a_fixed_number_of_statements(db):
+    db.statements.clear()
+    metrics = AnalyticsService.get_complaint_metrics(db, [2, 4, 99, 2], date(2025, 1, 1), date(2025, 3, 31))
+    assert len(db.statements) == 3
+
+    assert [m.hostel_id for m in metrics] == [2, 4, 2]
+    rows = complaints(db, hostel_name="Hostel 4")
+    metric = metrics[1]
+    assert metric.total_complaints == len(rows)
+    assert metric.by_status == {s.name: n for s in ComplaintStatus if (n := sum(r.status == s for r in rows))}
+    assert sum(metric.by_priority.values()) == sum(metric.by_category.values()) == len(rows)
+    assert metric.average_resolution_time == expected_statistics(rows)["average_resolution_hours"]
@@ -0,0 +1,46 @@
+import pytest
+
+from app.utils.content_filter import (
+    content_quality_score, detect_inappropriate_content, detect_spam, moderate_content, moderate_many, scan_text,
+)
+
+
+def test_scan_collects_every_signal_in_one_pass():
+    hits = scan_text("Spamoney! Visited the ROOM, staff were rude but the wifi was great. Damn.")
+    # substring matches, overlapping ones included ("spam" / "money")
+    assert hits["spam"] == ["spam", "visit", "money"]
+    assert hits["positive"] == ["great"] and hits["negative"] == ["rude"]
+    assert hits["specific"] == ["room", "wifi", "staff"]
+    assert hits["profanity"] and not hits["suspicious_pattern"] and not hits["excessive_caps"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Great place, call 98765432100 now", (False, ["suspicious_pattern"])),   # one signal, not enough
+    ("Promo inside", (True, ["promo"])),                                    # strong keyword alone
+    ("THIS HOSTEL IS THE BEST EVER!!", (False, ["excessive_caps"])),
+    ("Free wifi and a good deal", (True, ["deal", "free"])),
+    ("mail me at owner@hostel.com, greaaaaat", (False, ["suspicious_pattern"])),
+])
+def test_detect_spam(text, expected):
+    assert detect_spam(text) == expected
+
+
+def test_detect_inappropriate_and_quality():
+    assert detect_inappropriate_content("That was a threat. What the shit") == (True, ["threat", "profanity"])
+    assert detect_inappropriate_content("shitake soup") == (False, [])
+    text = "The room was clean and the staff friendly, but the bathroom was dirty. Good price."
+    # length 0.3 + specific 0.3 + balanced 0.2 + consistent 0.1 + sentences 0.1
+    assert content_quality_score(text, 4) == pytest.approx(1.0)
+    assert moderate_content(text, 4)["action"] == "auto_approve"
+
+
+def test_moderate_many_matches_moderate_content():
+    texts = ["Click here for a discount", "Nice", "The room was clean. Good wifi.", "Nice", "hate it"]
+    ratings = [5, 3, 5, 1, 1]
+    results = moderate_many(texts, ratings)
+    assert results == [moderate_content(t, r) for t, r in zip(texts, ratings)]
+    assert [r["action"] for r in results] == [
+        "flag_spam", "flag_low_quality", "auto_approve", "flag_low_quality", "reject",
+    ]
+    with pytest.raises(ValueError):
+        moderate_many(texts, ratings[:2])
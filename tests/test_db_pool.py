@@ -0,0 +1,38 @@
+from sqlalchemy import create_engine, text
+
+from app.config import InstrumentedQueuePool, _engine_options, settings, statement_timeout_for_path
+
+
+def test_statement_timeout_uses_longest_matching_prefix(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 30000)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_ROUTES", {
+        "/api/v1/auth": 5000,
+        "/api/v1/admin/reports": 120000,
+        "/api/v1/admin/reports/dashboard": 60000,
+    })
+
+    assert statement_timeout_for_path("/api/v1/auth/login") == 5000
+    assert statement_timeout_for_path("/api/v1/admin/reports/financial/income") == 120000
+    assert statement_timeout_for_path("/api/v1/admin/reports/dashboard") == 60000
+    assert statement_timeout_for_path("/api/v1/admin/students") == 30000
+
+
+def test_engine_options_follow_settings():
+    options = _engine_options("postgresql://u:p@localhost/db")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+    assert _engine_options("sqlite://") == {}
+
+
+def test_instrumented_pool_records_checkouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=2)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert engine.pool.checkedout() == 1
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert engine.pool.checkouts == 2
+    assert engine.pool.checkout_timeouts == 0
+    assert engine.pool.max_wait_seconds >= 0
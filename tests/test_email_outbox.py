@@ -0,0 +1,154 @@
+import smtplib
+import socket
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.email_service import EmailService
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class CollectingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content))
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = CollectingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, "127.0.0.1", port
+    controller.stop()
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    Base.metadata.create_all(engine, tables=[EmailOutbox.__table__])
+    return sessionmaker(bind=engine)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_outbox_delivers_over_pooled_connections(smtp_server, Session):
+    handler, host, port = smtp_server
+    worker = EmailOutboxWorker(Session, connect=lambda: smtplib.SMTP(host, port),
+                               build_message=EmailService().build_message,
+                               pool_size=2, batch_size=20, poll_interval=0.05)
+    worker.start()
+    for i in range(30):
+        worker.enqueue(f"student{i}@example.com", f"Notice {i}", f"<p>Hello {i}</p>", f"Hello {i}")
+    worker.enqueue("bounce@example.com", "Notice", "<p>x</p>")
+
+    assert wait_for(lambda: worker.stats()["sent"] + worker.stats()["failed"] == 31)
+    worker.stop()
+
+    assert len(handler.messages) == 30
+    stats = worker.stats()
+    assert stats["smtp_pool"]["connects"] <= 2  # connections reused across messages
+    with Session() as db:
+        assert db.query(EmailOutbox).filter(EmailOutbox.status == "sent").count() == 30
+        bounced = db.query(EmailOutbox).filter(EmailOutbox.to_email == "bounce@example.com").one()
+        assert bounced.status == "failed" and "550" in bounced.last_error
+
+
+class DroppedConnection:
+    def send_message(self, message):
+        raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+    def quit(self):
+        raise smtplib.SMTPServerDisconnected("already closed")
+
+    def close(self):
+        pass
+
+
+def test_dropped_connection_is_reopened_and_message_resent(smtp_server, Session):
+    handler, host, port = smtp_server
+    connections = [DroppedConnection()]
+
+    def connect():
+        return connections.pop() if connections else smtplib.SMTP(host, port)
+
+    worker = EmailOutboxWorker(Session, connect=connect, build_message=EmailService().build_message,
+                               pool_size=1)
+    worker.enqueue("student@example.com", "Reset", "<p>code</p>")
+    assert worker.run_once() == 1
+    worker.stop()
+
+    assert len(handler.messages) == 1
+    assert worker.pool.stats()["reconnects"] == 1
+    with Session() as db:
+        assert db.query(EmailOutbox).one().status == "sent"
+
+
+def test_unreachable_server_is_retried_later(Session):
+    def connect():
+        raise ConnectionRefusedError("connection refused")
+
+    worker = EmailOutboxWorker(Session, connect=connect, build_message=EmailService().build_message,
+                               pool_size=1, retry_base=60)
+    worker.enqueue("student@example.com", "Reset", "<p>code</p>")
+    worker.run_once()
+    assert worker.run_once() == 0  # not due again yet
+    worker.stop()
+
+    with Session() as db:
+        row = db.query(EmailOutbox).one()
+        assert row.status == "pending" and row.attempts == 1
+        assert "refused" in row.last_error
+
+
+def test_only_rows_with_an_expired_lease_are_taken_over(Session):
+    now = datetime.utcnow()
+    with Session() as db:
+        db.add_all([
+            # Being delivered by another live instance
+            EmailOutbox(id=1, to_email="a@example.com", subject="OTP", html_body="<p>1</p>", status="sending",
+                        attempts=0, next_attempt_at=now, claimed_at=now),
+            # Its instance died mid-batch
+            EmailOutbox(id=2, to_email="b@example.com", subject="OTP", html_body="<p>2</p>", status="sending",
+                        attempts=0, next_attempt_at=now, claimed_at=now - timedelta(minutes=30)),
+        ])
+        db.commit()
+
+    def connect():
+        raise ConnectionRefusedError("connection refused")
+
+    worker = EmailOutboxWorker(Session, connect=connect, build_message=EmailService().build_message,
+                               pool_size=1, lease_seconds=600)
+    assert worker.run_once() == 1
+    worker.stop()
+
+    with Session() as db:
+        live, expired = db.get(EmailOutbox, 1), db.get(EmailOutbox, 2)
+        assert live.status == "sending" and live.attempts == 0
+        assert expired.status == "pending" and expired.attempts == 1
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (configure all mappers)
+from app.api.deps import get_user_hostel_ids, get_users_hostel_ids
+from app.core.cache import MemoryCache, TieredCache, set_cache
+from app.core.database import Base
+from app.core.hostel_scope import invalidate_hostel_scope
+from app.models.admin_hostel_mapping import AdminHostelMapping
+from app.models.hostel import Hostel
+from app.models.supervisors import Supervisor, SupervisorHostel
+from app.models.user import User
+
+EXPECTED = {
+    (1, "superadmin"): [4, 3, 2, 1],
+    (2, "admin"): [1, 3],
+    (3, "supervisor"): [1, 2],     # linked by user_id
+    (4, "supervisor"): [3],        # matched by email
+    (5, "supervisor"): [4],        # matched by phone
+    (6, "student"): [2],
+    (7, "supervisor"): [],         # no supervisor record
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    set_cache(TieredCache(MemoryCache(), default_ttl=60))
+    yield
+    set_cache(None)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Hostel.__table__, User.__table__, Supervisor.__table__, SupervisorHostel.__table__,
+        AdminHostelMapping.__table__,
+    ])
+    with engine.begin() as conn:
+        conn.execute(Hostel.__table__.insert(), [
+            {"id": i, "hostel_name": f"Hostel {i}", "visibility": "public", "is_featured": False} for i in range(1, 5)
+        ])
+        conn.execute(User.__table__.insert(), [
+            {"id": user_id, "username": f"user{user_id}", "name": f"User {user_id}", "role": role,
+             "email": f"u{user_id}@x.com", "phone_number": f"555-{user_id}", "hostel_id": 2 if role == "student" else None}
+            for (user_id, role) in EXPECTED
+        ])
+        conn.execute(Supervisor.__table__.insert(), [
+            {"employee_id": "E3", "supervisor_name": "S3", "supervisor_email": "s3@x.com",
+             "supervisor_phone": "1", "role": "SUPERVISOR", "user_id": 3},
+            {"employee_id": "E4", "supervisor_name": "S4", "supervisor_email": "u4@x.com",
+             "supervisor_phone": "2", "role": "SUPERVISOR", "user_id": None},
+            {"employee_id": "E5", "supervisor_name": "S5", "supervisor_email": "s5@x.com",
+             "supervisor_phone": "555-5", "role": "SUPERVISOR", "user_id": None},
+        ])
+        conn.execute(SupervisorHostel.__table__.insert(), [
+            {"employee_id": employee_id, "hostel_id": hostel_id}
+            for employee_id, hostel_id in [("E3", 1), ("E3", 2), ("E4", 3), ("E5", 4)]
+        ])
+        conn.execute(AdminHostelMapping.__table__.insert(), [{"admin_id": 2, "hostel_id": 1},
+                                                             {"admin_id": 2, "hostel_id": 3}])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def test_scopes_are_resolved_once_per_user_and_role(db):
+    for (user_id, role), hostel_ids in EXPECTED.items():
+        assert sorted(get_user_hostel_ids(user_id, role, db)) == sorted(hostel_ids)
+
+    db.statements.clear()
+    for user_id, role in EXPECTED:
+        get_user_hostel_ids(user_id, role, db)
+    assert db.statements == []
+    # keyed by role too
+    assert get_user_hostel_ids(3, "student", db) == []
+
+
+def test_assignment_writes_and_explicit_invalidation_evict_scopes(db):
+    assert sorted(get_user_hostel_ids(3, "supervisor", db)) == [1, 2]
+    db.add(SupervisorHostel(employee_id="E3", hostel_id=4))
+    db.commit()
+    assert sorted(get_user_hostel_ids(3, "supervisor", db)) == [1, 2, 4]
+
+    assert sorted(get_user_hostel_ids(2, "admin", db)) == [1, 3]
+    db.statements.clear()
+    invalidate_hostel_scope(2)
+    get_user_hostel_ids(2, "admin", db)
+    assert len(db.statements) == 1
+
+
+def test_bulk_resolution_uses_a_fixed_number_of_queries(db):
+    db.statements.clear()
+    scopes = get_users_hostel_ids(list(EXPECTED), db)
+    assert {key: sorted(ids) for key, ids in scopes.items()} == {key: sorted(ids) for key, ids in EXPECTED.items()}
+    # superadmin 1, admin 1, supervisors 5 (user_id, users, email, phone, hostels), student 1
+    assert len(db.statements) == 8
+
+    db.statements.clear()
+    assert get_users_hostel_ids(list(EXPECTED), db) == scopes
+    assert db.statements == []
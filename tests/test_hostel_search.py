@@ -0,0 +1,265 @@
+import json
+import threading
+
+import pytest
+from elastic_transport import ApiResponseMeta, BaseNode, HttpHeaders
+from elastic_transport._node._base import NodeApiResponse
+from elasticsearch import Elasticsearch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (configure all mappers for ORM flushes)
+from app.core.database import Base
+from app.models.hostel import Hostel, Location
+from app.models.review import Review
+from app.models.rooms import Room, RoomType
+from app.schemas.search import HostelSearchFilters, HostelSearchSort
+from app.services import hostel_search
+from app.services.hostel_search import (
+    HostelSearchIndexer, HostelSearchSync, autocomplete_hostels, build_search_body, hostel_documents,
+    parse_search_response, search_hostels, set_search_sync,
+)
+from app.services.search_service import SearchService
+
+
+def fake_elasticsearch(responder):
+    """Client whose transport hands every request to `responder(method, path, body)`"""
+    requests = []
+
+    class FakeNode(BaseNode):
+        def perform_request(self, method, target, body=None, headers=None, request_timeout=None):
+            requests.append((method, target, body))
+            status, payload = responder(method, target.split("?")[0], body)
+            meta = ApiResponseMeta(status, "1.1", HttpHeaders({"x-elastic-product": "Elasticsearch"}), 0.0,
+                                   self.config)
+            return NodeApiResponse(meta, json.dumps(payload).encode())
+
+    return Elasticsearch("http://es:9200", node_class=FakeNode), requests
+
+
+def bulk_responder(method, path, body):
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    items = []
+    for line in lines:
+        for op in ("index", "delete"):
+            if op in line:
+                status = 404 if op == "delete" else 201
+                items.append({op: {"_index": "hostels", "_id": line[op]["_id"], "status": status}})
+    return 200, {"took": 1, "errors": False, "items": items}
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine, tables=[
+        Location.__table__, Hostel.__table__, Room.__table__, Review.__table__,
+    ])
+    with engine.begin() as conn:
+        conn.execute(Location.__table__.insert(), [{"id": 1, "city": "Pune"}])
+        for hostel in [
+            {"id": 1, "hostel_name": "Sunrise Residency", "location_id": 1, "full_address": "FC Road",
+             "amenities": "wifi, laundry", "total_beds": 10, "current_occupancy": 4, "gender_type": "Girls",
+             "latitude": 18.52, "longitude": 73.85, "visibility": "public", "is_featured": False},
+            {"id": 2, "hostel_name": "Hidden Annex", "location_id": 1, "visibility": "private", "is_featured": False},
+            {"id": 3, "hostel_name": "Lakeview", "city": "Nashik", "total_beds": 5, "current_occupancy": 5,
+             "visibility": "public", "is_featured": False},
+        ]:
+            conn.execute(Hostel.__table__.insert(), hostel)
+        conn.execute(Room.__table__.insert(), [
+            {"id": 1, "hostel_id": 1, "room_number": "101", "room_type": "SINGLE", "monthly_price": 9000.0,
+             "price": None, "total_beds": 1, "available_beds": 1},
+            {"id": 2, "hostel_id": 1, "room_number": "102", "room_type": "DOUBLE", "monthly_price": None,
+             "price": 6500.0,
+             "total_beds": 2, "available_beds": 2},
+        ])
+        conn.execute(Review.__table__.insert(), [
+            {"hostel_id": 1, "rating": 5, "text": "great", "is_approved": True, "is_spam": False},
+            {"hostel_id": 1, "rating": 4, "text": "good", "is_approved": True, "is_spam": False},
+            {"hostel_id": 1, "rating": 1, "text": "spam", "is_approved": True, "is_spam": True},
+        ])
+    return sessionmaker(bind=engine)
+
+
+def test_documents_are_built_with_one_query_per_table(Session):
+    statements = []
+    with Session() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        documents = hostel_documents(db, [1, 2, 3, 99])
+
+    assert len(statements) == 3
+    assert sorted(documents) == [1, 3]                  # private and missing hostels are left out
+    sunrise = documents[1]
+    assert (sunrise["price_range_min"], sunrise["price_range_max"]) == (6500.0, 9000.0)
+    assert (sunrise["rating"], sunrise["review_count"]) == (4.5, 2)
+    assert sunrise["available_beds"] == 6 and sunrise["amenities"] == ["wifi", "laundry"]
+    assert sunrise["geo_location"] == {"lat": 18.52, "lon": 73.85}
+    assert documents[3]["city"] == "Nashik" and "geo_location" not in documents[3]
+
+
+def test_search_body_uses_prefixes_geo_sort_and_facets():
+    filters = HostelSearchFilters(query="sunr", city="pune", amenities=["WiFi"], max_price=8000,
+                                  latitude=18.5, longitude=73.8, radius_km=3)
+    body = build_search_body(filters, HostelSearchSort(sort_by="distance"), page=2, page_size=10)
+
+    should = body["query"]["bool"]["must"][0]["bool"]["should"]
+    assert {"match": {"name.autocomplete": {"query": "sunr", "operator": "and", "boost": 2}}} in should
+    assert should[0]["multi_match"]["fuzziness"] == "AUTO"
+    filters_ = body["query"]["bool"]["filter"]
+    assert {"range": {"price_range_min": {"lte": 8000.0}}} in filters_
+    assert {"geo_distance": {"distance": "3.0km", "geo_location": {"lat": 18.5, "lon": 73.8}}} in filters_
+    assert body["sort"][0]["_geo_distance"]["unit"] == "km"
+    assert (body["from"], body["size"], body["track_total_hits"]) == (10, 10, True)
+    assert set(body["aggs"]) == {"cities", "genders", "amenities", "price_ranges"}
+
+    # No coordinates: "distance" cannot apply and relevance decides
+    body = build_search_body(HostelSearchFilters(), HostelSearchSort(sort_by="distance"), 1, 20)
+    assert body["sort"][0] == "_score"
+    assert body["query"]["bool"]["must"] == [{"match_all": {}}]
+
+
+def test_search_round_trip_through_the_client():
+    response = {
+        "hits": {"total": {"value": 41}, "hits": [
+            {"_id": "1", "_source": {"id": 1, "name": "Sunrise Residency", "city": "pune", "amenities": ["wifi"],
+                                     "latitude": 18.52, "longitude": 73.85, "available_beds": 6, "total_beds": 10,
+                                     "price_range_min": 6500.0, "price_range_max": 9000.0, "rating": 4.5,
+                                     "review_count": 2}, "sort": [1.23456, 2.0, 1]},
+        ]},
+        "aggregations": {
+            "cities": {"buckets": [{"key": "pune", "doc_count": 40}, {"key": "nashik", "doc_count": 1}]},
+            "price_ranges": {"buckets": [{"key": "under_5000", "doc_count": 0},
+                                         {"key": "5000_10000", "doc_count": 41}]},
+        },
+    }
+    es, requests = fake_elasticsearch(lambda method, path, body: (200, response))
+    filters = HostelSearchFilters(query="sunrise", latitude=18.5, longitude=73.8)
+
+    result = search_hostels(filters, HostelSearchSort(sort_by="distance"), 1, 20, es=es)
+
+    assert len(requests) == 1 and requests[0][1] == "/hostels/_search"
+    sent = json.loads(requests[0][2])
+    assert sent["from"] == 0 and sent["_source"][0] == "id"
+    assert result["total"] == 41
+    assert result["results"][0]["distance_km"] == 1.235
+    assert result["results"][0]["description"] == "" and result["results"][0]["photos"] == []
+    assert result["facets"]["cities"] == [{"value": "pune", "count": 40}, {"value": "nashik", "count": 1}]
+    assert result["facets"]["price_ranges"] == {"under_5000": 0, "5000_10000": 41}
+    assert parse_search_response(response)["results"][0]["distance_km"] is None
+
+
+def test_unavailable_cluster_falls_back(monkeypatch):
+    tripped = []
+    monkeypatch.setattr(hostel_search, "mark_elasticsearch_down", lambda: tripped.append(True))
+    es, _ = fake_elasticsearch(lambda method, path, body: (503, {"error": "unavailable"}))
+
+    assert search_hostels(HostelSearchFilters(query="x"), None, 1, 20, es=es) is None
+    assert autocomplete_hostels("su", es=es) is None
+    assert tripped == [True, True]
+
+
+def test_autocomplete_dedupes_suggestions():
+    hits = [{"_source": {"name": "Sunrise Residency", "city": "pune"}},
+            {"_source": {"name": "Sunrise Residency", "city": "pune"}},
+            {"_source": {"name": "Sunview", "city": "nashik"}}]
+    es, requests = fake_elasticsearch(lambda m, p, b: (200, {"hits": {"total": {"value": 3}, "hits": hits}}))
+    assert autocomplete_hostels("sun", "name", 5, es=es) == [
+        {"name": "Sunrise Residency", "city": "pune"}, {"name": "Sunview", "city": "nashik"},
+    ]
+    assert json.loads(requests[0][2])["query"] == {"match": {"name.autocomplete": {"query": "sun", "operator": "and"}}}
+
+
+def test_indexer_syncs_changes_in_one_bulk_request(Session):
+    es, requests = fake_elasticsearch(bulk_responder)
+    indexer = HostelSearchIndexer(Session, es_factory=lambda: es, chunk_size=500)
+
+    assert indexer.sync([1, 2, 3, 1])
+    assert len(requests) == 1 and requests[0][1] == "/_bulk"
+    actions = [json.loads(line) for line in requests[0][2].decode().splitlines()]
+    ops = [(op, action[op]["_id"]) for action in actions for op in ("index", "delete") if op in action]
+    assert ops == [("index", 1), ("delete", 2), ("index", 3)]      # hostel 2 is private
+
+    requests.clear()
+    assert HostelSearchIndexer(Session, es_factory=lambda: es, chunk_size=2).reindex_all() == 2
+    assert len(requests) == 2
+
+    assert not HostelSearchIndexer(Session, es_factory=lambda: None).sync([1])
+
+
+def test_committed_writes_are_queued_for_sync(Session):
+    synced = []
+
+    class RecordingIndexer:
+        def __init__(self):
+            self.available = False
+
+        def sync(self, ids):
+            synced.append(sorted(ids))
+            return self.available
+
+    indexer = RecordingIndexer()
+    sync = HostelSearchSync(indexer, flush_seconds=0)
+    set_search_sync(sync)
+    try:
+        with Session() as db:
+            db.add(Room(hostel_id=3, room_number="1", room_type=RoomType.DORM, total_beds=4, available_beds=4))
+            db.add(Review(hostel_id=1, rating=3, text="ok"))
+            db.flush()
+            db.rollback()
+            assert sync.stats()["pending"] == 0
+
+            db.add(Review(hostel_id=1, rating=3, text="ok"))
+            db.get(Hostel, 3).description = "By the lake"
+            db.commit()
+
+            review = db.query(Review).filter_by(text="ok").one()
+            review.hostel_id = 3                         # moved: both hostels change
+            db.commit()
+        assert sync.stats()["pending"] == 2
+
+        # Cluster down: ids stay queued and go out with the next flush
+        assert sync.flush() == 0 and sync.stats()["pending"] == 2
+        indexer.available = True
+        assert sync.flush() == 2
+        assert synced == [[1, 3], [1, 3]]
+    finally:
+        set_search_sync(None)
+
+
+def test_failed_ids_are_retried_without_new_writes():
+    attempts = []
+    synced = threading.Event()
+
+    class FlakyIndexer:
+        def sync(self, ids):
+            attempts.append(sorted(ids))
+            if len(attempts) > 1:
+                synced.set()
+                return True
+            return False
+
+    sync = HostelSearchSync(FlakyIndexer(), flush_seconds=0, retry_seconds=0.05)
+    sync.start()
+    try:
+        sync.enqueue([4, 2])
+        assert synced.wait(timeout=5)
+    finally:
+        sync.stop()
+    assert attempts == [[2, 4], [2, 4]]
+    assert sync.stats()["pending"] == 0
+
+
+def test_database_fallback_counts_in_the_page_query(Session):
+    statements = []
+    with Session() as db:
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        filters = HostelSearchFilters(query="sunrise", available_only=False)
+        hostels, total = SearchService.search_hostels.__wrapped__(db, filters, HostelSearchSort(), 1, 20)
+        assert (total, [h["name"] for h in hostels]) == (1, ["Sunrise Residency"])
+        assert hostels[0]["gender"] == "Girls" and float(hostels[0]["latitude"]) == 18.52
+        assert len(statements) == 1 and "COUNT(*) OVER ()" in statements[0]
+
+        # Past the last page the total still comes back
+        assert SearchService.search_hostels.__wrapped__(db, filters, HostelSearchSort(), 3, 20) == ([], 1)
+
+        assert SearchService.autocomplete(db, "lake", "name") == [{"name": "Lakeview", "city": None}]
+        assert SearchService.autocomplete(db, "pu", "city") == [{"city": "Pune"}]
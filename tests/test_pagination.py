@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.pagination import InvalidCursor, Keyset, count_rows, decode_cursor, encode_cursor, paginate
+from app.models.audit_log import AuditLog
+from app.models.complaint import Complaint
+from app.models.students import Student
+from app.repositories.audit_repository import AuditRepository
+from app.repositories.complaint_repository import COMPLAINT_KEYSET, ComplaintRepository
+from app.repositories.student_repository import list_students, list_students_page
+from app.schemas.audit import AuditLogFilter
+from app.schemas.complaint import ComplaintFilter
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Complaint.__table__, Student.__table__])
+    with engine.begin() as conn:
+        # three complaints share every timestamp, so the id has to break ties
+        conn.execute(Complaint.__table__.insert(), [
+            {"id": i, "title": "t", "description": "d", "category": "ROOM_MAINTENANCE",
+             "hostel_name": "Hostel A" if i % 2 else "Hostel B", "created_at": START + timedelta(hours=i // 3)}
+            for i in range(1, 61)
+        ])
+        conn.execute(Student.__table__.insert(), [
+            {"student_id": f"S{i:03d}", "student_name": f"Student {i % 7}", "student_email": f"s{i}@x.com",
+             "student_phone": "555", "hostel_id": 1 + i % 2}
+            for i in range(1, 26)
+        ])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    session.statements = statements
+    yield session
+    session.close()
+
+
+def all_pages(db, query, keyset, limit):
+    pages, cursor = [], None
+    while True:
+        page = paginate(db, query, keyset, limit, cursor=cursor)
+        pages.append(page)
+        if not page.has_more:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_cursor_tokens_round_trip_and_reject_tampering():
+    keys = COMPLAINT_KEYSET.keys
+    token = encode_cursor(keys, [datetime(2025, 3, 1, 12, 30), 42])
+    assert decode_cursor(token, keys) == [datetime(2025, 3, 1, 12, 30), 42]
+
+    for bad in ("not a cursor", token[:-3], encode_cursor(["created_at", "id"], [None, 1])):
+        with pytest.raises(InvalidCursor) as raised:
+            decode_cursor(bad, keys)
+        assert raised.value.status_code == 400
+
+
+def test_keyset_pages_cover_every_row_once_without_counting(db):
+    query = db.query(Complaint).filter(Complaint.hostel_name == "Hostel A")
+    expected = [c.id for c in query.order_by(Complaint.created_at.desc(), Complaint.id.desc())]
+
+    db.statements.clear()
+    pages = all_pages(db, query, COMPLAINT_KEYSET, 7)
+    assert [c.id for page in pages for c in page.items] == expected
+    assert pages[0].total == 30 and all(page.total is None for page in pages[1:])
+    # one COUNT for the first (offset) page, then one SELECT per page
+    assert sum("count(" in s.lower() for s in db.statements) == 1
+    assert len(db.statements) == len(pages) + 1
+
+    # Rows inserted ahead of the cursor do not shift the next page
+    second = paginate(db, query, COMPLAINT_KEYSET, 7, cursor=pages[0].next_cursor)
+    db.add(Complaint(title="t", description="d", category="ROOM_MAINTENANCE", hostel_name="Hostel A",
+                     created_at=START + timedelta(days=30)))
+    db.flush()
+    assert paginate(db, query, COMPLAINT_KEYSET, 7, cursor=pages[0].next_cursor).items == second.items
+
+    with pytest.raises(InvalidCursor):
+        paginate(db, query, Keyset(Complaint.id), 7, cursor=pages[0].next_cursor)
+
+
+def test_offset_pages_count_in_sql(db):
+    query = db.query(Complaint)
+    assert count_rows(db, query.filter(Complaint.hostel_name == "Hostel B")) == (30, False)
+
+    db.statements.clear()
+    page = paginate(db, query, COMPLAINT_KEYSET, 10, offset=55)
+    assert (page.total, len(page.items), page.next_cursor) == (60, 5, None)
+    assert "count(*)" in db.statements[0].lower() and "LIMIT" in db.statements[1]
+
+
+def test_failed_estimate_falls_back_to_counting(db, monkeypatch):
+    # EXPLAIN (FORMAT JSON) is not valid SQLite, standing in for a failed estimate
+    monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+    db.statements.clear()
+    assert count_rows(db, db.query(Complaint), estimate_threshold=10) == (60, False)
+    assert any(s.startswith("SAVEPOINT") for s in db.statements)
+    assert any(s.startswith("ROLLBACK TO SAVEPOINT") for s in db.statements)
+
+
+def test_complaint_repository_list_pages(db):
+    repo = ComplaintRepository(db)
+    items, total = repo.list(ComplaintFilter(hostel_name="hostel b", page=2, page_size=10))
+    assert total == 30 and len(items) == 10
+    assert items == sorted(items, key=lambda c: (c.created_at, c.id), reverse=True)
+
+    first = repo.list_page(ComplaintFilter(page_size=25))
+    rest = repo.list_page(ComplaintFilter(page_size=50, cursor=first.next_cursor))
+    assert rest.total is None and rest.next_cursor is None
+    assert [c.id for c in first.items + rest.items] == [c.id for c in db.query(Complaint).order_by(
+        Complaint.created_at.desc(), Complaint.id.desc())]
+
+
+def test_student_and_audit_listings_take_cursors(db):
+    first = list_students_page(db, limit=10, sort_by="student_name", sort_order="desc", user_hostel_ids=[1])
+    rest = list_students_page(db, limit=10, cursor=first.next_cursor, sort_by="student_name", sort_order="desc",
+                              user_hostel_ids=[1])
+    names = [(s.student_name, s.student_id) for s in first.items + rest.items]
+    assert first.total == 12 and names == sorted(names, reverse=True) and len(names) == 12
+    assert [s.student_id for s in list_students(db, skip=3, limit=2)] == ["S004", "S005"]
+
+    # nullable sort columns page by offset only
+    assert list_students_page(db, limit=5, sort_by="check_in_date").next_cursor is None
+    with pytest.raises(InvalidCursor):
+        list_students_page(db, limit=5, cursor=first.next_cursor, sort_by="check_in_date")
+
+    AuditLog.__table__.create(db.get_bind())
+    db.add_all([AuditLog(user_id=1, hostel_id=1, action="update", resource=f"r{i}",
+                         created_at=START + timedelta(minutes=i // 2)) for i in range(9)])
+    db.commit()
+    repo = AuditRepository(db)
+    page = repo.get_page(limit=4, filters=AuditLogFilter(hostel_id=1))
+    later = repo.get_all(limit=10, cursor=page.next_cursor)
+    assert page.total == 9
+    assert [log.resource for log in page.items + later] == [f"r{i}" for i in range(8, -1, -1)]
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.hostel  # noqa: F401  (users.hostel_id foreign key)
+from app.core.database import Base
+from app.core.password_pool import HashingPool, HashingPoolFull
+from app.core.security import BcryptContext, averify_and_upgrade, pwd_context
+from app.models.user import User
+
+
+def test_async_hash_and_verify_run_on_the_pool():
+    context = BcryptContext(rounds=4, pool=HashingPool(max_workers=2, max_queue=8))
+
+    async def scenario():
+        hashed = await context.ahash("s3cret-Pass")
+        results = await asyncio.gather(
+            context.averify("s3cret-Pass", hashed), context.averify("wrong", hashed)
+        )
+        return hashed, results
+
+    hashed, results = asyncio.run(scenario())
+    assert hashed.startswith("$2b$04$")
+    assert results == [True, False]
+    stats = context.pool.stats()
+    assert stats["completed"] == 3 and stats["running"] == 0 and stats["queue_depth"] == 0
+    context.pool.shutdown()
+
+
+def test_full_queue_rejects_instead_of_waiting():
+    pool = HashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        second = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queue_depth"] == 1
+        with pytest.raises(HashingPoolFull):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["max_queue_depth"] == 1 and stats["completed"] == 2
+    pool.shutdown()
+
+
+def test_needs_rehash_follows_configured_cost():
+    context = BcryptContext(rounds=5, pool=HashingPool(max_workers=1))
+    assert context.needs_rehash(BcryptContext(rounds=4).hash("pw"))
+    assert not context.needs_rehash(context.hash("pw"))
+    assert not context.needs_rehash(None)
+
+
+def test_long_passwords_from_the_truncating_helper_still_verify():
+    long_password = "p" * 100
+    legacy = bcrypt.hashpw(long_password.encode()[:72], bcrypt.gensalt(rounds=4)).decode()
+    assert BcryptContext(rounds=4).verify(long_password, legacy)
+
+
+def test_login_upgrades_hash_to_current_cost(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    db = sessionmaker(bind=engine)()
+    old_hash = BcryptContext(rounds=4).hash("s3cret-Pass")
+    db.add(User(id=1, username="u1", name="U", role="admin", is_active=True, hashed_password=old_hash))
+    db.commit()
+
+    monkeypatch.setattr(pwd_context, "rounds", 5)
+    user = db.get(User, 1)
+    assert not asyncio.run(averify_and_upgrade(db, user, "wrong"))
+    assert user.hashed_password == old_hash
+
+    assert asyncio.run(averify_and_upgrade(db, user, "s3cret-Pass"))
+    db.commit()
+    stored = db.get(User, 1).hashed_password
+    assert stored.startswith("$2b$05$")
+    assert pwd_context.verify("s3cret-Pass", stored)
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.push_models import (
+    DeviceToken, NotificationBatch, NotificationLog, NotificationPriority,
+    NotificationStatus, NotificationType, TargetAudience, UserRole,
+)
+from app.services.push_broadcast import BroadcastEngine, batch_progress
+
+
+def make_db(tmp_path, users):
+    engine = create_engine(f"sqlite:///{tmp_path / 'push.db'}")
+    Base.metadata.create_all(engine, tables=[
+        DeviceToken.__table__, NotificationLog.__table__, NotificationBatch.__table__,
+    ])
+    with engine.begin() as conn:
+        conn.execute(DeviceToken.__table__.insert(), [
+            {"user_id": i, "user_role": UserRole.student, "hostel_id": 1 + i % 2,
+             "device_token": f"tok-{i}", "device_type": "android", "is_active": True,
+             "last_used": datetime.utcnow(), "created_at": datetime.utcnow()}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(NotificationBatch.__table__.insert(), [{
+            "id": 1, "batch_name": "b", "notification_type": NotificationType.announcement,
+            "target_audience": TargetAudience.all_students, "status": "queued",
+            "total_recipients": 0, "sent_count": 0, "failed_count": 0,
+        }])
+    return engine, sessionmaker(bind=engine)
+
+
+REQUEST = {
+    "target_audience": TargetAudience.all_students,
+    "title": "Water cut",
+    "body": "No water 2-4pm",
+    "data": {"kind": "notice"},
+    "priority": NotificationPriority.high,
+    "notification_type": NotificationType.announcement,
+}
+
+
+def stub_sender(calls):
+    def send(tokens, title, body, data, priority):
+        calls.append(len(tokens))
+        return [
+            (None, "Requested entity was not found.", True) if token.endswith("7") else (f"msg-{token}", None, False)
+            for token in tokens
+        ]
+    return send
+
+
+def test_broadcast_bulk_inserts_and_writes_back_per_chunk(tmp_path):
+    engine, Session = make_db(tmp_path, 230)
+    inserts = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, params, ctx, many: inserts.append(many)
+                 if stmt.startswith("INSERT INTO notification_logs") else None)
+    calls = []
+    broadcaster = BroadcastEngine(Session, sender=stub_sender(calls), chunk_size=100, send_workers=2)
+
+    result = broadcaster.submit(1, REQUEST).result(timeout=10)
+    broadcaster.shutdown()
+
+    assert result == {"total": 230, "sent": 207, "failed": 23}
+    assert sorted(calls) == [30, 100, 100]
+    assert len(inserts) == 1  # one multi-row INSERT for every log
+
+    with Session() as db:
+        batch = db.get(NotificationBatch, 1)
+        progress = batch_progress(batch)
+        assert progress["status"] == "completed"
+        assert (progress["sent"], progress["failed"], progress["pending"]) == (207, 23, 0)
+        assert progress["progress"] == 1.0
+
+        sent = db.query(NotificationLog).filter(NotificationLog.user_id == 1).one()
+        assert sent.batch_id == 1
+        assert sent.status == NotificationStatus.sent
+        assert sent.fcm_message_id == "msg-tok-1" and sent.sent_at is not None
+
+        failed = db.query(NotificationLog).filter(NotificationLog.user_id == 7).one()
+        assert failed.status == NotificationStatus.failed and failed.sent_at is None
+        assert "not found" in failed.error_message
+        assert db.query(DeviceToken).filter(DeviceToken.is_active == False).count() == 23  # noqa: E712
+
+
+def test_whole_chunk_failure_marks_its_logs_failed(tmp_path):
+    _, Session = make_db(tmp_path, 10)
+
+    def broken(tokens, *args):
+        raise ConnectionError("fcm unreachable")
+
+    broadcaster = BroadcastEngine(Session, sender=broken, chunk_size=500, retry_backoff=0)
+    result = broadcaster.run_batch(1, dict(REQUEST, target_audience=TargetAudience.specific_hostel, hostel_ids=[1]))
+    broadcaster.shutdown()
+
+    assert result == {"total": 5, "sent": 0, "failed": 5}
+    with Session() as db:
+        assert db.get(NotificationBatch, 1).status == "completed"
+        assert {log.error_message for log in db.query(NotificationLog)} == {"fcm unreachable"}
+        assert db.query(DeviceToken).filter(DeviceToken.is_active == True).count() == 10  # noqa: E712
+
+
+def test_whole_chunk_errors_are_retried_and_never_deactivate_tokens(tmp_path):
+    _, Session = make_db(tmp_path, 10)
+    attempts = []
+
+    def flaky(tokens, *args):
+        attempts.append(len(tokens))
+        if len(attempts) == 1:
+            # Reads like a per-token UnregisteredError but covers the whole call
+            raise ValueError("Requested entity was not found.")
+        return [
+            (None, "The registration token is not a valid FCM registration token", False)
+            if token == "tok-4" else (f"msg-{token}", None, False)
+            for token in tokens
+        ]
+
+    broadcaster = BroadcastEngine(Session, sender=flaky, chunk_size=500, send_retries=2, retry_backoff=0)
+    result = broadcaster.run_batch(1, dict(REQUEST, target_audience=TargetAudience.specific_hostel, hostel_ids=[1]))
+    stats = broadcaster.stats()
+    broadcaster.shutdown()
+
+    assert attempts == [5, 5]
+    assert result == {"total": 5, "sent": 4, "failed": 1}
+    assert stats["chunk_retries"] == 1 and stats["tokens_deactivated"] == 0
+    with Session() as db:
+        assert db.query(DeviceToken).filter(DeviceToken.is_active == True).count() == 10  # noqa: E712
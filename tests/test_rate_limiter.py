@@ -0,0 +1,169 @@
+import json
+import os
+import types
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core import rate_limiter as rl
+from app.core.rate_limiter import (
+    MemoryRateLimitStore, RateLimit, RateLimitExceeded, RateLimitRegistry, RateLimiter, RedisRateLimitStore,
+    parse_rate_limit, rate_limit, rate_limit_exceeded_handler, set_rate_limiter,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rl, "time", types.SimpleNamespace(time=clock.time, monotonic=clock.monotonic))
+    return clock
+
+
+class CountingStore(MemoryRateLimitStore):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def hit(self, key, limit):
+        self.calls += 1
+        return super().hit(key, limit)
+
+
+def make_limiter(store=None, **limits):
+    return RateLimiter(store or MemoryRateLimitStore(), RateLimitRegistry(dict(rl.RATE_LIMITS, **limits)))
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit("5/minute") == RateLimit(5, 60)
+    assert parse_rate_limit("100 per hour") == RateLimit(100, 3600)
+    assert parse_rate_limit("10/30seconds") == RateLimit(10, 30)
+    with pytest.raises(ValueError):
+        parse_rate_limit("often")
+
+
+def test_gcra_allows_the_burst_then_spaces_requests(clock):
+    store = MemoryRateLimitStore()
+    limit = RateLimit(5, 60)
+    assert [store.hit("k", limit)[2] for _ in range(5)] == [4, 3, 2, 1, 0]
+    allowed, retry_after_ms, _ = store.hit("k", limit)
+    assert not allowed and retry_after_ms == 12_000
+
+    # No fresh window at a boundary: after 12 s exactly one more request fits
+    clock.now += 12
+    assert store.hit("k", limit)[0]
+    assert not store.hit("k", limit)[0]
+    assert store.hit("other", limit)[0]
+
+
+def test_local_precheck_rejects_without_the_store(clock):
+    store = CountingStore()
+    worker_a, worker_b = make_limiter(store), make_limiter(store)
+
+    for _ in range(5):
+        assert worker_a.hit("5/minute", "user:1")[0]
+    # worker A used the whole budget itself: rejected locally
+    allowed, retry_after, _ = worker_a.hit("5/minute", "user:1")
+    assert not allowed and retry_after == pytest.approx(12)
+    assert store.calls == 5
+
+    # worker B learns from the shared store, then stops asking it
+    assert not worker_b.hit("5/minute", "user:1")[0]
+    assert not worker_b.hit("5/minute", "user:1")[0]
+    assert store.calls == 6
+    assert worker_b.info()["local_rejections"] == 1
+
+    clock.now += 12
+    assert worker_b.hit("5/minute", "user:1")[0]
+    assert store.calls == 7
+
+
+def test_store_outage_fails_open(clock):
+    class DownStore:
+        def hit(self, key, limit):
+            raise ConnectionError("redis down")
+
+    limiter = make_limiter(DownStore())
+    assert limiter.hit("1/minute", "ip:1")[0] and limiter.hit("1/minute", "ip:1")[0]
+    assert limiter.info()["store_errors"] == 2
+
+
+def test_redis_store_makes_one_script_call_per_check():
+    class FakeScriptClient:
+        def __init__(self):
+            self.calls = []
+
+        def register_script(self, script):
+            assert "redis.call('TIME')" in script
+            return lambda keys, args: self.calls.append((keys, args)) or [0, 1500, 0]
+
+    client = FakeScriptClient()
+    store = RedisRateLimitStore(client, prefix="rl:")
+    assert store.hit("auth_login:ip:1.2.3.4", RateLimit(5, 60)) == (False, 1500, 0)
+    assert client.calls == [(["rl:auth_login:ip:1.2.3.4"], [12_000, 48_000])]
+
+
+def test_limits_reload_from_file(tmp_path):
+    path = tmp_path / "limits.json"
+    path.write_text(json.dumps({"search": "7/minute"}))
+    registry = RateLimitRegistry(rl.RATE_LIMITS, overrides={"search": "9/minute"}, path=str(path), reload_seconds=0)
+    assert registry.get("search") == "7/minute"
+    assert registry.get("auth_login") == "5/minute"
+
+    path.write_text(json.dumps({"search": "8/minute"}))
+    os.utime(path, (1, 1))
+    assert registry.resolve("search") == RateLimit(8, 60)
+
+    # A broken file keeps the last good limits
+    path.write_text("{not json")
+    os.utime(path, (2, 2))
+    assert registry.get("search") == "8/minute"
+
+    registry.update({"search": "3/second"})
+    assert registry.resolve("search") == RateLimit(3, 1)
+    with pytest.raises(ValueError):
+        registry.update({"search": "lots"})
+
+
+def test_dependency_limits_per_user_and_tenant(clock):
+    set_rate_limiter(make_limiter(review_submission="2/minute"))
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+    @app.middleware("http")
+    async def fake_auth(request: Request, call_next):
+        request.state.user_id = request.headers.get("x-user")
+        request.state.active_hostel_id = request.headers.get("x-hostel")
+        return await call_next(request)
+
+    @app.post("/reviews", dependencies=[Depends(rate_limit("review_submission", scope=("user", "tenant")))])
+    def post_review():
+        return {"ok": True}
+
+    try:
+        client = TestClient(app)
+        alice = {"x-user": "1", "x-hostel": "10"}
+        assert [client.post("/reviews", headers=alice).status_code for _ in range(2)] == [200, 200]
+        response = client.post("/reviews", headers=alice)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        assert response.json()["error"] == "rate_limit_exceeded"
+        # same hostel, other user: the tenant budget is spent too
+        assert client.post("/reviews", headers={"x-user": "2", "x-hostel": "10"}).status_code == 429
+        assert client.post("/reviews", headers={"x-user": "2", "x-hostel": "11"}).status_code == 200
+    finally:
+        set_rate_limiter(None)
+
+    with pytest.raises(ValueError):
+        rate_limit("search", scope="planet")
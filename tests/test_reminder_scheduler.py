@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.core.advisory_lock import advisory_lock
+from app.core.database import Base
+from app.models.hostel import Hostel
+from app.models.payment_models import (
+    Invoice, PaymentReminder, ReminderChannel, ReminderConfiguration, ReminderStatus,
+    ReminderTemplate, ReminderType,
+)
+from app.models.user import User
+from app.services.reminder_services import REMINDER_JOB_LOCK_KEY, process_automated_reminders
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+NOW = datetime(2026, 10, 18, 10, 0)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reminders.db'}")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Hostel.__table__, Invoice.__table__, ReminderConfiguration.__table__,
+        PaymentReminder.__table__, ReminderTemplate.__table__,
+    ])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Hostel(id=1, hostel_name="North Block", city="Pune"))
+        db.add(User(id=1, email="s@example.com", phone_number="9000000001", username="s", name="Sam"))
+        db.add(ReminderConfiguration(hostel_id=1, pre_due_days="7,3,1", pre_due_channels=ReminderChannel.EMAIL,
+                                     due_date_enabled=True, due_date_channels=ReminderChannel.BOTH,
+                                     overdue_frequency_days=3, overdue_channels=ReminderChannel.BOTH,
+                                     escalation_enabled=True, escalation_1_days=7, escalation_2_days=14,
+                                     escalation_3_days=30, final_notice_days=45, max_reminders=10))
+        db.add_all(ReminderTemplate(hostel_id=1, reminder_type=t, is_default=True,
+                                    email_subject="{{ invoice_number }}", email_body="Due {{ amount }}",
+                                    sms_body="Due") for t in ReminderType)
+        db.commit()
+    return Session
+
+
+def add_invoice(db, number: str, due_in: timedelta, status: str = "pending", next_at=NOW - timedelta(minutes=5)):
+    invoice = Invoice(invoice_number=number, user_id=1, hostel_id=1, total_amount=100, paid_amount=0,
+                      due_amount=100, status=status, due_date=NOW + due_in, next_reminder_at=next_at)
+    db.add(invoice)
+    return invoice
+
+
+def always_delivered(*args):
+    return True
+
+
+def test_run_only_touches_due_invoices_and_reschedules(Session):
+    with Session() as db:
+        add_invoice(db, "PRE", timedelta(days=3, hours=12))       # 3 days left -> pre-due
+        add_invoice(db, "LATER", timedelta(days=20))               # nothing yet
+        add_invoice(db, "LATE", -timedelta(days=8))                # escalation 1
+        add_invoice(db, "PAID", -timedelta(days=2), status="paid")
+        add_invoice(db, "FUTURE", -timedelta(days=2), next_at=NOW + timedelta(hours=3))
+        db.commit()
+
+    with Session() as db:
+        report = process_automated_reminders(db, now=NOW, batch_size=2, deliver=always_delivered)
+    assert (report["scanned"], report["created"], report["sent"], report["closed"]) == (4, 2, 2, 1)
+    assert report["batches"] == 2
+
+    with Session() as db:
+        sent = {r.invoice.invoice_number: r for r in db.query(PaymentReminder).all()}
+        assert sent["PRE"].reminder_type == ReminderType.PRE_DUE and sent["PRE"].status == ReminderStatus.SENT
+        assert sent["LATE"].reminder_type == ReminderType.ESCALATION_1
+        invoices = {i.invoice_number: i for i in db.query(Invoice).all()}
+        assert invoices["PAID"].next_reminder_at is None
+        # next pre-due window (1 day left) opens just after due - 2 days
+        assert invoices["PRE"].next_reminder_at == invoices["PRE"].due_date - timedelta(days=2, seconds=-1)
+        assert invoices["LATER"].next_reminder_at == invoices["LATER"].due_date - timedelta(days=8, seconds=-1)
+        # regular overdue reminder every 3 days after the escalation
+        assert invoices["LATE"].next_reminder_at == NOW + timedelta(days=3)
+        assert invoices["LATE"].reminder_count == 1 and invoices["LATE"].escalation_level == 1
+
+    # Nothing is due an hour later: the run reads nothing
+    with Session() as db:
+        report = process_automated_reminders(db, now=NOW + timedelta(hours=1), deliver=always_delivered)
+    assert (report["scanned"], report["created"]) == (0, 0)
+
+
+def test_failed_delivery_is_retried_next_hour(Session):
+    with Session() as db:
+        add_invoice(db, "LATE", -timedelta(days=2))
+        db.commit()
+    with Session() as db:
+        report = process_automated_reminders(db, now=NOW, deliver=lambda *args: False)
+    assert (report["created"], report["failed"]) == (1, 1)
+    with Session() as db:
+        invoice = db.query(Invoice).one()
+        assert invoice.reminder_count == 0 and invoice.next_reminder_at == NOW + timedelta(hours=1)
+        assert db.query(PaymentReminder).one().status == ReminderStatus.FAILED
+
+
+def test_reminders_are_inserted_in_one_statement_per_batch(Session):
+    with Session() as db:
+        for i in range(30):
+            add_invoice(db, f"INV{i}", -timedelta(days=2))
+        db.commit()
+    statements = []
+    engine = Session.kw["bind"]
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, many: statements.append(sql))
+    with Session() as db:
+        report = process_automated_reminders(db, now=NOW, batch_size=100, deliver=always_delivered)
+    assert report["created"] == 30
+    assert len([s for s in statements if s.startswith("INSERT INTO payment_reminders")]) == 1
+    assert len([s for s in statements if s.startswith("SELECT reminder_configurations")]) == 1
+
+
+def test_overlapping_run_is_skipped(Session):
+    with Session() as db:
+        add_invoice(db, "LATE", -timedelta(days=2))
+        db.commit()
+        with advisory_lock(db.get_bind(), REMINDER_JOB_LOCK_KEY) as held:
+            assert held
+            report = process_automated_reminders(db, now=NOW, deliver=always_delivered)
+    assert report["locked"] and report["scanned"] == 0
@@ -0,0 +1,77 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.middleware import audit_trail, tenant_filter
+from app.middleware.route_classifier import PrefixTrie, RouteZone, classify_route
+from app.middleware.security_pipeline import SecurityPipelineMiddleware
+
+
+def _client(monkeypatch):
+    audited = []
+    monkeypatch.setattr(audit_trail, "submit_audit", lambda record, block=True: audited.append(record))
+    monkeypatch.setattr(tenant_filter, "_load_active_hostel_id", lambda user_id: 42)
+    tenant_filter.active_session_cache.clear()
+
+    app = FastAPI()
+    app.add_middleware(SecurityPipelineMiddleware)
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    def echo(request: Request):
+        state = request.state
+        return {
+            "zone": getattr(state, "route_zone", RouteZone.PUBLIC),
+            "user_id": getattr(state, "user_id", None),
+            "active_hostel_id": getattr(state, "active_hostel_id", None),
+        }
+
+    return TestClient(app), audited
+
+
+def _auth(role, user_id=5):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id), 'role': role})}"}
+
+
+def test_trie_prefers_longest_prefix_and_exact_matches():
+    trie = PrefixTrie()
+    trie.add("/api", "api")
+    trie.add("/api/v1/admin", "admin")
+    trie.add("/api/v1/auth/login", "login", exact=True)
+
+    assert trie.match("/api/v1/admin/students") == "admin"
+    assert trie.match("/api/v1/auth/login") == "login"
+    assert trie.match("/api/v1/auth/login/extra") == "api"
+    assert trie.match("/other", "default") == "default"
+
+    assert classify_route("/openapi.json") is RouteZone.PUBLIC
+    assert classify_route("/api/v1/auth/refresh") is RouteZone.PUBLIC
+    assert classify_route("/api/v1/supervisor/complaints") is RouteZone.SUPERVISOR
+    assert classify_route("/api/v1/visitor/search") is RouteZone.PROTECTED
+
+
+def test_public_routes_skip_auth(monkeypatch):
+    client, audited = _client(monkeypatch)
+    assert client.get("/health").json()["user_id"] is None
+    assert client.get("/api/v1/students").status_code == 401
+
+
+def test_stages_run_in_order_for_admin_writes(monkeypatch):
+    client, audited = _client(monkeypatch)
+
+    body = client.post("/api/v1/admin/students", headers=_auth("admin")).json()
+
+    assert body == {"zone": "admin", "user_id": "5", "active_hostel_id": 42}
+    assert audited == [{
+        "user_id": "5", "action": "POST", "resource": "/api/v1/admin/students", "hostel_id": 42,
+        "ip_address": "testclient", "user_agent": "testclient",
+    }]
+
+
+def test_role_gate_rejects_other_zones(monkeypatch):
+    client, audited = _client(monkeypatch)
+
+    response = client.post("/api/v1/admin/students", headers=_auth("student"))
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Admin access required"}
+    assert client.get("/api/v1/supervisor/permissions", headers=_auth("admin")).status_code == 200
+    assert audited == []
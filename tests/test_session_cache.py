@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.config import settings
+from app.core import security, session_cache
+from app.core.cache import MemoryCache, TieredCache, set_cache
+from app.core.roles import Role
+from app.core.session_cache import (
+    ACTIVE_HOSTEL_CLAIM_HEADER, ActiveSessionCache, MISSING, create_active_hostel_claim,
+    invalidate_active_session, read_active_hostel_claim,
+)
+from app.core.token_cache import revoke_user_tokens, verified_tokens
+from app.middleware import tenant_filter
+from app.middleware.authentication import authenticate
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    set_cache(TieredCache(MemoryCache(), default_ttl=60))
+    verified_tokens.clear()
+    yield
+    set_cache(None)
+    verified_tokens.clear()
+
+
+def _request(user_id, headers=None):
+    return SimpleNamespace(
+        url=SimpleNamespace(path="/api/v1/admin/students"),
+        state=SimpleNamespace(user_id=user_id, user_role=Role.ADMIN),
+        headers=headers or {},
+        query_params={},
+    )
+
+
+def _run_middleware(request):
+    async def call_next(req):
+        return getattr(req.state, "active_hostel_id", None)
+    return asyncio.run(tenant_filter.tenant_filter_middleware(request, call_next))
+
+
+def test_middleware_hits_database_once_until_invalidated(monkeypatch):
+    cache = ActiveSessionCache(ttl=60)
+    monkeypatch.setattr(tenant_filter, "active_session_cache", cache)
+    monkeypatch.setattr(session_cache, "active_session_cache", cache)
+    active = {"7": 3}
+    loads = []
+
+    def load(user_id):
+        loads.append(user_id)
+        return active.get(str(user_id))
+
+    monkeypatch.setattr(tenant_filter, "_load_active_hostel_id", load)
+
+    assert [_run_middleware(_request("7")) for _ in range(3)] == [3, 3, 3]
+    assert len(loads) == 1
+
+    active["7"] = 5
+    session_cache.invalidate_active_session("7")
+    assert _run_middleware(_request("7")) == 5
+    assert len(loads) == 2
+
+    stats = cache.stats()
+    assert stats["cache_hits"] == 2 and stats["db_lookups"] == 2 and stats["lookups_saved"] == 2
+
+
+def test_signed_claim_skips_lookup(monkeypatch):
+    cache = ActiveSessionCache(ttl=60)
+    monkeypatch.setattr(tenant_filter, "active_session_cache", cache)
+    monkeypatch.setattr(session_cache, "active_session_cache", cache)
+    monkeypatch.setattr(tenant_filter, "_load_active_hostel_id", lambda user_id: 1 / 0)
+
+    claim = create_active_hostel_claim(7, 9)
+    assert _run_middleware(_request("7", {ACTIVE_HOSTEL_CLAIM_HEADER: claim})) == 9
+    assert cache.stats()["claim_hits"] == 1
+
+
+def test_claim_is_bound_to_user():
+    claim = create_active_hostel_claim(7, 9)
+    assert read_active_hostel_claim(claim, 8) is None
+    assert read_active_hostel_claim("not-a-token", 7) is None
+
+
+def test_claim_is_voided_by_switch_and_revocation():
+    claim = create_active_hostel_claim(7, 9)
+    invalidate_active_session(7)
+    assert read_active_hostel_claim(claim, 7) is None
+
+    switched = create_active_hostel_claim(7, 4)
+    assert read_active_hostel_claim(switched, 7) == 4
+    revoke_user_tokens(7)
+    assert read_active_hostel_claim(switched, 7) is None
+
+
+def test_claims_signed_like_access_tokens_are_rejected():
+    # The previous format: SECRET_KEY, no audience or version
+    forged = jwt.encode(
+        {"sub": "7", "hostel_id": 9, "type": "active_hostel",
+         "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        settings.SECRET_KEY, algorithm=settings.ALGORITHM,
+    )
+    assert read_active_hostel_claim(forged, 7) is None
+
+
+def test_claim_and_refresh_token_are_not_access_tokens():
+    claim = create_active_hostel_claim(7, 9)
+    refresh = security.create_refresh_token({"sub": "7"})
+    for token in (claim, refresh):
+        with pytest.raises(HTTPException) as exc:
+            security.decode_token(token)
+        assert exc.value.status_code == 401
+
+        request = SimpleNamespace(headers={"Authorization": f"Bearer {token}"}, state=SimpleNamespace())
+        assert authenticate(request).status_code == 401
+        assert not hasattr(request.state, "user_id")
+
+        with pytest.raises(HTTPException) as exc:
+            security.get_current_user(SimpleNamespace(cookies={}), token=token, db=None)
+        assert exc.value.status_code == 401
+
+    assert security.decode_token(security.create_access_token({"sub": "7"}))["sub"] == "7"
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(session_cache.time, "monotonic", lambda: now[0])
+    cache = ActiveSessionCache(ttl=30)
+    cache.set(1, None)
+    assert cache.get(1) is None
+    now[0] += 31
+    assert cache.get(1) is MISSING
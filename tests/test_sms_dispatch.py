@@ -0,0 +1,188 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.sms_models import (
+    EmergencyAlert, MessageType, PaymentReminders, SMSLog, SMSProvider, SMSStatus,
+)
+from app.services.sms_dispatch import SMSDispatcher, TokenBucket, backoff_delay
+
+
+def make_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sms.db'}")
+    Base.metadata.create_all(engine, tables=[
+        SMSLog.__table__, EmergencyAlert.__table__, PaymentReminders.__table__,
+    ])
+    return engine, sessionmaker(bind=engine)
+
+
+class StubProvider:
+    """Fails numbers ending in 9 once (transient) and numbers starting with 000 for good"""
+
+    def __init__(self, gate=None):
+        self.sent = []
+        self.attempts = {}
+        self.gate = gate
+        self.lock = threading.Lock()
+
+    def send_sms(self, phone, message):
+        if self.gate is not None:
+            self.gate.wait()
+        with self.lock:
+            self.attempts[phone] = self.attempts.get(phone, 0) + 1
+            if phone.startswith("000"):
+                raise ValueError("Twilio error: invalid 'To' phone number")
+            if phone.endswith("9") and self.attempts[phone] == 1:
+                raise TimeoutError("Twilio error: read timed out")
+            self.sent.append((phone, message))
+        return f"SM{phone}", "queued"
+
+
+def test_alert_is_sent_with_retries_and_counters_written_in_bulk(tmp_path):
+    engine, Session = make_db(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(EmergencyAlert.__table__.insert(), [
+            {"id": 1, "title": "Fire", "message": "Evacuate", "severity": "critical",
+             "total_recipients": 40, "sent_count": 0, "failed_count": 0},
+        ])
+    log_inserts = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, params, ctx, many: log_inserts.append(stmt)
+                 if stmt.startswith("INSERT INTO sms_logs") else None)
+
+    provider = StubProvider()
+    dispatcher = SMSDispatcher(Session, client_factory=lambda p: provider, concurrency=8,
+                               retry_base=0.01, retry_cap=0.02, flush_interval=0.05)
+    phones = [f"+9100000{i:03d}" for i in range(38)] + ["0001", "0002"]
+    dispatcher.submit_many(((p, "[CRITICAL] Fire: Evacuate", None) for p in phones),
+                           SMSProvider.twilio, MessageType.emergency_alert, alert_id=1)
+    assert dispatcher.drain(timeout=10)
+    dispatcher.stop()
+
+    stats = dispatcher.stats()
+    assert (stats["sent"], stats["failed"]) == (38, 2)
+    assert stats["retries"] == 3  # the three numbers ending in 9, once each
+    assert provider.attempts["0001"] == 1  # permanent errors are not retried
+    assert len(log_inserts) < 40
+
+    with Session() as db:
+        alert = db.get(EmergencyAlert, 1)
+        assert (alert.sent_count, alert.failed_count) == (38, 2)
+        assert alert.sent_at is not None
+        failed = db.query(SMSLog).filter(SMSLog.phone_number == "0001").one()
+        assert failed.status == SMSStatus.failed and "invalid" in failed.error_message
+        assert db.query(SMSLog).filter(SMSLog.status == SMSStatus.sent).count() == 38
+
+
+def test_failed_flush_is_retried_before_messages_count_as_done(tmp_path):
+    engine, Session = make_db(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(EmergencyAlert.__table__.insert(), [
+            {"id": 1, "title": "Flood", "message": "Move up", "severity": "critical",
+             "total_recipients": 5, "sent_count": 0, "failed_count": 0},
+        ])
+    failures = [2]
+
+    def flaky_session():
+        if failures[0]:
+            failures[0] -= 1
+            raise ConnectionError("database restarting")
+        return Session()
+
+    provider = StubProvider()
+    dispatcher = SMSDispatcher(flaky_session, client_factory=lambda p: provider, concurrency=2,
+                               retry_base=0.01, retry_cap=0.02, flush_interval=0.05)
+    dispatcher.submit_many(((f"+9177700{i:03d}", "Move up", None) for i in range(5)),
+                           SMSProvider.twilio, MessageType.emergency_alert, alert_id=1)
+    assert dispatcher.drain(timeout=10)
+    dispatcher.stop()
+
+    stats = dispatcher.stats()
+    assert stats["write_retries"] == 2 and stats["outcomes_lost"] == 0 and stats["sent"] == 5
+    with Session() as db:
+        assert db.query(SMSLog).count() == 5
+        alert = db.get(EmergencyAlert, 1)
+        assert alert.sent_count == 5 and alert.sent_at is not None
+
+
+def test_emergency_alerts_jump_ahead_of_queued_reminders(tmp_path):
+    engine, Session = make_db(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(PaymentReminders.__table__.insert(), [
+            {"id": i, "phone_number": f"+91555{i:04d}", "customer_name": "S", "amount": 10.0,
+             "due_date": datetime.utcnow(), "invoice_number": f"INV-{i}", "reminder_sent": False,
+             "queued_at": datetime.utcnow()}
+            for i in range(1, 6)
+        ] + [{"id": 6, "phone_number": "0006", "customer_name": "S", "amount": 10.0,
+              "due_date": datetime.utcnow(), "invoice_number": "INV-6", "reminder_sent": False,
+              "queued_at": datetime.utcnow()}])
+
+    gate = threading.Event()
+    provider = StubProvider(gate)
+    dispatcher = SMSDispatcher(Session, client_factory=lambda p: provider, concurrency=1,
+                               flush_interval=0.05)
+    dispatcher.submit_many(((f"+91555{i:04d}", "pay up", i) for i in range(1, 6)),
+                           SMSProvider.twilio, MessageType.payment_reminder)
+    dispatcher.submit("0006", "pay up", SMSProvider.twilio, MessageType.payment_reminder, reminder_id=6)
+    dispatcher.submit_many(((f"+91999{i:04d}", "alert", None) for i in range(3)),
+                           SMSProvider.twilio, MessageType.emergency_alert)
+    gate.set()
+    assert dispatcher.drain(timeout=10)
+    dispatcher.stop()
+
+    order = [message for _, message in provider.sent]
+    # At most the reminder the sender had already taken goes out before the alerts
+    assert order[:4].count("alert") == 3
+
+    with Session() as db:
+        sent = db.get(PaymentReminders, 2)
+        assert sent.reminder_sent and sent.sent_at is not None and sent.queued_at is None
+        assert db.get(SMSLog, sent.sms_log_id).phone_number == "+915550002"
+        failed = db.get(PaymentReminders, 6)
+        assert failed.reminder_sent is False and failed.sms_log_id is not None and failed.queued_at is None
+
+
+def test_due_reminders_are_claimed_until_their_outcome_is_written(tmp_path, monkeypatch):
+    from app.api.v1.admin import sms_router
+
+    engine, Session = make_db(tmp_path)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(PaymentReminders.__table__.insert(), [
+            {"id": i, "phone_number": f"+91555{i:04d}", "customer_name": "S", "amount": 10.0,
+             "due_date": now, "invoice_number": f"INV-{i}", "reminder_sent": False,
+             # 3: claimed by a process that died with it queued
+             "queued_at": now - timedelta(hours=2) if i == 3 else None}
+            for i in range(1, 4)
+        ])
+    queued = []
+
+    class Dispatcher:
+        def submit_many(self, messages, provider, message_type):
+            queued.append(sorted(reminder_id for _, _, reminder_id in messages))
+            return len(queued[-1])
+
+    monkeypatch.setattr(sms_router, "get_sms_dispatcher", Dispatcher)
+    with Session() as db:
+        assert sms_router.send_due_payment_reminders(db=db, current_user=None, _=None) == {"queued": 3}
+        assert sms_router.send_due_payment_reminders(db=db, current_user=None, _=None) == {"queued": 0}
+    assert queued == [[1, 2, 3], []]
+
+    with Session() as db:
+        reminders = db.query(PaymentReminders).all()
+        assert all(r.queued_at is not None and r.reminder_sent is False for r in reminders)
+
+
+def test_token_bucket_shapes_to_rate():
+    bucket = TokenBucket(rate=200, burst=1)
+    waited = sum(bucket.acquire() for _ in range(21))
+    assert 0.08 <= waited <= 0.3
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(5, base=0.5, cap=2.0) for _ in range(200)]
+    assert max(delays) <= 2.0
+    assert len({round(d, 3) for d in delays}) > 50
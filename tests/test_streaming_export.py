@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+
+from openpyxl import load_workbook
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.students import Student
+from app.services.student_service import export_students_statement
+from app.utils.streaming_export import (
+    encode_csv,
+    encode_ndjson,
+    encode_xlsx,
+    normalize_format,
+    stream_rows,
+)
+from app.utils.utils import generate_csv_report
+
+HEADERS = ["student_id", "student_name", "status"]
+
+
+def make_session(tmp_path, students: int):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine, tables=[Student.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(
+            Student(student_id=f"S{i:05d}", student_name=f"Student {i}", student_email=f"s{i}@example.com",
+                    student_phone=f"{i:010d}", room_assignment="A1" if i % 2 else "B2",
+                    hostel_id=1 + i % 3, status="active")
+            for i in range(students)
+        )
+        db.commit()
+    return engine, Session
+
+
+def test_encoders_chunk_and_round_trip():
+    rows = [(f"S{i}", f"Name, \"{i}\"", None) for i in range(25)]
+
+    chunks = list(encode_csv(HEADERS, iter(rows), chunk_rows=10))
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert parsed[0] == HEADERS
+    assert parsed[1] == ["S0", 'Name, "0"', ""]
+
+    lines = b"".join(encode_ndjson(HEADERS, iter(rows), chunk_rows=10)).decode().splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[-1]) == {"student_id": "S24", "student_name": 'Name, "24"', "status": None}
+
+
+def test_xlsx_is_streamed_and_readable():
+    rows = [(i, f"<name & {i}>", i * 1.5) for i in range(3000)]
+    chunks = list(encode_xlsx(["id", "name", "score"], iter(rows), chunk_rows=500))
+    assert len(chunks) > 1
+
+    sheet = load_workbook(io.BytesIO(b"".join(chunks)), read_only=True).active
+    values = list(sheet.iter_rows(values_only=True))
+    assert values[0] == ("id", "name", "score")
+    assert values[1] == (0, "<name & 0>", 0)
+    assert values[-1] == (2999, "<name & 2999>", 4498.5)
+
+
+def test_student_export_selects_columns_and_streams_in_batches(tmp_path):
+    engine, Session = make_session(tmp_path, 120)
+    with Session() as db:
+        statement = export_students_statement(db, HEADERS, room="A1")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, many: statements.append(sql))
+    rows = stream_rows(statement, session_factory=Session, batch_size=25)
+    first = next(rows)
+    assert tuple(first) == ("S00001", "Student 1", "active")
+    rest = list(rows)
+
+    assert len(rest) + 1 == 60
+    assert len(statements) == 1
+    # Column-only select, no ORM entity load
+    assert "students.guardian_name" not in statements[0]
+    assert "students.room_assignment" in statements[0]  # filter is applied
+
+
+def test_report_csv_keeps_layout():
+    body = b"".join(generate_csv_report({"result_data": {
+        "summary": {"total": 3, "paid": 2},
+        "by_hostel": [{"hostel": "A", "total": 2}, {"hostel": "B", "total": 1, "late": 1}],
+    }})).decode()
+    summary, table = body.split("\r\n\n")
+    assert summary.splitlines() == ["Key,Value", "total,3", "paid,2"]
+    assert table.splitlines() == ["hostel,total,late", "A,2,", "B,1,1"]
+
+
+def test_format_aliases():
+    assert normalize_format("excel") == "xlsx"
+    assert normalize_format(None) == "csv"
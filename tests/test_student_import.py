@@ -0,0 +1,158 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.student_import import StudentImportJob, StudentImportRow
+from app.models.students import Student
+from app.models.user import User
+from app.services.student_import import StudentImporter, job_progress, spool_upload
+
+HEADER = "Student ID,Name,Email,Phone,DOB,Room\n"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Student.__table__, StudentImportJob.__table__, StudentImportRow.__table__,
+    ])
+    return engine
+
+
+def write_csv(tmp_path, body: str) -> str:
+    path, _ = spool_upload(io.BytesIO((HEADER + body).encode()), str(tmp_path / "spool"))
+    return path
+
+
+def student_rows(start: int, count: int) -> str:
+    return "".join(f"S{i:04d},Student {i},s{i}@example.com,9{i:09d},2004-01-0{1 + i % 9},A{i % 10}\n"
+                   for i in range(start, start + count))
+
+
+def test_import_validates_reports_and_merges(engine, tmp_path):
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(User(email="known@example.com", username="known", name="Known", role="visitor"))
+        db.add(Student(student_id="S9999", student_name="Old", student_email="old@example.com",
+                       student_phone="1"))
+        db.add(User(email="s0@other.com", username="s0", name="Taken username", role="visitor"))
+        db.commit()
+
+    body = (
+        student_rows(0, 5)
+        + "S0100,,missing@example.com,9000000100,,A1\n"          # line 7: no name
+        + "S0101,Bad Date,bad@example.com,9000000101,01/02/2004,A1\n"  # line 8
+        + "S0102,Bad Email,not-an-email,9000000102,,A1\n"         # line 9
+        + "S0001,Dup,dup@example.com,9000000103,,A1\n"            # line 10: duplicate id
+        + "S9999,Existing,old@example.com,1,,A1\n"               # line 11: already a student
+        + "S0104,Known,known@example.com,9000000104,,A1\n"        # line 12: reuses existing user
+    )
+    path, total = spool_upload(io.BytesIO((HEADER + body).encode()), str(tmp_path / "spool"))
+    assert total == 11
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, many: statements.append(sql))
+    importer = StudentImporter(Session, batch_size=100)
+    job_id = importer.create_job(path, filename="intake.csv", total_rows=total)
+    progress = importer.run_job(job_id)
+
+    assert progress["status"] == "completed" and progress["progress"] == 1.0
+    assert (progress["created"], progress["skipped"], progress["failed"]) == (6, 1, 4)
+    assert [e["row"] for e in progress["errors"]] == [7, 8, 9, 10]
+    assert progress["errors"][0]["error"] == "missing required: student_name"
+    assert "first seen on row 3" in progress["errors"][3]["error"]
+    # One batch: the row count does not change the number of statements
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT INTO STUDENTS ")]) == 1
+
+    with Session() as db:
+        assert db.query(Student).count() == 7
+        assert db.query(StudentImportRow).count() == 0
+        known = db.query(User).filter(User.email == "known@example.com").one()
+        assert known.role == "student" and known.is_verified
+        assert db.query(Student).filter(Student.student_id == "S0104").one().user_id == known.id
+        new_user = db.query(User).filter(User.email == "s0@example.com").one()
+        assert new_user.username == "s01" and new_user.is_active
+        assert db.query(Student).filter(Student.student_id == "S0003").one().date_of_birth.isoformat() == "2004-01-04"
+
+
+def test_database_error_is_isolated_to_its_row(engine, tmp_path):
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        user = User(email="linked@example.com", username="linked", name="Linked", role="student")
+        db.add(user)
+        db.flush()
+        db.add(Student(student_id="S5000", student_name="Linked", student_email="first@example.com",
+                       student_phone="2", user_id=user.id))
+        db.commit()
+
+    # line 5 reuses a user that already has a student -> unique user_id violation at merge time
+    path = write_csv(tmp_path, student_rows(0, 3) + "S0200,Again,linked@example.com,9000000200,,A1\n"
+                     + student_rows(3, 4))
+    importer = StudentImporter(Session, batch_size=100)
+    progress = importer.run_job(importer.create_job(path))
+
+    assert progress["status"] == "completed"
+    assert (progress["created"], progress["failed"]) == (7, 1)
+    assert progress["errors"][0]["row"] == 5
+    assert importer.stats()["batches_split"] == 1
+
+
+def test_failed_job_resumes_from_checkpoint(engine, tmp_path, monkeypatch):
+    Session = sessionmaker(bind=engine)
+    path = write_csv(tmp_path, student_rows(0, 25))
+    importer = StudentImporter(Session, batch_size=10)
+    job_id = importer.create_job(path, total_rows=25)
+
+    original = importer._commit_batch
+    calls = []
+
+    def crash_on_second(job, rows, errors, last_row):
+        calls.append(last_row)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return original(job, rows, errors, last_row)
+
+    monkeypatch.setattr(importer, "_commit_batch", crash_on_second)
+    progress = importer.run_job(job_id)
+    assert progress["status"] == "failed" and progress["last_error"] == "connection lost"
+    assert progress["created"] == 10
+    with Session() as db:
+        assert db.get(StudentImportJob, job_id).last_row == 11
+
+    monkeypatch.setattr(importer, "_commit_batch", original)
+    assert importer.resume(job_id)
+    importer.shutdown(wait=True)
+
+    with Session() as db:
+        job = db.get(StudentImportJob, job_id)
+        assert job_progress(job)["created"] == 25 and job.status == "completed"
+        assert db.query(Student).count() == 25
+
+
+def test_start_up_only_takes_over_stale_jobs_whose_file_is_here(engine, tmp_path):
+    Session = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+    importer = StudentImporter(Session, batch_size=10, heartbeat_timeout=600)
+    live = importer.create_job(write_csv(tmp_path, student_rows(0, 5)), total_rows=5)
+    stale = importer.create_job(write_csv(tmp_path, student_rows(5, 5)), total_rows=5)
+    elsewhere = importer.create_job(str(tmp_path / "other-host" / "gone.csv"), total_rows=5)
+    with Session() as db:
+        for job_id, heartbeat in ((live, now), (stale, now - timedelta(hours=1)),
+                                  (elsewhere, now - timedelta(hours=1))):
+            job = db.get(StudentImportJob, job_id)
+            job.status, job.heartbeat_at = "running", heartbeat
+        db.commit()
+
+    assert importer.resume_interrupted() == 1
+    importer.shutdown(wait=True)
+
+    with Session() as db:
+        assert db.get(StudentImportJob, live).status == "running"
+        assert db.get(StudentImportJob, stale).status == "completed"
+        assert db.get(StudentImportJob, elsewhere).status == "running"
+        assert db.query(Student).count() == 5
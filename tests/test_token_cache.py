@@ -0,0 +1,101 @@
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models.hostel  # noqa: F401  (users.hostel_id foreign key)
+from app.core import security
+from app.core.cache import MemoryCache, TieredCache, get_cache, set_cache
+from app.core.database import Base
+from app.core.token_cache import (
+    VerifiedTokenCache, get_cached_user, revoke_user_tokens, verified_tokens,
+)
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    set_cache(TieredCache(MemoryCache(), default_ttl=60))
+    verified_tokens.clear()
+    yield
+    set_cache(None)
+    verified_tokens.clear()
+
+
+def test_decode_token_verifies_signature_once(monkeypatch):
+    token = security.create_access_token({"sub": "5", "role": "admin"})
+    decodes = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decodes.append(1) or real_decode(*a, **kw))
+
+    first = security.decode_token(token)
+    first["role"] = "mutated"
+    assert security.decode_token(token)["role"] == "admin"
+    assert len(decodes) == 1
+
+    revoke_user_tokens("5")
+    security.decode_token(token)
+    assert len(decodes) == 2
+
+
+def test_claims_expire_with_the_token():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("expired", {"sub": "1", "exp": time.time() - 1})
+    cache.put("no-exp", {"sub": "1"})
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+
+    for name in ("a", "b", "c"):
+        cache.put(name, {"sub": name, "exp": time.time() + 60})
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_token_is_still_rejected():
+    token = security.create_access_token({"sub": "5"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(Exception):
+        security.decode_token(token)
+
+
+def test_user_row_is_cached_until_users_table_changes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), {"id": 5, "username": "ann", "name": "Ann", "role": "admin"})
+    selects = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statement.startswith("SELECT") and selects.append(statement))
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        assert get_cached_user(db, 5).username == "ann"
+    with Session() as db:
+        user = get_cached_user(db, 5)
+        assert user.name == "Ann"
+        user.full_name = "Ann Lee"  # still a normal persistent instance
+        db.commit()
+    assert len(selects) == 1
+
+    # The committed UPDATE evicted the entry
+    with Session() as db:
+        assert get_cached_user(db, 5).full_name == "Ann Lee"
+    assert len(selects) == 2
+
+
+def test_password_hash_is_not_cached(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine, tables=[User.__table__])
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), {"id": 5, "username": "ann", "name": "Ann", "role": "admin",
+                                               "hashed_password": "$2b$12$secret"})
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        get_cached_user(db, 5)
+
+    cached = get_cache().get("auth:user:5")
+    assert cached["username"] == "ann" and "hashed_password" not in cached
+    with Session() as db:
+        # Loaded from the database when a caller needs it
+        assert get_cached_user(db, 5).hashed_password == "$2b$12$secret"